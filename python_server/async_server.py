@@ -0,0 +1,296 @@
+import argparse
+import asyncio
+import io
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+import metrics
+from production_server import HOP_BY_HOP_HEADERS
+from server import RESTfulServer
+from storage import DATA_DOCUMENT
+
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    web = None
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Expose-Headers": "Content-Type, Authorization",
+}
+
+
+class DataChangeWatcher:
+    """data.json değişikliklerini tek bir coroutine ile izler, bekleyen bağlantıları uyandırır"""
+
+    def __init__(self, json_reader, executor: ThreadPoolExecutor, interval: float):
+        self.storage = json_reader.storage
+        self.executor = executor
+        self.interval = interval
+        self.version = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _read_version(self) -> int:
+        # Versiyonun ilk elemanı nanosaniye damgasıdır (dosyada mtime)
+        version = self.storage.document_version(DATA_DOCUMENT)
+        return version[0] if version is not None else 0
+
+    async def start(self):
+        self._condition = asyncio.Condition()
+        loop = asyncio.get_running_loop()
+        self.version = await loop.run_in_executor(self.executor, self._read_version)
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                version = await loop.run_in_executor(self.executor, self._read_version)
+                if version != self.version:
+                    self.version = version
+                    async with self._condition:
+                        self._condition.notify_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Data değişiklik izleme hatası: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def wait_for_change(self, since: int, timeout: float) -> bool:
+        """Versiyon `since` değerinden farklı olana kadar bekle; zaman aşımında False"""
+        if self.version != since:
+            return True
+        try:
+            async with self._condition:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.version != since),
+                    timeout=timeout
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class AsyncRESTfulServer:
+    """Aynı /api/* endpoint'lerini asyncio üzerinden sunan sunucu
+
+    Route handler'ları RESTfulServer'daki Flask uygulamasıdır; bloklayan JSONReader
+    işleri sınırlı bir thread havuzunda çalışır. Boşta bekleyen bağlantılar
+    (long-poll, stream) thread tutmaz, sadece bir coroutine'dir.
+    """
+
+    def __init__(self, server: Optional[RESTfulServer] = None,
+                 max_workers: int = config.ASYNC_EXECUTOR_WORKERS,
+                 max_pending: int = config.ASYNC_MAX_PENDING):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("Asyncio sunucusu için aiohttp gerekli: pip3 install aiohttp")
+
+        self.server = server if server is not None else RESTfulServer()
+        self.flask_app = self.server.app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-io")
+        self.max_pending = max_pending
+        self._pending: Optional[asyncio.Semaphore] = None
+        self.watcher = DataChangeWatcher(self.server.json_reader, self.executor, config.CHANGE_POLL_INTERVAL)
+
+        self.app = web.Application()
+        self.app.router.add_get('/api/data/changes', self.data_changes)
+        self.app.router.add_get('/api/data/stream', self.data_stream)
+        self.app.router.add_route('*', '/api/{tail:.*}', self.dispatch)
+        self.app.on_startup.append(self._on_startup)
+        self.app.on_cleanup.append(self._on_cleanup)
+
+    async def _on_startup(self, app):
+        self._pending = asyncio.Semaphore(self.max_pending)
+        await self.watcher.start()
+        logger.info("Asyncio sunucusu hazır")
+
+    async def _on_cleanup(self, app):
+        await self.watcher.stop()
+        self.executor.shutdown(wait=False)
+        logger.info("Asyncio sunucusu durduruldu")
+
+    async def _run_blocking(self, func, *args):
+        """Bloklayan işi sınırlı havuzda çalıştır; havuz doluysa coroutine olarak sırada bekle"""
+        queue_depth = metrics.QUEUE_DEPTH.labels("async")
+        queue_depth.inc()
+        try:
+            async with self._pending:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            queue_depth.dec()
+
+    def _build_environ(self, request, body: bytes, path: Optional[str] = None,
+                       method: Optional[str] = None, query_string: Optional[str] = None) -> Dict[str, Any]:
+        host, _, port = (request.host or "localhost").partition(":")
+        environ = {
+            'REQUEST_METHOD': method or request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': (path or request.path).encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': request.query_string if query_string is None else query_string,
+            'SERVER_NAME': host,
+            'SERVER_PORT': port or '80',
+            'SERVER_PROTOCOL': f"HTTP/{request.version.major}.{request.version.minor}",
+            'REMOTE_ADDR': request.remote or '',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': request.scheme,
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            'CONTENT_LENGTH': str(len(body)) if body else '',
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace('-', '_')
+            if key == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif key != 'CONTENT_LENGTH':
+                environ[f"HTTP_{key}"] = value
+        return environ
+
+    def _call_wsgi(self, environ: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        """Flask uygulamasını çağır ve yanıtı topla (executor thread'inde çalışır)"""
+        captured = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            return chunks.append
+
+        result = self.flask_app(environ, start_response)
+        try:
+            for chunk in result:
+                chunks.append(chunk)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return captured['status'], captured['headers'], b"".join(chunks)
+
+    def _to_response(self, status: str, headers: List[Tuple[str, str]], body: bytes):
+        code, _, reason = status.partition(' ')
+        response_headers = [
+            (name, value) for name, value in headers
+            if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != 'content-length'
+        ]
+        return web.Response(status=int(code), reason=reason or None, headers=response_headers, body=body)
+
+    async def dispatch(self, request):
+        """Tüm /api/* isteklerini mevcut Flask route handler'larına ilet"""
+        body = await request.read()
+        environ = self._build_environ(request, body)
+        status, headers, response_body = await self._run_blocking(self._call_wsgi, environ)
+        return self._to_response(status, headers, response_body)
+
+    async def _current_data(self, request) -> bytes:
+        """/api/data yanıtını aynı handler ile üret"""
+        environ = self._build_environ(request, b"", path='/api/data', method='GET', query_string='')
+        _, _, body = await self._run_blocking(self._call_wsgi, environ)
+        return body
+
+    async def data_changes(self, request):
+        """Long-poll: data.json `since` versiyonundan farklı olana kadar bekle"""
+        try:
+            since = int(request.query.get('since', '0'))
+            timeout = min(float(request.query.get('timeout', config.LONG_POLL_TIMEOUT)), config.LONG_POLL_TIMEOUT)
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": "since ve timeout sayısal olmalı"
+            }, status=400, headers=CORS_HEADERS)
+
+        connections = metrics.ACTIVE_CONNECTIONS.labels("long_poll")
+        connections.inc()
+        try:
+            changed = await self.watcher.wait_for_change(since, timeout)
+        finally:
+            connections.dec()
+        payload = {
+            "success": True,
+            "changed": changed,
+            "version": self.watcher.version,
+            "data": json.loads(await self._current_data(request)) if changed else None
+        }
+        return web.json_response(payload, headers=CORS_HEADERS)
+
+    async def data_stream(self, request):
+        """Server-sent events: her data.json değişikliğinde /api/data yanıtını gönder"""
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            **CORS_HEADERS
+        })
+        await response.prepare(request)
+
+        version = -1
+        connections = metrics.ACTIVE_CONNECTIONS.labels("stream")
+        connections.inc()
+        try:
+            while True:
+                if await self.watcher.wait_for_change(version, config.STREAM_HEARTBEAT_INTERVAL):
+                    version = self.watcher.version
+                    data = await self._current_data(request)
+                    await response.write(b"event: data\nid: " + str(version).encode() + b"\ndata: " + data.strip() + b"\n\n")
+                else:
+                    # Ara proxy'ler bağlantıyı kapatmasın diye yorum satırı gönder
+                    await response.write(b": heartbeat\n\n")
+        except (ConnectionResetError, asyncio.CancelledError):
+            logger.debug("Stream bağlantısı kapandı")
+        finally:
+            connections.dec()
+        return response
+
+    def run(self, host: str, port: int):
+        logger.info(f"Asyncio RESTful API sunucusu başlatılıyor: {host}:{port}")
+        web.run_app(self.app, host=host, port=port, print=None)
+
+
+def main():
+    """Asyncio giriş noktası"""
+    parser = argparse.ArgumentParser(description="Hidrologger asyncio sunucusu")
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT)
+    parser.add_argument('--monitoring', action='store_true',
+                        help="data.json izleme thread'ini başlat")
+    args = parser.parse_args()
+
+    if not AIOHTTP_AVAILABLE:
+        logger.error("Asyncio sunucusu için aiohttp gerekli: pip3 install aiohttp")
+        raise SystemExit(1)
+
+    server = RESTfulServer()
+    if args.monitoring:
+        server.start_background_monitoring()
+    server.rollup_backfiller.start()
+    server.compactor.start()
+    try:
+        AsyncRESTfulServer(server).run(args.host, args.port)
+    except KeyboardInterrupt:
+        logger.info("Sunucu kullanıcı tarafından durduruldu")
+    finally:
+        server.stop_background_monitoring()
+        server.rollup_backfiller.stop()
+        server.compactor.stop()
+
+
+if __name__ == "__main__":
+    main()
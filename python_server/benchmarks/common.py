@@ -0,0 +1,136 @@
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    resource = None
+    RESOURCE_AVAILABLE = False
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Sıralı listede en yakın sıra (nearest-rank) yüzdeliği"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies: List[float], wall_seconds: float) -> Dict[str, float]:
+    """Saniye cinsinden gecikmelerden ms cinsinde özet"""
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "throughput_rps": round(len(values) / wall_seconds, 2) if wall_seconds > 0 else 0.0
+    }
+
+
+def peak_rss_kb(children: bool = False) -> Optional[int]:
+    """Bu sürecin (veya beklenmiş çocuk süreçlerin) en yüksek RSS değeri, KB"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # macOS byte, Linux KB döndürür
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def process_rss_kb(pid: int) -> Optional[int]:
+    """Çalışan bir sürecin anlık RSS değeri (sadece /proc olan sistemlerde)"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def process_tree_usage(pid: int) -> Optional[Dict[str, float]]:
+    """Süreç ve tüm alt süreçlerinin (örn. gunicorn worker'ları) toplam RSS ve CPU süresi
+
+    Sadece /proc olan sistemlerde çalışır; süreç yoksa None döner.
+    """
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+
+    parents = {}
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+            # ppid, utime, stime (")" sonrası 2., 12. ve 13. alanlar)
+            parents[int(entry)] = (int(fields[1]), int(fields[11]) + int(fields[12]))
+        except (OSError, IndexError, ValueError):
+            continue
+    if pid not in parents:
+        return None
+
+    tree, pending = set(), [pid]
+    while pending:
+        current = pending.pop()
+        tree.add(current)
+        pending.extend(child for child, (ppid, _) in parents.items() if ppid == current and child not in tree)
+
+    ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    return {
+        "processes": len(tree),
+        "rss_kb": sum(process_rss_kb(member) or 0 for member in tree),
+        "cpu_seconds": sum(parents[member][1] for member in tree if member in parents) / ticks
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata(**extra: Any) -> Dict[str, Any]:
+    """Sonuç dosyalarına eklenen ortak bilgiler (karşılaştırma için)"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "storage": os.environ.get("HIDROLOGGER_STORAGE", "json"),
+        **extra
+    }
+
+
+def write_results(path: str, results: Dict[str, Any]):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+    print(f"Sonuçlar kaydedildi: {path}")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def quiet_server_logs():
+    """Benchmark sırasında istek başına INFO logları ölçümü bozmasın"""
+    os.environ.setdefault("HIDROLOGGER_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("HIDROLOGGER_LOG_LEVELS", "werkzeug=WARNING")
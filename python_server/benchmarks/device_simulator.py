@@ -0,0 +1,349 @@
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from benchmarks.common import quiet_server_logs, run_metadata, summarize_latencies, write_results
+from benchmarks.synthetic_data import generate_dataset
+
+SHAPES = ("steady", "drift", "flood", "dropout", "battery")
+
+# (kanal, value_timestamp, value) -> yazıldığı an
+UpdateKey = Tuple[int, int, float]
+
+
+class Signal:
+    """Tek kanalın sinyal modeli; `sample` None dönerse kanal bu turda veri göndermez"""
+
+    def __init__(self, shape: str, base: float, rng: random.Random, duration: float):
+        self.shape = shape
+        self.base = base
+        self.rng = rng
+        self.battery = 100.0
+        self.signal_strength = rng.randint(70, 100)
+        self.drift_per_second = rng.uniform(-0.05, 0.05)
+        # Taşkın hidrografı: tepe zamanı ve büyüklüğü
+        self.flood_start = rng.uniform(0, duration / 3)
+        self.flood_peak_after = max(1.0, rng.uniform(duration / 10, duration / 3))
+        self.flood_height = rng.uniform(2, 10) * max(1.0, base / 10)
+        self.dropout_until = 0.0
+        self.battery_drain_per_second = rng.uniform(100 / duration, 300 / duration)
+
+    def sample(self, elapsed: float) -> Optional[Dict[str, Any]]:
+        noise = self.rng.gauss(0, 0.05)
+        value = self.base + noise
+
+        if self.shape == "drift":
+            value += self.drift_per_second * elapsed
+        elif self.shape == "flood":
+            t = (elapsed - self.flood_start) / self.flood_peak_after
+            if t > 0:
+                # Gama benzeri birim hidrograf: t=1'de tepe, ardından yavaş çekilme
+                value += self.flood_height * (t ** 3) * math.exp(3 * (1 - t))
+        elif self.shape == "dropout":
+            if elapsed < self.dropout_until:
+                return None
+            if self.rng.random() < 0.02:
+                self.dropout_until = elapsed + self.rng.uniform(1, 10)
+                self.signal_strength = self.rng.randint(0, 20)
+                return None
+            self.signal_strength = self.rng.randint(60, 100)
+        elif self.shape == "battery":
+            self.battery = max(0.0, 100 - self.battery_drain_per_second * elapsed)
+            if self.battery <= 0:
+                return None
+
+        return {"value": round(value, 3), "battery_percentage": int(self.battery),
+                "signal_strength": self.signal_strength}
+
+
+def parse_shape_mix(spec: str) -> Dict[str, float]:
+    """"steady=0.5,flood=0.3,dropout=0.2" biçimindeki karışımı çözümle"""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SHAPES:
+            raise ValueError(f"Bilinmeyen sinyal şekli: {name} (geçerli: {', '.join(SHAPES)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+class DataFileWriter:
+    """data.json'u cihaz/veri kaydedici gibi yazar
+
+    `atomic`: geçici dosyaya yazıp os.replace ile değiştirir (okuyucu hep tam dosya görür).
+    `inplace`: aynı dosyanın üzerine parça parça yazar; okuyucu yarım dosya görebilir.
+    """
+
+    def __init__(self, path: str, mode: str, chunk_size: int, chunk_delay: float):
+        self.path = path
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+
+    def write(self, document: Dict[str, Any]):
+        payload = json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8")
+        if self.mode == "atomic":
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(payload)
+            os.replace(temp_path, self.path)
+            return
+
+        with open(self.path, "r+b" if os.path.exists(self.path) else "wb") as file:
+            for offset in range(0, len(payload), self.chunk_size):
+                file.write(payload[offset:offset + self.chunk_size])
+                file.flush()
+                if self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+            file.truncate()
+
+
+class LogWatcher:
+    """logs.json'u izleyip yayınlanan güncellemelerin ilk görüldüğü anı kaydeder"""
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.first_seen: Dict[UpdateKey, float] = {}
+        self.record_count = 0
+        self.truncations = 0
+        self.records_lost = 0
+        self.unreadable = 0
+        self._last_mtime = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.scan()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.scan()
+
+    def scan(self) -> Optional[List[Dict[str, Any]]]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._last_mtime:
+                return None
+            with open(self.path, "rb") as file:
+                logs = json.loads(file.read()).get("logs", [])
+        except (OSError, ValueError):
+            self.unreadable += 1
+            return None
+        seen_at = time.time()
+        self._last_mtime = mtime
+
+        start = self.record_count
+        if len(logs) < self.record_count:
+            # Dosya küçüldü: sunucu kayıtları kaybetti (örn. bozuk okunup sıfırlandı)
+            self.truncations += 1
+            self.records_lost += self.record_count - len(logs)
+            start = 0
+        for record in logs[start:]:
+            key = _record_key(record)
+            if key is not None and key not in self.first_seen:
+                self.first_seen[key] = seen_at
+        self.record_count = len(logs)
+        return logs
+
+
+def _record_key(record: Dict[str, Any]) -> Optional[UpdateKey]:
+    try:
+        return int(record["channel"]), int(record["value_timestamp"]), float(record["value"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _start_remote_monitoring(url: str):
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=10)
+    connection.request("POST", "/api/monitoring/start")
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    print(f"Sunucu monitoring isteği: HTTP {response.status}")
+
+
+def run(args) -> Dict[str, Any]:
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="hidrologger_devices_")
+    data_path = os.path.join(data_dir, "variable", "data.json")
+    logs_path = os.path.join(data_dir, "logsfile", "logs.json")
+    if not os.path.exists(data_path):
+        print(f"{args.channels} kanallı veri seti üretiliyor: {data_dir}")
+        generate_dataset(data_dir, channels=args.channels, alarms_per_channel=1, stations=1,
+                         seed=args.seed, logs_per_channel=0)
+
+    with open(data_path, encoding="utf-8") as file:
+        document = json.load(file)
+    entries = document.get("data", [])
+    rng = random.Random(args.seed)
+    mix = parse_shape_mix(args.shapes)
+    names, weights = list(mix), list(mix.values())
+    signals = {
+        entry["channel"]: Signal(rng.choices(names, weights=weights)[0], float(entry.get("value", 10)),
+                                 random.Random(rng.random()), args.duration)
+        for entry in entries
+    }
+
+    server = None
+    if args.url:
+        _start_remote_monitoring(args.url)
+    else:
+        quiet_server_logs()
+        from json_reader import JSONReader
+        from server import RESTfulServer
+        server = RESTfulServer(JSONReader(data_dir))
+        server.start_background_monitoring()
+
+    writer = DataFileWriter(data_path, args.write_mode, args.chunk_size, args.chunk_delay / 1000)
+    watcher = LogWatcher(logs_path, args.watch_interval)
+    watcher.scan()
+    watcher.start()
+
+    published: Dict[UpdateKey, float] = {}
+    last_timestamp: Dict[int, int] = {}
+    write_durations = []
+    skipped = 0
+    started = time.monotonic()
+    next_write = started
+    try:
+        while time.monotonic() - started < args.duration:
+            elapsed = time.monotonic() - started
+            now = int(time.time())
+            pending = []
+            for entry in entries:
+                if args.update_fraction < 1 and rng.random() >= args.update_fraction:
+                    continue
+                reading = signals[entry["channel"]].sample(elapsed)
+                if reading is None:
+                    skipped += 1
+                    continue
+                # Kanal başına artan zaman damgası: her güncelleme loglarda ayırt edilebilsin
+                timestamp = max(now, last_timestamp.get(entry["channel"], 0) + 1)
+                last_timestamp[entry["channel"]] = timestamp
+                entry.update(reading, value_timestamp=timestamp)
+                entry["min_value"] = min(entry.get("min_value", reading["value"]), reading["value"])
+                entry["max_value"] = max(entry.get("max_value", reading["value"]), reading["value"])
+                pending.append((entry["channel"], timestamp, float(reading["value"])))
+
+            write_started = time.perf_counter()
+            writer.write(document)
+            write_durations.append(time.perf_counter() - write_started)
+            written_at = time.time()
+            for key in pending:
+                published[key] = written_at
+
+            next_write += 1 / args.rate
+            delay = next_write - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        writes_elapsed = time.monotonic() - started
+
+        print(f"Yazma bitti, {args.grace} sn yakalama bekleniyor...")
+        time.sleep(args.grace)
+    finally:
+        watcher.stop()
+        if server is not None:
+            server.stop_background_monitoring()
+
+    # Son logs.json görüntüsünden tekrar eden kayıtları say
+    try:
+        with open(logs_path, "rb") as file:
+            final_logs = json.loads(file.read()).get("logs", [])
+    except (OSError, ValueError):
+        final_logs = []
+    occurrences: Dict[UpdateKey, int] = {}
+    for record in final_logs:
+        key = _record_key(record)
+        if key in published:
+            occurrences[key] = occurrences.get(key, 0) + 1
+
+    latencies = [watcher.first_seen[key] - written_at for key, written_at in published.items()
+                 if key in watcher.first_seen]
+    captured = len(latencies)
+    shapes = {}
+    for signal in signals.values():
+        shapes[signal.shape] = shapes.get(signal.shape, 0) + 1
+
+    return {
+        "config": {
+            "channels": len(entries), "rate": args.rate, "update_fraction": args.update_fraction,
+            "write_mode": args.write_mode, "duration": args.duration, "shapes": shapes,
+            "server": args.url or "in-process"
+        },
+        "writes": {
+            "count": len(write_durations),
+            "achieved_rate": round(len(write_durations) / writes_elapsed, 2) if writes_elapsed else 0.0,
+            "duration": summarize_latencies(write_durations, writes_elapsed),
+            "data_json_bytes": os.path.getsize(data_path)
+        },
+        "capture": {
+            "published": len(published),
+            "skipped_readings": skipped,
+            "captured": captured,
+            "missed": len(published) - captured,
+            "miss_rate": round((len(published) - captured) / max(1, len(published)), 4),
+            "duplicate_records": sum(count - 1 for count in occurrences.values() if count > 1),
+            "latency": summarize_latencies(latencies, writes_elapsed),
+            "log_truncations": watcher.truncations,
+            "log_records_lost": watcher.records_lost,
+            "unreadable_log_scans": watcher.unreadable,
+            "final_log_records": len(final_logs)
+        }
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="data.json'u yüksek hızda güncelleyen cihaz simülatörü")
+    parser.add_argument("--data-dir", help="İzlenen jsons/ klasörü (verilmezse geçici klasöre üretilir)")
+    parser.add_argument("--url", help="Çalışan sunucu (monitoring başlatılır); verilmezse sunucu süreç içinde kurulur")
+    parser.add_argument("--channels", type=int, default=1000, help="Veri seti üretilirken kanal sayısı")
+    parser.add_argument("--rate", type=float, default=1.0, help="Saniyedeki data.json yazma sayısı")
+    parser.add_argument("--update-fraction", type=float, default=1.0, help="Her yazmada güncellenen kanal oranı")
+    parser.add_argument("--shapes", default="steady=0.4,drift=0.2,flood=0.2,dropout=0.1,battery=0.1",
+                        help="Sinyal şekli karışımı")
+    parser.add_argument("--write-mode", choices=("atomic", "inplace"), default="atomic")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="inplace modunda parça boyutu (byte)")
+    parser.add_argument("--chunk-delay", type=float, default=1.0, help="inplace modunda parçalar arası bekleme (ms)")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--grace", type=float, default=5.0, help="Yazma bittikten sonra yakalama için bekleme")
+    parser.add_argument("--watch-interval", type=float, default=0.05, help="logs.json kontrol aralığı")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="device_simulation.json")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    results["meta"] = run_metadata(kind="devices")
+    capture = results["capture"]
+    print(f"\n{results['writes']['count']} yazma ({results['writes']['achieved_rate']}/sn), "
+          f"{capture['published']} güncelleme yayınlandı")
+    print(f"  yakalanan={capture['captured']} kaçırılan={capture['missed']} (%{capture['miss_rate'] * 100:.1f}) "
+          f"tekrar eden kayıt={capture['duplicate_records']}")
+    print(f"  yakalama gecikmesi p50={capture['latency']['p50_ms']} p99={capture['latency']['p99_ms']} "
+          f"max={capture['latency']['max_ms']} ms")
+    if capture["log_truncations"]:
+        print(f"  UYARI: logs.json {capture['log_truncations']} kez küçüldü, "
+              f"{capture['log_records_lost']} kayıt kayboldu")
+    write_results(args.output, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from benchmarks.common import (
+    SERVER_DIR, load_results, peak_rss_kb, process_rss_kb, quiet_server_logs,
+    run_metadata, summarize_latencies, write_results
+)
+from benchmarks.synthetic_data import generate_dataset, scale_arguments, spec_from_args
+
+# Ölçülmeyen route'lar: statik dosyalar ve süreç içi admin/profil endpoint'leri
+EXCLUDED_PREFIXES = ('/static', '/api/admin/')
+
+# (metod, yol, gövde)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class RequestFactory:
+    """Route kurallarından, veri setine uygun rastgele parametrelerle istek üretir"""
+
+    def __init__(self, app, dataset: Dict[str, Any], seed: int = 1):
+        self.adapter = app.url_map.bind("localhost")
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+
+    def _value(self, argument: str) -> int:
+        channels = self.dataset["channels"]
+        if argument == "channel_id":
+            return self.rng.randint(1, channels)
+        if argument == "alarm_id":
+            return self.rng.randint(1, max(1, channels * self.dataset["alarms_per_channel"]))
+        if argument == "station_id":
+            return self.rng.randint(1, self.dataset["stations"])
+        if argument == "start_time":
+            return self.dataset["end_time"] - 86400
+        if argument == "end_time":
+            return self.dataset["end_time"]
+        return 1
+
+    def read_routes(self, rules) -> Dict[str, Callable[[], Request]]:
+        """Tüm GET route'ları ve salt okuma batch isteği"""
+        routes = {}
+        for rule in rules:
+            if 'GET' not in rule.methods or rule.rule.startswith(EXCLUDED_PREFIXES):
+                continue
+            routes[f"GET {rule.rule}"] = self._builder(rule)
+        routes["POST /api/batch"] = lambda: ('POST', '/api/batch', {"requests": [
+            {"path": "/api/channel"},
+            {"path": "/api/data"},
+            {"path": f"/api/alarm/channel-{self._value('channel_id')}/"}
+        ]})
+        return routes
+
+    def write_routes(self) -> Dict[str, Callable[[], Request]]:
+        """Veri setini değiştiren tipik yazma istekleri"""
+        return {
+            "POST /api/logs/<int:channel_id>": lambda: (
+                'POST', f"/api/logs/{self._value('channel_id')}",
+                {"value": round(self.rng.uniform(0, 50), 2), "timestamp": int(time.time())}
+            ),
+            "PUT /api/channel/<int:channel_id>": lambda: (
+                'PUT', f"/api/channel/{self._value('channel_id')}",
+                {"field": "description", "value": f"benchmark {self.rng.random():.6f}"}
+            ),
+            "POST /api/logs/auto-save": lambda: ('POST', '/api/logs/auto-save', {}),
+        }
+
+    def _builder(self, rule) -> Callable[[], Request]:
+        def build() -> Request:
+            values = {argument: self._value(argument) for argument in rule.arguments}
+            path = self.adapter.build(rule.endpoint, values, method='GET')
+            if rule.rule == '/api/log':
+                path += "?" + urlencode({
+                    "channel": self._value("channel_id"),
+                    "start": self.dataset["end_time"] - 86400,
+                    "end": self.dataset["end_time"]
+                })
+            return 'GET', path, None
+        return build
+
+
+def _response_bytes(status_line: str, headers: List[Tuple[str, str]], body_length: int) -> int:
+    """Durum satırı + başlıklar + gövde; kablodaki yanıt boyutuna yakın değer"""
+    return len(status_line) + 2 + sum(len(name) + len(value) + 4 for name, value in headers) + 2 + body_length
+
+
+def run_flask(server, routes: Dict[str, Callable[[], Request]], requests: int, warmup: int) -> Dict[str, Any]:
+    """Flask test client ile süreç içi ölçüm (ağ ve WSGI sunucu maliyeti hariç)"""
+    client = server.app.test_client()
+    results = {}
+    for name, build in routes.items():
+        for _ in range(warmup):
+            method, path, body = build()
+            client.open(path, method=method, json=body)
+
+        latencies, errors, wire_bytes = [], 0, 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            method, path, body = build()
+            request_started = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            latencies.append(time.perf_counter() - request_started)
+            data = response.get_data()
+            errors += response.status_code >= 500
+            wire_bytes += _response_bytes(f"HTTP/1.1 {response.status}", list(response.headers.items()), len(data))
+        wall = time.perf_counter() - started
+
+        results[name] = {
+            **summarize_latencies(latencies, wall),
+            "errors": errors,
+            "bytes_total": wire_bytes,
+            "bytes_per_request": wire_bytes // max(1, requests)
+        }
+        print(f"  {name}: p50={results[name]['p50_ms']} ms p99={results[name]['p99_ms']} ms")
+    return {"routes": results, "peak_rss_kb": peak_rss_kb()}
+
+
+class _HttpWorker:
+    """Kalıcı bağlantıyla sırayla istek gönderen istemci"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.connection = None
+
+    def send(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                status_line = f"HTTP/{response.version // 10}.{response.version % 10} {response.status} {response.reason}"
+                return response.status, _response_bytes(status_line, response.getheaders(), len(data))
+            except (http.client.HTTPException, OSError):
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+
+def run_http(host: str, port: int, routes: Dict[str, Callable[[], Request]], requests: int,
+             warmup: int, concurrency: int, server_pid: Optional[int] = None) -> Dict[str, Any]:
+    """Gerçek HTTP üzerinden, `concurrency` kalıcı bağlantıyla ölçüm"""
+    workers = [_HttpWorker(host, port) for _ in range(concurrency)]
+    build_lock = threading.Lock()
+    results = {}
+    rss_samples = []
+
+    for name, build in routes.items():
+        for _ in range(warmup):
+            workers[0].send(*build())
+
+        latencies, counters = [], {"errors": 0, "bytes": 0, "remaining": requests}
+
+        def drive(worker: _HttpWorker):
+            while True:
+                with build_lock:
+                    if counters["remaining"] <= 0:
+                        return
+                    counters["remaining"] -= 1
+                    request = build()
+                request_started = time.perf_counter()
+                try:
+                    status, wire_bytes = worker.send(*request)
+                except Exception:
+                    status, wire_bytes = 599, 0
+                elapsed = time.perf_counter() - request_started
+                with build_lock:
+                    latencies.append(elapsed)
+                    counters["errors"] += status >= 500
+                    counters["bytes"] += wire_bytes
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=drive, args=(worker,)) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        if server_pid is not None:
+            rss = process_rss_kb(server_pid)
+            if rss is not None:
+                rss_samples.append(rss)
+
+        results[name] = {
+            **summarize_latencies(latencies, wall),
+            "errors": counters["errors"],
+            "bytes_total": counters["bytes"],
+            "bytes_per_request": counters["bytes"] // max(1, requests)
+        }
+        print(f"  {name}: p50={results[name]['p50_ms']} ms p99={results[name]['p99_ms']} ms "
+              f"{results[name]['throughput_rps']} req/s")
+
+    return {"routes": results, "rss_samples_kb": rss_samples}
+
+
+def _free_port() -> int:
+    """İşletim sisteminden boş bir TCP portu al"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _wait_until_ready(host: str, port: int, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Benchmark sunucusu başlatılamadı (çıkış kodu {process.returncode})")
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=1)
+            connection.request("GET", "/api/health")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Benchmark sunucusu zamanında hazır olmadı")
+
+
+def _stop_server(process: subprocess.Popen) -> Optional[int]:
+    """Sunucuyu durdur; mümkünse çocuk sürecin en yüksek RSS değerini döndür"""
+    process.terminate()
+    if hasattr(os, "wait4"):
+        try:
+            _, _, usage = os.wait4(process.pid, 0)
+            process.returncode = 0
+            return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        except ChildProcessError:
+            pass
+    process.wait(timeout=10)
+    return peak_rss_kb(children=True)
+
+
+def serve(data_dir: str, host: str, port: int):
+    """HTTP modu için ayrı süreçte çalışan sunucu (ölçüm süreciyle RSS'i karışmasın)"""
+    quiet_server_logs()
+    from werkzeug.serving import make_server
+    from json_reader import JSONReader
+    from server import RESTfulServer
+
+    server = RESTfulServer(JSONReader(data_dir))
+    make_server(host, port, server.app, threaded=True).serve_forever()
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """İki sonuç dosyasını route bazında karşılaştır (oran > 1 yavaşlama)"""
+    for mode, mode_results in current.get("modes", {}).items():
+        base_routes = baseline.get("modes", {}).get(mode, {}).get("routes", {})
+        print(f"\n[{mode}] {'route':<60} p50 oranı  p99 oranı")
+        for name, result in mode_results["routes"].items():
+            base = base_routes.get(name)
+            if not base or not base["p50_ms"] or not base["p99_ms"]:
+                continue
+            print(f"  {name:<62} {result['p50_ms'] / base['p50_ms']:>8.2f}  {result['p99_ms'] / base['p99_ms']:>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Hidrologger endpoint benchmark")
+    scale_arguments(parser)
+    parser.add_argument("--data-dir", help="Var olan veri setini kullan (verilmezse geçici klasöre üretilir)")
+    parser.add_argument("--mode", choices=("flask", "http", "both"), default="both")
+    parser.add_argument("--url", help="Çalışan bir sunucuya karşı ölç (HTTP modu, örn. http://127.0.0.1:8765)")
+    parser.add_argument("--server-pid", type=int, help="--url ile ölçülen sunucunun PID'i (RSS örnekleri için)")
+    parser.add_argument("--requests", type=int, default=100, help="Route başına istek sayısı")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4, help="HTTP modunda eşzamanlı bağlantı")
+    parser.add_argument("--writes", action="store_true", help="Yazma route'larını da ölç (veri setini değiştirir)")
+    parser.add_argument("--output", default="endpoint_benchmark.json")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, "127.0.0.1", args.port)
+        return
+
+    quiet_server_logs()
+    from json_reader import JSONReader
+    from server import RESTfulServer
+
+    spec = spec_from_args(args)
+    if args.data_dir and os.path.exists(os.path.join(args.data_dir, "variable", "channel.json")):
+        data_dir = args.data_dir
+        with open(os.path.join(data_dir, "variable", "channel.json"), encoding="utf-8") as file:
+            spec["channels"] = len(json.load(file).get("channel", []))
+        dataset = {**spec, "path": data_dir, "end_time": int(time.time())}
+    else:
+        data_dir = args.data_dir or tempfile.mkdtemp(prefix="hidrologger_bench_")
+        print(f"Veri seti üretiliyor: {data_dir} {spec}")
+        dataset = generate_dataset(data_dir, **spec)
+        print(f"  {dataset['log_records']} log kaydı, logs.json {dataset['file_bytes'].get('logsfile/logs.json', 0)} byte")
+
+    server = RESTfulServer(JSONReader(data_dir))
+    factory = RequestFactory(server.app, dataset, seed=spec["seed"])
+    routes = factory.read_routes(server.app.url_map.iter_rules())
+    if args.writes:
+        routes.update(factory.write_routes())
+
+    results = {
+        "meta": run_metadata(kind="endpoint", dataset=dataset, requests=args.requests,
+                             warmup=args.warmup, concurrency=args.concurrency),
+        "modes": {}
+    }
+
+    if args.mode in ("flask", "both") and not args.url:
+        print("Flask test client ölçümü")
+        results["modes"]["flask"] = run_flask(server, routes, args.requests, args.warmup)
+
+    if args.mode in ("http", "both"):
+        print("HTTP ölçümü")
+        if args.url:
+            target = urlparse(args.url)
+            results["modes"]["http"] = run_http(target.hostname, target.port or 80, routes, args.requests,
+                                                args.warmup, args.concurrency, args.server_pid)
+        else:
+            port = _free_port()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.endpoint_benchmark", "--serve", data_dir, "--port", str(port)],
+                cwd=SERVER_DIR
+            )
+            try:
+                _wait_until_ready("127.0.0.1", port, process)
+                http_results = run_http("127.0.0.1", port, routes, args.requests, args.warmup,
+                                        args.concurrency, process.pid)
+            finally:
+                server_peak_rss = _stop_server(process)
+            http_results["peak_rss_kb"] = server_peak_rss
+            results["modes"]["http"] = http_results
+
+    write_results(args.output, results)
+    if args.compare:
+        compare(results, load_results(args.compare))
+
+
+if __name__ == "__main__":
+    main()
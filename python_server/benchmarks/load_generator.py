@@ -0,0 +1,314 @@
+import argparse
+import heapq
+import http.client
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from benchmarks.common import percentile, process_tree_usage, run_metadata, summarize_latencies, write_results
+
+# Flutter istemcisindeki http çağrılarının zaman aşımı (Duration(seconds: 10))
+CLIENT_TIMEOUT = 10.0
+
+# Ekran ziyaretleri (ağırlık); RestfulService'in ekranlardan çağrılan metodlarına karşılık gelir
+READ_ACTIONS = (("log_screen", 6), ("alarm_screen", 3), ("channel_screen", 1))
+WRITE_ACTIONS = (("alarm_save", 4), ("channel_update", 4), ("log_save", 2))
+
+
+class Target:
+    """Ölçülen sunucu ve istek gönderme (varsayılan olarak her istek yeni bağlantı, Dart http.get gibi)"""
+
+    def __init__(self, url: str, keep_alive: bool, timeout: float):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None) if self.keep_alive else None
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            if self.keep_alive:
+                self._local.connection = connection
+        return connection
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        connection = self._connection()
+        try:
+            connection.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, response.read()
+        except Exception:
+            connection.close()
+            self._local.connection = None
+            raise
+        finally:
+            if not self.keep_alive:
+                connection.close()
+
+
+class Recorder:
+    """İstek sonuçlarını tür bazında ve zaman penceresi bazında toplar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_kind: Dict[str, List[float]] = {}
+        self.errors_by_kind: Dict[str, int] = {}
+        self.window_latencies: List[float] = []
+        self.window_errors = 0
+        self.schedule_lag: List[float] = []
+
+    def record(self, kind: str, seconds: float, ok: bool):
+        with self._lock:
+            self.by_kind.setdefault(kind, []).append(seconds)
+            self.window_latencies.append(seconds)
+            if not ok:
+                self.errors_by_kind[kind] = self.errors_by_kind.get(kind, 0) + 1
+                self.window_errors += 1
+
+    def lag(self, seconds: float):
+        with self._lock:
+            self.schedule_lag.append(seconds)
+
+    def take_window(self) -> Tuple[List[float], int]:
+        with self._lock:
+            latencies, errors = self.window_latencies, self.window_errors
+            self.window_latencies, self.window_errors = [], 0
+        return latencies, errors
+
+
+class SimulatedPhone:
+    """Tek bir telefon: dashboard polling'i + düşünme süresi sonrası ekran ziyaretleri"""
+
+    def __init__(self, phone_id: int, target: Target, recorder: Recorder, catalog: Dict[str, Any],
+                 write_ratio: float, log_range_hours: float, rng: random.Random):
+        self.phone_id = phone_id
+        self.target = target
+        self.recorder = recorder
+        self.catalog = catalog
+        self.write_ratio = write_ratio
+        self.log_range_hours = log_range_hours
+        self.rng = rng
+
+    def _call(self, kind: str, method: str, path: str, body: Optional[Dict[str, Any]] = None):
+        started = time.perf_counter()
+        try:
+            status, _ = self.target.request(method, path, body)
+            ok = status < 500
+        except Exception:
+            ok = False
+        self.recorder.record(kind, time.perf_counter() - started, ok)
+
+    def _channel_id(self) -> int:
+        return self.rng.choice(self.catalog["channels"])
+
+    def open_dashboard(self):
+        """DashboardScreen açılışı: fetchAllData + fetchStationById(1)"""
+        self.poll()
+        self._call("station", "GET", "/api/station/1")
+
+    def poll(self):
+        """RestfulService.fetchAllData: /api/data ardından /api/channel"""
+        self._call("poll_data", "GET", "/api/data")
+        self._call("poll_channel", "GET", "/api/channel")
+
+    def screen_action(self):
+        actions = WRITE_ACTIONS if self.rng.random() < self.write_ratio else READ_ACTIONS
+        action = self.rng.choices([name for name, _ in actions], weights=[weight for _, weight in actions])[0]
+        getattr(self, f"_{action}")()
+
+    def _log_screen(self):
+        end = int(time.time())
+        start = end - int(self.log_range_hours * 3600)
+        self._call("log_screen", "GET", f"/api/data/channel_{self._channel_id()}/{start}/{end}")
+
+    def _alarm_screen(self):
+        self._call("alarm_screen", "GET", "/api/data/alarm")
+
+    def _channel_screen(self):
+        self._call("channel_screen", "GET", f"/api/channel/{self._channel_id()}")
+
+    def _alarm_save(self):
+        channel_id = self._channel_id()
+        low = round(self.rng.uniform(0, 20), 2)
+        self._call("alarm_save", "POST", "/api/data/alarm", {"alarm": {f"channel_{channel_id}": {"alarm_1": {
+            "alarminfo": f"Kanal {channel_id} yük testi alarmı",
+            "min_value": low, "min_value_reset": low + 1,
+            "max_value": low + 20, "max_value_reset": low + 19,
+            "color": "#FF0000", "data_post_frequency": 1000,
+            "status": "active", "trigger_time": 0, "reset_time": 0
+        }}}})
+
+    def _channel_update(self):
+        self._call("channel_update", "PUT", f"/api/channel/{self._channel_id()}",
+                   {"field": "offset", "value": round(self.rng.uniform(-1, 1), 2)})
+
+    def _log_save(self):
+        self._call("log_save", "POST", f"/api/logs/{self._channel_id()}",
+                   {"value": round(self.rng.uniform(0, 50), 2)})
+
+
+def load_catalog(target: Target) -> Dict[str, Any]:
+    """Sunucudaki kanal kimliklerini öğren (istekler var olan kanallara gitsin)"""
+    status, body = target.request("GET", "/api/channel")
+    if status != 200:
+        raise RuntimeError(f"/api/channel {status} döndürdü")
+    payload = json.loads(body)
+    channels = payload if isinstance(payload, list) else payload.get("data", payload.get("channel", []))
+    ids = [channel["id"] for channel in channels if isinstance(channel, dict) and "id" in channel]
+    return {"channels": ids or [1]}
+
+
+def run(args) -> Dict[str, Any]:
+    target = Target(args.url, args.keep_alive, args.timeout)
+    catalog = load_catalog(target)
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    phones = [
+        SimulatedPhone(phone_id, target, recorder, catalog, args.write_ratio, args.log_range_hours,
+                       random.Random(rng.random()))
+        for phone_id in range(args.clients)
+    ]
+
+    # (zaman, sıra, telefon, olay); telefonlar ramp-up süresine yayılarak açılır
+    sequence = itertools.count()
+    start = time.monotonic()
+    events = []
+    for phone in phones:
+        opened = start + rng.uniform(0, args.ramp_up)
+        heapq.heappush(events, (opened, next(sequence), phone, "open"))
+        heapq.heappush(events, (opened + args.poll_interval, next(sequence), phone, "poll"))
+        if args.think_time > 0:
+            heapq.heappush(events, (opened + rng.expovariate(1 / args.think_time), next(sequence), phone, "screen"))
+    deadline = start + args.ramp_up + args.duration
+
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    windows = []
+    stop = threading.Event()
+
+    def report():
+        previous = process_tree_usage(args.server_pid) if args.server_pid else None
+        previous_time = time.monotonic()
+        while not stop.wait(args.report_interval):
+            latencies, errors = recorder.take_window()
+            now = time.monotonic()
+            window = {
+                "t": round(now - start, 1),
+                **summarize_latencies(latencies, now - previous_time),
+                "errors": errors
+            }
+            usage = process_tree_usage(args.server_pid) if args.server_pid else None
+            if usage is not None:
+                window["server_rss_kb"] = usage["rss_kb"]
+                window["server_processes"] = usage["processes"]
+                if previous is not None:
+                    window["server_cpu_percent"] = round(
+                        (usage["cpu_seconds"] - previous["cpu_seconds"]) / (now - previous_time) * 100, 1)
+            previous, previous_time = usage, now
+            windows.append(window)
+            print(f"[{window['t']:>7.1f}s] {window['throughput_rps']:>8.1f} req/s  p50={window['p50_ms']:>8.1f}  "
+                  f"p99={window['p99_ms']:>8.1f} ms  hata={errors}"
+                  + (f"  rss={usage['rss_kb'] // 1024} MB cpu=%{window.get('server_cpu_percent', 0)}" if usage else ""))
+
+    reporter = threading.Thread(target=report, daemon=True)
+    reporter.start()
+
+    def dispatch(phone: SimulatedPhone, event: str, due: float):
+        recorder.lag(time.monotonic() - due)
+        if event == "open":
+            phone.open_dashboard()
+        elif event == "poll":
+            phone.poll()
+        else:
+            phone.screen_action()
+
+    try:
+        while events:
+            due, _, phone, event = heapq.heappop(events)
+            if due >= deadline:
+                break
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Timer.periodic gibi: önceki poll bitmese de sıradaki zamanında tetiklenir
+            executor.submit(dispatch, phone, event, due)
+            if event == "poll":
+                heapq.heappush(events, (due + args.poll_interval, next(sequence), phone, "poll"))
+            elif event == "screen":
+                heapq.heappush(events, (due + phone.rng.expovariate(1 / args.think_time), next(sequence), phone, "screen"))
+    except KeyboardInterrupt:
+        print("Durduruldu, devam eden istekler bekleniyor...")
+    finally:
+        executor.shutdown(wait=True)
+        stop.set()
+        reporter.join()
+
+    elapsed = time.monotonic() - start
+    kinds = {}
+    for kind, latencies in sorted(recorder.by_kind.items()):
+        kinds[kind] = {**summarize_latencies(latencies, elapsed), "errors": recorder.errors_by_kind.get(kind, 0)}
+    all_latencies = [value for latencies in recorder.by_kind.values() for value in latencies]
+    lag = sorted(recorder.schedule_lag)
+    return {
+        "summary": {
+            **summarize_latencies(all_latencies, elapsed),
+            "errors": sum(recorder.errors_by_kind.values()),
+            "error_rate": round(sum(recorder.errors_by_kind.values()) / max(1, len(all_latencies)), 4),
+            "schedule_lag_p99_ms": round(percentile(lag, 0.99) * 1000, 1)
+        },
+        "kinds": kinds,
+        "windows": windows
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flutter RestfulService istemcilerini taklit eden yük üreteci")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Çalışan sunucunun adresi")
+    parser.add_argument("--clients", type=int, default=50, help="Eşzamanlı telefon sayısı")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="startPolling aralığı (saniye)")
+    parser.add_argument("--think-time", type=float, default=30.0,
+                        help="Ekran ziyaretleri arası ortalama süre (saniye, 0 = sadece polling)")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Ekran ziyaretlerinde yazma oranı")
+    parser.add_argument("--log-range-hours", type=float, default=24.0, help="Log ekranının istediği aralık")
+    parser.add_argument("--duration", type=float, default=60.0, help="Ramp-up sonrası ölçüm süresi (saniye)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Telefonların açılışının yayıldığı süre")
+    parser.add_argument("--workers", type=int, default=64, help="İstek gönderen thread sayısı")
+    parser.add_argument("--keep-alive", action="store_true",
+                        help="Bağlantıları yeniden kullan (varsayılan: Dart http.get gibi her istek yeni bağlantı)")
+    parser.add_argument("--timeout", type=float, default=CLIENT_TIMEOUT)
+    parser.add_argument("--server-pid", type=int, help="Sunucu PID'i (alt süreçleriyle RSS/CPU örneklenir)")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="load_test.json")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    results["meta"] = run_metadata(kind="load", url=args.url, clients=args.clients,
+                                   poll_interval=args.poll_interval, think_time=args.think_time,
+                                   write_ratio=args.write_ratio, duration=args.duration,
+                                   keep_alive=args.keep_alive)
+
+    summary = results["summary"]
+    print(f"\nToplam {summary['count']} istek, {summary['throughput_rps']} req/s, "
+          f"p50={summary['p50_ms']} p95={summary['p95_ms']} p99={summary['p99_ms']} ms, "
+          f"hata oranı %{summary['error_rate'] * 100:.2f}, zamanlama gecikmesi p99={summary['schedule_lag_p99_ms']} ms")
+    for kind, result in results["kinds"].items():
+        print(f"  {kind:<15} {result['count']:>7}  p50={result['p50_ms']:>8.1f}  p99={result['p99_ms']:>8.1f} ms  "
+              f"hata={result['errors']}")
+    if summary["schedule_lag_p99_ms"] > args.poll_interval * 1000 / 2:
+        print("UYARI: yük üreteci istekleri zamanında gönderemedi; --workers artırılmalı veya yük bölünmeli")
+    write_results(args.output, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
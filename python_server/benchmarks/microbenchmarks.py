@@ -0,0 +1,218 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.common import load_results, quiet_server_logs, run_metadata, write_results
+from benchmarks.synthetic_data import generate_dataset
+
+# Boyut = kanal sayısı; log kayıtları kanal sayısıyla doğrusal büyür
+DEFAULT_SIZES = (5, 10, 20, 40)
+
+
+class Case:
+    """Tek bir JSONReader fonksiyonunun ölçümü
+
+    `prepare` her çağrıdan önce süre dışında çalışır (örn. data.json'a yeni değer yazmak).
+    """
+
+    def __init__(self, name: str, run: Callable[[Any, Dict[str, Any]], Any],
+                 prepare: Optional[Callable[[Any, Dict[str, Any]], None]] = None, mutates: bool = False):
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.mutates = mutates
+
+
+def _iso(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _bump_data_timestamps(reader, dataset: Dict[str, Any]):
+    """Her kanal için yeni bir okuma gelmiş gibi data.json'u güncelle"""
+    path = os.path.join(reader.variable_path, "data.json")
+    with open(path, "r", encoding="utf-8") as file:
+        content = json.load(file)
+    dataset["tick"] = dataset.get("tick", 0) + 1
+    for entry in content.get("data", []):
+        entry["value_timestamp"] = dataset["end_time"] + dataset["tick"]
+        entry["value"] = round(entry.get("value", 0) + 0.01, 2)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2, ensure_ascii=False)
+
+
+CASES = [
+    Case("_read_json_file", lambda reader, dataset: reader._read_json_file(
+        os.path.join(reader.logsfile_path, "logs.json"))),
+    Case("_read_directory_files", lambda reader, dataset: reader._read_directory_files(
+        reader.logsfile_path, "logsfile")),
+    Case("get_logs", lambda reader, dataset: reader.get_logs(
+        1, dataset["end_time"] - 86400, dataset["end_time"])),
+    Case("get_log_data", lambda reader, dataset: reader.get_log_data(
+        1, _iso(dataset["end_time"] - 86400), _iso(dataset["end_time"]))),
+    Case("get_alarms", lambda reader, dataset: reader.get_alarms()),
+    Case("save_log_data", lambda reader, dataset: reader.save_log_data(1, 12.5), mutates=True),
+    Case("check_alarms", lambda reader, dataset: reader.check_alarms(), mutates=True),
+    Case("auto_save_logs_from_data", lambda reader, dataset: reader.auto_save_logs_from_data(),
+         prepare=_bump_data_timestamps, mutates=True),
+]
+
+
+def measure(case: Case, reader, dataset: Dict[str, Any], repeats: int, max_seconds: float) -> Dict[str, Any]:
+    """En az 3, en fazla `repeats` çağrı; süre bütçesi dolunca durur"""
+    timings = []
+    budget_started = time.perf_counter()
+    while len(timings) < repeats:
+        if case.prepare is not None:
+            case.prepare(reader, dataset)
+        started = time.perf_counter()
+        case.run(reader, dataset)
+        timings.append(time.perf_counter() - started)
+        if len(timings) >= 3 and time.perf_counter() - budget_started > max_seconds:
+            break
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "min_ms": round(timings[0] * 1000, 4),
+        "median_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "max_ms": round(timings[-1] * 1000, 4)
+    }
+
+
+def scaling_exponent(points: Dict[int, float]) -> Optional[float]:
+    """log(süre) ~ k * log(boyut) doğrusunun eğimi: ~1 doğrusal, ~2 karesel"""
+    pairs = [(math.log(size), math.log(value)) for size, value in points.items() if value > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    denominator = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if denominator == 0:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in pairs) / denominator, 2)
+
+
+def run(sizes: List[int], logs_per_channel: int, alarms_per_channel: int, repeats: int,
+        max_seconds: float, selected: Optional[List[str]], seed: int) -> Dict[str, Any]:
+    from json_reader import JSONReader
+
+    cases = [case for case in CASES if not selected or case.name in selected]
+    results = {case.name: {"results": {}} for case in cases}
+    workspace = tempfile.mkdtemp(prefix="hidrologger_micro_")
+    try:
+        for size in sizes:
+            source = os.path.join(workspace, f"size_{size}")
+            dataset = generate_dataset(source, channels=size, alarms_per_channel=alarms_per_channel,
+                                       stations=2, seed=seed, logs_per_channel=logs_per_channel)
+            print(f"Boyut {size}: {dataset['log_records']} log kaydı, "
+                  f"logs.json {dataset['file_bytes']['logsfile/logs.json']} byte")
+
+            for case in cases:
+                # Yazan fonksiyonlar diğer ölçümleri etkilemesin diye kopya üzerinde çalışır
+                target = source
+                if case.mutates:
+                    target = os.path.join(workspace, f"size_{size}_{case.name}")
+                    shutil.copytree(source, target)
+                reader = JSONReader(target)
+                result = measure(case, reader, dict(dataset), repeats, max_seconds)
+                result["log_records"] = dataset["log_records"]
+                results[case.name]["results"][str(size)] = result
+                print(f"  {case.name:<28} min={result['min_ms']:>10.3f} ms median={result['median_ms']:>10.3f} ms "
+                      f"({result['runs']} çalıştırma)")
+                if case.mutates:
+                    shutil.rmtree(target, ignore_errors=True)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    for name, case_results in results.items():
+        case_results["exponent"] = scaling_exponent({
+            int(size): result["min_ms"] for size, result in case_results["results"].items()
+        })
+    return results
+
+
+def print_scaling(cases: Dict[str, Any]):
+    print("\nÖlçekleme (boyut = kanal sayısı, eğim ~1 doğrusal, ~2 karesel)")
+    for name, case_results in cases.items():
+        curve = "  ".join(f"{size}:{result['min_ms']:.2f}" for size, result in case_results["results"].items())
+        print(f"  {name:<28} eğim={case_results['exponent']}  [{curve}] ms")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            exponent_threshold: float) -> List[str]:
+    """Baseline'a göre `threshold` oranından fazla yavaşlayan veya eğimi büyüyen ölçümleri bul
+
+    Gürültüye en az duyarlı değer olduğu için en iyi (min) süreler karşılaştırılır.
+    """
+    regressions = []
+    for name, case_results in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if base_case is None:
+            continue
+        for size, result in case_results["results"].items():
+            base = base_case["results"].get(size)
+            if not base or not base["min_ms"]:
+                continue
+            ratio = result["min_ms"] / base["min_ms"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} boyut={size}: {base['min_ms']:.3f} -> {result['min_ms']:.3f} ms "
+                                   f"(x{ratio:.2f})")
+        if (case_results["exponent"] is not None and base_case.get("exponent") is not None
+                and case_results["exponent"] - base_case["exponent"] > exponent_threshold):
+            regressions.append(f"{name} ölçekleme eğimi: {base_case['exponent']} -> {case_results['exponent']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSONReader mikro benchmark'ları")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Virgülle ayrılmış kanal sayıları")
+    parser.add_argument("--logs-per-channel", type=int, default=200)
+    parser.add_argument("--alarms-per-channel", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=20, help="Ölçüm başına en fazla çağrı")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Ölçüm başına süre bütçesi")
+    parser.add_argument("--case", action="append", choices=[case.name for case in CASES],
+                        help="Sadece verilen ölçümleri çalıştır (tekrarlanabilir)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="microbenchmarks.json")
+    parser.add_argument("--baseline", help="Karşılaştırılacak baseline sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="En iyi sürede regresyon sayılacak artış oranı (0.25 = %%25)")
+    parser.add_argument("--exponent-threshold", type=float, default=0.3,
+                        help="Ölçekleme eğiminde regresyon sayılacak artış")
+    args = parser.parse_args(argv)
+
+    quiet_server_logs()
+    from log_pipeline import setup_logging
+    setup_logging()
+
+    sizes = sorted(int(size) for size in args.sizes.split(",") if size.strip())
+    cases = run(sizes, args.logs_per_channel, args.alarms_per_channel, args.repeats,
+                args.max_seconds, args.case, args.seed)
+    results = {
+        "meta": run_metadata(kind="micro", sizes=sizes, logs_per_channel=args.logs_per_channel,
+                             alarms_per_channel=args.alarms_per_channel, seed=args.seed),
+        "cases": cases
+    }
+    print_scaling(cases)
+    write_results(args.output, results)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold, args.exponent_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresyon bulundu (eşik %{args.threshold * 100:g}):")
+            for line in regressions:
+                print(f"  REGRESYON {line}")
+            return 1
+        print("\nBaseline'a göre regresyon yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+import textwrap
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Hazır ölçekler; komut satırından tek tek ezilebilir
+SCALES = {
+    "small": {"channels": 10, "years": 0.02, "alarms_per_channel": 2, "stations": 2},
+    "medium": {"channels": 50, "years": 0.1, "alarms_per_channel": 3, "stations": 5},
+    "large": {"channels": 200, "years": 1.0, "alarms_per_channel": 4, "stations": 20},
+}
+
+# Kanalların seçebileceği log aralıkları (saniye)
+LOG_INTERVALS = (60, 300, 600, 900, 3600)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def _write_json(path: str, data: Any):
+    """Sunucunun yazdığı formatla aynı (indent=2) JSON dosyası yaz"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+
+
+def _channel(channel_id: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": channel_id,
+        "name": f"Kanal {channel_id}",
+        "description": f"Sentetik seviye ölçer {channel_id}",
+        "channel_category": rng.randint(1, 3),
+        "channel_sub_category": rng.randint(1, 5),
+        "channel_parameter": 100 + rng.randint(1, 20),
+        "measurement_unit": rng.randint(1, 4),
+        "log_interval": rng.choice(LOG_INTERVALS),
+        "offset": 0.0
+    }
+
+
+def _alarm(channel_id: int, alarm_number: int, base: float) -> Dict[str, Any]:
+    width = 5.0 * alarm_number
+    return {
+        "alarminfo": f"Kanal {channel_id} Alarm {alarm_number} ayarları",
+        "min_value": round(base - width, 2),
+        "min_value_reset": round(base - width + 1, 2),
+        "max_value": round(base + width, 2),
+        "max_value_reset": round(base + width - 1, 2),
+        "color": "#FF0000" if alarm_number == 1 else "#FFA500",
+        "data_post_frequency": 1000,
+        "status": "active",
+        "trigger_time": 0,
+        "reset_time": 0
+    }
+
+
+def _station(station_id: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": station_id,
+        "code": f"STN{station_id:03d}",
+        "security_code": f"SEC{rng.randint(100, 999)}",
+        "name": f"Sentetik İstasyon {station_id}",
+        "region": rng.randint(1, 81),
+        "basin": rng.randint(1, 25),
+        "no": 100 + station_id,
+        "latitude": round(36 + rng.random() * 6, 4),
+        "longitude": round(26 + rng.random() * 19, 4),
+        "phone": f"+90{rng.randint(2000000000, 5999999999)}"
+    }
+
+
+def _channel_readings(channel: Dict[str, Any], base: float, start: int, end: int,
+                      seed: int) -> Iterator[Dict[str, Any]]:
+    """Günlük salınım + gürültü + yavaş pil azalması olan kanal okumaları"""
+    rng = random.Random(seed)
+    interval = channel["log_interval"]
+    battery = 100.0
+    for timestamp in range(start, end, interval):
+        daily = math.sin(2 * math.pi * (timestamp % 86400) / 86400)
+        battery = max(5.0, battery - interval / (90 * 86400) * 100)
+        yield {
+            "battery_percentage": int(battery),
+            "channel": channel["id"],
+            "signal_strength": rng.randint(60, 100),
+            "value": round(base + 3 * daily + rng.gauss(0, 0.3), 2),
+            "value_timestamp": timestamp,
+            "value_type": 1
+        }
+
+
+def generate_dataset(target_dir: str, channels: int = 10, years: float = 0.02,
+                     alarms_per_channel: int = 2, stations: int = 2, seed: int = 42,
+                     end_time: Optional[int] = None,
+                     logs_per_channel: Optional[int] = None) -> Dict[str, Any]:
+    """`target_dir` altında sunucunun beklediği jsons/ ağacını üret
+
+    Log kayıtları her kanalın log_interval değerine göre `years` yıllık geçmişi
+    kapsar ve zamana göre iç içe (sunucunun yazdığı sırayla) dosyaya akıtılır.
+    `logs_per_channel` verilirse `years` yerine her kanal için tam bu kadar kayıt üretilir.
+    Üretilen dosyaların özetini döndürür.
+    """
+    rng = random.Random(seed)
+    end_time = end_time if end_time is not None else int(time.time()) // 60 * 60
+    start_time = end_time - int(years * SECONDS_PER_YEAR)
+
+    channel_list = [_channel(channel_id, rng) for channel_id in range(1, channels + 1)]
+    bases = {channel["id"]: round(rng.uniform(5, 40), 2) for channel in channel_list}
+
+    alarm_section = {}
+    for channel in channel_list:
+        alarm_section[f"channel_{channel['id']}"] = {
+            f"alarm_{number}": _alarm(channel["id"], number, bases[channel["id"]])
+            for number in range(1, alarms_per_channel + 1)
+        }
+
+    current_values = []
+    for index, channel in enumerate(channel_list, start=1):
+        base = bases[channel["id"]]
+        current_values.append({
+            "id": index,
+            "channel": channel["id"],
+            "value_type": 1,
+            "value_timestamp": end_time,
+            "value": round(base + rng.gauss(0, 0.3), 2),
+            "min_value": round(base - 5, 2),
+            "max_value": round(base + 5, 2),
+            "battery_percentage": 100,
+            "signal_strength": 90
+        })
+
+    _write_json(os.path.join(target_dir, "variable", "channel.json"), {"channel": channel_list})
+    _write_json(os.path.join(target_dir, "variable", "data.json"), {"data": current_values})
+    _write_json(os.path.join(target_dir, "alarm", "alarm.json"), {"alarm": alarm_section})
+    _write_json(os.path.join(target_dir, "semi-variable", "station.json"),
+                {"station": [_station(station_id, rng) for station_id in range(1, stations + 1)]})
+
+    # logs.json: tüm kanalların okumaları zamana göre birleştirilerek akıtılır
+    logs_path = os.path.join(target_dir, "logsfile", "logs.json")
+    os.makedirs(os.path.dirname(logs_path), exist_ok=True)
+    if logs_per_channel is not None:
+        starts = {channel["id"]: end_time - logs_per_channel * channel["log_interval"] for channel in channel_list}
+        start_time = min(starts.values(), default=end_time)
+    else:
+        starts = {channel["id"]: start_time for channel in channel_list}
+    streams = [
+        _channel_readings(channel, bases[channel["id"]], starts[channel["id"]], end_time, seed + channel["id"])
+        for channel in channel_list
+    ]
+    log_count = 0
+    with open(logs_path, "w", encoding="utf-8") as file:
+        file.write('{\n  "logs": [')
+        for reading in heapq.merge(*streams, key=lambda item: item["value_timestamp"]):
+            log_count += 1
+            record = {"id": log_count, **reading}
+            file.write(("\n" if log_count == 1 else ",\n") +
+                       textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), "    "))
+        file.write("\n  ]\n}" if log_count else "]\n}")
+
+    sizes = {}
+    for folder, _, files in os.walk(target_dir):
+        for filename in files:
+            path = os.path.join(folder, filename)
+            sizes[os.path.relpath(path, target_dir).replace(os.sep, "/")] = os.path.getsize(path)
+
+    return {
+        "path": target_dir,
+        "channels": channels,
+        "years": years,
+        "alarms_per_channel": alarms_per_channel,
+        "stations": stations,
+        "seed": seed,
+        "logs_per_channel": logs_per_channel,
+        "start_time": start_time,
+        "end_time": end_time,
+        "log_records": log_count,
+        "file_bytes": sizes
+    }
+
+
+def scale_arguments(parser: argparse.ArgumentParser):
+    """Veri seti ölçeği için ortak komut satırı argümanları"""
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--channels", type=int)
+    parser.add_argument("--years", type=float)
+    parser.add_argument("--alarms-per-channel", type=int)
+    parser.add_argument("--stations", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def spec_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    spec = dict(SCALES[args.scale])
+    for key in ("channels", "years", "alarms_per_channel", "stations"):
+        value = getattr(args, key)
+        if value is not None:
+            spec[key] = value
+    spec["seed"] = args.seed
+    return spec
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sentetik hidroloji veri seti üret")
+    parser.add_argument("target_dir", help="Oluşturulacak jsons/ klasörü")
+    scale_arguments(parser)
+    args = parser.parse_args(argv)
+
+    summary = generate_dataset(args.target_dir, **spec_from_args(args))
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
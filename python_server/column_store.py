@@ -0,0 +1,355 @@
+"""Kanal başına sabit genişlikli ikili log dosyaları (sütun deposu)
+
+Segment backend'inin ham okumalardan türettiği, aralık sorguları için okuma
+kopyası. Her kanal ve dönem (COLUMN_PERIOD_DAYS gün, UTC epoch'a hizalı) için
+columns/<kanal>/<dönem başlangıcı>.bin dosyasında zaman damgasına göre sıralı,
+19 byte'lık kayıtlar tutulur:
+
+    int64 zaman damgası | float64 değer | uint8 batarya | uint8 sinyal | uint8 değer tipi
+
+Dosyalar mmap ile açılır; aralığın sınırları ikili aramayla bulunur ve eşlenmiş
+bellek kopyalanmadan dilimlenir. NumPy yüklüyse dilimler yapılandırılmış dizi
+görünümü olarak döner ve özetler vektörel hesaplanır; değilse memoryview döner.
+
+Yalnızca sayısal okumalar (rollups.reading ile aynı kural) ve tamsayı kanallar
+dosyalara girer. Zaman damgası tam saniyeye indirilir, değerler float64 olarak
+saklanır; 0-254 dışındaki batarya, sinyal ve tip değerleri 255 (bilinmiyor) olur.
+"""
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from rollups import aggregate, make_point, reading
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    numpy = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT = 1
+RECORD = struct.Struct("<qdBBB")
+RECORD_SIZE = RECORD.size
+_TIMESTAMP = struct.Struct("<q")
+UNKNOWN = 255
+# Aynı anda açık tutulan eşlemeler; çıkarılanlar son görünüm bırakılınca kapanır
+MAX_MAPPED_FILES = 64
+
+if NUMPY_AVAILABLE:
+    RECORD_DTYPE = numpy.dtype([("timestamp", "<i8"), ("value", "<f8"), ("battery", "u1"),
+                                ("signal", "u1"), ("value_type", "u1")])
+else:
+    RECORD_DTYPE = None
+
+# (zaman damgası, değer, batarya, sinyal, değer tipi)
+Row = Tuple[int, float, int, int, int]
+# NumPy yapılandırılmış dizi görünümü veya memoryview
+Block = Any
+
+
+def _u8(value: Any) -> int:
+    if type(value) is int and 0 <= value < UNKNOWN:
+        return value
+    return UNKNOWN
+
+
+def column_channel(log: Dict[str, Any]) -> Optional[int]:
+    channel = log.get('channel')
+    if type(channel) is int:
+        return channel
+    if type(channel) is float and channel.is_integer():
+        return int(channel)
+    return None
+
+
+def to_row(log: Any) -> Optional[Tuple[int, Row]]:
+    """(kanal, satır); dosyalara girmeyen kayıtlar için None"""
+    if not isinstance(log, dict):
+        return None
+    channel = column_channel(log)
+    if channel is None:
+        return None
+    parsed = reading(log.get('value_timestamp'), log.get('value'))
+    if parsed is None:
+        return None
+    return channel, (parsed[0], float(parsed[1]), _u8(log.get('battery_percentage')),
+                     _u8(log.get('signal_strength')), _u8(log.get('value_type')))
+
+
+def block_length(block: Block) -> int:
+    return len(block) if NUMPY_AVAILABLE else len(block) // RECORD_SIZE
+
+
+def _bisect(view: Any, count: int, timestamp: float, right: bool = False) -> int:
+    """Zaman damgası `timestamp`tan küçük (right: küçük veya eşit) ilk kaydın indeksi"""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        current = _TIMESTAMP.unpack_from(view, middle * RECORD_SIZE)[0]
+        if current < timestamp or (right and current == timestamp):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+# Özetler
+
+def block_points(blocks: Iterable[Block]) -> List[Dict[str, Any]]:
+    """Her okuma tek kayıtlık nokta (rollups.raw_points karşılığı)"""
+    points = []
+    for block in blocks:
+        if NUMPY_AVAILABLE:
+            rows = zip(block["timestamp"].tolist(), block["value"].tolist())
+        else:
+            rows = (row[:2] for row in RECORD.iter_unpack(block))
+        points.extend(make_point(timestamp, value, value, value, 1, value) for timestamp, value in rows)
+    return points
+
+
+def block_series(blocks: Iterable[Block], seconds: int) -> List[Dict[str, Any]]:
+    """Tek katmanlık seri (rollups.series_from_logs karşılığı)
+
+    Dönem gün katı olduğundan özet kovaları dosya sınırını aşmaz; her dilim ayrı özetlenir.
+    """
+    points = []
+    for block in blocks:
+        if not block_length(block):
+            continue
+        if NUMPY_AVAILABLE:
+            points.extend(_numpy_series(block, seconds))
+            continue
+        rows = ((None, row[0], row[1], index) for index, row in enumerate(RECORD.iter_unpack(block)))
+        # Kayıtlar zamana göre sıralı; kovalar da sıralı oluşur
+        points.extend(bucket.point(start) for (_, _, start), bucket in aggregate(rows, (seconds,)).items())
+    return points
+
+
+def _numpy_series(block: Block, seconds: int) -> List[Dict[str, Any]]:
+    timestamps = block["timestamp"]
+    values = block["value"]
+    starts = timestamps - timestamps % seconds
+    edges = numpy.flatnonzero(starts[1:] != starts[:-1]) + 1
+    first = numpy.concatenate(([0], edges))
+    last = numpy.concatenate((edges, [len(block)])) - 1
+    columns = zip(starts[first].tolist(), numpy.minimum.reduceat(values, first).tolist(),
+                  numpy.maximum.reduceat(values, first).tolist(), numpy.add.reduceat(values, first).tolist(),
+                  (last - first + 1).tolist(), values[last].tolist())
+    return [make_point(*column) for column in columns]
+
+
+class ColumnStore:
+    """columns/ klasöründeki dönem dosyaları ve kapsama durumu (state.json)
+
+    state.json dosyaların kapsadığı son log seq'ini ve geçmişin tamamen aktarılıp
+    aktarılmadığını (complete) tutar. Yazma sırasında `dirty` işaretlenir; yarıda
+    kalmış bir yazma açılışta fark edilirse depo silinip baştan kurulur. Yazma
+    metotları segment deposunun kilidi altında çağrılır.
+    """
+
+    def __init__(self, root: str, period_days: int):
+        self.root = root
+        self.period = period_days * 86400
+        self.state_path = os.path.join(root, "state.json")
+        self._state_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        self._maps_lock = threading.Lock()
+        # dosya yolu -> (imza, mmap)
+        self._maps: "OrderedDict[str, Tuple[Tuple[int, int, int], mmap.mmap]]" = OrderedDict()
+
+    def prepare(self, last_seq: int):
+        """Durumu doğrula; bozuksa, dönem değiştiyse veya loglarda olmayan kayıtları kapsıyorsa sıfırla"""
+        try:
+            with open(self.state_path, 'rb') as file:
+                state = json.loads(file.read())
+        except FileNotFoundError:
+            state = None
+        except ValueError:
+            state = {}
+        if state is not None and (state.get("format") == STATE_FORMAT and state.get("period") == self.period
+                                  and not state.get("dirty") and state.get("seq", 0) <= last_seq):
+            return
+        if state is not None:
+            logger.warning(f"Sütun deposu geçersiz veya yarım kalmış yazma var, yeniden kurulacak: {self.root}")
+        self.reset()
+
+    def reset(self):
+        """Dosyaları sil; depo arka planda baştan doldurulur"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+        self._save_state(0, False)
+
+    def state(self) -> Dict[str, Any]:
+        stat = os.stat(self.state_path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = self._state_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(self.state_path, 'rb') as file:
+            state = json.loads(file.read())
+        self._state_cache = (signature, state)
+        return state
+
+    def _save_state(self, seq: int, complete: bool, dirty: bool = False):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(json.dumps({"format": STATE_FORMAT, "period": self.period, "seq": seq,
+                                   "complete": complete, "dirty": dirty}).encode('utf-8'))
+        os.replace(temp_path, self.state_path)
+        self._state_cache = None
+
+    def _period_path(self, channel: int, period_start: int) -> str:
+        return os.path.join(self.root, str(channel), f"{period_start}.bin")
+
+    # Yazma
+
+    def add(self, records: List[Tuple[int, Any]], seq: Optional[int] = None, complete: Optional[bool] = None) -> int:
+        """(seq, kayıt) listesini dönem dosyalarına ekle ve kapsamayı `seq`e (verilmezse son kayda) ilerlet"""
+        state = self.state()
+        groups: Dict[Tuple[int, int], List[Row]] = {}
+        for _, log in records:
+            converted = to_row(log)
+            if converted is not None:
+                channel, row = converted
+                groups.setdefault((channel, row[0] - row[0] % self.period), []).append(row)
+        if groups:
+            self._save_state(state["seq"], state["complete"], dirty=True)
+            for (channel, period_start), rows in groups.items():
+                os.makedirs(os.path.join(self.root, str(channel)), exist_ok=True)
+                self._write_period(self._period_path(channel, period_start), rows)
+        if seq is None:
+            seq = records[-1][0] if records else state["seq"]
+        self._save_state(max(seq, state["seq"]), state["complete"] if complete is None else complete)
+        return sum(len(rows) for rows in groups.values())
+
+    def _write_period(self, path: str, rows: List[Row]):
+        """Satırları dosyaya ekle; sıra bozuluyorsa (geç gelen okuma) dosyayı birleştirip yeniden yaz"""
+        rows.sort(key=itemgetter(0))
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0
+        usable = size - size % RECORD_SIZE
+        last_timestamp = None
+        if usable:
+            with open(path, 'rb') as file:
+                file.seek(usable - RECORD_SIZE)
+                last_timestamp = _TIMESTAMP.unpack(file.read(_TIMESTAMP.size))[0]
+        if last_timestamp is None or rows[0][0] >= last_timestamp:
+            with open(path, 'r+b' if size else 'wb') as file:
+                if usable != size:
+                    file.truncate(usable)
+                file.seek(usable)
+                file.write(b''.join(RECORD.pack(*row) for row in rows))
+            return
+        with open(path, 'rb') as file:
+            existing = list(RECORD.iter_unpack(file.read(usable)))
+        # Sıralama kararlı: aynı zaman damgasında önce eklenen önde kalır
+        self._replace(path, sorted(existing + rows, key=itemgetter(0)))
+
+    def _replace(self, path: str, rows: List[Row]):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(b''.join(RECORD.pack(*row) for row in rows))
+        os.replace(temp_path, path)
+
+    def drop_before(self, cutoff: Callable[[Any], Optional[float]]) -> int:
+        """Saklama süresi dolan okumaları sil; geri kazanılan byte"""
+        reclaimed = 0
+        for name in os.listdir(self.root):
+            folder = os.path.join(self.root, name)
+            try:
+                channel = int(name)
+                limit = cutoff(channel)
+            except (TypeError, ValueError):
+                continue
+            if limit is None or not os.path.isdir(folder):
+                continue
+            for file_name in os.listdir(folder):
+                if not file_name.endswith(".bin"):
+                    continue
+                period_start = int(file_name[:-len(".bin")])
+                if period_start >= limit:
+                    continue
+                path = os.path.join(folder, file_name)
+                size = os.path.getsize(path)
+                if period_start + self.period <= limit:
+                    os.unlink(path)
+                    reclaimed += size
+                    continue
+                with open(path, 'rb') as file:
+                    content = file.read()
+                count = len(content) // RECORD_SIZE
+                index = _bisect(content, count, limit)
+                if index:
+                    self._replace(path, list(RECORD.iter_unpack(content[index * RECORD_SIZE:count * RECORD_SIZE])))
+                    reclaimed += size - (count - index) * RECORD_SIZE
+        return reclaimed
+
+    # Okuma
+
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        """Dosyanın salt okunur eşlemesi; dosya değiştiyse (ekleme, yeniden yazma) yeniden eşlenir"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if stat.st_size < RECORD_SIZE:
+            return None
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._maps_lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[0] == signature:
+                self._maps.move_to_end(path)
+                return cached[1]
+        try:
+            with open(path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        with self._maps_lock:
+            self._maps[path] = (signature, mapped)
+            self._maps.move_to_end(path)
+            while len(self._maps) > MAX_MAPPED_FILES:
+                # Kapatılmaz: dışarıda görünüm varsa son referansla birlikte kapanır
+                self._maps.popitem(last=False)
+        return mapped
+
+    def query(self, channel: int, start: Optional[float] = None, end: Optional[float] = None) -> List[Block]:
+        """Kanalın [start, end] aralığındaki kayıtları; dönem başına bir kopyasız dilim, zaman sırasıyla"""
+        folder = os.path.join(self.root, str(channel))
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return []
+        periods = sorted(int(name[:-len(".bin")]) for name in names if name.endswith(".bin"))
+        blocks = []
+        for period_start in periods:
+            if (end is not None and period_start > end) or (start is not None and period_start + self.period <= start):
+                continue
+            mapped = self._map(self._period_path(channel, period_start))
+            if mapped is None:
+                continue
+            count = len(mapped) // RECORD_SIZE
+            if NUMPY_AVAILABLE:
+                array = numpy.frombuffer(mapped, dtype=RECORD_DTYPE, count=count)
+                timestamps = array["timestamp"]
+                low = int(timestamps.searchsorted(start, "left")) if start is not None else 0
+                high = int(timestamps.searchsorted(end, "right")) if end is not None else count
+                block = array[low:high]
+            else:
+                low = _bisect(mapped, count, start) if start is not None else 0
+                high = _bisect(mapped, count, end, right=True) if end is not None else count
+                block = memoryview(mapped)[low * RECORD_SIZE:high * RECORD_SIZE]
+            if high > low:
+                blocks.append(block)
+        return blocks
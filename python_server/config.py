@@ -0,0 +1,134 @@
+import os
+import logging
+import tempfile
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _env(name: str, default: Any, cast: Callable[[str], Any] = str) -> Any:
+    """Ortam değişkenini oku, yoksa veya dönüştürülemezse varsayılanı döndür"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Geçersiz ayar değeri {name}={value!r}, varsayılan kullanılıyor: {default!r}")
+        return default
+
+
+# Sunucu ayarları
+SERVER_HOST = _env("HIDROLOGGER_HOST", "0.0.0.0")
+SERVER_PORT = _env("HIDROLOGGER_PORT", 8765, int)
+
+# Production (çoklu süreç) ayarları
+WORKERS = _env("HIDROLOGGER_WORKERS", max(2, os.cpu_count() or 1), int)
+WORKER_THREADS = _env("HIDROLOGGER_WORKER_THREADS", 4, int)
+WORKER_TIMEOUT = _env("HIDROLOGGER_WORKER_TIMEOUT", 30, int)
+
+# Yazma isteklerini işleyen tek sahip (owner) süreç, sadece localhost'ta dinler
+OWNER_HOST = _env("HIDROLOGGER_OWNER_HOST", "127.0.0.1")
+OWNER_PORT = _env("HIDROLOGGER_OWNER_PORT", 8766, int)
+
+# Worker'ların paylaştığı salt okunur snapshot dosyası
+SNAPSHOT_PATH = _env(
+    "HIDROLOGGER_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "hidrologger_snapshot.bin")
+)
+SNAPSHOT_REFRESH_INTERVAL = _env("HIDROLOGGER_SNAPSHOT_REFRESH_INTERVAL", 0.1, float)
+
+# Asyncio sunucu ayarları
+ASYNC_EXECUTOR_WORKERS = _env("HIDROLOGGER_ASYNC_EXECUTOR_WORKERS", 8, int)
+ASYNC_MAX_PENDING = _env("HIDROLOGGER_ASYNC_MAX_PENDING", 256, int)
+LONG_POLL_TIMEOUT = _env("HIDROLOGGER_LONG_POLL_TIMEOUT", 30.0, float)
+CHANGE_POLL_INTERVAL = _env("HIDROLOGGER_CHANGE_POLL_INTERVAL", 0.5, float)
+STREAM_HEARTBEAT_INTERVAL = _env("HIDROLOGGER_STREAM_HEARTBEAT_INTERVAL", 15.0, float)
+
+# Batch endpoint ayarları
+BATCH_MAX_REQUESTS = _env("HIDROLOGGER_BATCH_MAX_REQUESTS", 32, int)
+BATCH_MAX_WORKERS = _env("HIDROLOGGER_BATCH_MAX_WORKERS", 4, int)
+
+# Tracing ayarları; örnekleme oranı 0 ise sadece traceparent başlığı örneklenmiş gelen istekler izlenir
+TRACE_SAMPLE_RATE = _env("HIDROLOGGER_TRACE_SAMPLE_RATE", 0.0, float)
+TRACE_BUFFER_SIZE = _env("HIDROLOGGER_TRACE_BUFFER_SIZE", 256, int)
+TRACE_EXPORT_PATH = _env("HIDROLOGGER_TRACE_EXPORT_PATH", "")
+
+# Admin endpoint'leri (/api/admin/*); token verilirse Authorization: Bearer <token> gerekir
+ADMIN_TOKEN = _env("HIDROLOGGER_ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = _env("HIDROLOGGER_PROFILE_MAX_SECONDS", 60.0, float)
+
+# Yavaş istek kaydı; dosya yolunda {pid} süreç numarasıyla değiştirilir (production modunda önerilir)
+SLOW_REQUEST_THRESHOLD_MS = _env("HIDROLOGGER_SLOW_REQUEST_THRESHOLD_MS", 500.0, float)
+SLOW_REQUEST_MAX_ENTRIES = _env("HIDROLOGGER_SLOW_REQUEST_MAX_ENTRIES", 200, int)
+SLOW_REQUEST_LOG_PATH = _env(
+    "HIDROLOGGER_SLOW_REQUEST_LOG_PATH",
+    # {pid}: production modunda her süreç kendi dosyasını döndürür
+    os.path.join(tempfile.gettempdir(), "hidrologger_slow_requests.{pid}.jsonl")
+)
+SLOW_REQUEST_LOG_MAX_BYTES = _env("HIDROLOGGER_SLOW_REQUEST_LOG_MAX_BYTES", 5 * 1024 * 1024, int)
+SLOW_REQUEST_LOG_BACKUPS = _env("HIDROLOGGER_SLOW_REQUEST_LOG_BACKUPS", 3, int)
+
+# Log ayarları; modül seviyeleri "json_reader=DEBUG,server=WARNING" biçiminde
+LOG_LEVEL = _env("HIDROLOGGER_LOG_LEVEL", "INFO")
+LOG_LEVELS = _env("HIDROLOGGER_LOG_LEVELS", "")
+LOG_QUEUE_SIZE = _env("HIDROLOGGER_LOG_QUEUE_SIZE", 10000, int)
+# Çağrı noktası başına pencere içinde yazılan kayıt sayısı (0 ise sınır yok)
+LOG_RATE_LIMIT_BURST = _env("HIDROLOGGER_LOG_RATE_LIMIT_BURST", 20, int)
+LOG_RATE_LIMIT_INTERVAL = _env("HIDROLOGGER_LOG_RATE_LIMIT_INTERVAL", 10.0, float)
+LOG_SAMPLE_EVERY = _env("HIDROLOGGER_LOG_SAMPLE_EVERY", 100, int)
+
+# Bellek takibi (tracemalloc); çerçeve sayısı 0'dan büyükse takip açılışta başlar
+MEMORY_TRACE_FRAMES = _env("HIDROLOGGER_MEMORY_TRACE_FRAMES", 0, int)
+MEMORY_MAX_SNAPSHOTS = _env("HIDROLOGGER_MEMORY_MAX_SNAPSHOTS", 5, int)
+
+# Depolama backend'i: "json" (jsons/ altındaki dosyalar), "sqlite" (gömülü SQLite, WAL) veya
+# "segments" (dokümanlar dosyalarda, loglar logsfile/segments/ altında ekleme-sadece segmentlerde)
+STORAGE_BACKEND = _env("HIDROLOGGER_STORAGE", "json")
+# Boşsa veritabanı jsons/hidrologger.db olarak oluşturulur
+SQLITE_PATH = _env("HIDROLOGGER_SQLITE_PATH", "")
+SQLITE_BUSY_TIMEOUT = _env("HIDROLOGGER_SQLITE_BUSY_TIMEOUT", 5.0, float)
+# Harici yazıcıların (veri kaydedici) diskte güncellediği, değiştikçe veritabanına alınan dokümanlar
+SQLITE_FILE_FED_DOCUMENTS = _env("HIDROLOGGER_SQLITE_FILE_FED_DOCUMENTS", "variable/data.json")
+
+# Log özetleri (rollup): açık katmanlar ve mevcut geçmişi dolduran arka plan işi
+ROLLUP_TIERS = _env("HIDROLOGGER_ROLLUP_TIERS", "1m,1h,1d")
+ROLLUP_BACKFILL_BATCH = _env("HIDROLOGGER_ROLLUP_BACKFILL_BATCH", 20000, int)
+ROLLUP_BACKFILL_INTERVAL = _env("HIDROLOGGER_ROLLUP_BACKFILL_INTERVAL", 5.0, float)
+
+# Saklama kuralları (retention.py): "default=90d,category:2=30d,channel:7=365d"; boşsa süresiz
+RETENTION = _env("HIDROLOGGER_RETENTION", "")
+# Özet katmanları için: "1m=30d,1h=2y"; verilmeyen katmanlar süresiz
+ROLLUP_RETENTION = _env("HIDROLOGGER_ROLLUP_RETENTION", "")
+COMPACTION_INTERVAL = _env("HIDROLOGGER_COMPACTION_INTERVAL", 3600.0, float)
+# Kısmen dolmuş segment, kayıtlarının en az bu oranı silinecekse yeniden yazılır
+COMPACTION_MIN_EXPIRED_RATIO = _env("HIDROLOGGER_COMPACTION_MIN_EXPIRED_RATIO", 0.25, float)
+# SQLite'ta tek işlemde silinen en fazla satır; yazıcılar işlemler arasında devam eder
+COMPACTION_BATCH = _env("HIDROLOGGER_COMPACTION_BATCH", 5000, int)
+
+# Segment backend'i: aktif segment bu boyuta veya yaşa (sn) ulaşınca mühürlenir
+SEGMENT_MAX_BYTES = _env("HIDROLOGGER_SEGMENT_MAX_BYTES", 4 * 1024 * 1024, int)
+SEGMENT_MAX_AGE = _env("HIDROLOGGER_SEGMENT_MAX_AGE", 86400.0, float)
+# Mühürlü segmentlerin sıkıştırılması: "auto" (zstandard yüklüyse zstd, değilse gzip), "zstd", "gzip", "none"
+SEGMENT_COMPRESSION = _env("HIDROLOGGER_SEGMENT_COMPRESSION", "auto")
+# Çözülmüş segment önbelleğinin bütçesi (kodlanmamış JSONL boyutu olarak)
+SEGMENT_CACHE_BYTES = _env("HIDROLOGGER_SEGMENT_CACHE_BYTES", 32 * 1024 * 1024, int)
+# Segment backend'inde kanal başına sabit genişlikli ikili dosyaların dönem uzunluğu (gün); 0 ise kapalı
+COLUMN_PERIOD_DAYS = _env("HIDROLOGGER_COLUMN_PERIOD_DAYS", 7, int)
+
+# Yazma dayanıklılığı: "none" (fsync yok), "batch" (değişiklikler en geç DURABILITY_SYNC_INTERVAL sn içinde
+# fsync edilir) veya "sync" (her yazma fsync sonrası döner); SQLite'ta PRAGMA synchronous'a karşılık gelir
+DURABILITY = _env("HIDROLOGGER_DURABILITY", "batch")
+DURABILITY_SYNC_INTERVAL = _env("HIDROLOGGER_DURABILITY_SYNC_INTERVAL", 1.0, float)
+# JSON backend'inin yazma günlüğü (logsfile/logs.journal) bu boyuta veya yaşa (sn) ulaşınca logs.json'a
+# işlenir; açılışta yeniden oynatılan kısım en fazla bu kadardır
+JOURNAL_CHECKPOINT_BYTES = _env("HIDROLOGGER_JOURNAL_CHECKPOINT_BYTES", 1024 * 1024, int)
+JOURNAL_CHECKPOINT_INTERVAL = _env("HIDROLOGGER_JOURNAL_CHECKPOINT_INTERVAL", 300.0, float)
+
+# Kanal başına son okumaların bellekte tutulduğu halka tampon (hot_tail.py); kapasite kanalın log_interval'ına
+# göre bu pencereyi (sn) kapsayacak kadar, en fazla HOT_TAIL_MAX_READINGS okuma; 0 ise kapalı
+HOT_TAIL_WINDOW = _env("HIDROLOGGER_HOT_TAIL_WINDOW", 86400.0, float)
+HOT_TAIL_MAX_READINGS = _env("HIDROLOGGER_HOT_TAIL_MAX_READINGS", 20000, int)
+
+# Aralık sorgusu ve seri sonuçları için LRU önbellek bütçesi (sonuçların JSON boyutu, range_cache.py); 0 ise kapalı
+RANGE_CACHE_BYTES = _env("HIDROLOGGER_RANGE_CACHE_BYTES", 16 * 1024 * 1024, int)
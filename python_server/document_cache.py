@@ -0,0 +1,112 @@
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dosyada (st_mtime_ns, st_size), diğer depolama backend'lerinde backend'e özgü; doküman yoksa None
+DocumentVersion = Optional[Tuple[int, int]]
+Versioner = Callable[[str], DocumentVersion]
+
+
+class PinnedDocuments:
+    """Bir grup okuma boyunca sabit tutulan doküman görüntüsü
+
+    Her doküman grup içinde ilk istendiğinde bir kez okunur; gruptaki tüm okumalar
+    (paralel thread'lerde olsa bile) aynı nesneyi görür.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[DocumentVersion, Any]] = {}
+
+    def get(self, file_path: str, loader: Callable[[str], Any],
+            versioner: Optional[Versioner] = None) -> Tuple[Any, DocumentVersion]:
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None:
+                version = (versioner or DocumentCache.version_of)(file_path)
+                entry = (version, loader(file_path))
+                self._entries[file_path] = entry
+        return entry[1], entry[0]
+
+
+_pinned_documents: ContextVar[Optional[PinnedDocuments]] = ContextVar("pinned_documents", default=None)
+
+
+def current_pinned_documents() -> Optional[PinnedDocuments]:
+    return _pinned_documents.get()
+
+
+@contextmanager
+def pin_documents() -> Iterator[PinnedDocuments]:
+    """Blok içindeki (ve kopyalanan context'lerdeki) okumaları tek görüntüye sabitle"""
+    pinned = PinnedDocuments()
+    token = _pinned_documents.set(pinned)
+    try:
+        yield pinned
+    finally:
+        _pinned_documents.reset(token)
+
+
+class DocumentCache:
+    """Parse edilmiş JSON dokümanlarını versiyonlarına göre önbellekler
+
+    Versiyon varsayılan olarak dosyanın (mtime, boyut) değeridir; başka depolama
+    backend'leri için `versioner` verilir. Dönen dokümanlar tüm çağıranlar arasında
+    paylaşılır, değiştirilmemelidir.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], versioner: Optional[Versioner] = None):
+        self._loader = loader
+        self._versioner = versioner or self.version_of
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[DocumentVersion, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def version_of(file_path: str) -> DocumentVersion:
+        try:
+            stat = os.stat(file_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def get(self, file_path: str) -> Tuple[Any, DocumentVersion]:
+        """Dokümanı ve versiyonunu döndür; versiyon değiştiyse yeniden oku"""
+        pinned = _pinned_documents.get()
+        if pinned is not None:
+            return pinned.get(file_path, self._loader, self._versioner)
+
+        version = self._versioner(file_path)
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1], version
+
+        self.misses += 1
+        # Versiyon okumadan önce alınır: arada yazma olursa bir sonraki çağrı tekrar okur
+        document = self._loader(file_path) if version is not None else {}
+        with self._lock:
+            self._entries[file_path] = (version, document)
+        return document, version
+
+    def invalidate(self, file_path: Optional[str] = None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "documents": len(self._entries)
+        }
@@ -0,0 +1,150 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import config
+from slow_request_journal import phase
+from storage import LOGS_DOCUMENT, StorageBackend, filter_logs
+
+logger = logging.getLogger(__name__)
+
+NO_FLOOR = float("-inf")
+
+
+class HotTail:
+    """Kanal başına son okumaları eklenme sırasıyla tutan halka tamponlar
+
+    Tamponlar depodaki eklemeleri `storage.tail_logs` imleciyle izler: yazan süreçte ekleme
+    anında, diğer süreçlerde bir sonraki sorguda yalnızca yeni kayıtlar okunur. Kanalın
+    tampondan düşen en yeni kaydının zamanı (`floor`) tutulur; başlangıcı bundan sonra olan
+    aralıklar tampondan eksiksiz yanıtlanır, diğerleri depoya gider (None).
+    Abone olan dinleyiciler (range_cache.py) her senkronizasyonda yeni kayıtları alır;
+    tamponlar kapalı olsa da eklemeler dinleyiciler için izlenir.
+    """
+
+    def __init__(self, storage: StorageBackend, capacity_for: Callable[[Any], int]):
+        self.storage = storage
+        self.capacity_for = capacity_for
+        self.enabled = config.HOT_TAIL_WINDOW > 0 and config.HOT_TAIL_MAX_READINGS > 0
+        # Backend eklemeleri izlemeyi destekliyor mu (tail_logs)
+        self.following = True
+        self._listeners: List[Callable[[List[Dict[str, Any]], bool], None]] = []
+        self._lock = threading.Lock()
+        self._rings: Dict[Any, Deque[Dict[str, Any]]] = {}
+        self._floors: Dict[Any, float] = {}
+        self._cursor: Any = None
+        self._version: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def subscribe(self, listener: Callable[[List[Dict[str, Any]], bool], None]):
+        """`listener(kayıtlar, baştan mı)` her senkronizasyonda tampon kilidi altında çağrılır"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def sync(self) -> bool:
+        """Depoya eklenen yeni kayıtları tamponlara ve dinleyicilere ilet; izlenemiyorsa False"""
+        if not self.following or not (self.enabled or self._listeners):
+            return False
+        # Versiyon okumadan önce alınır: arada ekleme olursa bir sonraki çağrı tekrar okur
+        version = self.storage.document_version(LOGS_DOCUMENT)
+        with self._lock:
+            if self._cursor is not None and version == self._version:
+                return True
+            try:
+                result = self.storage.tail_logs(self._cursor)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Son okuma tamponu güncellenemedi: {e}")
+                self._cursor = None
+                return False
+            if result is None:
+                logger.info(f"{self.storage.name} depolamada eklemeler izlenmiyor, son okuma tamponu kullanılmıyor")
+                self.following = False
+                return False
+            cursor, reset, logs = result
+            # Dinleyiciler aynı kayıtları iki kez almasın
+            self._cursor, self._version = cursor, version
+            with phase("hot_tail"):
+                if self.enabled:
+                    if reset:
+                        self._rings.clear()
+                        self._floors.clear()
+                    self._add(logs, count_evictions=not reset)
+                for listener in self._listeners:
+                    listener(logs, reset)
+            return True
+
+    def _add(self, logs: List[Dict[str, Any]], count_evictions: bool):
+        for log in logs:
+            channel = log.get('channel')
+            try:
+                ring = self._rings.get(channel)
+            except TypeError:
+                continue
+            if ring is None:
+                ring = self._rings[channel] = deque(maxlen=max(1, self.capacity_for(channel)))
+            if len(ring) == ring.maxlen:
+                self._evict(channel, ring[0])
+                if count_evictions:
+                    self.evictions += 1
+            ring.append(log)
+
+    def _evict(self, channel: Any, log: Dict[str, Any]):
+        timestamp = log.get('value_timestamp', 0)
+        if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+            # Sayısal olmayan zaman damgası bir sınır vermez; kanal yeniden kurulana kadar depodan okunur
+            timestamp = float("inf")
+        self._floors[channel] = max(self._floors.get(channel, NO_FLOOR), timestamp)
+
+    def _resize(self, channel: Any, ring: Deque[Dict[str, Any]], capacity: int) -> Deque[Dict[str, Any]]:
+        # Küçülürken düşen kayıtlar sınırı yükseltir; büyürken eski kayıtlar geri gelmez
+        while len(ring) > capacity:
+            self._evict(channel, ring.popleft())
+        ring = self._rings[channel] = deque(ring, maxlen=capacity)
+        return ring
+
+    def query(self, channel: Any, start: Optional[Any] = None, end: Optional[Any] = None
+              ) -> Optional[List[Dict[str, Any]]]:
+        """Kanalın [start, end] aralığındaki okumaları eklenme sırasıyla; tampon kapsamıyorsa None"""
+        if channel is None or not self.enabled or not self.sync():
+            return None
+        capacity = max(1, self.capacity_for(channel))
+        with self._lock:
+            ring = self._rings.get(channel)
+            if ring is not None and ring.maxlen != capacity:
+                ring = self._resize(channel, ring, capacity)
+            floor = self._floors.get(channel, NO_FLOOR)
+            if floor != NO_FLOOR and (start is None or start <= floor):
+                self.misses += 1
+                return None
+            self.hits += 1
+            logs = list(ring) if ring is not None else []
+        with phase("filter"):
+            return filter_logs(logs, channel, start, end)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "channels": len(self._rings),
+            "readings": sum(len(ring) for ring in list(self._rings.values()))
+        }
+
+
+def ring_capacity(log_interval: Any) -> int:
+    """`log_interval` saniyede bir okuma yapan kanal için HOT_TAIL_WINDOW'u kapsayan okuma sayısı
+
+    Cihaz aralıktan sık kayıt atabileceği için %25 pay bırakılır.
+    """
+    try:
+        interval = float(log_interval)
+    except (TypeError, ValueError):
+        interval = 60.0
+    if interval <= 0:
+        interval = 60.0
+    return max(1, min(config.HOT_TAIL_MAX_READINGS, int(config.HOT_TAIL_WINDOW * 1.25 / interval) + 1))
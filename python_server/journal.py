@@ -0,0 +1,340 @@
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import config
+import metrics
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: kilit yalnızca süreç içinde geçerli
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# "none": fsync yok (işletim sisteminin yazma aralığı kadar kayıp olabilir),
+# "batch": değişen dosyalar arka planda en geç DURABILITY_SYNC_INTERVAL içinde fsync edilir,
+# "sync": her yazma dönmeden önce fsync edilir
+DURABILITY_LEVELS = ("none", "batch", "sync")
+
+# Kayıt başlığı: gövde uzunluğu ve gövdenin CRC32'si; gövde tek satırlık JSON
+RECORD_HEADER = struct.Struct('<II')
+# Bozuk bir uzunluk alanı yüzünden dev bir okuma yapılmasın
+MAX_RECORD_BYTES = 256 * 1024 * 1024
+
+Record = Dict[str, Any]
+
+
+class Durability:
+    """Dayanıklılık seviyesine göre fsync kararları; "batch" seviyesinde arka plan thread'i toplu fsync yapar"""
+
+    def __init__(self, level: Optional[str] = None, interval: Optional[float] = None):
+        level = (level or config.DURABILITY).strip().lower()
+        if level not in DURABILITY_LEVELS:
+            logger.warning(f"Bilinmeyen dayanıklılık seviyesi {level!r}, 'batch' kullanılıyor")
+            level = "batch"
+        self.level = level
+        self.interval = max(0.01, interval if interval is not None else config.DURABILITY_SYNC_INTERVAL)
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.fsyncs = 0
+        self.last_sync_ns = 0
+
+    def lost_write_window(self) -> Optional[float]:
+        """Güç kesintisinde kaybolabilecek en uzun yazma aralığı (sn); "none" için sınır yok (None)"""
+        return {"sync": 0.0, "batch": self.interval}.get(self.level)
+
+    def written(self, file, force: bool = False):
+        """Yazılıp kapatılmamış dosyayı seviyeye göre hemen veya toplu olarak diske indir"""
+        if self.level == "none":
+            return
+        file.flush()
+        if force or self.level == "sync":
+            self._fsync_fd(file.fileno(), "sync" if not force else "checkpoint")
+        else:
+            self._mark(file.name)
+
+    def replaced(self, path: str, force: bool = False):
+        """`os.replace` sonrası dizin girdisini kalıcı hale getir"""
+        if self.level == "none":
+            return
+        directory = os.path.dirname(path) or "."
+        if force or self.level == "sync":
+            self._fsync_path(directory, "sync" if not force else "checkpoint")
+        else:
+            self._mark(path)
+            self._mark(directory)
+
+    def flush(self):
+        """Bekleyen tüm toplu fsync'leri hemen yap (kontrol noktası öncesi)"""
+        with self._lock:
+            paths, self._dirty = self._dirty, set()
+        for path in paths:
+            self._fsync_path(path, "batch")
+
+    def _mark(self, path: str):
+        with self._lock:
+            self._dirty.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="durability-sync", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while not self._wakeup.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Toplu fsync hatası: {e}")
+
+    def _fsync_path(self, path: str, mode: str):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            # Bu arada değiştirilmiş veya silinmiş; yeni dosya kendi fsync'ini yapar
+            return
+        except OSError as e:
+            # Bazı platformlarda dizinler açılamaz
+            logger.debug("fsync için açılamadı %s: %s", path, e)
+            return
+        try:
+            self._fsync_fd(fd, mode)
+        finally:
+            os.close(fd)
+
+    def _fsync_fd(self, fd: int, mode: str):
+        started = time.perf_counter()
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.debug("fsync başarısız: %s", e)
+            return
+        metrics.FSYNCS.labels(mode).inc()
+        metrics.FSYNC_DURATION.observe(time.perf_counter() - started)
+        self.fsyncs += 1
+        self.last_sync_ns = time.time_ns()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._dirty)
+        return {
+            "level": self.level,
+            "sync_interval": self.interval if self.level == "batch" else None,
+            "lost_write_window_seconds": self.lost_write_window(),
+            "pending_syncs": pending,
+            "fsyncs": self.fsyncs,
+        }
+
+
+def atomic_write(path: str, payload: bytes, durability: Durability, force: bool = False):
+    """Geçici dosyaya yazıp `os.replace` ile değiştir; okuyucular yarım dosya görmez"""
+    # Süreç başına geçici dosya: aynı dokümanı birden fazla süreç yazabilir
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(payload)
+        if force or durability.level == "sync":
+            durability.written(file, force)
+    os.replace(temp_path, path)
+    durability.replaced(path, force)
+
+
+def encode_record(payload: Record) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_records(data: bytes) -> Tuple[List[Record], int]:
+    """(kayıtlar, geçerli önek uzunluğu); ilk kısa, CRC'si tutmayan veya çözülemeyen kayıtta durur"""
+    records = []
+    offset = 0
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        end = offset + header_size + length
+        if length > MAX_RECORD_BYTES or end > len(data):
+            break
+        body = data[offset + header_size:end]
+        if zlib.crc32(body) != checksum:
+            break
+        try:
+            record = json.loads(body)
+        except ValueError:
+            break
+        if not isinstance(record, dict):
+            break
+        records.append(record)
+        offset = end
+    return records, offset
+
+
+def apply_logs(logs: List[Any], records: List[Record], logs_bytes: Optional[bytes] = None) -> int:
+    """Günlükteki log eklemelerini logs.json listesine uygula; eklenen kayıt sayısı
+
+    Her ekleme, yazıldığı andaki liste uzunluğunu (`base`) taşır; kontrol noktasıyla
+    logs.json'a zaten yazılmış eklemeler atlanır. Tamamlanmış bir kontrol noktası
+    işaretinden (`checkpoint`: yazılan logs.json'un boyu ve CRC'si) önceki kayıtlar
+    yeni logs.json'da yer aldığından yok sayılır.
+    """
+    start = 0
+    if logs_bytes is not None:
+        for index, record in enumerate(records):
+            if (record.get("op") == "checkpoint" and record.get("bytes") == len(logs_bytes)
+                    and record.get("crc32") == zlib.crc32(logs_bytes)):
+                start = index + 1
+    applied = 0
+    for record in records[start:]:
+        if record.get("op") != "logs":
+            continue
+        base, new = record.get("base", 0), record.get("logs") or []
+        if base + len(new) <= len(logs):
+            continue
+        if base > len(logs):
+            logger.error(f"Yazma günlüğünde boşluk: kayıt {base}. konumdan başlıyor, logs.json {len(logs)} kayıt")
+            break
+        before = len(logs)
+        logs.extend(new[before - base:])
+        applied += len(logs) - before
+    return applied
+
+
+class Journal:
+    """Ekleme-sadece yazma günlüğü (write-ahead journal)
+
+    Her kayıt uzunluk + CRC32 başlığı ve JSON gövdesinden oluşur. Yarım kalmış son kayıt
+    (çökme sırasında yazılan) okumada yok sayılır ve kurtarmada dosyadan kesilir.
+    Süreçler arası yazmalar dosya üzerindeki flock ile sıralanır.
+    """
+
+    def __init__(self, path: str, durability: Durability):
+        self.path = path
+        self.durability = durability
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._cache: Optional[Tuple[Tuple[int, int, int], List[Record], int]] = None
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Süreçler arası günlük kilidi; aynı thread içinde iç içe alınabilir"""
+        with self._lock:
+            if not self._lock_depth:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if self._lock_depth or not FCNTL_AVAILABLE:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(self.path + ".lock", 'a+b') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def size(self) -> int:
+        signature = self.signature()
+        return signature[1] if signature else 0
+
+    def scan(self) -> Tuple[List[Record], int, int]:
+        """(geçerli kayıtlar, geçerli önek uzunluğu, dosya boyu); dosya değişmediyse önbellekten"""
+        signature = self.signature()
+        if signature is None or not signature[1]:
+            return [], 0, 0
+        cached = self._cache
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2], signature[1]
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return [], 0, 0
+        records, valid = decode_records(data)
+        if len(data) == signature[1]:
+            self._cache = (signature, records, valid)
+        return records, valid, len(data)
+
+    def records(self) -> List[Record]:
+        return self.scan()[0]
+
+    def append(self, payload: Record, force: bool = False) -> int:
+        """Kaydı ekle ve seviyeye göre diske indir; yazılan byte"""
+        record = dict(payload, ns=time.time_ns())
+        data = encode_record(record)
+        with self.locked():
+            records, valid, size = self.scan()
+            if valid < size:
+                # Okunamayan kaydın arkasına yazılan kayıt hiç okunmaz, kurtarmada da silinirdi
+                logger.warning(f"Yazma günlüğünün sonundaki {size - valid} byte'lık yarım kayıt kesiliyor")
+                self.truncate_tail(valid)
+                metrics.JOURNAL_TORN_BYTES.inc(size - valid)
+                size = valid
+            try:
+                with open(self.path, 'ab') as file:
+                    file.write(data)
+                    self.durability.written(file, force)
+            except BaseException:
+                self._discard_partial(size)
+                raise
+            # Yazıcı kendi eklediğini tekrar okumasın
+            signature = self.signature()
+            if valid == size and signature is not None and signature[1] == size + len(data):
+                self._cache = (signature, records + [record], valid + len(data))
+        metrics.JOURNAL_RECORDS.labels(payload.get("op", "")).inc()
+        metrics.JOURNAL_BYTES.inc(len(data))
+        return len(data)
+
+    def reset(self):
+        """Kontrol noktasından sonra günlüğü boşalt"""
+        with self.locked():
+            with open(self.path, 'r+b' if os.path.exists(self.path) else 'wb') as file:
+                file.truncate(0)
+                self.durability.written(file, force=True)
+            self._cache = None
+
+    def truncate_tail(self, valid: int):
+        """Yarım kalmış son kaydı kes; sonraki eklemeler okunamaz bir kaydın arkasına düşmesin"""
+        with self.locked():
+            with open(self.path, 'r+b') as file:
+                file.truncate(valid)
+                self.durability.written(file, force=True)
+            self._cache = None
+
+    def _discard_partial(self, size: int):
+        """Yarıda kalan eklemenin yazılmış byte'larını kes (günlük kilidi altında)"""
+        try:
+            if os.path.getsize(self.path) > size:
+                self.truncate_tail(size)
+        except OSError as e:
+            # Kesilemeyen yarım kayıt bir sonraki eklemede veya açılışta kesilir
+            logger.error(f"Yarım kalan günlük kaydı kesilemedi: {e}")
+            self._cache = None
+
+    def checkpoint_due(self) -> bool:
+        records, _, size = self.scan()
+        # Boşaltılmış günlüğün başındaki kuşak kaydı bekleyen iş sayılmaz
+        records = [record for record in records if record.get("op") != "generation"]
+        if not records:
+            return False
+        if size >= config.JOURNAL_CHECKPOINT_BYTES:
+            return True
+        first_ns = records[0].get("ns")
+        return isinstance(first_ns, int) and (time.time_ns() - first_ns) / 1e9 >= config.JOURNAL_CHECKPOINT_INTERVAL
@@ -1,15 +1,46 @@
 import json
 import os
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import traceback
 import time
+import hashlib
+import config
+import metrics
+from contextlib import contextmanager
+from snapshot import document_key
+from single_flight import SingleFlight, coalesced
+from document_cache import DocumentCache, DocumentVersion, current_pinned_documents, pin_documents
+from storage import DOCUMENT_FOLDERS, JSONFileStorage, StorageBackend, create_storage
+from column_store import block_points, block_series
+from hot_tail import HotTail, ring_capacity
+from range_cache import RangeCache
+from rollups import TIER_NAMES, bucket_start, choose_tier, enabled_tiers, raw_points, series_from_logs
+from tracing import trace_public_methods, traced
+from slow_request_journal import add_phase, count_records, phase
 
 logger = logging.getLogger(__name__)
 
+
+def _sort_logs(logs: List[Dict[str, Any]]):
+    # Verileri ID'ye göre sırala (ilk gelen en üstte)
+    logs.sort(key=lambda x: x.get('id', 0))
+    
+    # Verileri tarihe göre ters sırala (en yeni en üstte)
+    logs.sort(key=lambda x: x.get('value_timestamp', 0), reverse=True)
+
+
+def _merge_logs(logs: List[Dict[str, Any]], new_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Önbellekteki sıralı log listesine yeni kayıtları ekle; paylaşılan liste değiştirilmez"""
+    merged = logs + new_logs
+    _sort_logs(merged)
+    return merged
+
+
+@trace_public_methods
 class JSONReader:
-    def __init__(self, base_path: str = "jsons"):
+    def __init__(self, base_path: str = "jsons", storage: Optional[StorageBackend] = None):
         # Eğer jsons klasörü mevcut değilse, python_server/jsons'u dene
         if not os.path.exists(base_path) and os.path.exists(os.path.join("python_server", base_path)):
             base_path = os.path.join("python_server", base_path)
@@ -21,64 +52,132 @@ class JSONReader:
         self.alarm_path = os.path.join(base_path, "alarm")
         self.logsfile_path = os.path.join(base_path, "logsfile")
         
+        # Kalıcılık katmanı (config.STORAGE_BACKEND); jsons dışındaki sabit dosyalar her zaman diskten okunur
+        self.storage = storage if storage is not None else create_storage(base_path)
+        self._static_files = self.storage if isinstance(self.storage, JSONFileStorage) else JSONFileStorage(base_path)
+        
         # Dosya izleme için
         self.file_last_modified = {}
         self.last_successful_data = None
         self.last_check_time = 0
         self.check_interval = 0.1  # Saniye cinsinden kontrol aralığı (100ms)
         
+        # Production modunda worker'lar dokümanları paylaşılan snapshot'tan okur
+        self.snapshot = None
+        
+        # Eşzamanlı aynı okumaları tek hesaplamada birleştir
+        self.single_flight = SingleFlight()
+        
+        # Salt okunur yollar için versiyon doğrulamalı doküman önbelleği
+        self.document_cache = DocumentCache(self._load_json_file, self._document_version)
+        self._dashboard_cache = None
+        
+        # Kanal başına son okumalar (son 24 saat gibi pencereler diske gitmeden yanıtlanır)
+        self.hot_tail = HotTail(self.storage, self._hot_tail_capacity)
+        
+        # Aralık sorgusu ve seri sonuçları; eklemeler son okuma tamponunun imleciyle izlenir
+        self.range_cache = RangeCache(config.RANGE_CACHE_BYTES, self.hot_tail.sync)
+        self.hot_tail.subscribe(self.range_cache.observe)
+        
         # Başlangıçta tüm dosyaları tara
         self._initialize_file_tracking()
         
-        logger.info("JSONReader başlatıldı")
+        logger.info(f"JSONReader başlatıldı ({self.storage.name} depolama)")
     
     def _initialize_file_tracking(self):
-        """Tüm JSON dosyalarının son değiştirilme zamanlarını kaydet"""
-        for folder_path in [self.constant_path, self.variable_path, self.semi_variable_path, self.alarm_path, self.logsfile_path]:
-            if os.path.exists(folder_path):
-                for filename in os.listdir(folder_path):
-                    if filename.endswith('.json'):
-                        file_path = os.path.join(folder_path, filename)
-                        try:
-                            self.file_last_modified[file_path] = os.path.getmtime(file_path)
-                        except OSError:
-                            self.file_last_modified[file_path] = 0
+        """Tüm dokümanların versiyonlarını kaydet"""
+        for folder in DOCUMENT_FOLDERS:
+            for filename in self.storage.list_documents(folder) or []:
+                file_path = os.path.join(self.base_path, folder, filename)
+                self.file_last_modified[file_path] = self._document_version(file_path)
+    
+    def _locate(self, file_path: str) -> Tuple[StorageBackend, str]:
+        """Dosya yolunu (backend, doküman anahtarı) çiftine çevir"""
+        key = document_key(self.base_path, file_path)
+        if key.startswith("../"):
+            return self._static_files, key
+        return self.storage, key
+    
+    def _document_version(self, file_path: str) -> DocumentVersion:
+        storage, key = self._locate(file_path)
+        return storage.document_version(key)
+    
+    def _document_exists(self, file_path: str) -> bool:
+        return self._document_version(file_path) is not None
+    
+    def _remember_version(self, file_path: str):
+        """Yazma sonrası değişiklik takibini güncelle"""
+        self.file_last_modified[file_path] = self._document_version(file_path)
+    
+    def _load_document_strict(self, file_path: str) -> Any:
+        """Önbelleksiz oku; yoksa FileNotFoundError, bozuksa json.JSONDecodeError"""
+        storage, key = self._locate(file_path)
+        return storage.load_document(key)
+    
+    def pinned_documents(self):
+        """Blok içindeki okumaların hepsi aynı doküman görüntüsünü görsün (örn. batch istekleri)"""
+        return pin_documents()
     
     def _read_json_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Tek bir JSON dosyasını güvenli şekilde oku"""
-        try:
-            if not os.path.exists(file_path):
-                logger.warning(f"Dosya bulunamadı: {file_path}")
-                return {}
-                
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
-                if not content:
-                    logger.warning(f"Dosya boş: {file_path}")
-                    return {}
-                    
-                data = json.loads(content)
-                logger.debug(f"Dosya başarıyla okundu: {file_path}")
-                return data
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parse hatası {file_path}: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"Dosya okuma hatası {file_path}: {e}")
-            return {}
+        pinned = current_pinned_documents()
+        if pinned is not None:
+            document, _ = pinned.get(file_path, self._load_json_file, self._document_version)
+            return document
+        return self._load_json_file(file_path)
+    
+    def _load_json_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Dokümanı snapshot'tan veya depolama backend'inden oku"""
+        if self.snapshot is not None:
+            document = self.snapshot.get(document_key(self.base_path, file_path))
+            if document is not None:
+                return document
+        
+        storage, key = self._locate(file_path)
+        return storage.read_document(key)
+    
+    def _write_json_file(self, file_path: str, data: Any):
+        """Dokümanı yaz; devam eden okumalar yazma öncesi sonucu yeni çağrılara dağıtmasın"""
+        storage, key = self._locate(file_path)
+        storage.write_document(key, data)
+        self._forget_reads(file_path)
     
+    def _forget_reads(self, file_path: str):
+        self.single_flight.forget()
+        self.document_cache.invalidate(file_path)
+    
+    @contextmanager
+    def _log_writer(self):
+        """Log eklemeleri için tek yazma işlemi; işlem sonunda okuma önbellekleri temizlenir"""
+        logs_file_path = os.path.join(self.logsfile_path, "logs.json")
+        with self.storage.log_writer() as writer:
+            yield writer
+        if writer.appended:
+            self._forget_reads(logs_file_path)
+            self._remember_version(logs_file_path)
+            self.hot_tail.sync()
+    
+    def _hot_tail_capacity(self, channel_id: Any) -> int:
+        """Kanalın log_interval'ına göre son okuma tamponu kapasitesi"""
+        channel_data, _ = self.document_cache.get(os.path.join(self.variable_path, "channel.json"))
+        for channel in (channel_data or {}).get('channel', []):
+            if isinstance(channel, dict) and channel.get('id') == channel_id:
+                return ring_capacity(channel.get('log_interval', 60))
+        return ring_capacity(60)
+    
+    @traced
     def _read_directory_files(self, directory_path: str, category_name: str) -> Dict[str, Any]:
         """Bir klasördeki tüm JSON dosyalarını oku"""
         result = {}
         
-        if not os.path.exists(directory_path):
+        storage, folder = self._locate(directory_path)
+        files = storage.list_documents(folder)
+        if files is None:
             logger.warning(f"{category_name} klasörü bulunamadı: {directory_path}")
             return result
         
         try:
-            files = [f for f in os.listdir(directory_path) if f.endswith('.json')]
-            logger.debug(f"{category_name} klasöründe {len(files)} JSON dosyası bulundu")
+            logger.debug("%s klasöründe %d JSON dosyası bulundu", category_name, len(files))
             
             for filename in files:
                 file_path = os.path.join(directory_path, filename)
@@ -98,11 +197,11 @@ class JSONReader:
                             result.update(data)
                     else:
                         result[file_key] = data
-                    logger.info(f"{category_name} verisi yüklendi: {file_key}")
+                    logger.info("%s verisi yüklendi: %s", category_name, file_key)
                 elif data == {}:
                     # Boş dosya durumu - boş dict ekle
                     result[file_key] = {}
-                    logger.info(f"{category_name} boş dosya işlendi: {file_key}")
+                    logger.info("%s boş dosya işlendi: %s", category_name, file_key)
                 else:
                     logger.error(f"{category_name} verisi yüklenemedi: {file_key}")
                     
@@ -126,30 +225,25 @@ class JSONReader:
         logger.debug("Dosya değişikliği kontrolü yapılıyor...")
         
         for file_path, last_modified in self.file_last_modified.items():
-            try:
-                if os.path.exists(file_path):
-                    current_modified = os.path.getmtime(file_path)
-                    if current_modified != last_modified:
-                        logger.info(f"Dosya değişikliği tespit edildi: {file_path}")
-                        self.file_last_modified[file_path] = current_modified
-                        return True
-                else:
-                    # Dosya silinmiş
-                    logger.warning(f"Dosya silinmiş: {file_path}")
-                    return True
-            except OSError:
-                continue
+            current_modified = self._document_version(file_path)
+            if current_modified is None:
+                # Dosya silinmiş
+                logger.warning(f"Dosya silinmiş: {file_path}")
+                return True
+            if current_modified != last_modified:
+                logger.info(f"Dosya değişikliği tespit edildi: {file_path}")
+                self.file_last_modified[file_path] = current_modified
+                return True
                 
         # Yeni dosyalar var mı kontrol et
         for folder_path in [self.constant_path, self.variable_path, self.alarm_path]:
-            if os.path.exists(folder_path):
-                for filename in os.listdir(folder_path):
-                    if filename.endswith('.json'):
-                        file_path = os.path.join(folder_path, filename)
-                        if file_path not in self.file_last_modified:
-                            logger.info(f"Yeni dosya tespit edildi: {file_path}")
-                            self.file_last_modified[file_path] = os.path.getmtime(file_path)
-                            return True
+            storage, folder = self._locate(folder_path)
+            for filename in storage.list_documents(folder) or []:
+                file_path = os.path.join(folder_path, filename)
+                if file_path not in self.file_last_modified:
+                    logger.info(f"Yeni dosya tespit edildi: {file_path}")
+                    self.file_last_modified[file_path] = self._document_version(file_path)
+                    return True
         
         # Geliştirme için: Her zaman değişiklik var kabul et
         logger.debug("Geliştirme modu: Cache bypass ediliyor")
@@ -176,10 +270,6 @@ class JSONReader:
                 "alarm": alarm_data
             }
             
-            # Veri boyutunu hesapla
-            data_size = len(json.dumps(combined_data, ensure_ascii=False))
-            logger.info(f"Birleştirilmiş veri boyutu: {data_size} byte")
-            
             # Veri doğrulama
             if self._validate_data(combined_data):
                 self.last_successful_data = combined_data
@@ -286,11 +376,10 @@ class JSONReader:
             logger.info(f"Data dosya yolu: {data_file_path}")
             
             # Dosyayı oku veya yeni oluştur
-            if os.path.exists(channel_file_path):
+            if self._document_exists(channel_file_path):
                 logger.info("Mevcut channel.json dosyası okunuyor")
                 try:
-                    with open(channel_file_path, 'r', encoding='utf-8') as file:
-                        data = json.load(file)
+                    data = self._load_document_strict(channel_file_path)
                     logger.info(f"Mevcut kanal sayısı: {len(data.get('channel', []))}")
                 except (json.JSONDecodeError, FileNotFoundError):
                     logger.warning("Channel.json dosyası bozuk, yeni dosya oluşturuluyor")
@@ -313,8 +402,7 @@ class JSONReader:
             logger.info(f"Yeni kanal eklendi. Toplam kanal sayısı: {len(channels)}")
             
             # Channel dosyasını kaydet
-            with open(channel_file_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(channel_file_path, data)
             
             # Data.json dosyasına yeni veri bloğu ekle
             self._add_data_entry_for_channel(channel_data.get('id'))
@@ -337,14 +425,13 @@ class JSONReader:
             channel_file_path = os.path.join(self.variable_path, "channel.json")
             data_file_path = os.path.join(self.variable_path, "data.json")
             
-            if not os.path.exists(channel_file_path):
+            if not self._document_exists(channel_file_path):
                 logger.error(f"Channel dosyası bulunamadı: {channel_file_path}")
                 return False
             
             # Channel dosyasını oku
             try:
-                with open(channel_file_path, 'r', encoding='utf-8') as file:
-                    channel_data = json.load(file)
+                channel_data = self._load_document_strict(channel_file_path)
             except (json.JSONDecodeError, FileNotFoundError):
                 logger.error("Channel.json dosyası okunamadı")
                 return False
@@ -370,14 +457,12 @@ class JSONReader:
             logger.info(f"Silinecek kanal: {channel_to_delete.get('name', 'Bilinmeyen')}")
             
             # Channel dosyasını kaydet
-            with open(channel_file_path, 'w', encoding='utf-8') as file:
-                json.dump(channel_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(channel_file_path, channel_data)
             
             # Data dosyasından da ilgili veriyi sil
-            if os.path.exists(data_file_path):
+            if self._document_exists(data_file_path):
                 try:
-                    with open(data_file_path, 'r', encoding='utf-8') as file:
-                        data_content = json.load(file)
+                    data_content = self._load_document_strict(data_file_path)
                     
                     # Data listesini al
                     data_list = data_content.get('data', [])
@@ -389,8 +474,7 @@ class JSONReader:
                     data_content['data'] = data_list
                     
                     # Data dosyasını kaydet
-                    with open(data_file_path, 'w', encoding='utf-8') as file:
-                        json.dump(data_content, file, indent=2, ensure_ascii=False)
+                    self._write_json_file(data_file_path, data_content)
                     
                     deleted_data_count = original_data_count - len(data_list)
                     logger.info(f"Data dosyasından {deleted_data_count} veri silindi")
@@ -415,13 +499,12 @@ class JSONReader:
             # Channel dosyasının yolunu belirle (artık variable klasöründe)
             channel_file_path = os.path.join(self.variable_path, "channel.json")
             
-            if not os.path.exists(channel_file_path):
+            if not self._document_exists(channel_file_path):
                 logger.error(f"Channel dosyası bulunamadı: {channel_file_path}")
                 return False
             
             # Dosyayı oku
-            with open(channel_file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            data = self._load_document_strict(channel_file_path)
             
             # Kanalı bul
             channels = data.get('channel', [])
@@ -469,11 +552,10 @@ class JSONReader:
                 return False
             
             # Dosyayı geri yaz
-            with open(channel_file_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(channel_file_path, data)
             
             # Dosya değişiklik zamanını güncelle
-            self.file_last_modified[channel_file_path] = os.path.getmtime(channel_file_path)
+            self._remember_version(channel_file_path)
             
             # Cache'i temizle
             self.last_successful_data = None
@@ -513,11 +595,10 @@ class JSONReader:
                         current_alarm_data["alarm"][channel_key][alarm_key] = alarm_info
             
             # Dosyayı yaz
-            with open(alarm_file_path, 'w', encoding='utf-8') as file:
-                json.dump(current_alarm_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(alarm_file_path, current_alarm_data)
             
             # Dosya değişiklik zamanını güncelle
-            self.file_last_modified[alarm_file_path] = os.path.getmtime(alarm_file_path)
+            self._remember_version(alarm_file_path)
             
             # Cache'i temizle
             self.last_successful_data = None
@@ -530,6 +611,7 @@ class JSONReader:
             logger.error(traceback.format_exc())
             return False
 
+    @coalesced
     def get_alarm_data(self) -> Optional[Dict[str, Any]]:
         """Alarm verilerini oku"""
         try:
@@ -547,10 +629,9 @@ class JSONReader:
             data_file_path = os.path.join(self.variable_path, "data.json")
             
             # Mevcut data.json dosyasını oku
-            if os.path.exists(data_file_path):
+            if self._document_exists(data_file_path):
                 try:
-                    with open(data_file_path, 'r', encoding='utf-8') as file:
-                        data_content = json.load(file)
+                    data_content = self._load_document_strict(data_file_path)
                 except (json.JSONDecodeError, FileNotFoundError):
                     logger.warning("Data.json dosyası bozuk, yeni dosya oluşturuluyor")
                     data_content = {"data": []}
@@ -586,11 +667,10 @@ class JSONReader:
             data_content['data'] = data_list
             
             # Dosyayı kaydet
-            with open(data_file_path, 'w', encoding='utf-8') as file:
-                json.dump(data_content, file, indent=2, ensure_ascii=False)
+            self._write_json_file(data_file_path, data_content)
             
             # Dosya değişiklik zamanını güncelle
-            self.file_last_modified[data_file_path] = os.path.getmtime(data_file_path)
+            self._remember_version(data_file_path)
             
             # Cache'i temizle
             self.last_successful_data = None
@@ -608,20 +688,6 @@ class JSONReader:
         try:
             logger.info(f"Kanal {channel_id} için log verisi kaydediliyor...")
             
-            logs_file_path = os.path.join(self.logsfile_path, "logs.json")
-            
-            # Mevcut logs.json dosyasını oku
-            if os.path.exists(logs_file_path):
-                try:
-                    with open(logs_file_path, 'r', encoding='utf-8') as file:
-                        logs_content = json.load(file)
-                except (json.JSONDecodeError, FileNotFoundError):
-                    logger.warning("Logs.json dosyası bozuk, yeni dosya oluşturuluyor")
-                    logs_content = {"logs": []}
-            else:
-                logger.info("Yeni logs.json dosyası oluşturuluyor")
-                logs_content = {"logs": []}
-            
             # Timestamp'i belirle
             if timestamp is None:
                 current_timestamp = int(datetime.now().timestamp())
@@ -633,9 +699,6 @@ class JSONReader:
                 except:
                     current_timestamp = int(datetime.now().timestamp())
             
-            # Log listesini al
-            logs = logs_content.get('logs', [])
-            
             # Yeni log kaydı oluştur (yeni format)
             new_log_entry = {
                 "battery_percentage": 100,  # Varsayılan değer
@@ -646,16 +709,9 @@ class JSONReader:
                 "value_type": 1  # Varsayılan değer
             }
             
-            # Log kaydını listeye ekle
-            logs.append(new_log_entry)
-            logs_content['logs'] = logs
-            
-            # Dosyayı kaydet
-            with open(logs_file_path, 'w', encoding='utf-8') as file:
-                json.dump(logs_content, file, indent=2, ensure_ascii=False)
-            
-            # Dosya değişiklik zamanını güncelle
-            self.file_last_modified[logs_file_path] = os.path.getmtime(logs_file_path)
+            # Log kaydını ekle
+            with self._log_writer() as writer:
+                writer.append(new_log_entry)
             
             logger.info(f"Kanal {channel_id} için log verisi başarıyla kaydedildi")
             return True
@@ -665,23 +721,15 @@ class JSONReader:
             logger.error(traceback.format_exc())
             return False
 
+    @coalesced
     def get_log_data(self, channel_id: int, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Belirli kanal için log verilerini getir"""
         try:
-            logs_file_path = os.path.join(self.logsfile_path, "logs.json")
-            
-            if not os.path.exists(logs_file_path):
-                logger.warning("Logs.json dosyası bulunamadı")
-                return None
-            
-            logs_content = self._read_json_file(logs_file_path)
-            if not logs_content:
-                return None
-            
-            logs = logs_content.get('logs', [])
-            
             # Kanal ID'sine göre filtrele
-            channel_logs = [log for log in logs if log.get('channel') == channel_id]
+            channel_logs = self.storage.query_logs(channel=channel_id)
+            if channel_logs is None:
+                logger.warning("Logs.json dosyası okunamadı")
+                return None
             
             if not channel_logs:
                 logger.info(f"Kanal {channel_id} için log verisi bulunamadı")
@@ -693,19 +741,26 @@ class JSONReader:
             
             # Tarih filtreleme
             if start_date or end_date:
-                logger.info(f"Tarih filtreleme başlıyor - Başlangıç: {start_date}, Bitiş: {end_date}")
-                logger.info(f"Filtreleme öncesi log sayısı: {len(channel_logs)}")
+                filter_started = time.perf_counter()
+                logger.info("Tarih filtreleme başlıyor - Başlangıç: %s, Bitiş: %s", start_date, end_date)
+                logger.info("Filtreleme öncesi log sayısı: %d", len(channel_logs))
+                
+                # Kayıt başına satır yerine döngü sonunda tek özet yazılır
+                skipped_before = 0
+                skipped_after = 0
+                parse_errors = 0
+                first_parse_error = None
                 
                 filtered_data = []
                 for log_entry in channel_logs:
                     log_timestamp = log_entry.get('value_timestamp', 0)
-                    logger.info(f"Log entry timestamp: {log_timestamp}")
+                    logger.debug("Log entry timestamp: %s", log_timestamp)
                     
                     try:
                         # Unix timestamp'i datetime objesine çevir
                         if log_timestamp:
                             log_dt = datetime.fromtimestamp(log_timestamp)
-                            logger.info(f"Parse edilen log_dt: {log_dt}")
+                            logger.debug("Parse edilen log_dt: %s", log_dt)
                             
                             # Başlangıç tarihi kontrolü
                             if start_date:
@@ -713,9 +768,9 @@ class JSONReader:
                                 # Eğer start_dt offset-naive ise, UTC olarak kabul et
                                 if start_dt.tzinfo is None:
                                     start_dt = start_dt.replace(tzinfo=timezone.utc)
-                                logger.info(f"Başlangıç tarihi: {start_dt}")
                                 if log_dt < start_dt:
-                                    logger.info(f"Log tarihi {log_dt} başlangıç tarihinden {start_dt} küçük, atlanıyor")
+                                    logger.debug("Log tarihi %s başlangıç tarihinden %s küçük, atlanıyor", log_dt, start_dt)
+                                    skipped_before += 1
                                     continue
                             
                             # Bitiş tarihi kontrolü
@@ -724,27 +779,36 @@ class JSONReader:
                                 # Eğer end_dt offset-naive ise, UTC olarak kabul et
                                 if end_dt.tzinfo is None:
                                     end_dt = end_dt.replace(tzinfo=timezone.utc)
-                                logger.info(f"Bitiş tarihi: {end_dt}")
                                 if log_dt > end_dt:
-                                    logger.info(f"Log tarihi {log_dt} bitiş tarihinden {end_dt} büyük, atlanıyor")
+                                    logger.debug("Log tarihi %s bitiş tarihinden %s büyük, atlanıyor", log_dt, end_dt)
+                                    skipped_after += 1
                                     continue
                             
                             # Tüm kontrolleri geçti, veriyi ekle
-                            logger.info(f"Log entry filtrelendi ve eklendi: {log_entry}")
+                            logger.debug("Log entry filtrelendi ve eklendi: %s", log_entry)
                             filtered_data.append(log_entry)
                         else:
                             # Timestamp yoksa veriyi ekle
-                            logger.info(f"Timestamp yok, log entry eklendi: {log_entry}")
+                            logger.debug("Timestamp yok, log entry eklendi: %s", log_entry)
                             filtered_data.append(log_entry)
                         
                     except Exception as e:
-                        logger.warning(f"Timestamp parse hatası: {log_timestamp} - {e}")
+                        logger.debug("Timestamp parse hatası: %s - %s", log_timestamp, e)
+                        parse_errors += 1
+                        if first_parse_error is None:
+                            first_parse_error = f"{log_timestamp} - {e}"
                         # Parse edilemeyen timestamp'leri de dahil et
                         filtered_data.append(log_entry)
                 
                 channel_logs = filtered_data
-                logger.info(f"Kanal {channel_id} için {len(filtered_data)} log kaydı filtrelendi")
-            
+                add_phase("filter", time.perf_counter() - filter_started)
+                if parse_errors:
+                    logger.warning("Kanal %d için %d kayıtta timestamp parse hatası (ilk: %s)",
+                                   channel_id, parse_errors, first_parse_error)
+                logger.info("Kanal %d için %d log kaydı filtrelendi (başlangıç öncesi: %d, bitiş sonrası: %d)",
+                            channel_id, len(filtered_data), skipped_before, skipped_after)
+            
+            count_records(0, len(channel_logs))
             return {
                 "channel_id": channel_id,
                 "channel_name": self._get_channel_name(channel_id),
@@ -756,12 +820,13 @@ class JSONReader:
             logger.error(traceback.format_exc())
             return None
 
+    @traced
     def _get_channel_name(self, channel_id: int) -> str:
         """Kanal ID'sine göre kanal adını getir"""
         try:
             channel_file_path = os.path.join(self.variable_path, "channel.json")
-            if os.path.exists(channel_file_path):
-                channel_data = self._read_json_file(channel_file_path)
+            if self._document_exists(channel_file_path):
+                channel_data, _ = self.document_cache.get(channel_file_path)
                 if channel_data:
                     channels = channel_data.get('channel', [])
                     for channel in channels:
@@ -787,7 +852,7 @@ class JSONReader:
             
             # Data verilerini oku
             data_file_path = os.path.join(self.variable_path, "data.json")
-            if not os.path.exists(data_file_path):
+            if not self._document_exists(data_file_path):
                 logger.warning("Data.json dosyası bulunamadı")
                 return []
             
@@ -845,7 +910,7 @@ class JSONReader:
             
             # Data verilerini oku
             data_file_path = os.path.join(self.variable_path, "data.json")
-            if not os.path.exists(data_file_path):
+            if not self._document_exists(data_file_path):
                 logger.warning("Data.json dosyası bulunamadı")
                 return False
             
@@ -854,90 +919,63 @@ class JSONReader:
                 logger.warning("Data.json dosyası okunamadı")
                 return False
             
-            # Mevcut log verilerini oku
-            logs_file_path = os.path.join(self.logsfile_path, "logs.json")
-            if os.path.exists(logs_file_path):
-                try:
-                    with open(logs_file_path, 'r', encoding='utf-8') as file:
-                        logs_content = json.load(file)
-                except (json.JSONDecodeError, FileNotFoundError):
-                    logs_content = {"logs": []}
-            else:
-                logs_content = {"logs": []}
-            
             data_entries = data_content.get('data', [])
             saved_count = 0
-            logs = logs_content.get('logs', [])
             
-            for data_entry in data_entries:
-                channel_id = data_entry.get('channel')
-                value = data_entry.get('value', 0)
-                value_timestamp = data_entry.get('value_timestamp', 0)
-                
-                if channel_id is None:
-                    continue
-                
-                # Timestamp'i belirle
-                if value_timestamp:
-                    current_timestamp = value_timestamp
-                else:
-                    current_timestamp = int(datetime.now().timestamp())
-                
-                # Duplicate kontrolü - aynı value ve timestamp'e sahip kayıt var mı?
-                is_duplicate = False
-                for existing_log in logs:
-                    if (existing_log.get('value') == value and 
-                        existing_log.get('value_timestamp') == current_timestamp and
-                        existing_log.get('channel') == channel_id):
-                        is_duplicate = True
-                        break
-                
-                if is_duplicate:
-                    logger.debug(f"Kanal {channel_id} için duplicate kayıt tespit edildi: {value} - {current_timestamp}")
-                    continue
-                
-                # Son log kaydını kontrol et
-                channel_logs = [log for log in logs if log.get('channel') == channel_id]
-                last_log = channel_logs[-1] if channel_logs else None
-                
-                # Eğer son log kaydı yoksa veya değer değişmişse yeni kayıt ekle
-                should_add = False
-                
-                if last_log is None:
-                    should_add = True
-                    logger.info(f"Kanal {channel_id} için ilk log kaydı ekleniyor: {value}")
-                elif last_log.get('value') != value:
-                    should_add = True
-                    logger.info(f"Kanal {channel_id} için değer değişikliği tespit edildi: {last_log.get('value')} -> {value}")
-                elif last_log.get('value_timestamp') != current_timestamp:
-                    # Aynı değer ama farklı timestamp varsa da ekle
-                    should_add = True
-                    logger.info(f"Kanal {channel_id} için timestamp değişikliği tespit edildi: {current_timestamp}")
-                
-                if should_add:
-                    # Yeni log kaydı oluştur (yeni format)
-                    new_log_entry = {
-                        "battery_percentage": data_entry.get('battery_percentage', 100),
-                        "channel": channel_id,
-                        "signal_strength": data_entry.get('signal_strength', 90),
-                        "value": value,
-                        "value_timestamp": current_timestamp,
-                        "value_type": data_entry.get('value_type', 1)
-                    }
+            with self._log_writer() as writer:
+                for data_entry in data_entries:
+                    channel_id = data_entry.get('channel')
+                    value = data_entry.get('value', 0)
+                    value_timestamp = data_entry.get('value_timestamp', 0)
+                    
+                    if channel_id is None:
+                        continue
+                    
+                    # Timestamp'i belirle
+                    if value_timestamp:
+                        current_timestamp = value_timestamp
+                    else:
+                        current_timestamp = int(datetime.now().timestamp())
+                    
+                    # Duplicate kontrolü - aynı value ve timestamp'e sahip kayıt var mı?
+                    if writer.exists(channel_id, current_timestamp, value):
+                        logger.debug("Kanal %s için duplicate kayıt tespit edildi: %s - %s", channel_id, value, current_timestamp)
+                        continue
                     
-                    # Log kaydını listeye ekle
-                    logs.append(new_log_entry)
-                    saved_count += 1
-                    logger.info(f"Kanal {channel_id} için yeni log verisi kaydedildi: {value}")
+                    # Son log kaydını kontrol et
+                    last_log = writer.last(channel_id)
+                    
+                    # Eğer son log kaydı yoksa veya değer değişmişse yeni kayıt ekle
+                    should_add = False
+                    
+                    if last_log is None:
+                        should_add = True
+                        logger.info(f"Kanal {channel_id} için ilk log kaydı ekleniyor: {value}")
+                    elif last_log.get('value') != value:
+                        should_add = True
+                        logger.info(f"Kanal {channel_id} için değer değişikliği tespit edildi: {last_log.get('value')} -> {value}")
+                    elif last_log.get('value_timestamp') != current_timestamp:
+                        # Aynı değer ama farklı timestamp varsa da ekle
+                        should_add = True
+                        logger.info(f"Kanal {channel_id} için timestamp değişikliği tespit edildi: {current_timestamp}")
+                    
+                    if should_add:
+                        # Yeni log kaydı oluştur (yeni format)
+                        new_log_entry = {
+                            "battery_percentage": data_entry.get('battery_percentage', 100),
+                            "channel": channel_id,
+                            "signal_strength": data_entry.get('signal_strength', 90),
+                            "value": value,
+                            "value_timestamp": current_timestamp,
+                            "value_type": data_entry.get('value_type', 1)
+                        }
+                        
+                        # Log kaydını ekle; değişiklik varsa işlem sonunda tek seferde kaydedilir
+                        writer.append(new_log_entry)
+                        saved_count += 1
+                        logger.info(f"Kanal {channel_id} için yeni log verisi kaydedildi: {value}")
             
-            # Değişiklik varsa dosyayı kaydet
             if saved_count > 0:
-                logs_content['logs'] = logs
-                with open(logs_file_path, 'w', encoding='utf-8') as file:
-                    json.dump(logs_content, file, indent=2, ensure_ascii=False)
-                
-                # Dosya değişiklik zamanını güncelle
-                self.file_last_modified[logs_file_path] = os.path.getmtime(logs_file_path)
                 logger.info(f"Toplam {saved_count} yeni log verisi kaydedildi")
             else:
                 logger.info("Yeni log verisi bulunamadı, mevcut veriler güncel")
@@ -954,21 +992,19 @@ class JSONReader:
         try:
             data_file_path = os.path.join(self.variable_path, "data.json")
             
-            if not os.path.exists(data_file_path):
+            # Dokümanın versiyonunu kontrol et
+            current_version = self._document_version(data_file_path)
+            if current_version is None:
                 return False
             
-            # Dosyanın son değiştirilme zamanını kontrol et
-            current_mtime = os.path.getmtime(data_file_path)
-            last_mtime = self.file_last_modified.get(data_file_path, 0)
-            
-            if current_mtime > last_mtime:
+            if current_version != self.file_last_modified.get(data_file_path):
                 logger.info("Data.json dosyasında değişiklik tespit edildi, log verileri otomatik olarak kaydediliyor...")
                 
                 # Log verilerini otomatik olarak kaydet
                 success = self.auto_save_logs_from_data()
                 
-                # Dosya değişiklik zamanını güncelle
-                self.file_last_modified[data_file_path] = current_mtime
+                # Doküman versiyonunu güncelle
+                self.file_last_modified[data_file_path] = current_version
                 
                 if success:
                     logger.info("Log verileri başarıyla otomatik olarak kaydedildi")
@@ -999,8 +1035,7 @@ class JSONReader:
             current_data["data"] = variable_data.get("data", [])
             
             # Dosyaya kaydet
-            with open(data_file_path, 'w', encoding='utf-8') as file:
-                json.dump(current_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(data_file_path, current_data)
             
             logger.info("Variable data başarıyla güncellendi")
             return True
@@ -1010,6 +1045,7 @@ class JSONReader:
             logger.error(traceback.format_exc())
             return False
 
+    @coalesced
     def get_station_data(self) -> Optional[Dict[str, Any]]:
         """Station verilerini getir"""
         try:
@@ -1027,6 +1063,7 @@ class JSONReader:
             logger.error(f"Station verileri getirme hatası: {e}")
             return {"station": []}
 
+    @coalesced
     def get_station_by_id(self, station_id: int) -> Optional[Dict[str, Any]]:
         """Belirtilen ID'li istasyon bilgisini getir"""
         try:
@@ -1050,6 +1087,7 @@ class JSONReader:
             logger.error(f"Station ID {station_id} getirme hatası: {e}")
             return None
 
+    @coalesced
     def get_semi_variable_data(self) -> Optional[Dict[str, Any]]:
         """Semi-variable klasöründeki tüm verileri getir"""
         try:
@@ -1058,6 +1096,7 @@ class JSONReader:
             logger.error(f"Semi-variable veri getirme hatası: {e}")
             return {}
 
+    @coalesced
     def get_data_json_data(self) -> Optional[Dict[str, Any]]:
         """Data.json dosyasındaki verileri getir"""
         try:
@@ -1075,6 +1114,7 @@ class JSONReader:
             logger.error(f"Data.json veri getirme hatası: {e}")
             return {"data": []}
 
+    @coalesced
     def get_channel_json_data(self) -> Optional[Dict[str, Any]]:
         """Channel.json dosyasındaki verileri getir"""
         try:
@@ -1092,6 +1132,121 @@ class JSONReader:
             logger.error(f"Channel.json veri getirme hatası: {e}")
             return {"channel": []}
 
+    @staticmethod
+    def _format_channel(channel: Dict[str, Any]) -> Dict[str, Any]:
+        """Kanal kaydını API formatına çevir"""
+        return {
+            "id": channel.get('id'),
+            "name": channel.get('name', ''),
+            "description": channel.get('description', ''),
+            "channel_category": channel.get('channel_category', 1),
+            "channel_sub_category": channel.get('channel_sub_category', 1),
+            "channel_parameter": channel.get('channel_parameter', 101),
+            "measurement_unit": channel.get('measurement_unit', 1),
+            "log_interval": channel.get('log_interval', 60),
+            "offset": channel.get('offset', 0.0)
+        }
+
+    @staticmethod
+    def _format_alarm(alarm_id: int, channel_id: int, alarm_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Alarm kaydını API formatına çevir"""
+        return {
+            "id": alarm_id,
+            "channel_id": channel_id,
+            "alarminfo": alarm_info.get('alarminfo', f'Kanal {channel_id} Alarm'),
+            "min_value": alarm_info.get('min_value', 0.0),
+            "min_value_reset": alarm_info.get('min_value_reset', 0.0),
+            "max_value": alarm_info.get('max_value', 100.0),
+            "max_value_reset": alarm_info.get('max_value_reset', 0.0),
+            "color": alarm_info.get('color', '#FF0000'),
+            "data_post_frequency": alarm_info.get('data_post_frequency', 1000),
+            "status": alarm_info.get('status', 'active'),
+            "trigger_time": alarm_info.get('trigger_time', 0),
+            "reset_time": alarm_info.get('reset_time', 0)
+        }
+
+    @staticmethod
+    def format_current_value(item: Dict[str, Any]) -> Dict[str, Any]:
+        """data.json kaydını /api/data formatına çevir"""
+        return {
+            "battery_percentage": item.get('battery_percentage', 100),
+            "channelID": item.get('channel', 0),
+            "max_value": item.get('max_value', 0),
+            "min_value": item.get('min_value', 0),
+            "signal_strength": item.get('signal_strength', 90),
+            "value": item.get('value', 0),
+            "value_timestamp": item.get('value_timestamp', int(time.time())),
+            "value_type": item.get('value_type', 1)
+        }
+
+    @coalesced
+    def get_dashboard_snapshot(self) -> Tuple[str, Dict[str, Any]]:
+        """Kanal, anlık değer, alarm ve istasyon verilerini tek görünümde birleştir
+
+        Dokümanlar önbellekten okunur ve tek geçişte birleştirilir. Dönen ETag dört
+        dokümanın versiyonundan türetilir; versiyonlar değişmediyse önceki görünüm
+        yeniden kullanılır.
+        """
+        channel_data, channel_version = self.document_cache.get(os.path.join(self.variable_path, "channel.json"))
+        data_json, data_version = self.document_cache.get(os.path.join(self.variable_path, "data.json"))
+        alarm_data, alarm_version = self.document_cache.get(os.path.join(self.alarm_path, "alarm.json"))
+        station_data, station_version = self.document_cache.get(os.path.join(self.semi_variable_path, "station.json"))
+
+        versions = repr((channel_version, data_version, alarm_version, station_version))
+        etag = hashlib.sha1(versions.encode('utf-8')).hexdigest()
+        if self._dashboard_cache is not None and self._dashboard_cache[0] == etag:
+            return self._dashboard_cache
+
+        # Anlık değerleri kanala göre indeksle (kanal başına son kayıt geçerli)
+        current_by_channel = {}
+        for item in (data_json or {}).get('data', []) or []:
+            if item.get('channel') is not None:
+                current_by_channel[item.get('channel')] = item
+
+        alarm_section = (alarm_data or {}).get('alarm', {}) or {}
+
+        channels = []
+        for channel in (channel_data or {}).get('channel', []) or []:
+            channel_id = channel.get('id')
+            current = current_by_channel.get(channel_id)
+            value = current.get('value', 0) if current is not None else None
+
+            alarms = []
+            active_alarm_ids = []
+            alarm_id = 1
+            for alarm_key, alarm_info in alarm_section.get(f'channel_{channel_id}', {}).items():
+                if not alarm_key.startswith('alarm_'):
+                    continue
+                formatted_alarm = self._format_alarm(alarm_id, channel_id, alarm_info)
+                alarms.append(formatted_alarm)
+                # check_alarms ile aynı kural: değer alarm aralığındaysa tetiklenmiş say
+                if (value is not None and formatted_alarm['status'] == 'active'
+                        and formatted_alarm['min_value'] <= value <= formatted_alarm['max_value']):
+                    active_alarm_ids.append(alarm_id)
+                alarm_id += 1
+
+            channels.append({
+                "id": channel_id,
+                "channel": self._format_channel(channel),
+                "current": self.format_current_value(current) if current is not None else None,
+                "alarms": alarms,
+                "alarm_state": {
+                    "active": bool(active_alarm_ids),
+                    "active_alarm_ids": active_alarm_ids
+                }
+            })
+
+        snapshot = {
+            "success": True,
+            "station": (station_data or {}).get('station', []) or [],
+            "channels": channels,
+            "timestamp": datetime.now().isoformat()
+        }
+        self._dashboard_cache = (etag, snapshot)
+        logger.info(f"Dashboard görünümü oluşturuldu: {len(channels)} kanal")
+        return self._dashboard_cache
+
+    @coalesced
     def get_channels(self) -> List[Dict[str, Any]]:
         """Tüm kanalları getir - Yeni API yapısı"""
         try:
@@ -1104,20 +1259,7 @@ class JSONReader:
             
             if 'channel' in channel_data and channel_data['channel']:
                 # ID'leri string'e çevir (görüntüleme için)
-                formatted_channels = []
-                for channel in channel_data['channel']:
-                    formatted_channel = {
-                        "id": channel.get('id'),
-                        "name": channel.get('name', ''),
-                        "description": channel.get('description', ''),
-                        "channel_category": channel.get('channel_category', 1),
-                        "channel_sub_category": channel.get('channel_sub_category', 1),
-                        "channel_parameter": channel.get('channel_parameter', 101),
-                        "measurement_unit": channel.get('measurement_unit', 1),
-                        "log_interval": channel.get('log_interval', 60),
-                        "offset": channel.get('offset', 0.0)
-                    }
-                    formatted_channels.append(formatted_channel)
+                formatted_channels = [self._format_channel(channel) for channel in channel_data['channel']]
                 
                 logger.info(f"{len(formatted_channels)} kanal bulundu")
                 return formatted_channels
@@ -1129,6 +1271,7 @@ class JSONReader:
             logger.error(f"Kanal verileri getirme hatası: {e}")
             return []
 
+    @coalesced
     def get_channel(self, channel_id: int) -> Optional[Dict[str, Any]]:
         """Belirtilen ID'li kanal bilgisini getir"""
         try:
@@ -1152,6 +1295,7 @@ class JSONReader:
             logger.error(f"Kanal ID {channel_id} getirme hatası: {e}")
             return None
 
+    @coalesced
     def get_data(self) -> List[Dict[str, Any]]:
         """Tüm anlık verileri getir"""
         try:
@@ -1173,6 +1317,7 @@ class JSONReader:
             logger.error(f"Anlık veri getirme hatası: {e}")
             return []
 
+    @coalesced
     def get_channel_data(self, channel_id: int) -> List[Dict[str, Any]]:
         """Belirtilen kanal ID'sine ait anlık verileri getir"""
         try:
@@ -1232,8 +1377,7 @@ class JSONReader:
             existing_channels.append(new_channel)
             current_data['channel'] = existing_channels
             
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(current_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(file_path, current_data)
             
             # Min/max değerleri al (alarm için)
             min_value = channel_data.get('minvalue', -10.0)
@@ -1294,8 +1438,7 @@ class JSONReader:
             
             current_alarm_data["alarm"][channel_key][alarm_key] = new_alarm
             
-            with open(alarm_file_path, 'w', encoding='utf-8') as file:
-                json.dump(current_alarm_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(alarm_file_path, current_alarm_data)
             
             logger.info(f"Kanal {channel_id} için alarm {alarm_number} eklendi")
             return True
@@ -1312,7 +1455,7 @@ class JSONReader:
             logger.info(f"Data dosya yolu: {data_file_path}")
             
             # Dosya yoksa oluştur
-            if not os.path.exists(data_file_path):
+            if not self._document_exists(data_file_path):
                 logger.info("Data.json dosyası yok, oluşturuluyor")
                 current_data = {"data": []}
             else:
@@ -1353,8 +1496,7 @@ class JSONReader:
             current_data['data'] = existing_data
             
             # Dosyayı kaydet
-            with open(data_file_path, 'w', encoding='utf-8') as file:
-                json.dump(current_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(data_file_path, current_data)
             
             logger.info(f"Kanal {channel_id} için otomatik data eklendi: ID {new_data_id}")
             return True
@@ -1424,11 +1566,9 @@ class JSONReader:
                     migrated_count += 1
             
             # Dosyaları kaydet
-            with open(channel_file_path, 'w', encoding='utf-8') as file:
-                json.dump(channel_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(channel_file_path, channel_data)
             
-            with open(alarm_file_path, 'w', encoding='utf-8') as file:
-                json.dump(alarm_data, file, indent=2, ensure_ascii=False)
+            self._write_json_file(alarm_file_path, alarm_data)
             
             logger.info(f"{migrated_count} kanalın min/max değerleri alarm.json'a taşındı")
             return True
@@ -1505,6 +1645,7 @@ class JSONReader:
             logger.error(f"Alt kategori ad getirme hatası: {e}")
             return 'SolSahilSulama'
 
+    @coalesced
     def get_alarms(self) -> List[Dict[str, Any]]:
         """Tüm alarmları getir - Yeni yapı (alarm -> channel_1 -> alarm_1)"""
         try:
@@ -1526,20 +1667,7 @@ class JSONReader:
                     
                     for alarm_key, alarm_info in channel_data.items():
                         if alarm_key.startswith('alarm_'):
-                            formatted_alarm = {
-                                "id": alarm_id,
-                                "channel_id": channel_id,
-                                "alarminfo": alarm_info.get('alarminfo', f'Kanal {channel_id} Alarm'),
-                                "min_value": alarm_info.get('min_value', 0.0),
-                                "min_value_reset": alarm_info.get('min_value_reset', 0.0),
-                                "max_value": alarm_info.get('max_value', 100.0),
-                                "max_value_reset": alarm_info.get('max_value_reset', 0.0),
-                                "color": alarm_info.get('color', '#FF0000'),
-                                "data_post_frequency": alarm_info.get('data_post_frequency', 1000),
-                                "status": alarm_info.get('status', 'active'),
-                                "trigger_time": alarm_info.get('trigger_time', 0),
-                                "reset_time": alarm_info.get('reset_time', 0)
-                            }
+                            formatted_alarm = self._format_alarm(alarm_id, channel_id, alarm_info)
                             formatted_alarms.append(formatted_alarm)
                             alarm_id += 1
             
@@ -1550,6 +1678,7 @@ class JSONReader:
             logger.error(f"Alarm verileri getirme hatası: {e}")
             return []
 
+    @coalesced
     def get_channel_alarms(self, channel_id: int) -> List[Dict[str, Any]]:
         """Belirtilen kanalın tüm alarmlarını getir"""
         try:
@@ -1570,20 +1699,7 @@ class JSONReader:
                 
                 for alarm_key, alarm_info in channel_data.items():
                     if alarm_key.startswith('alarm_'):
-                        formatted_alarm = {
-                            "id": alarm_id,
-                            "channel_id": channel_id,
-                            "alarminfo": alarm_info.get('alarminfo', f'Kanal {channel_id} Alarm'),
-                            "min_value": alarm_info.get('min_value', 0.0),
-                            "min_value_reset": alarm_info.get('min_value_reset', 0.0),
-                            "max_value": alarm_info.get('max_value', 100.0),
-                            "max_value_reset": alarm_info.get('max_value_reset', 0.0),
-                            "color": alarm_info.get('color', '#FF0000'),
-                            "data_post_frequency": alarm_info.get('data_post_frequency', 1000),
-                            "status": alarm_info.get('status', 'active'),
-                            "trigger_time": alarm_info.get('trigger_time', 0),
-                            "reset_time": alarm_info.get('reset_time', 0)
-                        }
+                        formatted_alarm = self._format_alarm(alarm_id, channel_id, alarm_info)
                         formatted_alarms.append(formatted_alarm)
                         alarm_id += 1
             
@@ -1594,6 +1710,7 @@ class JSONReader:
             logger.error(f"Kanal {channel_id} alarm verileri getirme hatası: {e}")
             return []
 
+    @coalesced
     def get_channel_alarm(self, channel_id: int, alarm_id: int) -> Optional[Dict[str, Any]]:
         """Belirtilen kanalın belirtilen alarmını getir"""
         try:
@@ -1609,6 +1726,7 @@ class JSONReader:
             logger.error(f"Kanal {channel_id}, Alarm {alarm_id} getirme hatası: {e}")
             return None
 
+    @coalesced
     def get_alarm_by_id(self, alarm_id: int) -> Optional[Dict[str, Any]]:
         """Belirtilen ID'li alarmı getir"""
         try:
@@ -1621,55 +1739,101 @@ class JSONReader:
             logger.error(f"Alarm ID {alarm_id} getirme hatası: {e}")
             return None
 
+    @coalesced
     def get_logs(self, channel_id: Optional[int] = None, start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[Dict[str, Any]]:
         """Log verilerini getir - Filtreleme ile"""
         try:
-            logs_file_path = os.path.join(self.logsfile_path, "logs.json")
-            logs_data = self._read_json_file(logs_file_path)
-            
-            if logs_data is None or 'logs' not in logs_data:
+            filtered_logs = self.range_cache.fetch(
+                ("logs", channel_id, start_time, end_time), channel_id, start_time, end_time,
+                lambda: self._query_logs(channel_id, start_time, end_time), merge=_merge_logs
+            )
+            if filtered_logs is None:
                 logger.warning("Logs.json dosyası okunamadı veya 'logs' anahtarı bulunamadı")
                 return []
             
-            all_logs = logs_data['logs']
-            
-            # Logs verisinin liste olduğunu kontrol et
-            if not isinstance(all_logs, list):
-                logger.error(f"Logs verisi liste değil, tip: {type(all_logs)}")
-                return []
-            
-            filtered_logs = []
-            
-            for log in all_logs:
-                # Log verisinin dict olduğunu kontrol et
-                if not isinstance(log, dict):
-                    logger.warning(f"Log entry dict değil, tip: {type(log)}")
-                    continue
-                
-                # Kanal ID filtresi
-                if channel_id is not None and log.get('channel') != channel_id:
-                    continue
-                
-                # Zaman filtresi
-                log_timestamp = log.get('value_timestamp', 0)
-                if start_time is not None and log_timestamp < start_time:
-                    continue
-                if end_time is not None and log_timestamp > end_time:
-                    continue
-                
-                # Yeni format - direkt olarak log verisini döndür
-                filtered_logs.append(log)
-            
-            # Verileri ID'ye göre sırala (ilk gelen en üstte)
-            filtered_logs.sort(key=lambda x: x.get('id', 0))
-            
-            # Verileri tarihe göre ters sırala (en yeni en üstte)
-            filtered_logs.sort(key=lambda x: x.get('value_timestamp', 0), reverse=True)
-            
+            count_records(0, len(filtered_logs))
             logger.info(f"{len(filtered_logs)} log verisi bulundu")
             return filtered_logs
             
         except Exception as e:
             logger.error(f"Log verileri getirme hatası: {e}")
             logger.error(traceback.format_exc())
-            return []
\ No newline at end of file
+            return []
+
+    def _query_logs(self, channel_id: Optional[int], start_time: Optional[int], end_time: Optional[int]
+                    ) -> Optional[List[Dict[str, Any]]]:
+        filtered_logs = self.hot_tail.query(channel_id, start_time, end_time)
+        if filtered_logs is None:
+            filtered_logs = self.storage.query_logs(channel_id, start_time, end_time)
+        if filtered_logs is not None:
+            with phase("sort"):
+                _sort_logs(filtered_logs)
+        return filtered_logs
+
+    @coalesced
+    def get_channel_series(self, channel_id: int, start_time: int, end_time: int, resolution: float) -> Dict[str, Any]:
+        """Kanalın zaman aralığındaki serisi; istenen çözünürlüğü (sn) sağlayan en kaba özet katmanından
+
+        Noktalar kova başlangıcına göre sıralıdır ve min, max, mean, count, last içerir;
+        ilk kova aralığın başlangıcından önce başlayabilir. Çözünürlük en ince katmandan
+        küçükse her ham okuma tek kayıtlık bir nokta olarak döner.
+        """
+        seconds = choose_tier(resolution, enabled_tiers())
+        if seconds is None:
+            low, high = start_time, end_time
+        else:
+            # İlk kova aralıktan önce başlar, son kova aralıktan sonra biter
+            low, high = bucket_start(start_time, seconds), bucket_start(end_time, seconds) + seconds
+        series = self.range_cache.fetch(
+            ("series", channel_id, start_time, end_time, seconds), channel_id, low, high,
+            lambda: self._channel_series(channel_id, start_time, end_time, seconds)
+        )
+        metrics.ROLLUP_QUERIES.labels(series["tier"] if series["source"] == "rollup" else "raw").inc()
+        count_records(0, series["count"])
+        return series
+
+    def _channel_series(self, channel_id: int, start_time: int, end_time: int, seconds: Optional[int]) -> Dict[str, Any]:
+        source = "rollup"
+        if seconds is None:
+            logs = self.hot_tail.query(channel_id, start_time, end_time)
+            blocks = self.storage.query_columns(channel_id, start_time, end_time) if logs is None else None
+            if logs is not None:
+                with phase("aggregate"):
+                    points = raw_points(logs)
+                source = "hot_tail"
+            elif blocks is not None:
+                with phase("aggregate"):
+                    points = block_points(blocks)
+                source = "columns"
+            else:
+                logs = self.storage.query_logs(channel_id, start_time, end_time) or []
+                with phase("aggregate"):
+                    points = raw_points(logs)
+                source = "raw"
+        else:
+            points = self.storage.query_rollups(seconds, channel_id, start_time, end_time)
+            if points is None:
+                # Özetler henüz doldurulmadı; aynı sonuç ham okumalardan hesaplanır
+                first = bucket_start(start_time, seconds)
+                blocks = self.storage.query_columns(channel_id, first, end_time)
+                if blocks is not None:
+                    with phase("aggregate"):
+                        points = block_series(blocks, seconds)
+                    source = "columns"
+                else:
+                    logs = self.storage.query_logs(channel_id, first, end_time) or []
+                    with phase("aggregate"):
+                        points = series_from_logs(logs, seconds)
+                    source = "raw"
+        
+        tier = TIER_NAMES[seconds] if seconds is not None else "raw"
+        return {
+            "channel": channel_id,
+            "start": start_time,
+            "end": end_time,
+            "resolution": seconds or 0,
+            "tier": tier,
+            "source": source,
+            "count": len(points),
+            "points": points
+        }
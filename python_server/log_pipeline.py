@@ -0,0 +1,203 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class CallSiteRateLimitFilter(logging.Filter):
+    """Aynı çağrı noktasından (dosya, satır) gelen kayıtları sınırlar ve örnekler
+
+    Her çağrı noktası `interval` saniyelik pencerede en fazla `burst` kayıt yazar;
+    fazlası bastırılır ve her `sample_every` kayıttan biri örnek olarak geçer.
+    Pencere dolduktan sonra o noktadan gelen ilk kayda bastırılanların özeti eklenir.
+    `max_level` ve üzerindeki kayıtlar (varsayılan ERROR) sınırlanmaz.
+    """
+
+    def __init__(self, burst: int, interval: float, sample_every: int, max_level: int = logging.ERROR):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.sample_every = sample_every
+        self.max_level = max_level
+        self._sites: Dict[Any, list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno >= self.max_level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                # [pencere başlangıcı, penceredeki kayıt sayısı, bastırılan sayısı]
+                site = [now, 0, 0]
+                self._sites[key] = site
+
+            summary = None
+            if now - site[0] >= self.interval:
+                if site[2]:
+                    summary = site[2]
+                site[0], site[1], site[2] = now, 0, 0
+
+            site[1] += 1
+            if site[1] <= self.burst:
+                allowed, sampled = True, False
+            else:
+                site[2] += 1
+                self.suppressed += 1
+                sampled = self.sample_every > 0 and site[2] % self.sample_every == 0
+                allowed = sampled
+
+        if not allowed:
+            return False
+        if summary is not None or sampled:
+            message = record.getMessage()
+            if sampled:
+                message += f" [örnek: 1/{self.sample_every}]"
+            if summary is not None:
+                message += f" [önceki {self.interval:g} sn içinde {summary} benzer kayıt bastırıldı]"
+            record.msg, record.args = message, None
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Kaydı çağıran thread'de biçimlendirmeden kuyruğa atar; kuyruk doluysa kaydı düşürür
+
+    Mesaj argümanları burada çözülür (sonradan değişebilecek nesneler yüzünden),
+    zaman damgası ve format işlemi dinleyici thread'inde yapılır.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Kök logger'ı kuyruk + dinleyici thread üzerinden yazacak şekilde kurar"""
+
+    def __init__(self):
+        self.queue_handler: Optional[NonBlockingQueueHandler] = None
+        self.rate_limit: Optional[CallSiteRateLimitFilter] = None
+        self.listener: Optional[QueueListener] = None
+
+    @property
+    def installed(self) -> bool:
+        return self.listener is not None
+
+    def install(self, level: str = config.LOG_LEVEL, module_levels: str = config.LOG_LEVELS):
+        if self.installed:
+            return
+
+        log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        self.queue_handler = NonBlockingQueueHandler(log_queue)
+        self.rate_limit = CallSiteRateLimitFilter(
+            config.LOG_RATE_LIMIT_BURST, config.LOG_RATE_LIMIT_INTERVAL, config.LOG_SAMPLE_EVERY
+        )
+        self.queue_handler.addFilter(self.rate_limit)
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        self.listener.start()
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(level.upper())
+
+        for name, module_level in self.parse_levels(module_levels).items():
+            self.set_level(name, module_level)
+
+        atexit.register(self.shutdown)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _restart_in_child(self):
+        """Fork sonrası dinleyici thread'i çocuk süreçte yoktur (örn. gunicorn worker'ları)
+
+        Ebeveynin kuyruğundaki kayıtlar iki kez yazılmasın diye yeni kuyrukla başlatılır.
+        """
+        if self.listener is None:
+            return
+        log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        self.queue_handler.queue = log_queue
+        self.listener = QueueListener(log_queue, *self.listener.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def shutdown(self):
+        """Kuyrukta kalan kayıtları yazıp dinleyiciyi durdur"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    @staticmethod
+    def parse_levels(spec: str) -> Dict[str, str]:
+        """"json_reader=DEBUG,server=WARNING" biçimindeki ayarı çözümle"""
+        levels = {}
+        for item in (spec or "").split(","):
+            name, _, level = item.partition("=")
+            if name.strip() and level.strip():
+                levels[name.strip()] = level.strip().upper()
+        return levels
+
+    @staticmethod
+    def set_level(name: str, level: str):
+        """Modül logger'ının seviyesini çalışırken değiştir; geçersiz seviyede ValueError"""
+        target = logging.getLogger(name if name != "root" else None)
+        target.setLevel(level.upper())
+        logger.info("Log seviyesi değiştirildi: %s=%s", name, logging.getLevelName(target.level))
+
+    @staticmethod
+    def levels() -> Dict[str, str]:
+        """Kök ve seviyesi açıkça ayarlanmış modül logger'ları"""
+        result = {"root": logging.getLevelName(logging.getLogger().level)}
+        for name, item in sorted(logging.Logger.manager.loggerDict.items()):
+            if isinstance(item, logging.Logger) and item.level != logging.NOTSET:
+                result[name] = logging.getLevelName(item.level)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "installed": self.installed,
+            "queued": self.queue_handler.queue.qsize() if self.queue_handler else 0,
+            "dropped": self.queue_handler.dropped if self.queue_handler else 0,
+            "rate_limited": self.rate_limit.suppressed if self.rate_limit else 0,
+            "levels": self.levels()
+        }
+
+
+PIPELINE = LogPipeline()
+
+
+def setup_logging():
+    """Süreç başına bir kez çağrılır (tekrar çağrılar etkisizdir)"""
+    PIPELINE.install()
@@ -0,0 +1,219 @@
+import gc
+import linecache
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    resource = None
+    RESOURCE_AVAILABLE = False
+
+# Snapshot istatistiklerinde gösterilmeyen, ölçüm aracının kendi ayırmaları
+_IGNORED_FILES = (tracemalloc.__file__, linecache.__file__, "<frozen importlib._bootstrap>",
+                  "<frozen importlib._bootstrap_external>", "<unknown>")
+
+KEY_TYPES = ("lineno", "filename", "traceback")
+
+
+class SnapshotNotFoundError(KeyError):
+    """İstenen isimde snapshot yok"""
+
+
+def _rss_kb() -> Dict[str, Optional[int]]:
+    """Anlık (/proc) ve en yüksek (getrusage) RSS, KB"""
+    current = None
+    try:
+        with open(f"/proc/{os.getpid()}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1])
+                    break
+    except (OSError, ValueError):
+        pass
+    peak = None
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024
+    return {"current": current, "peak": peak}
+
+
+def _format_stat(stat, key_type: str) -> Dict[str, Any]:
+    frames = [{"file": frame.filename, "line": frame.lineno} for frame in stat.traceback]
+    item = {
+        "location": f"{frames[0]['file']}:{frames[0]['line']}" if frames else "?",
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count
+    }
+    if key_type == "traceback":
+        item["traceback"] = frames
+    if hasattr(stat, "size_diff"):
+        item["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        item["count_diff"] = stat.count_diff
+    return item
+
+
+class MemoryTracker:
+    """tracemalloc tabanlı ayırma takibi: isimli snapshot'lar, farklar ve istek başına tepe bellek
+
+    İstek başına tepe değer tracemalloc'un süreç geneli tepe sayacından hesaplanır;
+    eşzamanlı isteklerde diğer isteklerin ayırmaları da karışır, değerler yaklaşıktır.
+    """
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"Bellek takibi başlatıldı ({frames} çerçeve)")
+
+    def stop(self):
+        """Takibi durdur; snapshot'lar ve istek istatistikleri silinir"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("Bellek takibi durduruldu")
+        with self._lock:
+            self._snapshots.clear()
+            self._routes.clear()
+
+    def take_snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Bellek takibi kapalı; önce başlatılmalı")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+        )
+        traced, peak = tracemalloc.get_traced_memory()
+        info = {
+            "name": name or time.strftime("snapshot-%H%M%S"),
+            "timestamp": time.time(),
+            "traced_kb": round(traced / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "rss_kb": _rss_kb()["current"]
+        }
+        with self._lock:
+            self._snapshots.pop(info["name"], None)
+            self._snapshots[info["name"]] = {"info": info, "snapshot": snapshot}
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return info
+
+    def _snapshot(self, name: str):
+        with self._lock:
+            entry = self._snapshots.get(name)
+        if entry is None:
+            raise SnapshotNotFoundError(name)
+        return entry
+
+    def top(self, name: str, key_type: str = "lineno", limit: int = 20) -> Dict[str, Any]:
+        """Snapshot'taki en çok bellek ayıran noktalar"""
+        entry = self._snapshot(name)
+        stats = entry["snapshot"].statistics(key_type)
+        return {
+            **entry["info"],
+            "total_kb": round(sum(stat.size for stat in stats) / 1024, 1),
+            "top": [_format_stat(stat, key_type) for stat in stats[:limit]]
+        }
+
+    def diff(self, old_name: str, new_name: str, key_type: str = "lineno", limit: int = 20) -> Dict[str, Any]:
+        """İki snapshot arasında en çok büyüyen/küçülen ayırma noktaları"""
+        old, new = self._snapshot(old_name), self._snapshot(new_name)
+        stats = new["snapshot"].compare_to(old["snapshot"], key_type)
+        return {
+            "from": old["info"],
+            "to": new["info"],
+            "size_diff_kb": round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            "top": [_format_stat(stat, key_type) for stat in stats[:limit]]
+        }
+
+    @staticmethod
+    def object_counts(limit: int = 30, include_atoms: bool = False) -> Dict[str, Any]:
+        """Canlı nesne sayıları (tip bazında)
+
+        gc sadece kapsayıcı nesneleri (dict, list...) izler; `include_atoms` ile
+        bunların referans verdiği float, str, int gibi nesneler de sayılır (yavaş).
+        """
+        objects = gc.get_objects()
+        counts = Counter(type(item).__name__ for item in objects)
+        if include_atoms:
+            seen = set()
+            for referent in gc.get_referents(*objects):
+                if not gc.is_tracked(referent) and id(referent) not in seen:
+                    seen.add(id(referent))
+                    counts[type(referent).__name__] += 1
+        return {
+            "tracked_objects": len(objects),
+            "include_atoms": include_atoms,
+            "types": [{"type": name, "count": count} for name, count in counts.most_common(limit)]
+        }
+
+    # İstek başına tepe bellek
+
+    @staticmethod
+    def request_started() -> Optional[int]:
+        """İstek başında mevcut ayırmayı döndür ve tepe sayacını sıfırla (takip kapalıysa None)"""
+        # reset_peak Python 3.9 ile geldi
+        if not tracemalloc.is_tracing() or not hasattr(tracemalloc, "reset_peak"):
+            return None
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current
+
+    def request_finished(self, route: str, started_bytes: int) -> Optional[int]:
+        if not tracemalloc.is_tracing():
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes = max(0, peak - started_bytes)
+        with self._lock:
+            stats = self._routes.setdefault(route, {"requests": 0, "max_peak_kb": 0.0, "total_peak_kb": 0.0})
+            stats["requests"] += 1
+            stats["last_peak_kb"] = round(peak_bytes / 1024, 1)
+            stats["max_peak_kb"] = max(stats["max_peak_kb"], stats["last_peak_kb"])
+            stats["total_peak_kb"] += peak_bytes / 1024
+        return peak_bytes
+
+    def status(self) -> Dict[str, Any]:
+        traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        with self._lock:
+            snapshots = [entry["info"] for entry in self._snapshots.values()]
+            routes = {
+                route: {
+                    "requests": stats["requests"],
+                    "last_peak_kb": stats.get("last_peak_kb"),
+                    "max_peak_kb": stats["max_peak_kb"],
+                    "mean_peak_kb": round(stats["total_peak_kb"] / stats["requests"], 1)
+                }
+                for route, stats in sorted(self._routes.items())
+            }
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else 0,
+            "traced_kb": round(traced / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "tracemalloc_overhead_kb": round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            "rss_kb": _rss_kb(),
+            "snapshots": snapshots,
+            "request_peaks": routes
+        }
+
+
+MEMORY_TRACKER = MemoryTracker(config.MEMORY_MAX_SNAPSHOTS)
@@ -0,0 +1,335 @@
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Gecikme histogramları için varsayılan kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (metrik adı, etiketler, değer)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Etiketli metrik ailesi; etiket kombinasyonu başına bir çocuk tutar
+
+    Sıcak yoldaki güncellemeler kilitsizdir (GIL altında tek bayt kodluk artırımlar);
+    yoğun çekişmede nadiren bir artış kaybolabilir, bu izleme için kabul edilebilir.
+    """
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: Any):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+    def samples(self) -> List[Sample]:
+        return [(f"{self.name}_total", self._label_dict(key), child.value)
+                for key, child in list(self._children.items())]
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default.value = value
+
+    def inc(self, amount: float = 1):
+        self._default.value += amount
+
+    def dec(self, amount: float = 1):
+        self._default.value -= amount
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, self._label_dict(key), child.value)
+                for key, child in list(self._children.items())]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # value <= sınır olan ilk kova (Prometheus "le" semantiği)
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for key, child in list(self._children.items()):
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), list(child.counts)):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, child.sum))
+            samples.append((f"{self.name}_count", labels, child.count))
+        return samples
+
+
+class MetricsRegistry:
+    """Metrikleri ve okuma anında değer üreten toplayıcıları (collector) tutar"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        # anahtar -> collector; aynı anahtarla eklenen collector öncekinin yerini alır
+        self._collectors: Dict[Any, Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]],
+                      key: Optional[Any] = None):
+        """Collector (ad, tip, açıklama, örnekler) dörtlüleri üretir; sadece okuma anında çağrılır
+
+        `key` verilirse aynı anahtarlı önceki collector değiştirilir: yeniden oluşturulan
+        nesneler (ör. RESTfulServer) serileri tekrarlamaz ve eski örnek bellekte tutulmaz.
+        """
+        with self._lock:
+            self._collectors[collector if key is None else key] = collector
+
+    def remove_collector(self, collector):
+        """Collector'ı kendisiyle veya eklenirken verilen anahtarla kaldır"""
+        with self._lock:
+            if collector in self._collectors:
+                del self._collectors[collector]
+                return
+            for key, value in list(self._collectors.items()):
+                if value == collector:
+                    del self._collectors[key]
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition formatında (0.0.4) çıktı üret"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        families = [(m.name, m.metric_type, m.documentation, m.samples()) for m in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.error(f"Metrik toplayıcı hatası: {e}")
+
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.counter(
+    "hidrologger_http_requests", "Route, metod ve durum koduna göre HTTP istek sayısı",
+    ("route", "method", "status"))
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "hidrologger_http_request_duration_seconds", "Route başına istek süresi", ("route", "method"))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "hidrologger_http_requests_in_flight", "İşlenmekte olan HTTP istekleri")
+ACTIVE_CONNECTIONS = REGISTRY.gauge(
+    "hidrologger_active_connections", "Açık uzun ömürlü bağlantılar (long-poll, stream)", ("kind",))
+QUEUE_DEPTH = REGISTRY.gauge(
+    "hidrologger_queue_depth", "Havuzda çalışmayı bekleyen veya çalışan işler", ("queue",))
+
+# JSONReader dosya G/Ç
+FILE_READS = REGISTRY.counter(
+    "hidrologger_file_reads", "Diskten okunan JSON dosyası sayısı", ("file",))
+FILE_READ_BYTES = REGISTRY.counter(
+    "hidrologger_file_read_bytes", "Parse edilen byte sayısı", ("file",))
+FILE_PARSE_DURATION = REGISTRY.histogram(
+    "hidrologger_file_parse_duration_seconds", "JSON parse süresi", ("file",))
+FILE_WRITES = REGISTRY.counter(
+    "hidrologger_file_writes", "Yazılan JSON dosyası sayısı", ("file",))
+FILE_WRITE_BYTES = REGISTRY.counter(
+    "hidrologger_file_write_bytes", "Yazılan byte sayısı", ("file",))
+
+# Log özetleri
+ROLLUP_QUERIES = REGISTRY.counter(
+    "hidrologger_rollup_queries", "Zaman aralığı sorgularında kullanılan katman (raw: ham loglar)", ("tier",))
+ROLLUP_BACKFILLED_RECORDS = REGISTRY.counter(
+    "hidrologger_rollup_backfilled_records", "Arka planda özetlere eklenen geçmiş log kaydı sayısı")
+INDEX_LOADS = REGISTRY.counter(
+    "hidrologger_index_loads", "Açılışta yan dosya indeksi yükleme sonucu (loaded, missing, invalid)",
+    ("index", "result"))
+INDEX_SAVES = REGISTRY.counter(
+    "hidrologger_index_saves", "Yan dosya indeksi yazma sayısı", ("index",))
+
+# Saklama / sıkıştırma
+COMPACTION_RUNS = REGISTRY.counter(
+    "hidrologger_compaction_runs", "Sıkıştırma çalıştırma sayısı")
+COMPACTION_DURATION = REGISTRY.histogram(
+    "hidrologger_compaction_duration_seconds", "Sıkıştırma süresi",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0))
+COMPACTION_REMOVED_RECORDS = REGISTRY.counter(
+    "hidrologger_compaction_removed_records", "Süresi dolduğu için silinen log kaydı sayısı")
+COMPACTION_RECLAIMED_BYTES = REGISTRY.counter(
+    "hidrologger_compaction_reclaimed_bytes", "Sıkıştırmayla geri kazanılan disk alanı")
+COMPACTION_SEGMENTS = REGISTRY.counter(
+    "hidrologger_compaction_segments", "Mühürlenen, düşürülen, yeniden yazılan veya sıkıştırılan log segmenti sayısı",
+    ("action",))
+COMPRESSION_SAVED_BYTES = REGISTRY.counter(
+    "hidrologger_compression_saved_bytes", "Mühürlü segmentlerin sıkıştırılmasıyla kazanılan disk alanı")
+
+
+# Dayanıklılık / yazma günlüğü (journal.py)
+FSYNCS = REGISTRY.counter(
+    "hidrologger_fsyncs", "fsync çağrı sayısı (sync: yazma anında, batch: toplu, checkpoint: kontrol noktası)",
+    ("mode",))
+FSYNC_DURATION = REGISTRY.histogram(
+    "hidrologger_fsync_duration_seconds", "fsync süresi")
+JOURNAL_RECORDS = REGISTRY.counter(
+    "hidrologger_journal_records", "Yazma günlüğüne eklenen kayıt sayısı", ("op",))
+JOURNAL_BYTES = REGISTRY.counter(
+    "hidrologger_journal_bytes", "Yazma günlüğüne yazılan byte")
+JOURNAL_CHECKPOINTS = REGISTRY.counter(
+    "hidrologger_journal_checkpoints", "Yazma günlüğünün ana dosyalara işlendiği kontrol noktası sayısı")
+JOURNAL_RECOVERY_SECONDS = REGISTRY.gauge(
+    "hidrologger_journal_recovery_seconds", "Açılıştaki son günlük kurtarmasının süresi")
+JOURNAL_TORN_BYTES = REGISTRY.counter(
+    "hidrologger_journal_torn_bytes", "Kurtarmada kesilen yarım kalmış günlük sonu")
+
+def _sample_value(metric: _Metric, suffix: str = "") -> float:
+    return sum(value for name, _, value in metric.samples() if name.endswith(suffix))
+
+
+def metrics_summary(caches: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """/api/health ve /api/info için kısa özet"""
+    request_count = _sample_value(HTTP_REQUEST_DURATION, "_count")
+    request_seconds = _sample_value(HTTP_REQUEST_DURATION, "_sum")
+    summary = {
+        "requests_total": int(_sample_value(HTTP_REQUESTS)),
+        "requests_in_flight": int(HTTP_REQUESTS_IN_FLIGHT.samples()[0][2]),
+        "mean_latency_ms": round(request_seconds / request_count * 1000, 3) if request_count else 0.0,
+        "file_reads_total": int(_sample_value(FILE_READS)),
+        "file_read_bytes_total": int(_sample_value(FILE_READ_BYTES)),
+        "file_writes_total": int(_sample_value(FILE_WRITES)),
+        "file_write_bytes_total": int(_sample_value(FILE_WRITE_BYTES)),
+    }
+    if caches:
+        summary["cache_hit_ratio"] = {name: stats.get("hit_ratio", 0.0) for name, stats in caches.items()}
+    return summary
@@ -0,0 +1,725 @@
+"""Eski JSON dosyalarından (jsons/) yeni depolama backend'ine akışlı geçiş
+
+logs.json bölümlere (segment) ayrılıp paralel parse edilir, her bölüm hedefe tek
+işlemde yazılır. Her bölümden sonra kontrol noktası kaydedilir; kesilen geçiş
+kaldığı yerden devam eder. `--follow` ile sunucu çalışırken sonradan eklenen
+kayıtlar da aktarılır.
+
+    python migrate.py --source jsons --to sqlite --sqlite-path /var/lib/hidrologger/hidrologger.db
+"""
+import argparse
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import config
+from storage import ALARM_DOCUMENT, DOCUMENT_FOLDERS, LOGS_DOCUMENT, JSONFileStorage, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+READ_SIZE = 1 << 20
+# Tek bir log kaydı için okunacak en fazla byte; bozuk dosyada sonuna kadar okumayı önler
+MAX_ELEMENT_BYTES = 16 << 20
+# Bölüm başlangıcından önce okunan bağlam; ayırıcı virgülü görebilmek için
+SYNC_LOOKBEHIND = 64
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LEGACY_ALARM_KEY = re.compile(r'parameter(\d+)')
+
+
+class MigrationError(Exception):
+    """Geçiş devam edemiyor (kaynak değişmiş, hedef beklenmeyen durumda vb.)"""
+
+
+class TruncatedSource(MigrationError):
+    """Kaynak dosya beklenenden önce bitti; yazıcı dosyayı yeniden yazıyor olabilir"""
+
+
+# Sağlama
+
+def record_digest(record: Any) -> int:
+    """Kaydın anahtar sırasından bağımsız 64 bit özeti"""
+    canonical = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return int.from_bytes(hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def combine(checksum: int, digest: int) -> int:
+    """Sıradan bağımsız toplam: bölümler paralel işlenip sonra birleştirilebilir"""
+    return (checksum + digest) & 0xFFFFFFFFFFFFFFFF
+
+
+def logs_checksum(records: Iterator[Dict[str, Any]]) -> Tuple[int, int]:
+    count = 0
+    checksum = 0
+    for record in records:
+        count += 1
+        checksum = combine(checksum, record_digest(record))
+    return count, checksum
+
+
+# Eski alarm yapısı
+
+def convert_legacy_alarms(document: Dict[str, Any], keep_legacy: bool = False) -> Tuple[Dict[str, Any], int]:
+    """`parameterN` anahtarlarını alarm -> channel_N -> alarm_K yapısına çevir
+
+    Yeni yapıda alarmı olan kanalların eski kayıtları atlanır. Dönen ikinci değer
+    çevrilen alarm sayısıdır.
+    """
+    alarm_section = dict(document.get('alarm') or {})
+    converted = 0
+    result = {}
+    for key, value in document.items():
+        if key == 'alarm':
+            continue
+        match = _LEGACY_ALARM_KEY.fullmatch(key)
+        if match is None or not isinstance(value, dict):
+            result[key] = value
+            continue
+        if keep_legacy:
+            result[key] = value
+
+        channel_id = value.get('channel_id', int(match.group(1)))
+        channel_key = f"channel_{channel_id}"
+        if alarm_section.get(channel_key):
+            logger.warning(f"{key}: kanal {channel_id} yeni yapıda zaten alarm içeriyor, eski kayıt atlandı")
+            continue
+
+        alarms = {}
+        for number, legacy_alarm in enumerate(value.get('alarms') or [], start=1):
+            alarms[f"alarm_{number}"] = {
+                "alarminfo": f"Kanal {channel_id} Alarm {number} ayarları",
+                "min_value": legacy_alarm.get('min_value', -10.0),
+                "min_value_reset": legacy_alarm.get('min_value_reset', 0.0),
+                "max_value": legacy_alarm.get('max_value', 50.0),
+                "max_value_reset": legacy_alarm.get('max_value_reset', 40.0),
+                "color": legacy_alarm.get('color', "#FF0000"),
+                "data_post_frequency": legacy_alarm.get('data_post_frequency', 1000),
+                "status": "active",
+                "trigger_time": 0,
+                "reset_time": 0
+            }
+        alarm_section[channel_key] = alarms
+        converted += len(alarms)
+
+    if alarm_section or 'alarm' in document:
+        result['alarm'] = alarm_section
+    return result, converted
+
+
+# logs.json akışlı okuma
+
+class _TextWindow:
+    """Dosyanın bir bölümünü metin olarak okur; karakter indeksini byte ofsetine çevirir"""
+
+    def __init__(self, file, start: int):
+        file.seek(start)
+        self.file = file
+        self.start = start
+        self.text = ""
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder('utf-8')('surrogateescape')
+        self._ascii = True
+        self._anchor = (0, start)
+
+    def more(self) -> bool:
+        chunk = self.file.read(READ_SIZE)
+        if not chunk:
+            self.text += self._decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        self._ascii = self._ascii and chunk.isascii()
+        self.text += self._decoder.decode(chunk)
+        return True
+
+    def byte_offset(self, index: int) -> int:
+        if self._ascii:
+            return self.start + index
+        char, offset = self._anchor if index >= self._anchor[0] else (0, self.start)
+        offset += len(self.text[char:index].encode('utf-8', 'surrogateescape'))
+        self._anchor = (index, offset)
+        return offset
+
+    def skip_whitespace(self, index: int) -> int:
+        while True:
+            index = _WHITESPACE.match(self.text, index).end()
+            if index < len(self.text) or not self.more():
+                return index
+
+    def decode(self, index: int) -> Tuple[Any, int]:
+        while True:
+            try:
+                return _DECODER.raw_decode(self.text, index)
+            except json.JSONDecodeError:
+                if len(self.text) - index > MAX_ELEMENT_BYTES or not self.more():
+                    raise
+
+
+def find_logs_array(path: str) -> int:
+    """Üst seviye "logs" dizisinin ilk elemanından önceki byte ofseti ('[' sonrası)"""
+    with open(path, 'rb') as file:
+        window = _TextWindow(file, 0)
+        index = window.skip_whitespace(0)
+        if index >= len(window.text) or window.text[index] != '{':
+            raise MigrationError(f"{path}: JSON nesnesi bekleniyordu")
+        index += 1
+        while True:
+            index = window.skip_whitespace(index)
+            if index < len(window.text) and window.text[index] == '}':
+                raise MigrationError(f"{path}: 'logs' anahtarı bulunamadı")
+            key, index = window.decode(index)
+            index = window.skip_whitespace(index)
+            if index >= len(window.text) or window.text[index] != ':':
+                raise MigrationError(f"{path}: geçersiz JSON")
+            index = window.skip_whitespace(index + 1)
+            if key == 'logs':
+                if index >= len(window.text) or window.text[index] != '[':
+                    raise MigrationError(f"{path}: 'logs' bir liste değil")
+                return window.byte_offset(index + 1)
+            # Diğer üst seviye anahtarlar atlanır
+            _, index = window.decode(index)
+            index = window.skip_whitespace(index)
+            if index < len(window.text) and window.text[index] == ',':
+                index += 1
+
+
+def _synchronize(window: _TextWindow, segment_start: int, segment_end: int):
+    """Bölümde başlayan ilk log kaydını bul
+
+    Aday '{' karakterinden önce (boşluklardan sonra) ',' gelmeli ve kayıt parse
+    edilebilmelidir. Aday bir kaydın içinde de olabilir; bu yüzden çağıran taraf
+    kaydın önceki bölümün bittiği yere bitiştiğini ayrıca doğrular.
+    """
+    index = 0
+    while True:
+        index = window.text.find('{', index)
+        if index < 0:
+            if window.eof or len(window.text) > MAX_ELEMENT_BYTES + (segment_end - segment_start):
+                return None
+            index = len(window.text)
+            window.more()
+            continue
+        start = window.byte_offset(index)
+        if start >= segment_end:
+            return None
+        if start < segment_start:
+            index += 1
+            continue
+        separator = index - 1
+        while separator >= 0 and window.text[separator] in ' \t\n\r':
+            separator -= 1
+        if separator < 0 or window.text[separator] != ',':
+            index += 1
+            continue
+        try:
+            record, end = window.decode(index)
+        except json.JSONDecodeError:
+            index += 1
+            continue
+        following = window.skip_whitespace(end)
+        if following >= len(window.text) or window.text[following] not in ',]':
+            index += 1
+            continue
+        previous_end = separator
+        while previous_end > 0 and window.text[previous_end - 1] in ' \t\n\r':
+            previous_end -= 1
+        return window.byte_offset(previous_end), index, record, end
+
+
+def parse_segment(path: str, segment_start: int, segment_end: int, cursor: Optional[int] = None,
+                  first: bool = False) -> Dict[str, Any]:
+    """logs dizisinde `segment_start` <= başlangıç < `segment_end` olan kayıtları parse et
+
+    `cursor` verilirse okuma tam olarak bu ofsetten başlar (önceki kaydın bittiği yer
+    veya `first` ise '[' sonrası). Verilmezse bölümün ilk kaydı aranır.
+    """
+    result = {
+        "segment_end": segment_end, "exact": cursor is not None, "sync_cursor": None,
+        "records": [], "checksum": 0, "elements": 0, "skipped": 0,
+        "next_cursor": None, "array_end": False, "last_element": None, "empty": False
+    }
+
+    def take(record, start_index, end_index):
+        result["elements"] += 1
+        if isinstance(record, dict):
+            result["records"].append(record)
+            result["checksum"] = combine(result["checksum"], record_digest(record))
+        else:
+            result["skipped"] += 1
+        raw = window.text[start_index:end_index].encode('utf-8', 'surrogateescape')
+        result["last_element"] = [window.byte_offset(start_index), window.byte_offset(end_index),
+                                  hashlib.blake2b(raw, digest_size=8).hexdigest()]
+
+    with open(path, 'rb') as file:
+        if cursor is not None:
+            window = _TextWindow(file, cursor)
+            window.more()
+            index = 0
+        else:
+            window = _TextWindow(file, max(0, segment_start - SYNC_LOOKBEHIND))
+            window.more()
+            synchronized = _synchronize(window, segment_start, segment_end)
+            if synchronized is None:
+                result["empty"] = True
+                return result
+            result["sync_cursor"], start_index, record, index = synchronized
+            take(record, start_index, index)
+            first = False
+
+        while True:
+            cursor_index = index
+            index = window.skip_whitespace(index)
+            if index >= len(window.text):
+                raise TruncatedSource(f"{path}: logs dizisi {window.byte_offset(index)} ofsetinde kesiliyor")
+            character = window.text[index]
+            if character == ']':
+                result["array_end"] = True
+                break
+            if not first:
+                if character != ',':
+                    raise MigrationError(f"{path}: {window.byte_offset(index)} ofsetinde ',' bekleniyordu")
+                index = window.skip_whitespace(index + 1)
+                if index >= len(window.text):
+                    raise TruncatedSource(f"{path}: logs dizisi {window.byte_offset(index)} ofsetinde kesiliyor")
+            if window.byte_offset(index) >= segment_end:
+                break
+            try:
+                record, end = window.decode(index)
+            except json.JSONDecodeError as e:
+                if window.eof:
+                    raise TruncatedSource(f"{path}: {window.byte_offset(index)} ofsetindeki kayıt yarım: {e}")
+                raise MigrationError(f"{path}: {window.byte_offset(index)} ofsetindeki kayıt parse edilemedi: {e}")
+            take(record, index, end)
+            index = end
+            first = False
+
+        result["next_cursor"] = window.byte_offset(cursor_index)
+    return result
+
+
+# Kontrol noktası
+
+class Checkpoint:
+    """Geçiş durumu; hedefe yazılan her bölümden önce `pending`, sonra `committed` kaydedilir
+
+    Bölüm yazılırken süreç kesilirse hedefteki kayıt sayısı hangisinin geçerli
+    olduğunu gösterir; böylece kayıtlar iki kez aktarılmaz.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Any] = {}
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self.state = json.load(file)
+        except FileNotFoundError:
+            return False
+        if self.state.get("version") != CHECKPOINT_VERSION:
+            raise MigrationError(f"Desteklenmeyen kontrol noktası sürümü: {self.path}")
+        return True
+
+    def save(self):
+        self.state["version"] = CHECKPOINT_VERSION
+        self.state["updated_at"] = datetime.now().isoformat()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    @property
+    def committed(self) -> Dict[str, Any]:
+        return self.state["committed"]
+
+
+class Migrator:
+    def __init__(self, source_path: str, target: StorageBackend, checkpoint_path: str,
+                 workers: int = 0, segment_bytes: int = 4 << 20, keep_legacy_alarms: bool = False):
+        self.source = JSONFileStorage(source_path)
+        self.logs_path = os.path.join(source_path, LOGS_DOCUMENT)
+        self.target = target
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.segment_bytes = segment_bytes
+        self.keep_legacy_alarms = keep_legacy_alarms
+        self._document_versions: Dict[str, Any] = {}
+        # Segment hedefi kaynak klasörün kendisiyse dokümanlar zaten yerinde
+        self.in_place = (isinstance(target, JSONFileStorage)
+                         and os.path.abspath(target.base_path) == os.path.abspath(source_path))
+        self.resyncs = 0
+        self._stop_requested = False
+
+    # Başlatma / devam
+
+    def prepare(self, force: bool = False):
+        target_count = self.target.count_logs()
+        if self.checkpoint.load():
+            state = self.checkpoint.state
+            if state.get("source") != os.path.abspath(self.logs_path):
+                raise MigrationError(f"Kontrol noktası başka bir kaynağa ait: {state.get('source')}")
+            pending = state.get("pending")
+            if target_count == self.checkpoint.committed["records"]:
+                state["pending"] = None
+            elif pending is not None and target_count == pending["records"]:
+                # Bölüm yazıldı ama onay kaydedilemeden kesildi
+                state["committed"], state["pending"] = pending, None
+            else:
+                raise MigrationError(
+                    f"Hedefte {target_count} log var, kontrol noktası {self.checkpoint.committed['records']} "
+                    f"diyor; hedef geçiş dışında değiştirilmiş olabilir")
+            self._check_source_prefix()
+            self.checkpoint.save()
+            print(f"Kontrol noktasından devam: {self.checkpoint.committed['records']} kayıt, "
+                  f"ofset {self.checkpoint.committed['cursor']}")
+            return
+
+        if target_count and not force:
+            raise MigrationError(f"Hedefte zaten {target_count} log var; devam etmek için --force")
+        cursor = find_logs_array(self.logs_path) if os.path.exists(self.logs_path) else None
+        self.checkpoint.state = {
+            "source": os.path.abspath(self.logs_path),
+            "target": describe_target(self.target),
+            "started_at": datetime.now().isoformat(),
+            "target_initial_records": target_count,
+            "committed": {"cursor": cursor, "first": True, "records": target_count, "source_records": 0,
+                          "checksum": 0, "skipped": 0, "last_element": None},
+            "pending": None
+        }
+        self.checkpoint.save()
+
+    def _check_source_prefix(self):
+        """Son aktarılan kayıt kaynakta aynı yerde duruyor mu (dosyaya sadece ekleme yapılmış mı)"""
+        last_element = self.checkpoint.committed.get("last_element")
+        if not last_element:
+            return
+        start, end, digest = last_element
+        try:
+            with open(self.logs_path, 'rb') as file:
+                file.seek(start)
+                raw = file.read(end - start)
+        except OSError as e:
+            raise TruncatedSource(f"Kaynak okunamadı: {e}")
+        if len(raw) < end - start:
+            raise TruncatedSource(f"{self.logs_path} kontrol noktasından kısa")
+        if hashlib.blake2b(raw, digest_size=8).hexdigest() != digest:
+            raise MigrationError(f"{self.logs_path} kontrol noktasından sonra yeniden yazılmış "
+                                 f"(sadece ekleme bekleniyordu); geçişi baştan başlatın")
+
+    # Loglar
+
+    def _segments(self, cursor: int, size: int) -> List[Tuple[int, int]]:
+        bounds = list(range(cursor, size, self.segment_bytes)) + [size]
+        return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)] or [(cursor, size)]
+
+    def copy_logs(self) -> int:
+        """Kontrol noktasından dosyanın şu anki sonuna kadar olan kayıtları aktar"""
+        # Sunucunun yazma günlüğünde bekleyen eklemeler önce logs.json'a işlenir
+        self.source.checkpoint()
+        committed = self.checkpoint.committed
+        if committed["cursor"] is None:
+            if not os.path.exists(self.logs_path):
+                return 0
+            committed["cursor"] = find_logs_array(self.logs_path)
+        self._check_source_prefix()
+        size = os.path.getsize(self.logs_path)
+        segments = self._segments(committed["cursor"], size)
+        copied = 0
+        started = time.perf_counter()
+
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            pending_futures = []
+            segment_iter = iter(enumerate(segments))
+
+            def submit_next():
+                try:
+                    number, (start, end) = next(segment_iter)
+                except StopIteration:
+                    return
+                # İlk bölüm kontrol noktasından tam olarak başlar
+                cursor = committed["cursor"] if number == 0 else None
+                args = (self.logs_path, start, end, cursor, committed["first"] if number == 0 else False)
+                pending_futures.append(executor.submit(parse_segment, *args) if executor else args)
+
+            # Bellek sınırlı kalsın diye aynı anda en fazla 2 x worker bölüm işlenir
+            for _ in range(self.workers * 2):
+                submit_next()
+            while pending_futures:
+                item = pending_futures.pop(0)
+                submit_next()
+                result = item.result() if executor else parse_segment(*item)
+                committed = self.checkpoint.committed
+                if result["empty"] and pending_futures:
+                    # Bu bölümde başlayan kayıt yok; bir sonraki bölüm kaldığı yerden devam eder
+                    continue
+                if not result["exact"] and result["sync_cursor"] != committed["cursor"]:
+                    # Bölüm bir kaydın içinde senkronize olmuş; önceki bölümün bittiği yerden tekrar oku
+                    result = parse_segment(self.logs_path, committed["cursor"], result["segment_end"],
+                                           committed["cursor"], committed["first"])
+                    self.resyncs += 1
+                self._commit(result)
+                copied += len(result["records"])
+                elapsed = time.perf_counter() - started
+                print(f"  {self.checkpoint.committed['records']} kayıt aktarıldı "
+                      f"(ofset {self.checkpoint.committed['cursor']}/{size}, "
+                      f"{copied / elapsed if elapsed else 0:.0f} kayıt/s)")
+                if result["array_end"]:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return copied
+
+    def _commit(self, result: Dict[str, Any]):
+        committed = self.checkpoint.committed
+        pending = {
+            "cursor": result["next_cursor"],
+            "first": committed["first"] and result["elements"] == 0,
+            "records": committed["records"] + len(result["records"]),
+            "source_records": committed["source_records"] + len(result["records"]),
+            "checksum": combine(committed["checksum"], result["checksum"]),
+            "skipped": committed["skipped"] + result["skipped"],
+            "last_element": result["last_element"] or committed["last_element"]
+        }
+        self.checkpoint.state["pending"] = pending
+        self.checkpoint.save()
+        if result["records"]:
+            with self.target.log_writer() as writer:
+                writer.extend(result["records"])
+        self.checkpoint.state["committed"], self.checkpoint.state["pending"] = pending, None
+        self.checkpoint.save()
+
+    # Dokümanlar
+
+    def _expected_document(self, key: str) -> Tuple[Any, int]:
+        document = self.source.load_document(key)
+        if key == ALARM_DOCUMENT and isinstance(document, dict):
+            return convert_legacy_alarms(document, self.keep_legacy_alarms)
+        return document, 0
+
+    def _document_keys(self) -> List[str]:
+        if self.in_place:
+            return []
+        keys = []
+        for folder in DOCUMENT_FOLDERS:
+            for filename in self.source.list_documents(folder) or []:
+                key = f"{folder}/{filename}"
+                if key != LOGS_DOCUMENT:
+                    keys.append(key)
+        return keys
+
+    def copy_documents(self) -> int:
+        """Değişen dokümanları (kanal, anlık değer, alarm, istasyon...) aktar"""
+        copied = 0
+        for key in self._document_keys():
+            version = self.source.document_version(key)
+            if version is None or self._document_versions.get(key) == version:
+                continue
+            try:
+                document, converted = self._expected_document(key)
+            except (OSError, ValueError) as e:
+                logger.warning(f"{key} okunamadı, sonraki turda tekrar denenecek: {e}")
+                continue
+            if converted:
+                print(f"  {key}: {converted} eski yapı (parameterN) alarm yeni yapıya çevrildi")
+            self.target.write_document(key, document)
+            self._document_versions[key] = version
+            copied += 1
+        return copied
+
+    # Doğrulama
+
+    def source_checksum(self, limit: int) -> Tuple[int, int, int]:
+        """Kaynakta `limit` ofsetinden önce başlayan kayıtları baştan okuyup (sayı, sağlama, atlanan) hesapla"""
+        count = checksum = skipped = 0
+        if not os.path.exists(self.logs_path):
+            return count, checksum, skipped
+        cursor = find_logs_array(self.logs_path)
+        first = True
+        span = self.segment_bytes
+        while cursor < limit:
+            end = min(cursor + span, limit)
+            result = parse_segment(self.logs_path, cursor, end, cursor, first)
+            count += len(result["records"])
+            checksum = combine(checksum, result["checksum"])
+            skipped += result["skipped"]
+            if result["array_end"]:
+                break
+            if not result["elements"]:
+                if end >= limit:
+                    break
+                # Bölümden büyük tek bir kayıt; pencereyi büyüt
+                span *= 2
+                continue
+            cursor, first, span = result["next_cursor"], False, self.segment_bytes
+        return count, checksum, skipped
+
+    def verify(self) -> List[str]:
+        """Kaynağı ve hedefi yeniden okuyup kayıt sayılarını ve sağlamaları karşılaştır"""
+        problems = []
+        committed = self.checkpoint.committed
+        initial_records = self.checkpoint.state.get("target_initial_records", 0)
+        source_count, source_checksum, skipped = self.source_checksum(committed["cursor"] or 0)
+        target_count, target_checksum = logs_checksum(self.target.iter_logs())
+        print(f"Loglar: kaynak {source_count} kayıt ({skipped} geçersiz kayıt atlandı), "
+              f"hedef {target_count} kayıt")
+        if (source_count, source_checksum) != (committed["source_records"], committed["checksum"]):
+            problems.append("kaynaktaki loglar aktarıldıktan sonra değiştirilmiş")
+        if target_count != initial_records + source_count:
+            problems.append(f"log sayısı farklı: beklenen {initial_records + source_count}, hedef {target_count}")
+        elif not initial_records and target_checksum != source_checksum:
+            problems.append(f"log sağlaması farklı: kaynak {source_checksum:016x}, hedef {target_checksum:016x}")
+
+        for key in self._document_keys():
+            try:
+                expected = record_digest(self._expected_document(key)[0])
+                actual = record_digest(self.target.load_document(key))
+            except (OSError, ValueError) as e:
+                problems.append(f"{key} karşılaştırılamadı: {e}")
+                continue
+            if expected != actual:
+                problems.append(f"{key} içeriği farklı")
+        return problems
+
+    # Çalıştırma
+
+    def request_stop(self, *_):
+        if not self._stop_requested:
+            print("\nDurdurma istendi; son değişiklikler aktarılıp doğrulanacak...")
+        self._stop_requested = True
+
+    def catch_up(self, interval: float, final_attempts: int = 5):
+        """Sunucu yazmaya devam ederken yeni kayıtları ve doküman değişikliklerini izle"""
+        logs_version = self.source.document_version(LOGS_DOCUMENT)
+        print(f"Takip modu: {interval} sn aralıkla yeni kayıtlar aktarılıyor (durdurmak için Ctrl+C)")
+        while not self._stop_requested:
+            time.sleep(interval)
+            current = self.source.document_version(LOGS_DOCUMENT)
+            try:
+                if current != logs_version:
+                    copied = self.copy_logs()
+                    logs_version = current
+                    if copied:
+                        print(f"Takip: {copied} yeni kayıt")
+                self.copy_documents()
+            except TruncatedSource as e:
+                # Sunucu dosyayı yeniden yazıyor; bir sonraki turda tekrar denenir
+                logger.info(f"Kaynak yazılıyor, tekrar denenecek: {e}")
+
+        for attempt in range(final_attempts):
+            try:
+                self.copy_logs()
+                self.copy_documents()
+                return
+            except TruncatedSource:
+                time.sleep(interval)
+        raise MigrationError("Son aktarım tamamlanamadı; kaynak sürekli yazılıyor")
+
+    def run(self, force: bool = False, follow: bool = False, interval: float = 1.0) -> List[str]:
+        started = time.perf_counter()
+        self.prepare(force)
+        print(f"Loglar aktarılıyor: {self.logs_path} -> {describe_target(self.target)} "
+              f"({self.workers} worker, bölüm {self.segment_bytes} byte)")
+        self.copy_logs()
+        print(f"{self.resyncs} bölüm sıralı olarak yeniden okundu; {self.copy_documents()} doküman aktarıldı")
+        if follow:
+            signal.signal(signal.SIGINT, self.request_stop)
+            signal.signal(signal.SIGTERM, self.request_stop)
+            self.catch_up(interval)
+        print(f"Aktarım tamamlandı ({time.perf_counter() - started:.1f} sn), doğrulanıyor...")
+        return self.verify()
+
+
+def describe_target(target: StorageBackend) -> str:
+    location = getattr(target, "database_path", None) or getattr(target, "base_path", "")
+    return f"{target.name}:{os.path.abspath(location)}"
+
+
+def create_target(kind: str, source_path: str, target_path: Optional[str]) -> StorageBackend:
+    if kind == "sqlite":
+        from sqlite_storage import SQLiteStorage
+        database_path = target_path or config.SQLITE_PATH or os.path.join(source_path, "hidrologger.db")
+        # Hedef dokümanları sadece geçiş yazar; diskten beslenen doküman yok
+        return SQLiteStorage(database_path, source_path, file_fed=[])
+    if kind == "json":
+        if not target_path:
+            raise MigrationError("JSON hedefi için --target-path gerekli")
+        if os.path.abspath(target_path) == os.path.abspath(source_path):
+            raise MigrationError("Hedef klasör kaynakla aynı olamaz")
+        for folder in DOCUMENT_FOLDERS:
+            os.makedirs(os.path.join(target_path, folder), exist_ok=True)
+        return JSONFileStorage(target_path)
+    if kind == "segments":
+        # Hedef kaynakla aynı klasör olabilir: loglar logsfile/segments/ altına yazılır
+        from segment_storage import SegmentStorage
+        target_path = target_path or source_path
+        for folder in DOCUMENT_FOLDERS:
+            os.makedirs(os.path.join(target_path, folder), exist_ok=True)
+        return SegmentStorage(target_path)
+    raise MigrationError(f"Bilinmeyen hedef: {kind}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Eski JSON verilerini yeni depolama backend'ine aktar")
+    parser.add_argument("--source", default="jsons", help="Eski JSON klasörü")
+    parser.add_argument("--to", choices=["sqlite", "json", "segments"], default="sqlite", help="Hedef backend")
+    parser.add_argument("--target-path", "--sqlite-path", dest="target_path",
+                        help="SQLite veritabanı dosyası veya JSON/segment hedef klasörü")
+    parser.add_argument("--checkpoint", help="Kontrol noktası dosyası (varsayılan: hedefin yanında)")
+    parser.add_argument("--workers", type=int, default=0, help="Parse süreç sayısı (0: CPU sayısı - 1)")
+    parser.add_argument("--segment-mb", type=float, default=4.0, help="Bölüm (tek işlemde yazılan) boyutu, MB")
+    parser.add_argument("--follow", action="store_true",
+                        help="Sunucu çalışırken yeni kayıtları aktarmaya devam et (Ctrl+C ile bitir)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Takip modunda kontrol aralığı (sn)")
+    parser.add_argument("--keep-legacy-alarms", action="store_true",
+                        help="Çevrilen parameterN anahtarlarını alarm.json'da da bırak")
+    parser.add_argument("--force", action="store_true", help="Hedefte log olsa da aktar")
+    parser.add_argument("--verify-only", action="store_true", help="Aktarmadan sadece doğrula")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        target = create_target(args.to, args.source, args.target_path)
+        checkpoint_path = args.checkpoint or (
+            (getattr(target, "database_path", None) or (args.target_path or args.source).rstrip("/\\"))
+            + ".migration.json")
+        migrator = Migrator(args.source, target, checkpoint_path, workers=args.workers,
+                            segment_bytes=max(1, int(args.segment_mb * (1 << 20))),
+                            keep_legacy_alarms=args.keep_legacy_alarms)
+        if args.verify_only:
+            if not migrator.checkpoint.load():
+                raise MigrationError(f"Kontrol noktası bulunamadı: {checkpoint_path}")
+            problems = migrator.verify()
+        else:
+            problems = migrator.run(force=args.force, follow=args.follow, interval=args.interval)
+    except MigrationError as e:
+        print(f"HATA: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\nKesildi; tekrar çalıştırıldığında kontrol noktasından devam edilir", file=sys.stderr)
+        return 130
+
+    if problems:
+        print(f"Doğrulama başarısız ({len(problems)} fark):")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("Doğrulama başarılı: kayıt sayıları ve sağlamalar eşleşiyor")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import argparse
+import http.client
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qs
+
+from flask import request
+from werkzeug.serving import make_server
+
+import config
+from json_reader import JSONReader
+from server import RESTfulServer, batch_has_writes, is_write_request
+from snapshot import SnapshotPublisher, SnapshotReader
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Proxy sırasında aktarılmaması gereken hop-by-hop başlıklar
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade',
+}
+
+
+class WriteRouter:
+    """Worker'larda yazma isteklerini tek sahip (owner) sürece yönlendiren WSGI ara katmanı"""
+
+    def __init__(self, app, owner_host: str, owner_port: int, timeout: float = 30):
+        self.app = app
+        self.owner_host = owner_host
+        self.owner_port = owner_port
+        self.timeout = timeout
+
+    def __call__(self, environ: Dict[str, Any], start_response) -> Iterable[bytes]:
+        method = environ.get('REQUEST_METHOD', 'GET')
+        path = environ.get('PATH_INFO', '')
+        if path.startswith('/api/admin/profile/'):
+            # Profil isteği alan worker'ı kapsar; ?process=owner sahip süreci (monitoring döngüsü) profiller
+            if parse_qs(environ.get('QUERY_STRING', '')).get('process') == ['owner']:
+                return self._forward(environ, start_response, self.timeout + config.PROFILE_MAX_SECONDS)
+            return self.app(environ, start_response)
+        if method == 'POST' and path == '/api/batch':
+            # Sadece okuma içeren batch istekleri worker'da kalır
+            if not self._batch_has_writes(environ):
+                return self.app(environ, start_response)
+        elif not is_write_request(method, path):
+            return self.app(environ, start_response)
+        return self._forward(environ, start_response)
+
+    @staticmethod
+    def _batch_has_writes(environ: Dict[str, Any]) -> bool:
+        try:
+            content_length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        body = environ['wsgi.input'].read(content_length) if content_length > 0 else b""
+        # Gövde okunduğu için uygulamaya veya sahip sürece tekrar verilebilmeli
+        environ['wsgi.input'] = io.BytesIO(body)
+        try:
+            return batch_has_writes(json.loads(body or b"null"))
+        except ValueError:
+            return False
+
+    def _forward(self, environ: Dict[str, Any], start_response, timeout: Optional[float] = None) -> Iterable[bytes]:
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '')
+        query_string = environ.get('QUERY_STRING')
+        url = f"{path}?{query_string}" if query_string else path
+
+        try:
+            content_length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        body = environ['wsgi.input'].read(content_length) if content_length > 0 else None
+
+        headers = {}
+        for key, value in environ.items():
+            if key.startswith('HTTP_'):
+                name = key[5:].replace('_', '-').title()
+                if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != 'host':
+                    headers[name] = value
+        if environ.get('CONTENT_TYPE'):
+            headers['Content-Type'] = environ['CONTENT_TYPE']
+
+        connection = http.client.HTTPConnection(self.owner_host, self.owner_port, timeout=timeout or self.timeout)
+        try:
+            connection.request(method, url, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            response_headers = [
+                (name, value) for name, value in response.getheaders()
+                if name.lower() not in HOP_BY_HOP_HEADERS
+            ]
+            start_response(f"{response.status} {response.reason}", response_headers)
+            return [data]
+        except (OSError, http.client.HTTPException) as e:
+            logger.error(f"Yazma isteği sahip sürece iletilemedi: {method} {url} - {e}")
+            data = json.dumps({
+                "success": False,
+                "error": "Yazma süreci erişilemez durumda"
+            }).encode('utf-8')
+            start_response('503 Service Unavailable', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(data)))
+            ])
+            return [data]
+        finally:
+            connection.close()
+
+
+def create_worker_app(snapshot_path: str, owner_host: str, owner_port: int):
+    """Worker süreci için uygulamayı oluştur: okumalar snapshot'tan, yazmalar sahip sürece"""
+    json_reader = JSONReader()
+    json_reader.snapshot = SnapshotReader(snapshot_path, config.SNAPSHOT_REFRESH_INTERVAL)
+    server = RESTfulServer(json_reader=json_reader)
+    logger.info(f"Worker uygulaması hazır (pid={os.getpid()})")
+    return WriteRouter(server.app, owner_host, owner_port)
+
+
+def run_owner(host: str, port: int, snapshot_path: str, monitoring: bool = False):
+    """Tüm yazma isteklerini sırayla işleyen ve snapshot'ı yayınlayan sahip süreç"""
+    server = RESTfulServer()
+    publisher = SnapshotPublisher(server.json_reader, snapshot_path, config.SNAPSHOT_REFRESH_INTERVAL)
+    publisher.publish()
+    publisher.start()
+
+    @server.app.after_request
+    def publish_after_write(response):
+        # Worker'lar yazılan veriyi bir sonraki okumada görsün
+        if is_write_request(request.method, request.path):
+            try:
+                publisher.publish_if_changed()
+            except Exception as e:
+                logger.error(f"Yazma sonrası snapshot yayınlama hatası: {e}")
+        return response
+
+    if monitoring:
+        server.start_background_monitoring()
+    server.rollup_backfiller.start()
+    server.compactor.start()
+
+    logger.info(f"Sahip süreç dinliyor: {host}:{port} (pid={os.getpid()})")
+    httpd = make_server(host, port, server.app, threaded=True)
+    try:
+        httpd.serve_forever()
+    finally:
+        publisher.stop()
+        server.stop_background_monitoring()
+        server.rollup_backfiller.stop()
+        server.compactor.stop()
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn ile pre-fork çoklu süreç sunucusu"""
+
+    def __init__(self, host: str, port: int, workers: int, owner_host: str, owner_port: int,
+                 snapshot_path: str, monitoring: bool = False):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.owner_host = owner_host
+        self.owner_port = owner_port
+        self.snapshot_path = snapshot_path
+        self.monitoring = monitoring
+        self.owner_process: Optional[subprocess.Popen] = None
+        super().__init__()
+
+    def load_config(self):
+        self.cfg.set('bind', f"{self.host}:{self.port}")
+        self.cfg.set('workers', self.workers)
+        self.cfg.set('worker_class', 'gthread')
+        self.cfg.set('threads', config.WORKER_THREADS)
+        self.cfg.set('timeout', config.WORKER_TIMEOUT)
+        self.cfg.set('preload_app', False)
+        self.cfg.set('on_starting', self._on_starting)
+        self.cfg.set('on_exit', self._on_exit)
+
+    def load(self):
+        return create_worker_app(self.snapshot_path, self.owner_host, self.owner_port)
+
+    def _on_starting(self, arbiter):
+        # Worker'lar açılmadan önce ilk snapshot hazır olsun
+        SnapshotPublisher(JSONReader(), self.snapshot_path).publish()
+        # Worker'lar fork edildiğinde alt süreç kaydını devralmasın diye ayrı bir
+        # Python süreci olarak başlatılır
+        command = [
+            sys.executable, os.path.abspath(__file__), '--owner',
+            '--owner-host', self.owner_host,
+            '--owner-port', str(self.owner_port),
+            '--snapshot-path', self.snapshot_path,
+        ]
+        if self.monitoring:
+            command.append('--monitoring')
+        self.owner_process = subprocess.Popen(command)
+        logger.info(f"Sahip süreç başlatıldı (pid={self.owner_process.pid})")
+
+    def _on_exit(self, arbiter):
+        if self.owner_process is not None and self.owner_process.poll() is None:
+            self.owner_process.terminate()
+            try:
+                self.owner_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.owner_process.kill()
+        logger.info("Sahip süreç durduruldu")
+
+
+def main():
+    """Production giriş noktası"""
+    parser = argparse.ArgumentParser(description="Hidrologger production sunucusu (çoklu süreç)")
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=config.WORKERS)
+    parser.add_argument('--owner-host', default=config.OWNER_HOST)
+    parser.add_argument('--owner-port', type=int, default=config.OWNER_PORT)
+    parser.add_argument('--snapshot-path', default=config.SNAPSHOT_PATH)
+    parser.add_argument('--monitoring', action='store_true',
+                        help="data.json izleme thread'ini sahip süreçte başlat")
+    parser.add_argument('--owner', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.owner:
+        run_owner(args.owner_host, args.owner_port, args.snapshot_path, args.monitoring)
+        return
+
+    if not GUNICORN_AVAILABLE:
+        logger.error("Production modu için gunicorn gerekli: pip3 install gunicorn")
+        raise SystemExit(1)
+
+    logger.info(f"Production sunucusu başlatılıyor: {args.host}:{args.port}, {args.workers} worker")
+    ProductionServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        owner_host=args.owner_host,
+        owner_port=args.owner_port,
+        snapshot_path=args.snapshot_path,
+        monitoring=args.monitoring
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
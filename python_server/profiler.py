@@ -0,0 +1,154 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Aynı anda ikinci bir profil oturumu başlatılmak istendi"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """Tüm thread'lerin yığınlarını belirli aralıkla örnekleyen istatistiksel profiler
+
+    Örnekler "thread;çerçeve;çerçeve... sayı" biçiminde toplanır (collapsed stack),
+    bu çıktı flamegraph.pl veya speedscope ile doğrudan açılabilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def sample(self, duration: float, interval: float = 0.005) -> Dict[str, Any]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Başka bir örnekleme oturumu devam ediyor")
+        try:
+            return self._sample(duration, interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, duration: float, interval: float) -> Dict[str, Any]:
+        own_ident = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + duration
+
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        return {
+            "duration": round(time.perf_counter() - started, 3),
+            "interval": interval,
+            "samples": samples,
+            "stacks": stacks
+        }
+
+    @staticmethod
+    def collapsed(result: Dict[str, Any]) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in result["stacks"].most_common())
+
+
+class RequestProfiler:
+    """Belirli bir route'a gelen sonraki K isteği cProfile ile deterministik profiller
+
+    cProfile aynı anda tek bir profili destekler; eşzamanlı eşleşen istekler
+    bekletilmez, profillenmeden geçer ve sayaçtan düşülmez.
+    """
+
+    def __init__(self, max_results: int = 20):
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self.route: Optional[str] = None
+        self.remaining = 0
+        self.results = deque(maxlen=max_results)
+
+    @property
+    def armed(self) -> bool:
+        return self.remaining > 0
+
+    def arm(self, route: str, count: int):
+        with self._lock:
+            self.route = route
+            self.remaining = count
+        logger.info(f"İstek profili kuruldu: {route} için sonraki {count} istek")
+
+    def disarm(self):
+        with self._lock:
+            self.route = None
+            self.remaining = 0
+
+    def start(self, route: str) -> Optional[cProfile.Profile]:
+        """İstek route'u eşleşiyorsa profili başlat; hazırlık yoksa sadece öznitelik kontrolü yapar"""
+        if self.remaining <= 0 or route != self.route:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        with self._lock:
+            if self.remaining <= 0 or route != self.route:
+                self._active.release()
+                return None
+            self.remaining -= 1
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Başka bir profil aracı aktif; hak geri verilir
+            with self._lock:
+                self.remaining += 1
+            self._active.release()
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, route: str, method: str, status: Optional[int],
+               limit: int = 40):
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats("cumulative").print_stats(limit)
+        self.results.append({
+            "route": route,
+            "method": method,
+            "status": status,
+            "total_calls": stats.total_calls,
+            "total_time": round(stats.total_tt, 6),
+            "timestamp": time.time(),
+            "stats": output.getvalue()
+        })
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "remaining": self.remaining,
+            "results": list(self.results)
+        }
+
+
+SAMPLING_PROFILER = SamplingProfiler()
+REQUEST_PROFILER = RequestProfiler()
@@ -0,0 +1,208 @@
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bir sonuç hesaplanırken gelen eklemeler bu kadar geriye kadar hatırlanır; hesaplama
+# sırasında daha fazla ekleme olduysa sonuç saklanmaz
+RECENT_APPENDS = 4096
+
+Logs = List[Dict[str, Any]]
+Merge = Callable[[Any, Logs], Any]
+
+
+def _is_number(value: Any) -> bool:
+    return not isinstance(value, bool) and isinstance(value, (int, float))
+
+
+def covers(low: Any, high: Any, timestamp: Any) -> bool:
+    """Zaman damgası [low, high] kapsamına düşüyor mu (None: sınırsız)
+
+    Sayısal olmayan zaman damgaları her aralığı etkilemiş sayılır.
+    """
+    if not _is_number(timestamp):
+        return True
+    try:
+        return (low is None or timestamp >= low) and (high is None or timestamp <= high)
+    except TypeError:
+        return True
+
+
+def encoded_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str))
+
+
+class _Entry:
+    __slots__ = ("channel", "low", "high", "value", "size", "merge")
+
+    def __init__(self, channel: Any, low: Any, high: Any, value: Any, size: int, merge: Optional[Merge]):
+        self.channel = channel
+        self.low = low
+        self.high = high
+        self.value = value
+        self.size = size
+        self.merge = merge
+
+
+class RangeCache:
+    """Aralık sorgusu ve seri sonuçları için byte bütçeli LRU önbellek
+
+    Girdiler depoya eklenen kayıtları `HotTail` aboneliğiyle izler: bir girdi yalnızca
+    kanalına ve zaman kapsamına ([low, high]) düşen bir kayıt eklendiğinde etkilenir,
+    bu yüzden sonu geçmişte kalan aralıklar yeni okumalarla geçersizleşmez. Canlı uca
+    uzanan girdiler `merge` verilmişse yeni kayıtlarla genişletilir, verilmemişse atılır.
+    Baştan okuma gerektiren değişikliklerde (sıkıştırma, logs.json'un yeniden yazılması)
+    tüm girdiler atılır. Boyut sonucun JSON boyutudur. Dönen değerler tüm çağıranlar
+    arasında paylaşılır, değiştirilmemelidir.
+    """
+
+    def __init__(self, max_bytes: int, sync: Callable[[], bool]):
+        self.max_bytes = max_bytes
+        self.enabled = max_bytes > 0
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # kanal -> girdi anahtarları; None kanalı tüm kanalları kapsayan sorgulardır
+        self._channels: Dict[Any, Set[Hashable]] = {}
+        # Son eklemelerin (kanal, zaman damgası); hesaplama sırasında gelenleri ayırmak için
+        self._recent: Deque[Tuple[Any, Any]] = deque(maxlen=RECENT_APPENDS)
+        self._appends = 0
+        self._resets = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.extensions = 0
+
+    def fetch(self, key: Hashable, channel: Any, low: Any, high: Any, compute: Callable[[], Any],
+              merge: Optional[Merge] = None) -> Any:
+        """Önbellekteki sonuç veya `compute()`
+
+        [low, high] sonucu etkileyen kayıtların zaman kapsamıdır. `merge(değer, yeni kayıtlar)`
+        verilirse kapsama düşen eklemeler girdiyi atmak yerine yeni değere işlenir.
+        """
+        if not self.enabled or not self.sync():
+            return compute()
+        try:
+            hash(key)
+        except TypeError:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            token = (self._resets, self._appends)
+        value = compute()
+        # Hesaplama sırasında eklenen kayıtlar sonuca girmiş de olabilir girmemiş de;
+        # tekrar senkronize edip kapsama düşen varsa sonuç saklanmaz
+        if value is not None and self.sync():
+            self._put(key, channel, low, high, value, merge, token)
+        return value
+
+    def _put(self, key: Hashable, channel: Any, low: Any, high: Any, value: Any, merge: Optional[Merge],
+             token: Tuple[int, int]):
+        size = encoded_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            resets, appends = token
+            since = self._appends - appends
+            if resets != self._resets or since > len(self._recent):
+                return
+            for log_channel, timestamp in islice(reversed(self._recent), since):
+                if (channel is None or log_channel == channel) and covers(low, high, timestamp):
+                    return
+            self._remove(key)
+            self._entries[key] = _Entry(channel, low, high, value, size, merge)
+            self._channels.setdefault(channel, set()).add(key)
+            self.bytes += size
+            self._evict()
+
+    def _remove(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            keys = self._channels.get(entry.channel)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._channels[entry.channel]
+        return entry
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def observe(self, logs: Logs, reset: bool):
+        """HotTail dinleyicisi: eklenen kayıtların kapsamına düştüğü girdileri genişlet veya at"""
+        with self._lock:
+            if reset:
+                self._resets += 1
+                self._recent.clear()
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._channels.clear()
+                self.bytes = 0
+                return
+            # anahtar -> genişletilecek kayıtlar; None ise girdi atılır
+            affected: Dict[Hashable, Optional[Logs]] = {}
+            for log in logs:
+                channel, timestamp = log.get('channel'), log.get('value_timestamp', 0)
+                self._appends += 1
+                self._recent.append((channel, timestamp))
+                for key in self._candidates(channel):
+                    entry = self._entries[key]
+                    if (key in affected and affected[key] is None) or not covers(entry.low, entry.high, timestamp):
+                        continue
+                    if entry.merge is None or not _is_number(timestamp):
+                        affected[key] = None
+                    else:
+                        affected.setdefault(key, []).append(log)
+            for key, new_logs in affected.items():
+                entry = self._entries[key]
+                if new_logs is not None:
+                    try:
+                        entry.value = entry.merge(entry.value, new_logs)
+                    except (TypeError, ValueError) as e:
+                        logger.debug("Aralık önbelleği girdisi genişletilemedi: %s", e)
+                    else:
+                        growth = encoded_size(new_logs)
+                        entry.size += growth
+                        self.bytes += growth
+                        self.extensions += 1
+                        continue
+                self._remove(key)
+                self.invalidations += 1
+            self._evict()
+
+    def _candidates(self, channel: Any) -> List[Hashable]:
+        keys = list(self._channels.get(None, ()))
+        if channel is not None:
+            try:
+                keys.extend(self._channels.get(channel, ()))
+            except TypeError:
+                pass
+        return keys
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "extensions": self.extensions,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes
+        }
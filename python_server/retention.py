@@ -0,0 +1,249 @@
+"""Log geçmişi için saklama (retention) kuralları ve arka plan sıkıştırıcısı
+
+Kurallar HIDROLOGGER_RETENTION ile verilir:
+
+    default=90d,category:2=30d,channel:7=365d
+
+Kanal kuralı kategori kuralından (channel.json'daki `channel_category`), kategori
+kuralı varsayılandan önceliklidir. Özet katmanları HIDROLOGGER_ROLLUP_RETENTION ile
+ayrıca sınırlanır (`1m=30d,1h=2y`); kural verilmeyen her şey süresiz saklanır.
+"""
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import config
+import metrics
+from rollups import TIER_NAMES, TIER_SECONDS
+from storage import CHANNEL_DOCUMENT, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*([smhdwy]?)')
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+_FOREVER = ("", "0", "forever", "inf", "none")
+
+# Kanal -> bu zamandan (epoch sn) eski kayıtların silineceği sınır; None ise saklanır
+Cutoff = Callable[[Any], Optional[float]]
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """"90d", "12h", "2y" -> saniye; "forever" veya "0" -> None (süresiz)"""
+    text = text.strip().lower()
+    if text in _FOREVER:
+        return None
+    match = _DURATION.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Geçersiz süre: {text!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def format_duration(seconds: Optional[int]) -> str:
+    if seconds is None:
+        return "forever"
+    for unit in ("y", "w", "d", "h", "m"):
+        if seconds % _UNITS[unit] == 0:
+            return f"{seconds // _UNITS[unit]}{unit}"
+    return f"{seconds}s"
+
+
+class RetentionPolicy:
+    def __init__(self, default: Optional[int] = None, channels: Optional[Dict[str, Optional[int]]] = None,
+                 categories: Optional[Dict[str, Optional[int]]] = None,
+                 tiers: Optional[Dict[int, Optional[int]]] = None):
+        self.default = default
+        self.channels = channels or {}
+        self.categories = categories or {}
+        self.tiers = tiers or {}
+
+    @classmethod
+    def parse(cls, raw: str = "", rollups: str = "") -> "RetentionPolicy":
+        policy = cls()
+        for item in filter(None, (part.strip() for part in raw.split(","))):
+            key, separator, value = item.rpartition("=")
+            key = key.strip() if separator else "default"
+            duration = parse_duration(value)
+            if key == "default":
+                policy.default = duration
+            elif key.startswith("channel:"):
+                policy.channels[key[len("channel:"):].strip()] = duration
+            elif key.startswith("category:"):
+                policy.categories[key[len("category:"):].strip()] = duration
+            else:
+                raise ValueError(f"Geçersiz saklama kuralı: {item!r}")
+        for item in filter(None, (part.strip() for part in rollups.split(","))):
+            name, separator, value = item.partition("=")
+            if not separator or name.strip() not in TIER_SECONDS:
+                raise ValueError(f"Geçersiz özet saklama kuralı: {item!r}")
+            policy.tiers[TIER_SECONDS[name.strip()]] = parse_duration(value)
+        return policy
+
+    @classmethod
+    def from_config(cls) -> "RetentionPolicy":
+        try:
+            return cls.parse(config.RETENTION, config.ROLLUP_RETENTION)
+        except ValueError as e:
+            logger.error(f"Saklama kuralları okunamadı, veriler silinmeyecek: {e}")
+            return cls()
+
+    @property
+    def active(self) -> bool:
+        return (self.default is not None or any(value is not None for value in self.channels.values())
+                or any(value is not None for value in self.categories.values())
+                or any(value is not None for value in self.tiers.values()))
+
+    def raw_seconds(self, channel: Any, category: Any = None) -> Optional[int]:
+        if str(channel) in self.channels:
+            return self.channels[str(channel)]
+        if category is not None and str(category) in self.categories:
+            return self.categories[str(category)]
+        return self.default
+
+    def cutoff(self, now: float, categories: Dict[Any, Any]) -> Cutoff:
+        """Kanal başına silme sınırı; `categories` kanal id -> channel_category"""
+        cache: Dict[Any, Optional[float]] = {}
+
+        def channel_cutoff(channel: Any) -> Optional[float]:
+            try:
+                return cache[channel]
+            except KeyError:
+                pass
+            except TypeError:
+                seconds = self.raw_seconds(channel)
+                return now - seconds if seconds is not None else None
+            seconds = self.raw_seconds(channel, categories.get(channel))
+            cache[channel] = now - seconds if seconds is not None else None
+            return cache[channel]
+
+        return channel_cutoff
+
+    def tier_cutoffs(self, now: float) -> Dict[int, float]:
+        return {seconds: now - keep for seconds, keep in self.tiers.items() if keep is not None}
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "default": format_duration(self.default),
+            "channels": {channel: format_duration(value) for channel, value in self.channels.items()},
+            "categories": {category: format_duration(value) for category, value in self.categories.items()},
+            "rollups": {TIER_NAMES[tier]: format_duration(value) for tier, value in sorted(self.tiers.items())}
+        }
+
+
+def channel_categories(storage: StorageBackend) -> Dict[Any, Any]:
+    """channel.json'dan kanal id -> channel_category"""
+    channels = storage.read_document(CHANNEL_DOCUMENT).get('channel', [])
+    categories = {}
+    for channel in channels if isinstance(channels, list) else []:
+        if isinstance(channel, dict) and 'id' in channel:
+            categories[channel['id']] = channel.get('channel_category')
+    return categories
+
+
+class Compactor:
+    """Süresi dolan log kayıtlarını ve özet kovalarını arka planda silen iş
+
+    Silme backend'e bırakılır: segment backend'inde tamamen dolmuş segmentler
+    dosyası silinerek (O(1)) düşürülür, kısmen dolmuşlar yeniden yazılır; SQLite
+    küçük işlemlerle siler. Okuyucu ve yazıcılar iş boyunca bekletilmez. Backend
+    soğuk veriyi sıkıştırıyorsa (segmentler) her turda yeni mühürlenen segmentler
+    de sıkıştırılır; bu iş saklama kuralı olmasa da çalışır.
+    """
+
+    def __init__(self, storage: StorageBackend, policy: Optional[RetentionPolicy] = None,
+                 interval: float = config.COMPACTION_INTERVAL):
+        self.storage = storage
+        self.policy = policy if policy is not None else RetentionPolicy.from_config()
+        self.interval = interval
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.totals = {"runs": 0, "removed_records": 0, "reclaimed_bytes": 0, "dropped_segments": 0,
+                       "rewritten_segments": 0, "removed_buckets": 0, "compressed_segments": 0,
+                       "compression_saved_bytes": 0, "seconds": 0.0}
+        self._run_lock = threading.Lock()
+        self._active = False
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def run_once(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Kuralları bir kez uygula ve raporu döndür"""
+        with self._run_lock:
+            now = time.time() if now is None else now
+            started = time.perf_counter()
+            report = {"started_at": now, "removed_records": 0, "scanned_records": 0, "reclaimed_bytes": 0,
+                      "dropped_segments": 0, "rewritten_segments": 0, "removed_buckets": 0,
+                      "compressed_segments": 0, "compression_saved_bytes": 0}
+            if self.policy.active:
+                cutoff = self.policy.cutoff(now, channel_categories(self.storage))
+                for key, value in self.storage.compact_logs(cutoff).items():
+                    report[key] = report.get(key, 0) + value
+                tier_cutoffs = self.policy.tier_cutoffs(now)
+                if tier_cutoffs:
+                    report["removed_buckets"] = self.storage.compact_rollups(tier_cutoffs)
+            if self.storage.cold_compression:
+                # Süresi dolanlar düşürüldükten sonra: silinecek segment boşuna sıkıştırılmasın
+                report.update(self.storage.compress_segments())
+
+            seconds = time.perf_counter() - started
+            report["seconds"] = round(seconds, 3)
+            report["records_per_second"] = round(report["scanned_records"] / seconds) if seconds else 0
+            report["reclaimed_bytes_per_second"] = round(report["reclaimed_bytes"] / seconds) if seconds else 0
+
+            self.last_report = report
+            self.totals["runs"] += 1
+            for key in ("removed_records", "reclaimed_bytes", "dropped_segments", "rewritten_segments",
+                        "removed_buckets", "compressed_segments", "compression_saved_bytes"):
+                self.totals[key] += report[key]
+            self.totals["seconds"] = round(self.totals["seconds"] + seconds, 3)
+            metrics.COMPACTION_RUNS.inc()
+            metrics.COMPACTION_DURATION.observe(seconds)
+            metrics.COMPACTION_REMOVED_RECORDS.inc(report["removed_records"])
+            metrics.COMPACTION_RECLAIMED_BYTES.inc(report["reclaimed_bytes"])
+            metrics.COMPACTION_SEGMENTS.labels("dropped").inc(report["dropped_segments"])
+            metrics.COMPACTION_SEGMENTS.labels("rewritten").inc(report["rewritten_segments"])
+            metrics.COMPACTION_SEGMENTS.labels("compressed").inc(report["compressed_segments"])
+            metrics.COMPRESSION_SAVED_BYTES.inc(report["compression_saved_bytes"])
+
+            if report["compressed_segments"]:
+                logger.info(f"Sıkıştırma: {report['compressed_segments']} segment soğuk biçime çevrildi, "
+                            f"{report['compression_saved_bytes']} byte kazanıldı")
+            if report["removed_records"] or report["removed_buckets"]:
+                logger.info(f"Sıkıştırma: {report['removed_records']} kayıt, {report['removed_buckets']} özet kovası "
+                            f"silindi, {report['dropped_segments']} segment düşürüldü, "
+                            f"{report['rewritten_segments']} segment yeniden yazıldı, "
+                            f"{report['reclaimed_bytes']} byte geri kazanıldı ({seconds:.2f} sn)")
+            return report
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy.describe(),
+            "active": self.policy.active,
+            "compression": self.storage.cold_compression,
+            "running": self._active,
+            "interval": self.interval,
+            "last_run": self.last_report,
+            "totals": dict(self.totals)
+        }
+
+    def start(self):
+        if not self._active and (self.policy.active or self.storage.cold_compression):
+            self._active = True
+            self._wakeup.clear()
+            self._thread = threading.Thread(target=self._loop, name="log-compactor", daemon=True)
+            self._thread.start()
+            logger.info(f"Log sıkıştırıcı başlatıldı ({self.interval} sn aralıkla)")
+
+    def stop(self):
+        self._active = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _loop(self):
+        while self._active:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Log sıkıştırma hatası: {e}")
+            self._wakeup.wait(self.interval)
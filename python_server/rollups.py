@@ -0,0 +1,258 @@
+"""Log kayıtlarının çok çözünürlüklü özetleri (rollup)
+
+Her kanal için 1 dakikalık, 1 saatlik ve 1 günlük kovalarda min, max, ortalama,
+kayıt sayısı ve son değer tutulur. Kovalar UTC epoch saniyesine hizalıdır
+(günlük kova UTC gece yarısında başlar). Depolama backend'leri eklemelerde
+kovaları artımlı günceller; mevcut geçmiş arka planda `RollupBackfiller` ile
+doldurulur.
+"""
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# (isim, kova genişliği sn); inceden kabaya
+TIERS = (("1m", 60), ("1h", 3600), ("1d", 86400))
+TIER_SECONDS = dict(TIERS)
+TIER_NAMES = {seconds: name for name, seconds in TIERS}
+
+def enabled_tiers() -> List[int]:
+    """Ayarlarda açık olan katmanların kova genişlikleri (HIDROLOGGER_ROLLUP_TIERS)"""
+    seconds = []
+    for name in config.ROLLUP_TIERS.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in TIER_SECONDS:
+            logger.warning(f"Bilinmeyen rollup katmanı atlandı: {name}")
+            continue
+        seconds.append(TIER_SECONDS[name])
+    return sorted(set(seconds))
+
+
+def choose_tier(resolution: float, available: Iterable[int]) -> Optional[int]:
+    """İstenen çözünürlüğü sağlayan en kaba katman; hiçbiri yetmiyorsa None (ham veri)"""
+    candidates = [seconds for seconds in available if seconds <= resolution]
+    return max(candidates) if candidates else None
+
+
+def bucket_start(timestamp: int, seconds: int) -> int:
+    return timestamp - timestamp % seconds
+
+
+def reading(timestamp: Any, value: Any) -> Optional[Tuple[int, float]]:
+    """(zaman damgası, değer); sayısal olmayan kayıtlar özetlere girmez"""
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return int(timestamp), value
+
+
+class Bucket:
+    """Tek kovanın özeti; son değer (zaman damgası, eklenme sırası) en büyük olan kayıttır"""
+
+    __slots__ = ("min", "max", "sum", "count", "last", "last_ts", "last_seq")
+
+    def __init__(self, value: float, timestamp: int, seq: int):
+        self.min = self.max = self.sum = self.last = value
+        self.count = 1
+        self.last_ts = timestamp
+        self.last_seq = seq
+
+    def add(self, value: float, timestamp: int, seq: int):
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sum += value
+        self.count += 1
+        if (timestamp, seq) >= (self.last_ts, self.last_seq):
+            self.last, self.last_ts, self.last_seq = value, timestamp, seq
+
+    def merge(self, other: "Bucket"):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.count += other.count
+        if (other.last_ts, other.last_seq) >= (self.last_ts, self.last_seq):
+            self.last, self.last_ts, self.last_seq = other.last, other.last_ts, other.last_seq
+
+    def point(self, start: int) -> Dict[str, Any]:
+        return make_point(start, self.min, self.max, self.sum, self.count, self.last)
+
+
+def make_point(start: int, minimum: float, maximum: float, total: float, count: int, last: float) -> Dict[str, Any]:
+    return {
+        "timestamp": start,
+        "min": minimum,
+        "max": maximum,
+        "mean": total / count,
+        "count": count,
+        "last": last
+    }
+
+
+def aggregate(records: Iterable[Tuple[Any, int, float, int]], tiers: Iterable[int]
+              ) -> Dict[Tuple[int, Any, int], Bucket]:
+    """(kanal, zaman, değer, sıra) kayıtlarını (katman, kanal, kova) anahtarlı özetlere topla"""
+    tiers = list(tiers)
+    buckets: Dict[Tuple[int, Any, int], Bucket] = {}
+    for channel, timestamp, value, seq in records:
+        for seconds in tiers:
+            key = (seconds, channel, timestamp - timestamp % seconds)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = Bucket(value, timestamp, seq)
+            else:
+                bucket.add(value, timestamp, seq)
+    return buckets
+
+
+def _readings(logs: Iterable[Dict[str, Any]]) -> List[Tuple[int, float, int]]:
+    rows = []
+    for seq, log in enumerate(logs):
+        parsed = reading(log.get('value_timestamp'), log.get('value'))
+        if parsed is not None:
+            rows.append((parsed[0], parsed[1], seq))
+    return rows
+
+
+def series_from_logs(logs: Iterable[Dict[str, Any]], seconds: int) -> List[Dict[str, Any]]:
+    """Ham loglardan (eklenme sırasıyla) tek katmanlık seri; özetler hazır değilken kullanılır"""
+    buckets = aggregate(((None, timestamp, value, seq) for timestamp, value, seq in _readings(logs)), (seconds,))
+    return [buckets[key].point(key[2]) for key in sorted(buckets, key=lambda key: key[2])]
+
+
+def raw_points(logs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Her okuma tek kayıtlık bir nokta; katman istenen çözünürlük için fazla kaba olduğunda"""
+    rows = sorted(_readings(logs), key=lambda row: row[0])
+    return [make_point(timestamp, value, value, value, 1, value) for timestamp, value, _ in rows]
+
+
+class RollupTiers:
+    """Süreç içi özetler (JSON backend'i); kanal ve katman başına kova sözlüğü"""
+
+    def __init__(self, tiers: Iterable[int]):
+        self.tiers = sorted(tiers)
+        self._buckets: Dict[Tuple[int, Any], Dict[int, Bucket]] = {}
+        self.records = 0
+
+    def add_logs(self, logs: Iterable[Any]):
+        """Logları eklenme sırasıyla ekle"""
+        rows = []
+        for log in logs:
+            if not isinstance(log, dict):
+                continue
+            parsed = reading(log.get('value_timestamp'), log.get('value'))
+            if parsed is not None:
+                channel = log.get('channel')
+                try:
+                    hash(channel)
+                except TypeError:
+                    continue
+                rows.append((channel, parsed[0], parsed[1], self.records))
+                self.records += 1
+        for (seconds, channel, start), bucket in aggregate(rows, self.tiers).items():
+            series = self._buckets.setdefault((seconds, channel), {})
+            existing = series.get(start)
+            if existing is None:
+                series[start] = bucket
+            else:
+                existing.merge(bucket)
+
+    def query(self, seconds: int, channel: Any, start: int, end: int) -> List[Dict[str, Any]]:
+        series = self._buckets.get((seconds, channel), {})
+        first = bucket_start(start, seconds)
+        return [series[bucket].point(bucket) for bucket in sorted(series) if first <= bucket <= end]
+
+    def drop_before(self, seconds: int, cutoff: float) -> int:
+        """Katmanda `cutoff`tan önce biten kovaları sil"""
+        removed = 0
+        for (tier, _), series in self._buckets.items():
+            if tier != seconds:
+                continue
+            expired = [start for start in series if start + seconds <= cutoff]
+            for start in expired:
+                del series[start]
+            removed += len(expired)
+        return removed
+
+    def bucket_count(self) -> int:
+        return sum(len(series) for series in self._buckets.values())
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Kovaların düz listesi (yan dosyaya yazmak için)"""
+        return [{"tier": seconds, "channel": channel, "start": start, "min": bucket.min, "max": bucket.max,
+                 "sum": bucket.sum, "count": bucket.count, "last": bucket.last, "last_ts": bucket.last_ts,
+                 "last_seq": bucket.last_seq}
+                for (seconds, channel), series in self._buckets.items() for start, bucket in series.items()]
+
+    @classmethod
+    def from_columns(cls, tiers: Iterable[int], columns: Dict[str, List[Any]], records: int) -> "RollupTiers":
+        """`rows` çıktısının sütunlarından (anahtar -> değerler) kur"""
+        rollups = cls(tiers)
+        rollups.records = records
+        new_bucket = Bucket.__new__
+        for seconds, channel, start, minimum, maximum, total, count, last, last_ts, last_seq in zip(
+                columns["tier"], columns["channel"], columns["start"], columns["min"], columns["max"],
+                columns["sum"], columns["count"], columns["last"], columns["last_ts"], columns["last_seq"]):
+            bucket = new_bucket(Bucket)
+            bucket.min, bucket.max, bucket.sum, bucket.count = minimum, maximum, total, count
+            bucket.last, bucket.last_ts, bucket.last_seq = last, last_ts, last_seq
+            series = rollups._buckets.get((seconds, channel))
+            if series is None:
+                series = rollups._buckets[(seconds, channel)] = {}
+            series[start] = bucket
+        return rollups
+
+
+class RollupBackfiller:
+    """Mevcut log geçmişini arka planda özetlere ekleyen thread
+
+    Her turda backend'in `backfill_rollups` metodu bir parti işler; iş kalmadıysa
+    `interval` kadar bekler. Partiler arasında kısa bekleme yazıcılara yer açar.
+    Segment backend'inin sütun deposu (`backfill_columns`) da aynı thread'de doldurulur.
+    """
+
+    def __init__(self, storage, interval: float = config.ROLLUP_BACKFILL_INTERVAL,
+                 batch_size: int = config.ROLLUP_BACKFILL_BATCH):
+        self.storage = storage
+        self.interval = interval
+        self.batch_size = batch_size
+        self._active = False
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def start(self):
+        if not self._active and (enabled_tiers() or self.storage.column_store is not None):
+            self._active = True
+            self._wakeup.clear()
+            self._thread = threading.Thread(target=self._loop, name="rollup-backfill", daemon=True)
+            self._thread.start()
+            logger.info("Rollup backfill thread'i başlatıldı")
+
+    def stop(self):
+        self._active = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        try:
+            # Yeniden başlatmada yalnızca bu noktadan sonraki kayıtlar özetlensin
+            self.storage.save_indexes()
+        except Exception as e:
+            logger.error(f"İndeks kaydetme hatası: {e}")
+
+    def _loop(self):
+        while self._active:
+            try:
+                more = self.storage.backfill_rollups(self.batch_size)
+                more = self.storage.backfill_columns() or more
+            except Exception as e:
+                logger.error(f"Rollup backfill hatası: {e}")
+                more = False
+            self._wakeup.wait(0.05 if more else self.interval)
@@ -0,0 +1,249 @@
+"""Mühürlü log segmentlerinin sıkıştırılmış (soğuk) biçimi
+
+Kayıtlar sütunlara ayrılır. Tamsayı sütunlarında (seq, zaman damgası, kanal,
+batarya...) ardışık farklar, ondalık sütunlarında önceki değerle XOR'lanmış
+IEEE 754 bitleri tutulur. Düzenli ölçüm serilerinde bu bloklar çoğunlukla sıfır
+byte'tan oluşur ve zstd/gzip ile çok iyi sıkışır. Kodlama kayıpsızdır: çözülen
+kayıtlar anahtar sırası ve int/float ayrımı dahil yazılanlarla aynıdır.
+
+Dosya: MAGIC + codec adı uzunluğu (1 byte) + codec adı + sıkıştırılmış gövde.
+Gövde: başlık uzunluğu (4 byte) + JSON başlık + sütun blokları.
+"""
+import gzip
+import json
+import logging
+import operator
+import struct
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HLSC\x01"
+CODECS = ("zstd", "gzip")
+FILE_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+# Bu aralıktaki tamsayılar float sütununda kayıpsız taşınır
+_EXACT_FLOAT_INT = 1 << 53
+# Sözlük olmayan kayıtlar için şekil numarası
+_OTHER_SHAPE = 0xFFFF
+
+
+class CodecError(ValueError):
+    pass
+
+
+def resolve_codec(name: str) -> Optional[str]:
+    """Ayardaki codec adı -> kullanılacak codec ("auto": zstd varsa zstd, yoksa gzip); "none" -> None"""
+    name = (name or "none").strip().lower()
+    if name in ("none", "off", ""):
+        return None
+    if name == "auto":
+        return "zstd" if ZSTD_AVAILABLE else "gzip"
+    if name == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard modülü yüklü değil, segmentler gzip ile sıkıştırılacak")
+        return "gzip"
+    if name not in CODECS:
+        raise ValueError(f"Bilinmeyen sıkıştırma: {name}")
+    return name
+
+
+def compress(codec: str, payload: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(payload)
+    if codec == "gzip":
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+    raise CodecError(f"Bilinmeyen codec: {codec}")
+
+
+def decompress(codec: str, payload: bytes) -> bytes:
+    """Gövdeyi aç; bozuk veya yarım içerik CodecError"""
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise CodecError("Segment zstd ile sıkıştırılmış ama zstandard modülü yüklü değil")
+        try:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        except zstandard.ZstdError as e:
+            raise CodecError(f"zstd gövdesi açılamadı: {e}")
+    if codec == "gzip":
+        try:
+            return gzip.decompress(payload)
+        except (OSError, EOFError, zlib.error) as e:
+            raise CodecError(f"gzip gövdesi açılamadı: {e}")
+    raise CodecError(f"Bilinmeyen codec: {codec}")
+
+
+# Sütunlar
+
+def _is_int(value: Any) -> bool:
+    return type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+
+
+def _encode_deltas(values: List[int]) -> Optional[bytes]:
+    deltas = [current - previous for current, previous in zip(values, [0] + values[:-1])]
+    if any(not _INT64_MIN <= delta <= _INT64_MAX for delta in deltas):
+        return None
+    return array('q', deltas).tobytes()
+
+
+def _decode_deltas(block: bytes) -> List[int]:
+    deltas = array('q')
+    deltas.frombytes(block)
+    return list(accumulate(deltas))
+
+
+def _encode_floats(values: List[float]) -> bytes:
+    bits = array('q')
+    bits.frombytes(array('d', values).tobytes())
+    return array('q', [current ^ previous for current, previous in zip(bits, [0] + bits[:-1].tolist())]).tobytes()
+
+
+def _decode_floats(block: bytes) -> List[float]:
+    xored = array('q')
+    xored.frombytes(block)
+    floats = array('d')
+    floats.frombytes(array('q', accumulate(xored, operator.xor)).tobytes())
+    return floats.tolist()
+
+
+def _encode_column(values: List[Any]) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Sütunu en uygun biçimde kodla: "i" tamsayı farkları, "f" XOR'lu float bitleri, "j" JSON"""
+    if all(_is_int(value) for value in values):
+        block = _encode_deltas(values)
+        if block is not None:
+            return {"type": "i"}, [block]
+    if all(type(value) is float or (type(value) is int and -_EXACT_FLOAT_INT <= value <= _EXACT_FLOAT_INT)
+           for value in values):
+        blocks = [_encode_floats([float(value) for value in values])]
+        ints = bytes(type(value) is int for value in values)
+        if any(ints):
+            # Tamsayı olarak yazılmış değerler (15 ile 15.0) ayırt edilsin
+            blocks.append(ints)
+        return {"type": "f"}, blocks
+    return {"type": "j"}, [json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')]
+
+
+def _decode_column(column: Dict[str, Any], blocks: List[bytes]) -> List[Any]:
+    kind = column["type"]
+    if kind == "i":
+        return _decode_deltas(blocks[0])
+    if kind == "f":
+        values = _decode_floats(blocks[0])
+        if len(blocks) > 1:
+            values = [int(value) if is_int else value for value, is_int in zip(values, blocks[1])]
+        return values
+    if kind == "j":
+        return json.loads(blocks[0])
+    raise CodecError(f"Bilinmeyen sütun tipi: {kind}")
+
+
+# Segment
+
+def encode_records(records: List[Tuple[int, Any]], codec: str) -> bytes:
+    """(seq, kayıt) listesini sütunlu ve sıkıştırılmış segment dosyası içeriğine çevir"""
+    shapes: Dict[Tuple[str, ...], int] = {}
+    shape_ids = array('H')
+    values: Dict[str, List[Any]] = {}
+    others = []
+    for _, log in records:
+        if not isinstance(log, dict):
+            shape_ids.append(_OTHER_SHAPE)
+            others.append(log)
+            continue
+        keys = tuple(log)
+        shape = shapes.get(keys)
+        if shape is None:
+            shape = shapes[keys] = len(shapes)
+            if shape >= _OTHER_SHAPE:
+                raise CodecError("Segmentte çok fazla farklı kayıt yapısı var")
+        shape_ids.append(shape)
+        for key, value in log.items():
+            column = values.get(key)
+            if column is None:
+                column = values[key] = []
+            column.append(value)
+
+    seq_block = _encode_deltas([seq for seq, _ in records])
+    if seq_block is None:
+        raise CodecError("seq değerleri int64 aralığında değil")
+    blocks = [seq_block, shape_ids.tobytes()]
+    columns = []
+    for key, column_values in list(values.items()) + ([(None, others)] if others else []):
+        column, column_blocks = _encode_column(column_values)
+        column["key"] = key
+        column["blocks"] = [len(block) for block in column_blocks]
+        columns.append(column)
+        blocks.extend(column_blocks)
+
+    header = json.dumps({
+        "count": len(records),
+        "shapes": [list(keys) for keys in shapes],
+        "blocks": [len(blocks[0]), len(blocks[1])],
+        "columns": columns
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    body = struct.pack('<I', len(header)) + header + b''.join(blocks)
+    name = codec.encode('ascii')
+    return MAGIC + bytes([len(name)]) + name + compress(codec, body)
+
+
+def _decode_body(content: bytes) -> Tuple[Dict[str, Any], List[int], array, Dict[Optional[str], List[Any]]]:
+    """(başlık, seq'ler, şekil numaraları, anahtar -> sütun değerleri)"""
+    if not content.startswith(MAGIC):
+        raise CodecError("Sıkıştırılmış segment başlığı geçersiz")
+    name_end = len(MAGIC) + 1 + content[len(MAGIC)]
+    codec = content[len(MAGIC) + 1:name_end].decode('ascii')
+    body = decompress(codec, content[name_end:])
+
+    try:
+        header_length, = struct.unpack_from('<I', body)
+    except struct.error:
+        raise CodecError("Sıkıştırılmış segment gövdesi eksik")
+    header = json.loads(body[4:4 + header_length])
+    offset = 4 + header_length
+
+    def take(length: int) -> bytes:
+        nonlocal offset
+        block = body[offset:offset + length]
+        offset += length
+        return block
+
+    seqs = _decode_deltas(take(header["blocks"][0]))
+    shape_ids = array('H')
+    shape_ids.frombytes(take(header["blocks"][1]))
+    columns = {column["key"]: _decode_column(column, [take(length) for length in column["blocks"]])
+               for column in header["columns"]}
+    if len(seqs) != header["count"] or len(shape_ids) != header["count"]:
+        raise CodecError("Sıkıştırılmış segment eksik")
+    return header, seqs, shape_ids, columns
+
+
+def decode_records(content: bytes) -> List[Tuple[int, Any]]:
+    header, seqs, shape_ids, columns = _decode_body(content)
+    iterators = {key: iter(values) for key, values in columns.items() if key is not None}
+    others = iter(columns.get(None, ()))
+    shapes = header["shapes"]
+    shape_iterators = [[iterators[key] for key in keys] for keys in shapes]
+    logs = [dict(zip(shapes[shape], map(next, shape_iterators[shape]))) if shape != _OTHER_SHAPE else next(others)
+            for shape in shape_ids]
+    return list(zip(seqs, logs))
+
+
+def decode_columns(content: bytes) -> Dict[str, List[Any]]:
+    """Tüm kayıtları aynı anahtarlara sahip sözlükler olan içerik için anahtar -> değerler
+
+    Kayıt başına sözlük kurmadan okumak için (ör. özet indeksi); yapılar farklıysa CodecError.
+    """
+    header, _, shape_ids, columns = _decode_body(content)
+    if len(header["shapes"]) != 1 or None in columns or any(shape_ids):
+        raise CodecError("Kayıtların yapısı aynı değil")
+    return {key: columns[key] for key in header["shapes"][0]}
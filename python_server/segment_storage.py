@@ -0,0 +1,981 @@
+"""Segmentli log deposu
+
+Log kayıtları logsfile/segments/ altında eklenme sırasıyla numaralanmış JSON Lines
+segmentlerinde tutulur; her satır `seq<TAB>{kayıt}` biçimindedir. Yeni kayıtlar
+yalnızca aktif segmentin sonuna eklenir. Segment SEGMENT_MAX_BYTES boyuta veya
+SEGMENT_MAX_AGE yaşa ulaşınca mühürlenir ve yazıcılar onu bir daha değiştirmez.
+
+manifest.json mühürlü segmentlerin seq aralığını, boyutunu ve kanal başına
+[kanal, kayıt sayısı, en küçük zaman, en büyük zaman] özetini tutar. Sorgular
+aralığa girmeyen segmentleri açmadan atlar. Saklama süresi tamamen dolan segment,
+dosyası silinerek düşürülür (O(1)). Kanal, istasyon ve alarm dokümanları JSON
+backend'indeki gibi dosyalarda kalır.
+
+Mühürlü segmentler arka planda (Compactor) segment_codec.py'deki sütunlu biçime
+çevrilip zstd veya gzip ile sıkıştırılır. Okumada şeffaf olarak çözülür; son
+okunan segmentler SegmentCache'te çözülmüş halde tutulur.
+
+Sayısal okumalar ayrıca logsfile/columns/ altında kanal ve dönem başına sabit
+genişlikli ikili dosyalara (column_store.py) yazılır; ham seri sorguları bu
+dosyalardan mmap ile okunur. Mevcut geçmiş RollupBackfiller thread'inde aktarılır.
+
+Süreç içi özetler segments/rollups.idx yan dosyasına yazılır (her mühürlemeden
+sonra ve kapanışta). Açılışta dosyanın sağlaması ve manifestle tutarlılığı
+doğrulanır; geçerliyse yalnızca dosyanın kapsadığı seq'ten sonraki kayıtlar
+özetlenir, değilse özetler baştan kurulur.
+"""
+import copy
+import json
+import os
+import logging
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+import metrics
+import tracing
+from column_store import ColumnStore
+from journal import atomic_write
+from rollups import RollupTiers, enabled_tiers
+from segment_codec import (FILE_SUFFIXES, CodecError, decode_columns, decode_records, encode_records,
+                           resolve_codec)
+from slow_request_journal import count_records, phase
+from storage import (LOGS_DOCUMENT, DocumentVersion, JSONFileStorage, LogWriter, _JSONLogWriter,
+                     filter_logs, is_expired)
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: kilit yalnızca süreç içinde geçerli
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_FOLDER = "logsfile/segments"
+COLUMNS_FOLDER = "logsfile/columns"
+MANIFEST_FORMAT = 1
+INDEX_FORMAT = 1
+INDEX_MAGIC = b"HLIX\x01"
+
+# (seq, kayıt) çiftleri, eklenme sırasıyla
+Records = List[Tuple[int, Dict[str, Any]]]
+
+
+def segment_name(segment_id: int) -> str:
+    return f"{segment_id:012d}.jsonl"
+
+
+def encode_record(seq: int, record: Dict[str, Any]) -> bytes:
+    return f"{seq}\t{json.dumps(record, ensure_ascii=False, separators=(',', ':'))}\n".encode('utf-8')
+
+
+def decode_segment(content: bytes, name: str = "") -> Tuple[Records, int]:
+    """Segment içeriğini çöz; (kayıtlar, tamamlanmış satırların byte uzunluğu)
+
+    Sondaki yarım satır (yazılırken kesilmiş ekleme) sayılmaz.
+    """
+    end = content.rfind(b'\n') + 1
+    lines = content[:end].splitlines()
+    try:
+        # Satır başına json.loads yerine tek bir dizi olarak çözülür
+        seqs = [int(line[:line.index(b'\t')]) for line in lines]
+        logs = json.loads(b'[' + b','.join(line[line.index(b'\t') + 1:] for line in lines) + b']')
+        return list(zip(seqs, logs)), end
+    except ValueError:
+        pass
+    records = []
+    for line in lines:
+        seq, _, body = line.partition(b'\t')
+        try:
+            records.append((int(seq), json.loads(body)))
+        except ValueError as e:
+            logger.warning(f"Segment satırı okunamadı ({name}): {e}")
+    return records, end
+
+
+def channel_stats(records: Records) -> List[List[Any]]:
+    """Kanal başına [kanal, kayıt sayısı, en küçük zaman, en büyük zaman]
+
+    Sayısal zaman damgası olmayan kayıt içeren kanalda sınırlar None'dır; böyle
+    kanallar aralık sorgularında ve saklamada budanmaz.
+    """
+    stats: Dict[str, List[Any]] = {}
+    for _, log in records:
+        if not isinstance(log, dict):
+            continue
+        channel = log.get('channel')
+        key = json.dumps(channel, sort_keys=True)
+        timestamp = log.get('value_timestamp')
+        numeric = not isinstance(timestamp, bool) and isinstance(timestamp, (int, float))
+        stat = stats.get(key)
+        if stat is None:
+            stats[key] = [channel, 1, timestamp, timestamp] if numeric else [channel, 1, None, None]
+            continue
+        stat[1] += 1
+        if stat[2] is None:
+            continue
+        if not numeric:
+            stat[2] = stat[3] = None
+        elif timestamp < stat[2]:
+            stat[2] = timestamp
+        elif timestamp > stat[3]:
+            stat[3] = timestamp
+    return list(stats.values())
+
+
+def write_sidecar(path: str, header: Dict[str, Any], body: bytes):
+    """Yan dosya: MAGIC + başlık uzunluğu (4 byte) + JSON başlık + gövde; başlık gövdenin CRC32'sini taşır"""
+    encoded = json.dumps(dict(header, body_bytes=len(body), crc32=zlib.crc32(body)),
+                         ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # Süreç başına geçici dosya: aynı indeksi birden fazla süreç yazabilir
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(INDEX_MAGIC + struct.pack('<I', len(encoded)) + encoded + body)
+    os.replace(temp_path, path)
+
+
+def read_sidecar(path: str) -> Tuple[Dict[str, Any], bytes]:
+    """(başlık, gövde); dosya yoksa FileNotFoundError, bozuksa ValueError"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    offset = len(INDEX_MAGIC) + 4
+    if not content.startswith(INDEX_MAGIC) or len(content) < offset:
+        raise ValueError("başlık geçersiz")
+    header_length, = struct.unpack_from('<I', content, len(INDEX_MAGIC))
+    header = json.loads(content[offset:offset + header_length])
+    body = content[offset + header_length:]
+    if len(body) != header.get("body_bytes") or zlib.crc32(body) != header.get("crc32"):
+        raise ValueError("sağlama tutmuyor")
+    return header, body
+
+
+def may_contain(entry: Dict[str, Any], channel: Optional[Any], start: Optional[Any], end: Optional[Any]) -> bool:
+    """Segmentin özetine göre filtreye uyan kayıt içerebilir mi"""
+    for stat_channel, _, minimum, maximum in entry["channels"]:
+        if channel is not None and stat_channel != channel:
+            continue
+        if minimum is None:
+            return True
+        try:
+            if (start is None or maximum >= start) and (end is None or minimum <= end):
+                return True
+        except TypeError:
+            return True
+    return False
+
+
+def expired_estimate(entry: Dict[str, Any], cutoff: Callable[[Any], Optional[float]]) -> Optional[int]:
+    """Özete göre süresi dolmuş kayıt sayısı; kesin değilse (sınır kanalın aralığındaysa) None"""
+    expired = 0
+    for channel, count, minimum, maximum in entry["channels"]:
+        try:
+            limit = cutoff(channel)
+        except TypeError:
+            limit = None
+        if limit is None:
+            continue
+        if minimum is None:
+            return None
+        if maximum < limit:
+            expired += count
+        elif minimum < limit:
+            return None
+    return expired
+
+
+class SegmentCache:
+    """Çözülmüş mühürlü segmentler için byte bütçeli LRU önbellek
+
+    Boyut segmentin kodlanmamış (JSONL) boyutudur; bellekte kayıtlar bunun birkaç
+    katı yer tutar. Dönen kayıtlar tüm çağıranlar arasında paylaşılır, değiştirilmemelidir.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # segment id -> (imza, kayıtlar, boyut); imza segment yeniden yazılınca değişir
+        self._entries: "OrderedDict[int, Tuple[Any, Records, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, segment_id: int, signature: Any) -> Optional[Records]:
+        with self._lock:
+            item = self._entries.get(segment_id)
+            if item is not None and item[0] == signature:
+                self._entries.move_to_end(segment_id)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            return None
+
+    def put(self, segment_id: int, signature: Any, records: Records, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(segment_id, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            self._entries[segment_id] = (signature, records, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, segment_id: int):
+        with self._lock:
+            previous = self._entries.pop(segment_id, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "segments": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+class _SegmentLogWriter(_JSONLogWriter):
+    """Aktif segmentin kayıtları üzerinde JSON yazıcısı; bulunamayanlar mühürlü segmentlerde aranır"""
+
+    def __init__(self, storage: "SegmentStorage", sealed: List[Dict[str, Any]], active_logs: List[Dict[str, Any]]):
+        super().__init__(list(active_logs))
+        self.storage = storage
+        self.sealed = sealed
+        self.base = len(active_logs)
+        self._segments: Dict[int, List[Dict[str, Any]]] = {}
+
+    def _segment_logs(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        logs = self._segments.get(entry["id"])
+        if logs is None:
+            logs = [log for _, log in self.storage._read_entry(entry) if isinstance(log, dict)]
+            self._segments[entry["id"]] = logs
+        return logs
+
+    def exists(self, channel: Any, value_timestamp: Any, value: Any) -> bool:
+        if super().exists(channel, value_timestamp, value):
+            return True
+        for entry in reversed(self.sealed):
+            if not may_contain(entry, channel, value_timestamp, value_timestamp):
+                continue
+            for log in self._segment_logs(entry):
+                if (log.get('channel') == channel and log.get('value_timestamp') == value_timestamp
+                        and log.get('value') == value):
+                    return True
+        return False
+
+    def last(self, channel: Any) -> Optional[Dict[str, Any]]:
+        log = super().last(channel)
+        if log is not None:
+            return log
+        for entry in reversed(self.sealed):
+            if not may_contain(entry, channel, None, None):
+                continue
+            for log in reversed(self._segment_logs(entry)):
+                if log.get('channel') == channel:
+                    return log
+        return None
+
+    @property
+    def new_logs(self) -> List[Dict[str, Any]]:
+        return self.logs[self.base:]
+
+
+class SegmentStorage(JSONFileStorage):
+    """Dokümanlar JSON dosyalarında, loglar ekleme-sadece segmentlerde"""
+
+    name = "segments"
+
+    def __init__(self, base_path: str):
+        super().__init__(base_path)
+        self.segments_path = self._path(SEGMENTS_FOLDER)
+        self.manifest_path = os.path.join(self.segments_path, "manifest.json")
+        self.rollup_index_path = os.path.join(self.segments_path, "rollups.idx")
+        self._lock_path = os.path.join(self.segments_path, ".lock")
+        self._lock_depth = 0
+        self._manifest_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        # Yazıcı sürecin aktif segment görüntüsü: (segment id, dosya boyu, kayıtlar)
+        self._active_cache: Optional[Tuple[int, int, Records]] = None
+        # Özetler süreç içinde; `_rollup_seq`e kadarki kayıtları kapsar
+        self._rollup_seq = 0
+        self._rollups_ready = False
+        # rollups.idx'in kapsadığı son seq
+        self._index_seq = 0
+        self.cold_compression = resolve_codec(config.SEGMENT_COMPRESSION)
+        self.segment_cache = SegmentCache(config.SEGMENT_CACHE_BYTES)
+        if config.COLUMN_PERIOD_DAYS > 0:
+            self.column_store = ColumnStore(self._path(COLUMNS_FOLDER), config.COLUMN_PERIOD_DAYS)
+
+        os.makedirs(self.segments_path, exist_ok=True)
+        with self._locked():
+            if not os.path.exists(self.manifest_path):
+                self._save_manifest({"format": MANIFEST_FORMAT, "store_id": uuid.uuid4().hex, "segments": [],
+                                     "active": {"id": 1, "first_seq": 1, "created_ns": time.time_ns()}})
+            elif "store_id" not in self._manifest():
+                # Yan dosyalar başka bir depoya (yeniden aktarılmış segmentler) uygulanmasın
+                self._save_manifest(dict(self._manifest(), store_id=uuid.uuid4().hex))
+            if self.column_store is not None:
+                self.column_store.prepare(self._last_seq(self._manifest()))
+        if os.path.exists(self._path(LOGS_DOCUMENT)):
+            logger.warning(f"{self._path(LOGS_DOCUMENT)} segment deposunda kullanılmıyor; eski loglar için "
+                           f"`python migrate.py --to segments` ile aktarın")
+        logger.info(f"Segmentli log deposu kullanılıyor: {self.segments_path}")
+
+    # Kilit ve manifest
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Süreçler arası yazma kilidi (flock); aynı thread içinde iç içe alınabilir"""
+        with self._write_lock:
+            if self._lock_depth or not FCNTL_AVAILABLE:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(self._lock_path, 'a+b') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _manifest(self) -> Dict[str, Any]:
+        """Güncel manifest; dosya değişmediyse önbellekten"""
+        stat = os.stat(self.manifest_path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = self._manifest_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(self.manifest_path, 'rb') as file:
+            manifest = json.loads(file.read())
+        self._manifest_cache = (signature, manifest)
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any], force: bool = False):
+        payload = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        atomic_write(self.manifest_path, payload, self.durability, force)
+        self._manifest_cache = None
+
+    def _segment_path(self, segment_id: int, codec: Optional[str] = None) -> str:
+        return os.path.join(self.segments_path, segment_name(segment_id) + FILE_SUFFIXES.get(codec, ""))
+
+    def _read_file(self, path: str, codec: Optional[str] = None) -> Records:
+        """Segment dosyasını oku ve çöz; dosya yoksa FileNotFoundError"""
+        with tracing.span("file.read", path=path) as read_span, phase("io"):
+            with open(path, 'rb') as file:
+                content = file.read()
+            read_span.set_attribute("bytes", len(content))
+        reads, read_bytes, parse_duration = self._read_metrics(LOGS_DOCUMENT)
+        reads.inc()
+        read_bytes.inc(len(content))
+        with phase("parse"):
+            started = time.perf_counter()
+            records = decode_records(content) if codec else decode_segment(content, path)[0]
+            parse_duration.observe(time.perf_counter() - started)
+        return records
+
+    def _read_segment(self, segment_id: int) -> Records:
+        """Sıkıştırılmamış segmentin kayıtları; dosya yoksa boş liste"""
+        try:
+            return self._read_file(self._segment_path(segment_id))
+        except FileNotFoundError:
+            return []
+
+    def _read_entry(self, entry: Dict[str, Any], cache: bool = True) -> Records:
+        """Mühürlü segmentin kayıtları, önbellekten veya diskten
+
+        Okuyucunun manifesti eskiyse dosya bu arada sıkıştırılmış veya yeniden yazılmış
+        olabilir; güncel manifestteki kayda göre tekrar denenir. Segment düşürülmüşse boş liste.
+        `cache=False` (tam taramalar) önbelleği doldurmaz.
+        """
+        signature = (entry.get("codec"), entry["bytes"], entry["records"])
+        if cache:
+            records = self.segment_cache.get(entry["id"], signature)
+            if records is not None:
+                return records
+        try:
+            records = self._read_file(self._segment_path(entry["id"], entry.get("codec")), entry.get("codec"))
+        except FileNotFoundError:
+            current = next((candidate for candidate in self._manifest()["segments"]
+                            if candidate["id"] == entry["id"]), None)
+            if current is None or current == entry:
+                return []
+            return self._read_entry(current, cache)
+        if cache:
+            self.segment_cache.put(entry["id"], signature, records, entry.get("raw_bytes", entry["bytes"]))
+        return records
+
+    def _last_seq(self, manifest: Dict[str, Any]) -> int:
+        records = self._active_records(manifest)
+        return records[-1][0] if records else manifest["active"]["first_seq"] - 1
+
+    def _active_records(self, manifest: Dict[str, Any]) -> Records:
+        active_id = manifest["active"]["id"]
+        cached = self._active_cache
+        if cached is not None and cached[0] == active_id:
+            try:
+                if os.path.getsize(self._segment_path(active_id)) == cached[1]:
+                    return cached[2]
+            except OSError:
+                pass
+        return self._read_segment(active_id)
+
+    # Yazma
+
+    def _load_active(self, manifest: Dict[str, Any]) -> Records:
+        """Kilit altında: aktif segmenti önbellekten veya diskten yükle, yarım satırı kes"""
+        active_id = manifest["active"]["id"]
+        path = self._segment_path(active_id)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        cached = self._active_cache
+        if cached is not None and cached[:2] == (active_id, size):
+            return cached[2]
+        if not size:
+            records = []
+        else:
+            with open(path, 'rb') as file:
+                content = file.read()
+            records, valid = decode_segment(content, path)
+            if valid != size:
+                logger.warning(f"Aktif segmentin sonundaki yarım kayıt kesildi: {path}")
+                with open(path, 'r+b') as file:
+                    file.truncate(valid)
+                size = valid
+        self._active_cache = (active_id, size, records)
+        return records
+
+    def _seal(self, manifest: Dict[str, Any], records: Records, size: int):
+        """Aktif segmenti mühürle ve yenisini başlat (kilit altında)"""
+        active = manifest["active"]
+        manifest["segments"].append({
+            "id": active["id"],
+            "first_seq": records[0][0],
+            "last_seq": records[-1][0],
+            "records": len(records),
+            "bytes": size,
+            "raw_bytes": size,
+            "created_ns": active["created_ns"],
+            "channels": channel_stats(records)
+        })
+        manifest["active"] = {"id": active["id"] + 1, "first_seq": records[-1][0] + 1, "created_ns": time.time_ns()}
+        self._save_manifest(manifest)
+        self._active_cache = (manifest["active"]["id"], 0, [])
+        metrics.COMPACTION_SEGMENTS.labels("sealed").inc()
+        logger.info(f"Log segmenti mühürlendi: {segment_name(active['id'])} ({len(records)} kayıt, {size} byte)")
+
+    def _seal_due(self, manifest: Dict[str, Any], size: int) -> bool:
+        if not size:
+            return False
+        age = (time.time_ns() - manifest["active"]["created_ns"]) / 1e9
+        return size >= config.SEGMENT_MAX_BYTES or age >= config.SEGMENT_MAX_AGE
+
+    def _append(self, manifest: Dict[str, Any], logs: List[Dict[str, Any]]) -> Tuple[Records, int]:
+        """Kayıtları aktif segmente ekle; segment dolunca mühürleyip sonrakine geç
+
+        (eklenen kayıtlar, yazılan byte) döner.
+        """
+        records = self._load_active(manifest)
+        size = self._active_cache[1]
+        next_seq = records[-1][0] + 1 if records else manifest["active"]["first_seq"]
+        added: Records = []
+        written_bytes = 0
+        index = 0
+        while index < len(logs):
+            if not size:
+                # Segmentin yaşı ilk kayıttan itibaren sayılır
+                manifest["active"]["created_ns"] = time.time_ns()
+                self._save_manifest(manifest)
+            chunk = []
+            chunk_records: Records = []
+            while index < len(logs) and (not chunk or size < config.SEGMENT_MAX_BYTES):
+                line = encode_record(next_seq, logs[index])
+                chunk.append(line)
+                chunk_records.append((next_seq, logs[index]))
+                size += len(line)
+                next_seq += 1
+                index += 1
+            path = self._segment_path(manifest["active"]["id"])
+            payload = b''.join(chunk)
+            with tracing.span("file.write", path=path, bytes=len(payload)), phase("io"):
+                with open(path, 'ab') as file:
+                    file.write(payload)
+                    self.durability.written(file)
+            written_bytes += len(payload)
+            records = records + chunk_records
+            added.extend(chunk_records)
+            self._active_cache = (manifest["active"]["id"], size, records)
+            if self._seal_due(manifest, size):
+                self._seal(manifest, records, size)
+                records, size = [], 0
+        return added, written_bytes
+
+    @contextmanager
+    def log_writer(self) -> Iterator[LogWriter]:
+        with self._locked():
+            manifest = self._manifest()
+            active_logs = [log for _, log in self._load_active(manifest)]
+            writer = _SegmentLogWriter(self, manifest["segments"], active_logs)
+            yield writer
+
+            new_logs = writer.new_logs
+            if not new_logs:
+                return
+            # Manifest mühürlemede değişir; önbellekteki nesne paylaşılmasın
+            manifest = copy.deepcopy(manifest)
+            added, written_bytes = self._append(manifest, new_logs)
+            if self._rollups_ready:
+                with self._rollup_lock:
+                    # Özetler eklemeden önceki tüm kayıtları kapsıyorsa kilit altında güncel tutulur
+                    if added[0][0] == self._rollup_seq + 1:
+                        self._rollups.add_logs(log for _, log in added)
+                        self._rollup_seq = added[-1][0]
+                        self._rollups_version = self.document_version(LOGS_DOCUMENT)
+            if self.column_store is not None:
+                self._update_columns(added)
+        writes, write_bytes = self._write_metrics(LOGS_DOCUMENT)
+        writes.inc()
+        write_bytes.inc(written_bytes)
+
+    def _update_columns(self, added: Records):
+        """Eklenen kayıtları sütun deposuna yaz (kilit altında); geçmiş aktarılmadıysa backfill'e kalır"""
+        try:
+            state = self.column_store.state()
+            if not state["complete"]:
+                return
+            records = added
+            if added[0][0] != state["seq"] + 1:
+                # Önceki bir ekleme sütun deposuna ulaşmadan kesilmiş
+                records = [record for chunk in self._segments_after(state["seq"]) for record in chunk]
+            self.column_store.add(records)
+        except (OSError, ValueError) as e:
+            logger.error(f"Sütun deposu güncellenemedi, yeniden kurulacak: {e}")
+            try:
+                self.column_store.reset()
+            except OSError:
+                pass
+
+    # Okuma
+
+    def _segments_after(self, seq: int) -> Iterator[Records]:
+        manifest = self._manifest()
+        for entry in manifest["segments"]:
+            if entry["last_seq"] > seq:
+                yield [record for record in self._read_entry(entry, cache=False) if record[0] > seq]
+        yield [record for record in self._active_records(manifest) if record[0] > seq]
+
+    def query_logs(self, channel: Optional[Any] = None, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Optional[List[Dict[str, Any]]]:
+        manifest = self._manifest()
+        logs = []
+        skipped = 0
+        for entry in manifest["segments"]:
+            if may_contain(entry, channel, start, end):
+                logs.extend(log for _, log in self._read_entry(entry))
+            else:
+                skipped += 1
+        logs.extend(log for _, log in self._active_records(manifest))
+        with phase("filter"):
+            filtered_logs = filter_logs(logs, channel, start, end)
+        count_records(len(logs), 0)
+        logger.debug("Log sorgusu: %d segment atlandı, %d kayıt tarandı", skipped, len(logs))
+        return filtered_logs
+
+    def count_logs(self) -> int:
+        manifest = self._manifest()
+        return sum(entry["records"] for entry in manifest["segments"]) + len(self._active_records(manifest))
+
+    def tail_logs(self, cursor: Any) -> Optional[Tuple[Any, bool, List[Dict[str, Any]]]]:
+        """seq'e göre artımlı; silinen kayıt sayısı (sıkıştırma) veya depo değişirse baştan"""
+        manifest = self._manifest()
+        active = self._active_records(manifest)
+        last = active[-1][0] if active else manifest["active"]["first_seq"] - 1
+        removed = last - sum(entry["records"] for entry in manifest["segments"]) - len(active)
+        key = (manifest.get("store_id"), removed)
+        reset = cursor is None or cursor[0] != key or cursor[1] > last
+        after = 0 if reset else cursor[1]
+        logs = []
+        for entry in manifest["segments"]:
+            if entry["last_seq"] > after:
+                logs.extend(log for seq, log in self._read_entry(entry, cache=False) if seq > after)
+        logs.extend(log for seq, log in active if seq > after)
+        return (key, last), reset, [log for log in logs if isinstance(log, dict)]
+
+    def iter_logs(self) -> Iterator[Dict[str, Any]]:
+        for records in self._segments_after(0):
+            for _, log in records:
+                if isinstance(log, dict):
+                    yield log
+
+    # Dokümanlar: logs.json sanal, segmentlerden oluşturulur
+
+    def read_document(self, key: str) -> Dict[str, Any]:
+        if key == LOGS_DOCUMENT:
+            return {"logs": list(self.iter_logs())}
+        return super().read_document(key)
+
+    def load_document(self, key: str) -> Any:
+        if key == LOGS_DOCUMENT:
+            return {"logs": list(self.iter_logs())}
+        return super().load_document(key)
+
+    def write_document(self, key: str, data: Any):
+        if key == LOGS_DOCUMENT:
+            raise ValueError("Segment deposunda loglar yalnızca log_writer ile eklenir")
+        super().write_document(key, data)
+
+    def _checkpoint(self) -> Dict[str, Any]:
+        """Günlükte yalnızca doküman yazmaları işlenir; loglar segmentlerde (eski JSON eklemeleri yok sayılır)"""
+        records = self.journal.records()
+        if records:
+            self.durability.flush()
+            self.journal.reset()
+            metrics.JOURNAL_CHECKPOINTS.inc()
+        return {"records": len(records), "logs_bytes": 0, "seconds": 0.0}
+
+    def document_version(self, key: str) -> DocumentVersion:
+        if key != LOGS_DOCUMENT:
+            return super().document_version(key)
+        try:
+            manifest_stat = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        stamp, size = manifest_stat.st_mtime_ns, manifest_stat.st_size
+        try:
+            active_stat = os.stat(self._segment_path(self._manifest()["active"]["id"]))
+            stamp, size = max(stamp, active_stat.st_mtime_ns), size + active_stat.st_size
+        except OSError:
+            pass
+        return (stamp, size)
+
+    def list_documents(self, folder: str) -> Optional[List[str]]:
+        names = super().list_documents(folder)
+        if folder.rstrip("/") == "logsfile":
+            names = sorted(set(names or []) | {"logs.json"})
+        return names
+
+    # Özetler
+
+    def query_rollups(self, seconds: int, channel: Any, start: int, end: int) -> Optional[List[Dict[str, Any]]]:
+        if not self._rollups_ready or seconds not in self._rollups.tiers:
+            return None
+        with self._rollup_lock:
+            version = self.document_version(LOGS_DOCUMENT)
+            if version != self._rollups_version:
+                # Başka süreçlerin eklediği kayıtlar (genelde yalnızca aktif segmentin sonu)
+                for records in self._segments_after(self._rollup_seq):
+                    if records:
+                        self._rollups.add_logs(log for _, log in records)
+                        self._rollup_seq = records[-1][0]
+                self._rollups_version = version
+            return self._rollups.query(seconds, channel, start, end)
+
+    def backfill_rollups(self, batch_size: int) -> bool:
+        """Her turda bir mühürlü segment özetlenir; aktif segmente gelince özetler hazırdır"""
+        tiers = enabled_tiers()
+        if not tiers:
+            return False
+        if self._rollups_ready:
+            if self._index_due():
+                self.save_indexes()
+            return False
+        with self._rollup_lock:
+            if self._rollups is None:
+                loaded = self._load_rollup_index(tiers)
+                self._rollups, self._rollup_seq = loaded if loaded is not None else (RollupTiers(tiers), 0)
+                self._index_seq = self._rollup_seq
+            pending = [entry for entry in self._manifest()["segments"] if entry["last_seq"] > self._rollup_seq]
+            if pending:
+                records = [record for record in self._read_entry(pending[0], cache=False)
+                           if record[0] > self._rollup_seq]
+                self._rollup_seq = pending[0]["last_seq"]
+            else:
+                records = [record for record in self._active_records(self._manifest())
+                           if record[0] > self._rollup_seq]
+                if records:
+                    self._rollup_seq = records[-1][0]
+                self._rollups_ready = True
+            self._rollups.add_logs(log for _, log in records)
+        metrics.ROLLUP_BACKFILLED_RECORDS.inc(len(records))
+        if self._rollups_ready:
+            logger.info(f"Log özetleri kuruldu: {self._rollups.records} kayıt, {self._rollups.bucket_count()} kova")
+            if self._index_due():
+                self.save_indexes()
+        return not self._rollups_ready
+
+    # Yan dosya indeksi
+
+    def _index_due(self) -> bool:
+        """Son yazmadan bu yana segment mühürlendiyse; açılışta böylece en fazla aktif segment özetlenir"""
+        segments = self._manifest()["segments"]
+        return bool(segments) and segments[-1]["last_seq"] > self._index_seq
+
+    def save_indexes(self):
+        if not self._rollups_ready:
+            return
+        started = time.perf_counter()
+        with self._rollup_lock:
+            seq = self._rollup_seq
+            if seq == self._index_seq and os.path.exists(self.rollup_index_path):
+                return
+            rows = self._rollups.rows()
+            header = {"format": INDEX_FORMAT, "seq": seq, "tiers": self._rollups.tiers,
+                      "records": self._rollups.records, "buckets": len(rows)}
+        manifest = self._manifest()
+        header.update({
+            "store_id": manifest.get("store_id"),
+            "segments": [[entry["id"], entry["first_seq"], entry["last_seq"], entry["created_ns"]]
+                         for entry in manifest["segments"]],
+            "active": [manifest["active"]["id"], manifest["active"]["first_seq"]]
+        })
+        body = encode_records(list(enumerate(rows)), resolve_codec("auto")) if rows else b""
+        try:
+            write_sidecar(self.rollup_index_path, header, body)
+        except OSError as e:
+            logger.error(f"Özet indeksi yazılamadı: {e}")
+            return
+        self._index_seq = seq
+        metrics.INDEX_SAVES.labels("rollups").inc()
+        logger.info(f"Özet indeksi yazıldı: seq {seq}, {len(rows)} kova, {len(body)} byte "
+                    f"({time.perf_counter() - started:.2f} sn)")
+
+    def _load_rollup_index(self, tiers: List[int]) -> Optional[Tuple[RollupTiers, int]]:
+        """Doğrulanmış yan dosyadan özetler ve kapsadığı seq; dosya yoksa veya geçersizse None"""
+        started = time.perf_counter()
+        try:
+            header, body = read_sidecar(self.rollup_index_path)
+            problem = self._index_mismatch(header, self._manifest(), tiers)
+            if problem is None:
+                columns = decode_columns(body) if body else {}
+                if len(columns.get("tier", ())) != header["buckets"]:
+                    problem = "kova sayısı tutmuyor"
+        except FileNotFoundError:
+            metrics.INDEX_LOADS.labels("rollups", "missing").inc()
+            return None
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            problem = str(e) or type(e).__name__
+        if problem is not None:
+            metrics.INDEX_LOADS.labels("rollups", "invalid").inc()
+            logger.warning(f"Özet indeksi geçersiz ({problem}), özetler baştan kurulacak")
+            return None
+        rollups = RollupTiers.from_columns(header["tiers"], columns, header["records"]) if columns \
+            else RollupTiers(header["tiers"])
+        metrics.INDEX_LOADS.labels("rollups", "loaded").inc()
+        logger.info(f"Özet indeksi yüklendi: seq {header['seq']}, {header['buckets']} kova "
+                    f"({time.perf_counter() - started:.2f} sn); sonraki kayıtlar özetlenecek")
+        return rollups, header["seq"]
+
+    def _index_mismatch(self, header: Dict[str, Any], manifest: Dict[str, Any], tiers: List[int]) -> Optional[str]:
+        """Yan dosya manifestle tutarlı değilse nedeni
+
+        Saklama süresiyle düşürülen veya küçülen segmentler indeksi bozmaz (özetler ham
+        veriden uzun yaşar); değişmiş, yerine başkası konmuş veya bilinmeyen segmentler bozar.
+        """
+        if header.get("format") != INDEX_FORMAT:
+            return "biçim farklı"
+        if header.get("store_id") != manifest.get("store_id"):
+            return "farklı depo"
+        if header.get("tiers") != sorted(tiers):
+            return "katmanlar değişti"
+        active_id, active_first_seq = header["active"]
+        if active_id > manifest["active"]["id"]:
+            return "aktif segment geride"
+        if active_id == manifest["active"]["id"] and active_first_seq != manifest["active"]["first_seq"]:
+            return "aktif segment değişmiş"
+        current = {entry["id"]: entry for entry in manifest["segments"]}
+        sealed = current.get(active_id)
+        if sealed is not None and sealed["first_seq"] < active_first_seq:
+            return f"{segment_name(active_id)} değişmiş"
+        known = set()
+        for segment_id, first_seq, last_seq, created_ns in header["segments"]:
+            known.add(segment_id)
+            entry = current.get(segment_id)
+            if entry is not None and (entry["created_ns"] != created_ns or entry["first_seq"] < first_seq
+                                      or entry["last_seq"] > last_seq):
+                return f"{segment_name(segment_id)} değişmiş"
+        if any(segment_id < active_id and segment_id not in known for segment_id in current):
+            return "bilinmeyen segment"
+        if header["seq"] > self._last_seq(manifest):
+            return "kayıtlar eksik"
+        return None
+
+    # Sütun deposu
+
+    def query_columns(self, channel: Any, start: Optional[int], end: Optional[int]) -> Optional[List[Any]]:
+        if self.column_store is None or type(channel) is not int:
+            return None
+        try:
+            if not self.column_store.state()["complete"]:
+                return None
+        except (OSError, ValueError):
+            return None
+        return self.column_store.query(channel, start, end)
+
+    def backfill_columns(self) -> bool:
+        """Her turda bir mühürlü segment aktarılır; aktif segmente gelince depo tamamlanır"""
+        if self.column_store is None:
+            return False
+        state = self.column_store.state()
+        if state["complete"]:
+            return False
+        seq = state["seq"]
+        pending = [entry for entry in self._manifest()["segments"] if entry["last_seq"] > seq]
+        # Segment kilit dışında okunur; kilit yalnızca dosyalara yazarken alınır
+        records = None
+        if pending:
+            records = [record for record in self._read_entry(pending[0], cache=False) if record[0] > seq]
+        with self._locked():
+            if self.column_store.state()["seq"] != seq:
+                return True
+            if records is not None:
+                self.column_store.add(records, seq=pending[0]["last_seq"])
+                return True
+            records = [record for record in self._active_records(self._manifest()) if record[0] > seq]
+            self.column_store.add(records, complete=True)
+        logger.info(f"Sütun deposu kuruldu: {self.column_store.root}")
+        return False
+
+    # Saklama
+
+    def compact_logs(self, cutoff: Callable[[Any], Optional[float]]) -> Dict[str, int]:
+        """Süresi tamamen dolan mühürlü segmentleri düşür, çoğu dolanları yeniden yaz
+
+        Aktif segmente dokunulmaz; yaşı dolunca burada mühürlenir. Yeniden yazma kilit
+        dışında geçici dosyaya yapılır, kilit yalnızca dosya değişimi ve manifest için alınır.
+        """
+        report = {"scanned_records": 0, "removed_records": 0, "reclaimed_bytes": 0,
+                  "dropped_segments": 0, "rewritten_segments": 0}
+        with self._locked():
+            manifest = copy.deepcopy(self._manifest())
+            records = self._load_active(manifest)
+            if self._seal_due(manifest, self._active_cache[1]):
+                self._seal(manifest, records, self._active_cache[1])
+
+        for entry in self._manifest()["segments"]:
+            report["scanned_records"] += entry["records"]
+            expired = expired_estimate(entry, cutoff)
+            if expired == 0:
+                continue
+            if expired == entry["records"]:
+                if self._replace_segment(entry, None) is not None:
+                    report["removed_records"] += entry["records"]
+                    report["reclaimed_bytes"] += entry["bytes"]
+                    report["dropped_segments"] += 1
+                continue
+
+            kept = [record for record in self._read_entry(entry, cache=False)
+                    if not (isinstance(record[1], dict) and is_expired(record[1], cutoff))]
+            removed = entry["records"] - len(kept)
+            if removed < entry["records"] * config.COMPACTION_MIN_EXPIRED_RATIO:
+                continue
+            size = self._replace_segment(entry, kept, entry.get("codec"))
+            if size is not None:
+                report["removed_records"] += removed
+                report["reclaimed_bytes"] += entry["bytes"] - size
+                report["dropped_segments" if not kept else "rewritten_segments"] += 1
+        if self.column_store is not None:
+            with self._locked():
+                report["reclaimed_bytes"] += self.column_store.drop_before(cutoff)
+        return report
+
+    def compress_segments(self) -> Dict[str, int]:
+        """Sıkıştırılmamış mühürlü segmentleri soğuk biçime çevir"""
+        report = {"compressed_segments": 0, "compression_saved_bytes": 0}
+        if self.cold_compression is None:
+            return report
+        for entry in self._manifest()["segments"]:
+            if entry.get("codec"):
+                continue
+            records = self._read_entry(entry, cache=False)
+            started = time.perf_counter()
+            try:
+                size = self._replace_segment(entry, records, self.cold_compression)
+            except CodecError as e:
+                logger.warning(f"{segment_name(entry['id'])} sıkıştırılamadı: {e}")
+                continue
+            if size is not None:
+                report["compressed_segments"] += 1
+                report["compression_saved_bytes"] += entry["bytes"] - size
+                logger.info(f"Log segmenti sıkıştırıldı: {segment_name(entry['id'])} "
+                            f"({entry['bytes']} -> {size} byte, {time.perf_counter() - started:.2f} sn)")
+        return report
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"segment_cache": self.segment_cache.stats()}
+
+    def _replace_segment(self, entry: Dict[str, Any], kept: Optional[Records], codec: Optional[str] = None
+                         ) -> Optional[int]:
+        """Segmenti düşür (kept boş/None) veya kalan kayıtlarla `codec` biçiminde yeniden yaz
+
+        Yeni dosya kilit dışında geçici dosyaya yazılır; kilit yalnızca dosya değişimi ve
+        manifest için alınır. Bu arada segment değiştiyse (başka bir sıkıştırma) vazgeçilir.
+        Yeni dosya boyutunu (düşürüldüyse 0), vazgeçildiyse None döndürür.
+        """
+        old_path = self._segment_path(entry["id"], entry.get("codec"))
+        temp_path = None
+        if kept:
+            path = self._segment_path(entry["id"], codec)
+            temp_path = path + ".tmp"
+            if codec:
+                content = encode_records(kept, codec)
+                # Önbellek bütçesi için kodlanmamış boyutun tahmini
+                raw_bytes = entry.get("raw_bytes", entry["bytes"]) * len(kept) // max(entry["records"], 1)
+            else:
+                content = b''.join(encode_record(seq, log) for seq, log in kept)
+                raw_bytes = len(content)
+            with open(temp_path, 'wb') as file:
+                file.write(content)
+                # Eski dosya silinmeden önce yenisi ve manifest diskte olmalı
+                self.durability.written(file, force=True)
+
+        with self._locked():
+            manifest = copy.deepcopy(self._manifest())
+            position = next((index for index, current in enumerate(manifest["segments"])
+                             if current["id"] == entry["id"]), None)
+            if position is None or manifest["segments"][position] != entry:
+                if temp_path is not None:
+                    os.unlink(temp_path)
+                return None
+            if temp_path is None:
+                del manifest["segments"][position]
+                size = 0
+            else:
+                os.replace(temp_path, path)
+                self.durability.replaced(path, force=True)
+                size = len(content)
+                updated = dict(entry, first_seq=kept[0][0], last_seq=kept[-1][0], records=len(kept), bytes=size,
+                               raw_bytes=raw_bytes, channels=channel_stats(kept))
+                updated.pop("codec", None)
+                if codec:
+                    updated["codec"] = codec
+                manifest["segments"][position] = updated
+            self._save_manifest(manifest, force=True)
+            self.segment_cache.discard(entry["id"])
+            # Eski manifesti okumuş okuyucular eksik dosyada güncel manifestle tekrar dener
+            if temp_path is None or path != old_path:
+                try:
+                    os.unlink(old_path)
+                except FileNotFoundError:
+                    pass
+            return size
@@ -1,30 +1,81 @@
+import hmac
 import json
 import logging
+import os
 import threading
 import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, request, jsonify
+from typing import Any, Dict, List, Optional
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import config
+import metrics
+from tracing import TRACER
+from profiler import REQUEST_PROFILER, SAMPLING_PROFILER, ProfilerBusyError
+from memory_tracker import KEY_TYPES, MEMORY_TRACKER, SnapshotNotFoundError
+from log_pipeline import PIPELINE, setup_logging
+from retention import Compactor
+from rollups import RollupBackfiller
+from slow_request_journal import SlowRequestJournal, phase, reset_timings, start_timings
 from json_reader import JSONReader
 
-# Logging ayarları
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Logging ayarları: kuyruk tabanlı, çağrı noktası başına sınırlı
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# GET olmasına rağmen dosyalara yazan endpoint'ler
+SIDE_EFFECT_GET_PATHS = (
+    '/api/data/variable',
+    '/api/alarms/check',
+    '/api/alarms/active',
+)
+
+def is_write_request(method: str, path: str) -> bool:
+    """İsteğin JSON dosyalarını değiştirip değiştirmediğini belirle"""
+    # Admin endpoint'leri isteği alan sürecin kendisiyle ilgilidir (profil, log seviyesi)
+    if path.startswith('/api/admin/'):
+        return False
+    if method in ('POST', 'PUT', 'DELETE', 'PATCH'):
+        return True
+    if method == 'GET' and path in SIDE_EFFECT_GET_PATHS:
+        return True
+    # Monitoring thread'i yazma sürecinde çalıştığı için durumu da oradan alınır
+    return path.startswith('/api/monitoring/')
+
+def batch_has_writes(payload: Any) -> bool:
+    """Batch isteğindeki alt isteklerden herhangi biri yazma yapıyor mu"""
+    sub_requests = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(sub_requests, list):
+        return False
+    for sub_request in sub_requests:
+        if isinstance(sub_request, dict) and isinstance(sub_request.get('path'), str):
+            method = str(sub_request.get('method', 'GET')).upper()
+            if is_write_request(method, sub_request['path'].split('?', 1)[0]):
+                return True
+    return False
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Yanıt serileştirme süresini istek ölçümüne "serialize" aşaması olarak ekler"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        with phase("serialize"):
+            return super().dumps(obj, **kwargs)
+
 class RESTfulServer:
-    def __init__(self):
-        self.json_reader = JSONReader()
+    def __init__(self, json_reader: Optional[JSONReader] = None):
+        self.json_reader = json_reader if json_reader is not None else JSONReader()
         self.app = Flask(__name__)
+        self.app.json = TimedJSONProvider(self.app)
         # CORS ayarları - tüm cihazlardan erişime izin ver
         CORS(self.app, resources={
             r"/api/*": {
                 "origins": ["*"],
                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization", "Accept"],
-                "expose_headers": ["Content-Type", "Authorization"]
+                "allow_headers": ["Content-Type", "Authorization", "Accept", "traceparent"],
+                "expose_headers": ["Content-Type", "Authorization", "ETag", "traceparent"]
             }
         })
         
@@ -32,9 +83,237 @@ class RESTfulServer:
         self.monitoring_active = False
         self.monitoring_thread = None
         
+        # Log özetlerini mevcut geçmişten dolduran arka plan işi (yazan süreçte başlatılır)
+        self.rollup_backfiller = RollupBackfiller(self.json_reader.storage)
+        # Saklama süresi dolan logları ve özet kovalarını silen arka plan işi (yazan süreçte)
+        self.compactor = Compactor(self.json_reader.storage)
+        
+        # Batch isteklerindeki okumaları paralel çalıştırmak için havuz
+        self.batch_executor = ThreadPoolExecutor(max_workers=config.BATCH_MAX_WORKERS, thread_name_prefix="batch")
+        
+        # İstek metrikleri, tracing ve önbellek toplayıcısı
+        self.setup_metrics()
+        self.setup_tracing()
+        self.setup_profiling()
+        self.setup_slow_request_journal()
+        self.setup_memory_tracking()
+        # Süreçte tek önbellek collector'ı: yeni sunucu örneği (testler, worker uygulaması) öncekinin yerini alır
+        metrics.REGISTRY.add_collector(self._collect_cache_metrics, key="server_caches")
+        
         # API endpoint'lerini tanımla
         self.setup_routes()
     
+    def setup_metrics(self):
+        """Route başına istek sayısı ve gecikme ölçümü"""
+        # Başlangıç zamanı environ'da tutulur: batch alt istekleri dış isteğin app context'ini (g) paylaşır
+        
+        @self.app.before_request
+        def start_request_timer():
+            request.environ['hidrologger.request_started'] = time.perf_counter()
+            metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+        
+        @self.app.after_request
+        def record_request_metrics(response):
+            started = request.environ.get('hidrologger.request_started')
+            if started is not None:
+                route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+                metrics.HTTP_REQUEST_DURATION.labels(route, request.method).observe(time.perf_counter() - started)
+                metrics.HTTP_REQUESTS.labels(route, request.method, response.status_code).inc()
+            return response
+        
+        @self.app.teardown_request
+        def finish_request(exc):
+            if request.environ.pop('hidrologger.request_started', None) is not None:
+                metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+    
+    def setup_tracing(self):
+        """Her istek için (örneklenirse) kök span aç; traceparent başlığı varsa ona bağlan"""
+        
+        @self.app.before_request
+        def start_request_span():
+            route = request.url_rule.rule if request.url_rule is not None else request.path
+            request_span = TRACER.start_span(
+                f"{request.method} {route}",
+                request.headers.get('traceparent'),
+                {"http.method": request.method, "http.target": request.full_path.rstrip('?')}
+            )
+            if request_span is not None:
+                request.environ['hidrologger.span'] = request_span
+        
+        @self.app.after_request
+        def tag_request_span(response):
+            request_span = request.environ.get('hidrologger.span')
+            if request_span is not None:
+                request_span.set_attribute("http.status_code", response.status_code)
+                response.headers['traceparent'] = TRACER.traceparent_of(request_span)
+            return response
+        
+        @self.app.teardown_request
+        def end_request_span(exc):
+            request_span = request.environ.pop('hidrologger.span', None)
+            if request_span is not None:
+                request_span.end(exc)
+    
+    def setup_profiling(self):
+        """Hazırlanmış route'a gelen istekleri cProfile ile profille"""
+        
+        @self.app.before_request
+        def start_request_profile():
+            if REQUEST_PROFILER.armed and request.url_rule is not None:
+                profile = REQUEST_PROFILER.start(request.url_rule.rule)
+                if profile is not None:
+                    request.environ['hidrologger.profile'] = profile
+        
+        @self.app.after_request
+        def record_profile_status(response):
+            if 'hidrologger.profile' in request.environ:
+                request.environ['hidrologger.profile_status'] = response.status_code
+            return response
+        
+        @self.app.teardown_request
+        def finish_request_profile(exc):
+            profile = request.environ.pop('hidrologger.profile', None)
+            if profile is not None:
+                REQUEST_PROFILER.finish(profile, request.url_rule.rule, request.method,
+                                        request.environ.get('hidrologger.profile_status'))
+    
+    def setup_slow_request_journal(self):
+        """Eşiği aşan istekleri aşama süreleri ve kayıt sayılarıyla kaydet"""
+        self.slow_requests = SlowRequestJournal(
+            config.SLOW_REQUEST_THRESHOLD_MS,
+            config.SLOW_REQUEST_MAX_ENTRIES,
+            config.SLOW_REQUEST_LOG_PATH,
+            config.SLOW_REQUEST_LOG_MAX_BYTES,
+            config.SLOW_REQUEST_LOG_BACKUPS
+        )
+        
+        @self.app.before_request
+        def start_request_timings():
+            request.environ['hidrologger.timings'] = start_timings()
+        
+        @self.app.after_request
+        def record_slow_request(response):
+            started = request.environ.get('hidrologger.request_started')
+            timings_entry = request.environ.get('hidrologger.timings')
+            if started is None or timings_entry is None:
+                return response
+            
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self.slow_requests.is_slow(duration_ms):
+                timings = timings_entry[0]
+                phases_ms = {name: round(seconds * 1000, 3) for name, seconds in timings.phases.items()}
+                self.slow_requests.record({
+                    "timestamp": datetime.now().isoformat(),
+                    "method": request.method,
+                    "route": request.url_rule.rule if request.url_rule is not None else "unmatched",
+                    "path": request.path,
+                    "args": request.args.to_dict(),
+                    "view_args": request.view_args or {},
+                    "status": response.status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "response_bytes": response.content_length,
+                    "records_scanned": timings.records_scanned,
+                    "records_returned": timings.records_returned,
+                    "phases_ms": phases_ms,
+                    "other_ms": round(duration_ms - sum(phases_ms.values()), 3),
+                    "memory_peak_kb": request.environ.get('hidrologger.memory_peak_kb')
+                })
+            return response
+        
+        @self.app.teardown_request
+        def finish_request_timings(exc):
+            timings_entry = request.environ.pop('hidrologger.timings', None)
+            if timings_entry is not None:
+                reset_timings(timings_entry[1])
+    
+    def setup_memory_tracking(self):
+        """Bellek takibi açıksa istek başına (yaklaşık) tepe bellek ayırmasını ölç"""
+        if config.MEMORY_TRACE_FRAMES > 0:
+            MEMORY_TRACKER.start(config.MEMORY_TRACE_FRAMES)
+        
+        @self.app.before_request
+        def start_request_memory():
+            started = MEMORY_TRACKER.request_started()
+            if started is not None:
+                request.environ['hidrologger.memory_started'] = started
+        
+        # Yavaş istek kaydından önce çalışır (after_request ters sırada çağrılır)
+        @self.app.after_request
+        def record_request_memory(response):
+            started = request.environ.pop('hidrologger.memory_started', None)
+            if started is not None:
+                route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+                peak = MEMORY_TRACKER.request_finished(route, started)
+                if peak is not None:
+                    request.environ['hidrologger.memory_peak_kb'] = round(peak / 1024, 1)
+            return response
+    
+    def _admin_denied(self):
+        """Admin token tanımlıysa isteği doğrula; yetkisizse hata yanıtı döndür"""
+        if not config.ADMIN_TOKEN:
+            return None
+        provided = request.headers.get('Authorization', '')
+        if provided.startswith('Bearer '):
+            provided = provided[len('Bearer '):]
+        if hmac.compare_digest(provided.encode('utf-8'), config.ADMIN_TOKEN.encode('utf-8')):
+            return None
+        return jsonify({
+            "success": False,
+            "error": "Yetkisiz"
+        }), 401
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Önbellek isabet oranları (metrik özeti için)"""
+        flight = self.json_reader.single_flight.stats()
+        return {
+            "document_cache": self.json_reader.document_cache.stats(),
+            "single_flight": {
+                **flight,
+                "hit_ratio": round(flight["coalesced"] / flight["calls"], 4) if flight["calls"] else 0.0
+            },
+            "hot_tail": self.json_reader.hot_tail.stats(),
+            "range_cache": self.json_reader.range_cache.stats(),
+            **self.json_reader.storage.cache_stats()
+        }
+    
+    def _collect_cache_metrics(self):
+        """Önbellek sayaçlarını okuma anında metriklere dönüştür"""
+        caches = self.cache_stats()
+        document = caches.pop("document_cache")
+        flight = caches.pop("single_flight")
+        # Backend önbellekleri (ör. segment_cache -> cache="segment")
+        backend = [(name[:-len("_cache")] if name.endswith("_cache") else name, stats)
+                   for name, stats in caches.items()]
+        return [
+            ("hidrologger_cache_requests", "counter", "Önbellek isabet ve ıskaları", [
+                ("hidrologger_cache_requests_total", {"cache": "document", "result": "hit"}, document["hits"]),
+                ("hidrologger_cache_requests_total", {"cache": "document", "result": "miss"}, document["misses"]),
+                ("hidrologger_cache_requests_total", {"cache": "single_flight", "result": "hit"}, flight["coalesced"]),
+                ("hidrologger_cache_requests_total", {"cache": "single_flight", "result": "miss"}, flight["executions"]),
+            ] + [
+                ("hidrologger_cache_requests_total", {"cache": name, "result": result}, stats[key])
+                for name, stats in backend for result, key in (("hit", "hits"), ("miss", "misses"))
+            ]),
+            ("hidrologger_cache_hit_ratio", "gauge", "Önbellek isabet oranı", [
+                ("hidrologger_cache_hit_ratio", {"cache": name}, stats["hit_ratio"])
+                for name, stats in [("document", document), ("single_flight", flight)] + backend
+            ]),
+            ("hidrologger_cache_evictions", "counter", "Bellek bütçesi nedeniyle önbellekten çıkarılan girdiler", [
+                ("hidrologger_cache_evictions_total", {"cache": name}, stats["evictions"])
+                for name, stats in backend if "evictions" in stats
+            ]),
+            ("hidrologger_cache_bytes", "gauge", "Önbellekte tutulan veri boyutu", [
+                ("hidrologger_cache_bytes", {"cache": name}, stats["bytes"])
+                for name, stats in backend if "bytes" in stats
+            ]),
+            ("hidrologger_cache_documents", "gauge", "Doküman önbelleğindeki dosya sayısı", [
+                ("hidrologger_cache_documents", {}, document["documents"])
+            ]),
+            ("hidrologger_single_flight_in_flight", "gauge", "Devam eden birleştirilmiş okumalar", [
+                ("hidrologger_single_flight_in_flight", {}, flight["in_flight"])
+            ]),
+        ]
+    
     def setup_routes(self):
         """API endpoint'lerini tanımla"""
         
@@ -43,23 +322,15 @@ class RESTfulServer:
             """Tüm anlık verileri getir - Yeni JSON yapısı"""
             try:
                 logger.info("Tüm anlık veriler istendi")
-                data_list = self.json_reader.get_data()
-                
-                # Yeni JSON yapısına dönüştür
-                formatted_data = []
-                for item in data_list:
-                    formatted_item = {
-                        "battery_percentage": item.get('battery_percentage', 100),
-                        "channelID": item.get('channel', 0),
-                        "max_value": item.get('max_value', 0),
-                        "min_value": item.get('min_value', 0),
-                        "signal_strength": item.get('signal_strength', 90),
-                        "value": item.get('value', 0),
-                        "value_timestamp": item.get('value_timestamp', int(time.time())),
-                        "value_type": item.get('value_type', 1)
-                    }
-                    formatted_data.append(formatted_item)
                 
+                def build_formatted_data():
+                    data_list = self.json_reader.get_data()
+                    
+                    # Yeni JSON yapısına dönüştür
+                    return [self.json_reader.format_current_value(item) for item in data_list]
+                
+                # Aynı anda gelen istekler listeyi bir kez oluşturur
+                formatted_data = self.json_reader.single_flight.do(('route:/api/data',), build_formatted_data)
                 return jsonify(formatted_data)
                     
             except Exception as e:
@@ -314,7 +585,11 @@ class RESTfulServer:
 
         @self.app.route('/api/data/channel_<int:channel_id>/<int:start_time>/<int:end_time>', methods=['GET'])
         def get_channel_data_by_timerange(channel_id, start_time, end_time):
-            """Belirtilen kanal için belirli zaman aralığında log verilerini getir"""
+            """Belirtilen kanal için belirli zaman aralığında log verilerini getir
+
+            ?resolution=<sn> veya ?points=<nokta sayısı> verilirse ham loglar yerine
+            çözünürlüğü sağlayan en kaba özet katmanından (1m, 1h, 1d) seri döner.
+            """
             try:
                 logger.info(f"Kanal {channel_id} için {start_time} - {end_time} arası log verileri istendi")
                 
@@ -324,6 +599,19 @@ class RESTfulServer:
                         "error": "Başlangıç zamanı bitiş zamanından büyük olamaz"
                     }), 400
                 
+                resolution = request.args.get('resolution', type=float)
+                points = request.args.get('points', type=int)
+                if resolution is not None or points is not None:
+                    if (resolution is not None and resolution <= 0) or (points is not None and points <= 0):
+                        return jsonify({
+                            "error": "resolution ve points pozitif olmalı"
+                        }), 400
+                    if resolution is None:
+                        resolution = (end_time - start_time) / points
+                    series = self.json_reader.get_channel_series(channel_id, start_time, end_time, resolution)
+                    logger.info(f"Kanal {channel_id} için {series['count']} nokta ({series['tier']}) bulundu")
+                    return jsonify(series)
+                
                 logs = self.json_reader.get_logs(channel_id, start_time, end_time)
                 logger.info(f"Kanal {channel_id} için {len(logs)} log verisi bulundu")
                 
@@ -544,6 +832,69 @@ class RESTfulServer:
                     "error": str(e)
                 }), 500
         
+        @self.app.route('/api/dashboard', methods=['GET'])
+        def get_dashboard():
+            """Dashboard için kanal, anlık değer, alarm ve istasyon verilerini tek yanıtta getir"""
+            try:
+                logger.info("Dashboard görünümü istendi")
+                etag, snapshot = self.json_reader.get_dashboard_snapshot()
+                
+                response = jsonify(snapshot)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                # If-None-Match eşleşirse gövdesiz 304 döner
+                return response.make_conditional(request)
+                
+            except Exception as e:
+                logger.error(f"Dashboard görünümü getirme hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/batch', methods=['POST'])
+        def batch():
+            """Birden fazla API çağrısını tek HTTP isteğinde çalıştır"""
+            try:
+                payload = request.get_json(silent=True)
+                sub_requests = payload.get('requests') if isinstance(payload, dict) else None
+                
+                if not isinstance(sub_requests, list) or not sub_requests:
+                    return jsonify({
+                        "success": False,
+                        "error": "requests listesi gerekli"
+                    }), 400
+                
+                if len(sub_requests) > config.BATCH_MAX_REQUESTS:
+                    return jsonify({
+                        "success": False,
+                        "error": f"En fazla {config.BATCH_MAX_REQUESTS} alt istek gönderilebilir"
+                    }), 400
+                
+                for index, sub_request in enumerate(sub_requests):
+                    path = sub_request.get('path') if isinstance(sub_request, dict) else None
+                    if not isinstance(path, str) or not path.startswith('/api/') or path.startswith('/api/batch'):
+                        return jsonify({
+                            "success": False,
+                            "error": f"Geçersiz alt istek: {index}"
+                        }), 400
+                
+                logger.info(f"Batch isteği: {len(sub_requests)} alt istek")
+                responses = self._run_batch(sub_requests)
+                
+                return jsonify({
+                    "success": True,
+                    "responses": responses,
+                    "timestamp": datetime.now().isoformat()
+                })
+                
+            except Exception as e:
+                logger.error(f"Batch isteği hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
         @self.app.route('/api/health', methods=['GET'])
         def health_check():
             """Sağlık kontrolü"""
@@ -551,9 +902,368 @@ class RESTfulServer:
                 "success": True,
                 "status": "healthy",
                 "timestamp": datetime.now().isoformat(),
-                "server": "Hidrologger RESTful API"
+                "server": "Hidrologger RESTful API",
+                "metrics": metrics.metrics_summary(self.cache_stats())
             })
         
+        @self.app.route('/api/metrics', methods=['GET'])
+        def get_metrics():
+            """Prometheus text formatında metrikler (süreç başına)"""
+            return Response(metrics.REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+        
+        @self.app.route('/api/admin/profile/sample', methods=['GET'])
+        def profile_sample():
+            """Tüm thread'leri N saniye örnekle; collapsed stack (flamegraph) veya JSON döndür"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                seconds = request.args.get('seconds', 5.0, type=float)
+                interval = request.args.get('interval', 0.005, type=float)
+                output_format = request.args.get('format', 'collapsed')
+                
+                if not 0 < seconds <= config.PROFILE_MAX_SECONDS or not 0.001 <= interval <= 1:
+                    return jsonify({
+                        "success": False,
+                        "error": f"seconds 0-{config.PROFILE_MAX_SECONDS}, interval 0.001-1 aralığında olmalı"
+                    }), 400
+                
+                logger.info(f"Örnekleme profili başlatıldı: {seconds} saniye")
+                result = SAMPLING_PROFILER.sample(seconds, interval)
+                
+                if output_format == 'json':
+                    return jsonify({
+                        "success": True,
+                        "pid": os.getpid(),
+                        "duration": result["duration"],
+                        "interval": result["interval"],
+                        "samples": result["samples"],
+                        "stacks": [
+                            {"stack": stack, "count": count}
+                            for stack, count in result["stacks"].most_common()
+                        ]
+                    })
+                return Response(SAMPLING_PROFILER.collapsed(result), content_type='text/plain; charset=utf-8',
+                                headers={'X-Hidrologger-Pid': str(os.getpid())})
+                
+            except ProfilerBusyError as e:
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 409
+            except Exception as e:
+                logger.error(f"Örnekleme profili hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/profile/requests', methods=['GET', 'POST', 'DELETE'])
+        def profile_requests():
+            """Sonraki K isteği deterministik profille (POST), sonuçları getir (GET), iptal et (DELETE)"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                if request.method == 'POST':
+                    data = request.get_json(silent=True) or {}
+                    route = data.get('route')
+                    count = data.get('count', 1)
+                    
+                    if not isinstance(route, str) or route not in {rule.rule for rule in self.app.url_map.iter_rules()}:
+                        return jsonify({
+                            "success": False,
+                            "error": "Geçerli bir route gerekli (örn. /api/data/variable)"
+                        }), 400
+                    if not isinstance(count, int) or not 0 < count <= 100:
+                        return jsonify({
+                            "success": False,
+                            "error": "count 1-100 aralığında olmalı"
+                        }), 400
+                    
+                    REQUEST_PROFILER.arm(route, count)
+                elif request.method == 'DELETE':
+                    REQUEST_PROFILER.disarm()
+                
+                return jsonify({
+                    "success": True,
+                    "pid": os.getpid(),
+                    "profile": REQUEST_PROFILER.status()
+                })
+            except Exception as e:
+                logger.error(f"İstek profili hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/slow-requests', methods=['GET', 'DELETE'])
+        def slow_requests():
+            """Yavaş istek kaydı; route, min_ms ve limit ile filtrelenebilir"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                if request.method == 'DELETE':
+                    self.slow_requests.clear()
+                
+                return jsonify({
+                    "success": True,
+                    "journal": self.slow_requests.stats(),
+                    "entries": self.slow_requests.entries(
+                        request.args.get('route'),
+                        request.args.get('min_ms', type=float),
+                        request.args.get('limit', type=int)
+                    )
+                })
+            except Exception as e:
+                logger.error(f"Yavaş istek kaydı getirme hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/logging', methods=['GET', 'PUT'])
+        def logging_levels():
+            """Modül bazlı log seviyelerini getir (GET) veya çalışırken değiştir (PUT)"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                if request.method == 'PUT':
+                    data = request.get_json(silent=True) or {}
+                    levels = data.get('levels')
+                    if not isinstance(levels, dict) or not levels:
+                        return jsonify({
+                            "success": False,
+                            "error": "levels nesnesi gerekli (örn. {\"json_reader\": \"DEBUG\"})"
+                        }), 400
+                    
+                    for name, level in levels.items():
+                        try:
+                            PIPELINE.set_level(str(name), str(level))
+                        except ValueError:
+                            return jsonify({
+                                "success": False,
+                                "error": f"Geçersiz log seviyesi: {name}={level}"
+                            }), 400
+                
+                return jsonify({
+                    "success": True,
+                    "logging": PIPELINE.stats()
+                })
+            except Exception as e:
+                logger.error(f"Log seviyesi işlemi hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/memory', methods=['GET', 'POST', 'DELETE'])
+        def memory_tracking():
+            """Bellek takibini başlat (POST), durdur (DELETE) veya durumunu getir (GET)"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                if request.method == 'POST':
+                    data = request.get_json(silent=True) or {}
+                    frames = data.get('frames', 10)
+                    if not isinstance(frames, int) or not 1 <= frames <= 100:
+                        return jsonify({
+                            "success": False,
+                            "error": "frames 1-100 aralığında olmalı"
+                        }), 400
+                    MEMORY_TRACKER.start(frames)
+                elif request.method == 'DELETE':
+                    MEMORY_TRACKER.stop()
+                
+                return jsonify({
+                    "success": True,
+                    "memory": MEMORY_TRACKER.status()
+                })
+            except Exception as e:
+                logger.error(f"Bellek takibi hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/memory/snapshots', methods=['GET', 'POST'])
+        def memory_snapshots():
+            """Snapshot listesi (GET) veya yeni snapshot (POST, {"name": "..."})"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                if request.method == 'POST':
+                    if not MEMORY_TRACKER.tracing:
+                        return jsonify({
+                            "success": False,
+                            "error": "Bellek takibi kapalı; önce POST /api/admin/memory"
+                        }), 409
+                    data = request.get_json(silent=True) or {}
+                    name = data.get('name')
+                    if name is not None and (not isinstance(name, str) or not name.strip()):
+                        return jsonify({
+                            "success": False,
+                            "error": "name boş olmayan bir metin olmalı"
+                        }), 400
+                    return jsonify({
+                        "success": True,
+                        "snapshot": MEMORY_TRACKER.take_snapshot(name)
+                    })
+                
+                return jsonify({
+                    "success": True,
+                    "snapshots": MEMORY_TRACKER.status()["snapshots"]
+                })
+            except Exception as e:
+                logger.error(f"Bellek snapshot hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/memory/snapshots/<name>', methods=['GET'])
+        def memory_snapshot(name):
+            """Snapshot'taki en büyük ayırma noktaları; compare_to verilirse iki snapshot farkı"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                key_type = request.args.get('key', 'lineno')
+                limit = request.args.get('limit', 20, type=int)
+                compare_to = request.args.get('compare_to')
+                if key_type not in KEY_TYPES:
+                    return jsonify({
+                        "success": False,
+                        "error": f"key şunlardan biri olmalı: {', '.join(KEY_TYPES)}"
+                    }), 400
+                
+                if compare_to:
+                    result = MEMORY_TRACKER.diff(compare_to, name, key_type, limit)
+                else:
+                    result = MEMORY_TRACKER.top(name, key_type, limit)
+                return jsonify({
+                    "success": True,
+                    "memory": result
+                })
+            except SnapshotNotFoundError as e:
+                return jsonify({
+                    "success": False,
+                    "error": f"Snapshot bulunamadı: {e.args[0]}"
+                }), 404
+            except Exception as e:
+                logger.error(f"Bellek snapshot getirme hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/memory/objects', methods=['GET'])
+        def memory_objects():
+            """Tip bazında canlı nesne sayıları (atoms=1 ile float/str/int dahil)"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                return jsonify({
+                    "success": True,
+                    "objects": MEMORY_TRACKER.object_counts(
+                        request.args.get('limit', 30, type=int),
+                        request.args.get('atoms', '0') in ('1', 'true')
+                    )
+                })
+            except Exception as e:
+                logger.error(f"Nesne sayımı hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/retention', methods=['GET'])
+        def retention_status():
+            """Saklama kuralları, son sıkıştırma raporu ve toplamlar"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            return jsonify({
+                "success": True,
+                "storage": self.json_reader.storage.name,
+                "retention": self.compactor.status()
+            })
+        
+        @self.app.route('/api/admin/retention/compact', methods=['POST'])
+        def retention_compact():
+            """Saklama kurallarını ve segment sıkıştırmasını hemen uygula (arka plan işini beklemeden)"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            if not self.compactor.policy.active and not self.json_reader.storage.cold_compression:
+                return jsonify({
+                    "success": False,
+                    "error": "Saklama kuralı tanımlı değil (HIDROLOGGER_RETENTION)"
+                }), 409
+            try:
+                return jsonify({
+                    "success": True,
+                    "report": self.compactor.run_once()
+                })
+            except Exception as e:
+                logger.error(f"Sıkıştırma hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
+        @self.app.route('/api/admin/durability', methods=['GET'])
+        def durability_status():
+            """Dayanıklılık seviyesi, kayıp penceresi, yazma günlüğü ve açılış kurtarma raporu"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            return jsonify({
+                "success": True,
+                "storage": self.json_reader.storage.name,
+                "durability": self.json_reader.storage.durability_status()
+            })
+        
+        @self.app.route('/api/admin/durability/checkpoint', methods=['POST'])
+        def durability_checkpoint():
+            """Yazma günlüğünü hemen ana dosyalara işle"""
+            denied = self._admin_denied()
+            if denied is not None:
+                return denied
+            try:
+                return jsonify({
+                    "success": True,
+                    "report": self.json_reader.storage.checkpoint()
+                })
+            except Exception as e:
+                logger.error(f"Kontrol noktası hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+
+        @self.app.route('/api/traces', methods=['GET'])
+        def get_traces():
+            """Halka tampondaki son trace'ler (süreç başına)"""
+            try:
+                limit = request.args.get('limit', type=int)
+                return jsonify({
+                    "success": True,
+                    "tracing": TRACER.stats(),
+                    "traces": TRACER.traces(limit)
+                })
+            except Exception as e:
+                logger.error(f"Trace listeleme hatası: {e}")
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 500
+        
         @self.app.route('/api/info', methods=['GET'])
         def get_server_info():
             """Sunucu bilgilerini getir"""
@@ -565,7 +1275,9 @@ class RESTfulServer:
                         "version": "1.0.0",
                         "status": "running",
                         "timestamp": datetime.now().isoformat()
-                    }
+                    },
+                    "single_flight": self.json_reader.single_flight.stats(),
+                    "metrics": metrics.metrics_summary(self.cache_stats())
                 })
             except Exception as e:
                 logger.error(f"Sunucu bilgisi getirme hatası: {e}")
@@ -826,11 +1538,81 @@ class RESTfulServer:
                     "error": str(e)
                 }), 500
 
+    def _run_sub_request(self, sub_request: Dict[str, Any]) -> Dict[str, Any]:
+        """Tek bir alt isteği mevcut route handler'ları üzerinden çalıştır"""
+        method = str(sub_request.get('method', 'GET')).upper()
+        path = sub_request['path']
+        body = sub_request.get('body')
+        
+        try:
+            with self.app.test_request_context(path, method=method, json=body):
+                response = self.app.full_dispatch_request()
+            
+            response_body = response.get_json(silent=True)
+            if response_body is None:
+                response_body = response.get_data(as_text=True)
+            
+            return {
+                "id": sub_request.get('id'),
+                "status": response.status_code,
+                "body": response_body
+            }
+        except Exception as e:
+            logger.error(f"Batch alt isteği hatası: {method} {path} - {e}")
+            return {
+                "id": sub_request.get('id'),
+                "status": 500,
+                "body": {"error": str(e)}
+            }
+    
+    def _run_batch(self, sub_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ardışık okumaları aynı doküman görüntüsüyle paralel, yazmaları sırayla çalıştır"""
+        responses = [None] * len(sub_requests)
+        index = 0
+        
+        while index < len(sub_requests):
+            sub_request = sub_requests[index]
+            method = str(sub_request.get('method', 'GET')).upper()
+            if is_write_request(method, sub_request['path'].split('?', 1)[0]):
+                # Yazmalar sırayı korumak için tek başına çalışır
+                responses[index] = self._run_sub_request(sub_request)
+                index += 1
+                continue
+            
+            # Bir sonraki yazmaya kadar olan okumaları grupla
+            group_end = index
+            while group_end < len(sub_requests):
+                candidate = sub_requests[group_end]
+                candidate_method = str(candidate.get('method', 'GET')).upper()
+                if is_write_request(candidate_method, candidate['path'].split('?', 1)[0]):
+                    break
+                group_end += 1
+            
+            with self.json_reader.pinned_documents():
+                if group_end - index == 1:
+                    responses[index] = self._run_sub_request(sub_request)
+                else:
+                    queue_depth = metrics.QUEUE_DEPTH.labels("batch")
+                    futures = []
+                    for position in range(index, group_end):
+                        queue_depth.inc()
+                        future = self.batch_executor.submit(
+                            contextvars.copy_context().run, self._run_sub_request, sub_requests[position]
+                        )
+                        future.add_done_callback(lambda _: queue_depth.dec())
+                        futures.append((position, future))
+                    for position, future in futures:
+                        responses[position] = future.result()
+            
+            index = group_end
+        
+        return responses
+    
     def start_background_monitoring(self):
         """Background monitoring thread'ini başlat"""
         if not self.monitoring_active:
             self.monitoring_active = True
-            self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
+            self.monitoring_thread = threading.Thread(target=self._monitoring_loop, name="monitoring", daemon=True)
             self.monitoring_thread.start()
             logger.info("Background monitoring thread başlatıldı")
 
@@ -873,6 +1655,8 @@ class RESTfulServer:
         # Background monitoring devre dışı - loglar sabit kalacak
         logger.info("Background monitoring devre dışı - loglar sabit kalacak")
         
+        self.rollup_backfiller.start()
+        self.compactor.start()
         try:
             self.app.run(
                 host=host,
@@ -884,6 +1668,9 @@ class RESTfulServer:
         except Exception as e:
             logger.error(f"Sunucu başlatma hatası: {e}")
             raise
+        finally:
+            self.rollup_backfiller.stop()
+            self.compactor.stop()
 
 def main():
     """Ana fonksiyon"""
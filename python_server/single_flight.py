@@ -0,0 +1,104 @@
+import functools
+import logging
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable
+
+from document_cache import current_pinned_documents
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """Devam eden tek bir hesaplama; bekleyenler sonucu buradan alır"""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Aynı anahtarla eşzamanlı gelen çağrıları tek bir hesaplamada birleştirir
+
+    İlk gelen çağrı (lider) fonksiyonu çalıştırır, aynı anahtarla arada gelenler
+    onun sonucunu bekler ve aynı nesneyi alır. Sonuç önbelleğe alınmaz; hesaplama
+    bittiğinde anahtar serbest kalır. Dönen nesneler paylaşıldığı için çağıranlar
+    bunları değiştirmemelidir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.coalesced_by_name = Counter()
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                self.coalesced_by_name[key[0] if isinstance(key, tuple) else key] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                # forget() sonrası aynı anahtarla yeni bir çağrı başlamış olabilir
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+
+    def forget(self):
+        """Devam eden çağrılara yeni katılımı kes (yazma sonrası eski sonucu paylaşmamak için)"""
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "coalesced_by_name": dict(self.coalesced_by_name)
+            }
+
+
+def coalesced(method: Callable[..., Any]) -> Callable[..., Any]:
+    """JSONReader okuma metodları için: aynı argümanlı eşzamanlı çağrıları birleştir"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        flight = getattr(self, "single_flight", None)
+        # Sabitlenmiş doküman görüntüsündeki okumalar başka görüntüyle birleştirilmez
+        if flight is None or current_pinned_documents() is not None:
+            return method(self, *args, **kwargs)
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return flight.do(key, method, self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Tek bir isteğin aşama süreleri (io, parse, filter, sort, serialize...) ve kayıt sayıları"""
+    __slots__ = ("phases", "records_scanned", "records_returned")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.records_scanned = 0
+        self.records_returned = 0
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count(self, scanned: int, returned: int):
+        self.records_scanned += scanned
+        self.records_returned += returned
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+def start_timings():
+    """İstek için yeni ölçüm başlat; reset için token döner"""
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def reset_timings(token):
+    try:
+        _current_timings.reset(token)
+    except ValueError:
+        _current_timings.set(None)
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoopPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_PHASE = _NoopPhase()
+
+
+def phase(name: str):
+    """Aktif istek ölçümü varsa bloğun süresini verilen aşamaya ekle"""
+    timings = _current_timings.get()
+    if timings is None:
+        return _NOOP_PHASE
+    return _Phase(timings, name)
+
+
+def add_phase(name: str, seconds: float):
+    """Elle ölçülen süreyi aktif istek ölçümüne ekle"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def count_records(scanned: int, returned: int):
+    """Taranan ve döndürülen kayıt sayısını aktif istek ölçümüne ekle"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.count(scanned, returned)
+
+
+class SlowRequestJournal:
+    """Eşik süresini aşan isteklerin sınırlı, sorgulanabilir kaydı
+
+    Kayıtlar bellekte halka tamponda tutulur; dosya yolu verilirse ayrıca
+    JSON satırları olarak dönen (rotating) dosyaya yazılır.
+    """
+
+    def __init__(self, threshold_ms: float, max_entries: int = 200, path: str = "",
+                 max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3):
+        self.threshold_ms = threshold_ms
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.path = path.replace("{pid}", str(os.getpid())) if path else ""
+        # Handler doğrudan kullanılır; uygulamanın log seviyesi ayarları kaydı etkilemez
+        self._file_handler = None
+        if self.path:
+            try:
+                self._file_handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count,
+                                                         encoding="utf-8", delay=True)
+                self._file_handler.setFormatter(logging.Formatter("%(message)s"))
+            except Exception as e:
+                logger.error(f"Yavaş istek dosyası açılamadı {self.path}: {e}")
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return duration_ms >= self.threshold_ms
+
+    def record(self, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+        logger.warning(f"Yavaş istek: {entry['method']} {entry['path']} {entry['duration_ms']} ms")
+        if self._file_handler is not None:
+            self._file_handler.handle(logging.makeLogRecord({
+                "msg": json.dumps(entry, ensure_ascii=False),
+                "levelno": logging.INFO,
+                "levelname": "INFO"
+            }))
+
+    def entries(self, route: Optional[str] = None, min_ms: Optional[float] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Kayıtları yeniden eskiye döndür; route ve minimum süreye göre filtrele"""
+        with self._lock:
+            entries = list(self._entries)[::-1]
+        if route is not None:
+            entries = [entry for entry in entries if entry["route"] == route]
+        if min_ms is not None:
+            entries = [entry for entry in entries if entry["duration_ms"] >= min_ms]
+        if limit is not None:
+            entries = entries[:limit]
+        return entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "recorded": self.recorded,
+            "buffered": len(self._entries),
+            "path": self.path or None
+        }
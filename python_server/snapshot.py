@@ -0,0 +1,160 @@
+import json
+import mmap
+import os
+import struct
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshot'a alınan dokümanlar (jsons klasörüne göre göreli yollar)
+SNAPSHOT_DOCUMENTS = (
+    "variable/channel.json",
+    "variable/data.json",
+    "alarm/alarm.json",
+    "semi-variable/station.json",
+)
+
+# Dosya başlığı: magic, format versiyonu, nesil (generation), payload uzunluğu
+SNAPSHOT_MAGIC = b"HDSN"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sIQQ")
+
+
+def document_key(base_path: str, file_path: str) -> str:
+    """Dosya yolunu jsons klasörüne göre göreli doküman anahtarına çevir"""
+    return os.path.relpath(file_path, base_path).replace(os.sep, "/")
+
+
+class SnapshotPublisher:
+    """Sahip (owner) süreçte çalışır: dokümanları bir kez parse edip snapshot dosyasına yazar"""
+
+    def __init__(self, json_reader, snapshot_path: str, interval: float = 0.1):
+        self.json_reader = json_reader
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.generation = self._existing_generation()
+        self._published_versions: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._active = False
+        self._thread = None
+
+    def _existing_generation(self) -> int:
+        """Önceki yayıncının bıraktığı nesilden devam et"""
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                magic, version, generation, _ = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+            return generation if magic == SNAPSHOT_MAGIC and version == SNAPSHOT_VERSION else 0
+        except (OSError, struct.error):
+            return 0
+
+    def _current_versions(self) -> Dict[str, Any]:
+        return {key: self.json_reader.storage.document_version(key) for key in SNAPSHOT_DOCUMENTS}
+
+    def publish(self) -> int:
+        """Dokümanları oku ve yeni nesil snapshot'ı atomik olarak yayınla"""
+        with self._lock:
+            versions = self._current_versions()
+            documents = {}
+            for key in SNAPSHOT_DOCUMENTS:
+                if versions[key] is not None:
+                    documents[key] = self.json_reader._read_json_file(os.path.join(self.json_reader.base_path, key))
+
+            payload = json.dumps(documents, ensure_ascii=False).encode("utf-8")
+            self.generation += 1
+            header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.generation, len(payload))
+
+            # Okuyucular yarım dosya görmesin diye geçici dosyaya yazıp yer değiştir
+            temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(header)
+                file.write(payload)
+            os.replace(temp_path, self.snapshot_path)
+
+            self._published_versions = versions
+            logger.info(f"Snapshot yayınlandı: nesil {self.generation}, {len(payload)} byte")
+            return self.generation
+
+    def publish_if_changed(self) -> bool:
+        """Dokümanlardan biri değiştiyse yeni snapshot yayınla"""
+        if self._current_versions() == self._published_versions:
+            return False
+        self.publish()
+        return True
+
+    def start(self):
+        """Harici yazıcıları (veri kaydedici vb.) yakalamak için izleme thread'ini başlat"""
+        if not self._active:
+            self._active = True
+            self._thread = threading.Thread(target=self._loop, name="snapshot-publisher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._active = False
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _loop(self):
+        while self._active:
+            try:
+                self.publish_if_changed()
+            except Exception as e:
+                logger.error(f"Snapshot yayınlama hatası: {e}")
+            time.sleep(self.interval)
+
+
+class SnapshotReader:
+    """Worker süreçlerinde çalışır: snapshot dosyasını mmap ile okur, nesil değişince yeniler"""
+
+    def __init__(self, snapshot_path: str, check_interval: float = 0.1):
+        self.snapshot_path = snapshot_path
+        self.check_interval = check_interval
+        self.generation = 0
+        self._documents: Dict[str, Any] = {}
+        self._file_identity: Optional[Tuple[int, int, int]] = None
+        self._last_check_time = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Snapshot'taki dokümanı döndür; snapshot yoksa None (çağıran dosyadan okur)"""
+        now = time.monotonic()
+        if now - self._last_check_time >= self.check_interval:
+            with self._lock:
+                if now - self._last_check_time >= self.check_interval:
+                    self._refresh()
+                    self._last_check_time = now
+        return self._documents.get(key)
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.snapshot_path)
+        except OSError:
+            self._documents = {}
+            self._file_identity = None
+            return
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._file_identity or stat.st_size < SNAPSHOT_HEADER.size:
+            return
+
+        try:
+            with open(self.snapshot_path, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, version, generation, length = SNAPSHOT_HEADER.unpack_from(mapped, 0)
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                    logger.error(f"Geçersiz snapshot dosyası: {self.snapshot_path}")
+                    return
+                with memoryview(mapped) as view, \
+                        view[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length] as payload:
+                    documents = json.loads(payload.tobytes().decode("utf-8")) if length else {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Snapshot okuma hatası: {e}")
+            return
+
+        self._documents = documents
+        self._file_identity = identity
+        self.generation = generation
+        logger.debug(f"Snapshot yüklendi: nesil {generation}")
@@ -0,0 +1,553 @@
+import json
+import os
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+import metrics
+import tracing
+from rollups import TIER_NAMES, aggregate, bucket_start, enabled_tiers, make_point, reading
+from slow_request_journal import count_records, phase
+from storage import LOGS_DOCUMENT, DocumentVersion, LogWriter, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS documents (
+        key TEXT PRIMARY KEY,
+        body TEXT NOT NULL,
+        revision INTEGER NOT NULL,
+        updated_ns INTEGER NOT NULL,
+        source TEXT
+    )""",
+    # Kolon tipleri bilerek verilmedi: değerler JSON'daki tipleriyle (int/float/str) saklanır,
+    # karşılaştırmalar JSON backend'indeki Python karşılaştırmalarıyla aynı sonucu verir
+    """CREATE TABLE IF NOT EXISTS logs (
+        seq INTEGER PRIMARY KEY,
+        channel,
+        value_timestamp,
+        value,
+        body TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS logs_channel_time ON logs (channel, value_timestamp)",
+    "CREATE INDEX IF NOT EXISTS logs_channel_seq ON logs (channel, seq)",
+    "CREATE INDEX IF NOT EXISTS logs_time ON logs (value_timestamp)",
+    # Özet kovaları (rollups.py); tier kova genişliği (sn), bucket kova başlangıcı.
+    # Değer kolonları tipsiz: tamsayı ölçümler JSON backend'indeki gibi tamsayı kalır
+    """CREATE TABLE IF NOT EXISTS rollups (
+        tier INTEGER NOT NULL,
+        channel,
+        bucket INTEGER NOT NULL,
+        min, max, sum,
+        count INTEGER NOT NULL,
+        last, last_ts, last_seq,
+        PRIMARY KEY (tier, channel, bucket)
+    ) WITHOUT ROWID""",
+    # live_from'dan sonraki loglar eklenirken, backfilled'a kadar olanlar arka planda özetlenmiştir;
+    # backfilled >= live_from olduğunda katman sorgulanabilir
+    """CREATE TABLE IF NOT EXISTS rollup_state (
+        tier INTEGER PRIMARY KEY,
+        live_from INTEGER NOT NULL,
+        backfilled INTEGER NOT NULL
+    )""",
+)
+
+UPSERT_DOCUMENT = """
+    INSERT INTO documents (key, body, revision, updated_ns, source) VALUES (?, ?, 1, ?, ?)
+    ON CONFLICT (key) DO UPDATE SET
+        body = excluded.body,
+        revision = documents.revision + 1,
+        updated_ns = excluded.updated_ns,
+        source = COALESCE(excluded.source, documents.source)
+"""
+INSERT_LOG = "INSERT INTO logs (channel, value_timestamp, value, body) VALUES (?, ?, ?, ?)"
+UPSERT_ROLLUP = """
+    INSERT INTO rollups (tier, channel, bucket, min, max, sum, count, last, last_ts, last_seq)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (tier, channel, bucket) DO UPDATE SET
+        min = MIN(rollups.min, excluded.min),
+        max = MAX(rollups.max, excluded.max),
+        sum = rollups.sum + excluded.sum,
+        count = rollups.count + excluded.count,
+        last = CASE WHEN (excluded.last_ts, excluded.last_seq) >= (rollups.last_ts, rollups.last_seq)
+                    THEN excluded.last ELSE rollups.last END,
+        last_seq = CASE WHEN (excluded.last_ts, excluded.last_seq) >= (rollups.last_ts, rollups.last_seq)
+                        THEN excluded.last_seq ELSE rollups.last_seq END,
+        last_ts = MAX(rollups.last_ts, excluded.last_ts)
+"""
+
+# Havuzda boşta tutulan en fazla bağlantı; istek başına thread açan sunucularda bağlantı sızmasın
+MAX_IDLE_CONNECTIONS = 8
+# config.DURABILITY -> PRAGMA synchronous; WAL'da NORMAL kesintide son işlemleri kaybedebilir ama
+# veritabanını bozmaz, FULL her commit'te WAL'ı fsync eder
+SYNCHRONOUS = {"none": "OFF", "batch": "NORMAL", "sync": "FULL"}
+
+
+def _column_value(value: Any) -> Any:
+    """SQLite'a bağlanamayan değerleri (liste, dict) karşılaştırılabilir metne çevir"""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def _upsert_rollups(connection: sqlite3.Connection, rows: Iterable[Tuple[int, Any, Any, Any]], tiers: List[int]):
+    """(seq, kanal, zaman, değer) satırlarını katmanların kovalarına ekle"""
+    readings = []
+    for seq, channel, value_timestamp, value in rows:
+        parsed = reading(value_timestamp, value)
+        if parsed is not None:
+            readings.append((channel, parsed[0], parsed[1], seq))
+    buckets = aggregate(readings, tiers)
+    connection.executemany(UPSERT_ROLLUP, [
+        (tier, channel, start, bucket.min, bucket.max, bucket.sum, bucket.count,
+         bucket.last, bucket.last_ts, bucket.last_seq)
+        for (tier, channel, start), bucket in buckets.items()
+    ])
+
+
+def _log_row(record: Dict[str, Any]):
+    return (_column_value(record.get('channel')),
+            _column_value(record.get('value_timestamp', 0)),
+            _column_value(record.get('value')),
+            json.dumps(record, ensure_ascii=False))
+
+
+class _SQLiteLogWriter(LogWriter):
+    def __init__(self, connection: sqlite3.Connection):
+        super().__init__()
+        self.connection = connection
+        self.pending: List[Dict[str, Any]] = []
+
+    def exists(self, channel: Any, value_timestamp: Any, value: Any) -> bool:
+        for log in self.pending:
+            if (log.get('value') == value and log.get('value_timestamp') == value_timestamp
+                    and log.get('channel') == channel):
+                return True
+        row = self.connection.execute(
+            "SELECT 1 FROM logs WHERE channel IS ? AND value_timestamp IS ? AND value IS ? LIMIT 1",
+            (_column_value(channel), _column_value(value_timestamp), _column_value(value))
+        ).fetchone()
+        return row is not None
+
+    def last(self, channel: Any) -> Optional[Dict[str, Any]]:
+        for log in reversed(self.pending):
+            if log.get('channel') == channel:
+                return log
+        row = self.connection.execute(
+            "SELECT body FROM logs WHERE channel IS ? ORDER BY seq DESC LIMIT 1", (_column_value(channel),)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def append(self, record: Dict[str, Any]):
+        self.pending.append(record)
+        self.appended += 1
+
+    def extend(self, records: List[Dict[str, Any]]):
+        self.pending.extend(records)
+        self.appended += len(records)
+
+    def flush(self) -> int:
+        rows = [_log_row(record) for record in self.pending]
+        # Yazma kilidi tutulduğu için eklenen satırlar son seq'ten itibaren sırayla numaralanır
+        last_seq = self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM logs").fetchone()[0]
+        self.connection.executemany(INSERT_LOG, rows)
+        tiers = [tier for tier, in self.connection.execute("SELECT tier FROM rollup_state")]
+        if tiers:
+            _upsert_rollups(self.connection, ((last_seq + number, row[0], row[1], row[2])
+                                              for number, row in enumerate(rows, start=1)), tiers)
+        self.pending = []
+        return sum(len(row[3]) for row in rows)
+
+
+class SQLiteStorage(StorageBackend):
+    """Gömülü SQLite backend'i (WAL modu)
+
+    Dokümanlar revizyonlu JSON gövdeleri olarak, loglar (kanal, zaman) indeksli satırlar
+    olarak saklanır; her satır kaydın orijinal JSON'unu da tutar, böylece yanıtlar JSON
+    backend'iyle birebir aynıdır. `file_fed` dokümanları harici yazıcılar diskte günceller;
+    dosya değiştikçe veritabanına alınır.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database_path: str, base_path: str, file_fed: Optional[List[str]] = None):
+        super().__init__()
+        self.database_path = database_path
+        self.base_path = base_path
+        if file_fed is None:
+            file_fed = [key.strip() for key in config.SQLITE_FILE_FED_DOCUMENTS.split(",") if key.strip()]
+        self.file_fed = frozenset(file_fed)
+        self._pool: List[sqlite3.Connection] = []
+        self._pool_pid = os.getpid()
+        self._pool_lock = threading.Lock()
+        self.durability = config.DURABILITY.strip().lower()
+        if self.durability not in SYNCHRONOUS:
+            logger.warning(f"Bilinmeyen dayanıklılık seviyesi {self.durability!r}, 'batch' kullanılıyor")
+            self.durability = "batch"
+        self.synchronous = SYNCHRONOUS[self.durability]
+
+        directory = os.path.dirname(database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            # Yalnızca yeni veritabanında etkili: silinen log sayfaları dosyadan geri verilebilsin
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._register_rollup_tiers(connection)
+        logger.info(f"SQLite depolama kullanılıyor: {database_path}")
+
+    def _register_rollup_tiers(self, connection: sqlite3.Connection):
+        """Yeni açılan katmanlar bundan sonraki eklemelerde güncellenir, öncesi arka planda doldurulur"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            known = {tier for tier, in connection.execute("SELECT tier FROM rollup_state")}
+            missing = [tier for tier in enabled_tiers() if tier not in known]
+            if missing:
+                live_from = connection.execute("SELECT COALESCE(MAX(seq), 0) FROM logs").fetchone()[0]
+                connection.executemany("INSERT INTO rollup_state (tier, live_from, backfilled) VALUES (?, ?, 0)",
+                                       [(tier, live_from) for tier in missing])
+                logger.info(f"Rollup katmanları eklendi: {', '.join(TIER_NAMES[tier] for tier in missing)}"
+                            f" ({live_from} kayıt arka planda özetlenecek)")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.rollback()
+            raise
+
+    # Bağlantı havuzu
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: işlemler BEGIN/COMMIT ile elle yönetilir;
+        # hazırlanmış ifadeler bağlantı başına SQL metnine göre önbelleklenir
+        connection = sqlite3.connect(self.database_path, timeout=config.SQLITE_BUSY_TIMEOUT,
+                                     isolation_level=None, check_same_thread=False, cached_statements=256)
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = None
+        with self._pool_lock:
+            if self._pool_pid != os.getpid():
+                # fork sonrası ebeveynin bağlantıları kullanılmaz
+                self._pool = []
+                self._pool_pid = os.getpid()
+            if self._pool:
+                connection = self._pool.pop()
+        if connection is None:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            with self._pool_lock:
+                if len(self._pool) < MAX_IDLE_CONNECTIONS and self._pool_pid == os.getpid():
+                    self._pool.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for connection in pool:
+            connection.close()
+
+    def durability_status(self) -> Dict[str, Any]:
+        # Kurtarmayı SQLite yapar (WAL); NORMAL'de kayıp penceresi son WAL checkpoint'ine kadardır
+        return {
+            "level": self.durability,
+            "synchronous": self.synchronous,
+            "lost_write_window_seconds": 0.0 if self.synchronous == "FULL" else None,
+        }
+
+    # Dokümanlar
+
+    def _sync_file(self, connection: sqlite3.Connection, key: str):
+        """Harici yazıcının güncellediği dosyayı, değiştiyse veritabanına al"""
+        if key not in self.file_fed:
+            return
+        file_path = os.path.join(self.base_path, key)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        source = f"{stat.st_mtime_ns}:{stat.st_size}"
+        row = connection.execute("SELECT source FROM documents WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[0] == source:
+            return
+        try:
+            with open(file_path, 'rb') as file:
+                content = file.read().decode('utf-8')
+            if content.strip():
+                json.loads(content)
+        except (OSError, ValueError) as e:
+            # Yazıcı dosyayı yazarken okunmuş olabilir; bir sonraki okumada tekrar denenir
+            logger.warning(f"{file_path} veritabanına alınamadı: {e}")
+            return
+        connection.execute(UPSERT_DOCUMENT, (key, content.strip(), time.time_ns(), source))
+        logger.info(f"{key} diskten veritabanına alındı")
+
+    def _document_body(self, key: str) -> Optional[str]:
+        with self._connection() as connection:
+            self._sync_file(connection, key)
+            with tracing.span("sqlite.read", key=key), phase("io"):
+                row = connection.execute("SELECT body FROM documents WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def read_document(self, key: str) -> Dict[str, Any]:
+        try:
+            body = self._document_body(key)
+            if body is None:
+                logger.warning(f"Doküman bulunamadı: {key}")
+                return {}
+            if not body:
+                logger.warning(f"Doküman boş: {key}")
+                return {}
+            data = self._parse(key, body.encode('utf-8'), key)
+            logger.debug("Doküman başarıyla okundu: %s", key)
+            return data
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse hatası {key}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Doküman okuma hatası {key}: {e}")
+            return {}
+
+    def load_document(self, key: str) -> Any:
+        body = self._document_body(key)
+        if body is None:
+            raise FileNotFoundError(key)
+        return json.loads(body)
+
+    def write_document(self, key: str, data: Any):
+        with tracing.span("file.dump", path=key), phase("dump"):
+            body = json.dumps(data, ensure_ascii=False)
+        with self._connection() as connection, phase("io"):
+            with tracing.span("sqlite.write", key=key, bytes=len(body)):
+                connection.execute(UPSERT_DOCUMENT, (key, body, time.time_ns(), None))
+        writes, write_bytes = self._write_metrics(key)
+        writes.inc()
+        write_bytes.inc(len(body))
+
+    def document_version(self, key: str) -> DocumentVersion:
+        with self._connection() as connection:
+            self._sync_file(connection, key)
+            row = connection.execute(
+                "SELECT updated_ns, revision FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def list_documents(self, folder: str) -> Optional[List[str]]:
+        prefix = folder.rstrip("/") + "/"
+        with self._connection() as connection:
+            for key in self.file_fed:
+                if key.startswith(prefix):
+                    self._sync_file(connection, key)
+            # '0' karakteri '/' karakterinden hemen sonra gelir: prefix aralık taraması
+            rows = connection.execute(
+                "SELECT key FROM documents WHERE key >= ? AND key < ? ORDER BY key",
+                (prefix, prefix[:-1] + "0")
+            ).fetchall()
+        names = [key[len(prefix):] for key, in rows]
+        names = [name for name in names if '/' not in name and name.endswith('.json')]
+        return names or None
+
+    # Loglar
+
+    def query_logs(self, channel: Optional[Any] = None, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Optional[List[Dict[str, Any]]]:
+        clauses = []
+        params = []
+        if channel is not None:
+            clauses.append("channel = ?")
+            params.append(_column_value(channel))
+        if start is not None:
+            clauses.append("value_timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("value_timestamp <= ?")
+            params.append(end)
+        sql = "SELECT body FROM logs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+
+        with self._connection() as connection:
+            with tracing.span("sqlite.query", sql=sql) as query_span, phase("io"):
+                rows = connection.execute(sql, params).fetchall()
+                query_span.set_attribute("rows", len(rows))
+
+        reads, read_bytes, parse_duration = self._read_metrics(LOGS_DOCUMENT)
+        reads.inc()
+        with phase("parse"):
+            started = time.perf_counter()
+            logs = [json.loads(body) for body, in rows]
+            parse_duration.observe(time.perf_counter() - started)
+        read_bytes.inc(sum(len(body) for body, in rows))
+        count_records(len(rows), 0)
+        return logs
+
+    @contextmanager
+    def log_writer(self) -> Iterator[LogWriter]:
+        with self._connection() as connection:
+            # Yazma kilidi baştan alınır: kontroller ve eklemeler aynı görüntü üzerinde çalışır
+            connection.execute("BEGIN IMMEDIATE")
+            writer = _SQLiteLogWriter(connection)
+            try:
+                yield writer
+                with tracing.span("sqlite.write", key=LOGS_DOCUMENT, rows=len(writer.pending)), phase("io"):
+                    written_bytes = writer.flush()
+                    connection.execute("COMMIT")
+            except BaseException:
+                connection.rollback()
+                raise
+        if writer.appended:
+            writes, write_bytes = self._write_metrics(LOGS_DOCUMENT)
+            writes.inc()
+            write_bytes.inc(written_bytes)
+
+    def count_logs(self) -> int:
+        with self._connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+
+    def query_rollups(self, seconds: int, channel: Any, start: int, end: int) -> Optional[List[Dict[str, Any]]]:
+        with self._connection() as connection:
+            # Durum ve kovalar aynı okuma görüntüsünden gelsin
+            connection.execute("BEGIN")
+            state = connection.execute(
+                "SELECT live_from, backfilled FROM rollup_state WHERE tier = ?", (seconds,)
+            ).fetchone()
+            if state is None or state[1] < state[0]:
+                return None
+            with tracing.span("sqlite.query", sql="rollups", tier=seconds) as query_span, phase("io"):
+                rows = connection.execute(
+                    "SELECT bucket, min, max, sum, count, last FROM rollups "
+                    "WHERE tier = ? AND channel = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+                    (seconds, _column_value(channel), bucket_start(start, seconds), end)
+                ).fetchall()
+                query_span.set_attribute("rows", len(rows))
+            connection.execute("COMMIT")
+        count_records(len(rows), 0)
+        return [make_point(*row) for row in rows]
+
+    def backfill_rollups(self, batch_size: int) -> bool:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                state = connection.execute(
+                    "SELECT live_from, backfilled FROM rollup_state WHERE backfilled < live_from "
+                    "ORDER BY backfilled LIMIT 1"
+                ).fetchone()
+                if state is None:
+                    connection.execute("COMMIT")
+                    return False
+                live_from, backfilled = state
+                # Aynı noktadaki katmanlar tek okumada doldurulur
+                tiers = [tier for tier, in connection.execute(
+                    "SELECT tier FROM rollup_state WHERE live_from = ? AND backfilled = ?", (live_from, backfilled))]
+                rows = connection.execute(
+                    "SELECT seq, channel, value_timestamp, value FROM logs WHERE seq > ? AND seq <= ? "
+                    "ORDER BY seq LIMIT ?", (backfilled, live_from, batch_size)
+                ).fetchall()
+                _upsert_rollups(connection, rows, tiers)
+                progress = rows[-1][0] if len(rows) == batch_size else live_from
+                connection.executemany("UPDATE rollup_state SET backfilled = ? WHERE tier = ?",
+                                       [(progress, tier) for tier in tiers])
+                remaining = connection.execute(
+                    "SELECT 1 FROM rollup_state WHERE backfilled < live_from LIMIT 1").fetchone() is not None
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.rollback()
+                raise
+        metrics.ROLLUP_BACKFILLED_RECORDS.inc(len(rows))
+        if progress >= live_from:
+            logger.info(f"Rollup katmanları dolduruldu: {', '.join(TIER_NAMES.get(tier, str(tier)) for tier in tiers)}")
+        return remaining
+
+    # Saklama
+
+    def compact_logs(self, cutoff: Callable[[Any], Optional[float]]) -> Dict[str, int]:
+        """Süresi dolan satırları kanal kanal, kısa yazma işlemleriyle sil
+
+        Her işlem en fazla COMPACTION_BATCH satır siler; yazıcılar işlemler arasında
+        devam eder. Özet katmanları doldurulurken ham veri silinmez, yoksa geçmiş
+        özetlere hiç girmeden kaybolurdu.
+        """
+        report = {"scanned_records": 0, "removed_records": 0, "reclaimed_bytes": 0}
+        with self._connection() as connection:
+            if connection.execute("SELECT 1 FROM rollup_state WHERE backfilled < live_from LIMIT 1").fetchone():
+                logger.info("Rollup katmanları doldurulurken log silme ertelendi")
+                return report
+            report["scanned_records"] = connection.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+            # INTEGER PRIMARY KEY en büyük seq silinirse yeniden kullanılır; son satır korunur
+            last_seq = connection.execute("SELECT COALESCE(MAX(seq), 0) FROM logs").fetchone()[0]
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            free_before = connection.execute("PRAGMA freelist_count").fetchone()[0]
+
+            channels = [channel for channel, in connection.execute("SELECT DISTINCT channel FROM logs")]
+            for channel in channels:
+                limit = cutoff(channel)
+                if limit is None:
+                    continue
+                while True:
+                    connection.execute("BEGIN IMMEDIATE")
+                    try:
+                        removed = connection.execute(
+                            "DELETE FROM logs WHERE seq IN (SELECT seq FROM logs WHERE channel IS ? "
+                            "AND value_timestamp < ? AND typeof(value_timestamp) IN ('integer', 'real') "
+                            "AND seq < ? LIMIT ?)",
+                            (channel, limit, last_seq, config.COMPACTION_BATCH)
+                        ).rowcount
+                        connection.execute("COMMIT")
+                    except BaseException:
+                        connection.rollback()
+                        raise
+                    report["removed_records"] += removed
+                    if removed < config.COMPACTION_BATCH:
+                        break
+
+            if report["removed_records"]:
+                freed = connection.execute("PRAGMA freelist_count").fetchone()[0] - free_before
+                report["reclaimed_bytes"] = max(freed, 0) * page_size
+                self._release_free_pages(connection)
+        return report
+
+    def _release_free_pages(self, connection: sqlite3.Connection):
+        """Boş sayfaları dosyadan geri ver (auto_vacuum=INCREMENTAL ile oluşturulmuş veritabanında)"""
+        if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            connection.execute("PRAGMA incremental_vacuum").fetchall()
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+
+    def compact_rollups(self, cutoffs: Dict[int, float]) -> int:
+        removed = 0
+        with self._connection() as connection:
+            for seconds, cutoff in cutoffs.items():
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    removed += connection.execute(
+                        "DELETE FROM rollups WHERE tier = ? AND bucket <= ?", (seconds, cutoff - seconds)
+                    ).rowcount
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.rollback()
+                    raise
+            if removed:
+                self._release_free_pages(connection)
+        return removed
+
+    def iter_logs(self) -> Iterator[Dict[str, Any]]:
+        with self._connection() as connection:
+            cursor = connection.execute("SELECT body FROM logs ORDER BY seq")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for body, in rows:
+                    yield json.loads(body)
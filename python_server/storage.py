@@ -0,0 +1,810 @@
+import json
+import os
+import logging
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+import metrics
+import tracing
+from journal import Durability, Journal, apply_logs, atomic_write
+from rollups import RollupTiers, enabled_tiers
+from slow_request_journal import count_records, phase
+
+logger = logging.getLogger(__name__)
+
+# Doküman anahtarları jsons klasörüne göre göreli yollardır (snapshot.document_key ile aynı)
+DOCUMENT_FOLDERS = ("constant", "variable", "semi-variable", "alarm", "logsfile")
+CHANNEL_DOCUMENT = "variable/channel.json"
+DATA_DOCUMENT = "variable/data.json"
+ALARM_DOCUMENT = "alarm/alarm.json"
+STATION_DOCUMENT = "semi-variable/station.json"
+LOGS_DOCUMENT = "logsfile/logs.json"
+# JSON backend'inin yazma günlüğü (journal.py); logs.json'a henüz işlenmemiş eklemeler ve doküman yazmaları
+JOURNAL_DOCUMENT = "logsfile/logs.journal"
+
+# İlk eleman nanosaniye cinsinden artan bir damga (dosyada mtime), ikincisi backend'e özgü;
+# doküman yoksa None
+DocumentVersion = Optional[Tuple[int, int]]
+
+
+class LogWriter:
+    """Tek bir yazma işlemi içindeki log eklemeleri
+
+    Kontroller (`exists`, `last`) aynı işlemde eklenmiş kayıtları da görür; eklemeler
+    işlem sonunda toplu olarak kalıcı hale getirilir.
+    """
+
+    def __init__(self):
+        self.appended = 0
+
+    def exists(self, channel: Any, value_timestamp: Any, value: Any) -> bool:
+        raise NotImplementedError
+
+    def last(self, channel: Any) -> Optional[Dict[str, Any]]:
+        """Kanalın eklenme sırasına göre son log kaydı"""
+        raise NotImplementedError
+
+    def append(self, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def extend(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self.append(record)
+
+
+class StorageBackend:
+    """JSONReader'ın kalıcılık arayüzü
+
+    Kanallar, anlık değerler, alarmlar ve istasyonlar versiyonlu dokümanlar olarak,
+    log kayıtları ise ayrı bir kayıt API'si üzerinden saklanır. Okuma hataları
+    mevcut JSON davranışıyla aynı şekilde boş dict olarak döner.
+    """
+
+    name = "base"
+    # Soğuk verinin sıkıştırıldığı codec (segment backend'i); None ise sıkıştırma yok
+    cold_compression: Optional[str] = None
+    # Kanal başına ikili okuma kopyası (column_store.ColumnStore; segment backend'i)
+    column_store = None
+
+    def __init__(self):
+        # Doküman başına metrik çocukları; etiket araması sıcak yolda tekrarlanmasın
+        self._read_metric_children = {}
+        self._write_metric_children = {}
+
+    # Dokümanlar
+
+    def read_document(self, key: str) -> Dict[str, Any]:
+        """Dokümanı oku; yoksa, boşsa veya bozuksa uyarı yazıp {} döndür"""
+        raise NotImplementedError
+
+    def load_document(self, key: str) -> Any:
+        """Dokümanı oku; yoksa FileNotFoundError, bozuksa json.JSONDecodeError fırlatır"""
+        raise NotImplementedError
+
+    def write_document(self, key: str, data: Any):
+        raise NotImplementedError
+
+    def document_version(self, key: str) -> DocumentVersion:
+        raise NotImplementedError
+
+    def document_exists(self, key: str) -> bool:
+        return self.document_version(key) is not None
+
+    def list_documents(self, folder: str) -> Optional[List[str]]:
+        """Klasördeki doküman dosya adları (örn. "data.json"); klasör yoksa None"""
+        raise NotImplementedError
+
+    # Loglar
+
+    def query_logs(self, channel: Optional[Any] = None, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Optional[List[Dict[str, Any]]]:
+        """Filtreye uyan log kayıtları, eklenme sırasıyla; log dokümanı okunamıyorsa None
+
+        Zaman damgası olmayan kayıtlar zaman filtresinde 0 kabul edilir.
+        """
+        raise NotImplementedError
+
+    def log_writer(self):
+        """`with storage.log_writer() as writer:` biçiminde kullanılan LogWriter bağlamı"""
+        raise NotImplementedError
+
+    def count_logs(self) -> int:
+        raise NotImplementedError
+
+    def iter_logs(self) -> Iterator[Dict[str, Any]]:
+        """Tüm log kayıtları, eklenme sırasıyla"""
+        raise NotImplementedError
+
+    def tail_logs(self, cursor: Any) -> Optional[Tuple[Any, bool, List[Dict[str, Any]]]]:
+        """İmleçten sonra eklenen loglar: (yeni imleç, baştan mı, kayıtlar)
+
+        İmleç None ise veya geçersizleştiyse (sıkıştırma, yeniden yazma) tüm loglar
+        `baştan=True` ile döner. Backend desteklemiyorsa None (hot_tail.py).
+        """
+        return None
+
+    # Özetler (rollups.py)
+
+    def query_rollups(self, seconds: int, channel: Any, start: int, end: int) -> Optional[List[Dict[str, Any]]]:
+        """Katmanın [start kovası, end] aralığındaki noktaları; katman hazır değilse None"""
+        return None
+
+    def backfill_rollups(self, batch_size: int) -> bool:
+        """Mevcut geçmişin bir partisini özetlere ekle; iş kaldıysa True"""
+        return False
+
+    def query_columns(self, channel: Any, start: Optional[int], end: Optional[int]) -> Optional[List[Any]]:
+        """Kanalın sabit genişlikli kayıt dilimleri (column_store); depo yoksa veya eksikse None"""
+        return None
+
+    def backfill_columns(self) -> bool:
+        """Mevcut geçmişin bir bölümünü sütun deposuna aktar; iş kaldıysa True"""
+        return False
+
+    def save_indexes(self):
+        """Bellekteki indeksleri yan dosyalara yaz (kapanışta ve arka plan işinde)"""
+
+    # Saklama (retention.py)
+
+    def compact_logs(self, cutoff: Callable[[Any], Optional[float]]) -> Dict[str, int]:
+        """`cutoff(kanal)` zamanından eski log kayıtlarını sil (None: sakla)
+
+        Zaman damgası sayısal olmayan kayıtlar silinmez. Rapor: scanned_records,
+        removed_records, reclaimed_bytes, dropped_segments, rewritten_segments.
+        """
+        raise NotImplementedError
+
+    def compact_rollups(self, cutoffs: Dict[int, float]) -> int:
+        """Katman başına sınırdan önce biten özet kovalarını sil; silinen kova sayısı"""
+        return 0
+
+    def compress_segments(self) -> Dict[str, int]:
+        """Soğuk veriyi sıkıştır; rapor: compressed_segments, compression_saved_bytes"""
+        return {"compressed_segments": 0, "compression_saved_bytes": 0}
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Backend'in kendi önbellekleri (isim -> hits, misses, hit_ratio, ...)"""
+        return {}
+
+    def close(self):
+        pass
+
+    # Dayanıklılık (journal.py)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Bekleyen yazma günlüğünü ana dosyalara işle; rapor"""
+        return {}
+
+    def durability_status(self) -> Dict[str, Any]:
+        """Dayanıklılık seviyesi, kayıp penceresi, günlük durumu ve son açılış kurtarması"""
+        return {}
+
+    # Metrikler
+
+    def _read_metrics(self, key: str):
+        children = self._read_metric_children.get(key)
+        if children is None:
+            children = (metrics.FILE_READS.labels(key),
+                        metrics.FILE_READ_BYTES.labels(key),
+                        metrics.FILE_PARSE_DURATION.labels(key))
+            self._read_metric_children[key] = children
+        return children
+
+    def _write_metrics(self, key: str):
+        children = self._write_metric_children.get(key)
+        if children is None:
+            children = (metrics.FILE_WRITES.labels(key), metrics.FILE_WRITE_BYTES.labels(key))
+            self._write_metric_children[key] = children
+        return children
+
+    def _parse(self, key: str, content: bytes, path: str) -> Any:
+        reads, read_bytes, parse_duration = self._read_metrics(key)
+        reads.inc()
+        read_bytes.inc(len(content))
+        with tracing.span("file.parse", path=path), phase("parse"):
+            started = time.perf_counter()
+            data = json.loads(content)
+            parse_duration.observe(time.perf_counter() - started)
+        return data
+
+
+def filter_logs(logs: List[Any], channel: Optional[Any] = None, start: Optional[Any] = None,
+                end: Optional[Any] = None) -> List[Dict[str, Any]]:
+    filtered_logs = []
+    for log in logs:
+        if not isinstance(log, dict):
+            logger.warning(f"Log entry dict değil, tip: {type(log)}")
+            continue
+        if channel is not None and log.get('channel') != channel:
+            continue
+        log_timestamp = log.get('value_timestamp', 0)
+        if start is not None and log_timestamp < start:
+            continue
+        if end is not None and log_timestamp > end:
+            continue
+        filtered_logs.append(log)
+    return filtered_logs
+
+
+def is_expired(log: Dict[str, Any], cutoff: Callable[[Any], Optional[float]]) -> bool:
+    timestamp = log.get('value_timestamp')
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        return False
+    try:
+        limit = cutoff(log.get('channel'))
+    except TypeError:
+        return False
+    return limit is not None and timestamp < limit
+
+
+class _JSONLogWriter(LogWriter):
+    def __init__(self, logs: List[Any]):
+        super().__init__()
+        self.logs = logs
+        self._keys = None
+        self._last = None
+
+    def _index(self):
+        # Tek geçişte kurulur; kayıt başına tüm listeyi taramak yerine
+        self._keys = set()
+        self._last = {}
+        for log in self.logs:
+            if isinstance(log, dict):
+                self._remember(log)
+
+    def _remember(self, log: Dict[str, Any]):
+        try:
+            self._keys.add((log.get('channel'), log.get('value_timestamp'), log.get('value')))
+        except TypeError:
+            pass
+        self._last[log.get('channel')] = log
+
+    def exists(self, channel: Any, value_timestamp: Any, value: Any) -> bool:
+        if self._keys is None:
+            self._index()
+        try:
+            return (channel, value_timestamp, value) in self._keys
+        except TypeError:
+            return any(isinstance(log, dict) and log.get('channel') == channel
+                       and log.get('value_timestamp') == value_timestamp and log.get('value') == value
+                       for log in self.logs)
+
+    def last(self, channel: Any) -> Optional[Dict[str, Any]]:
+        if self._last is None:
+            self._index()
+        return self._last.get(channel)
+
+    def append(self, record: Dict[str, Any]):
+        self.logs.append(record)
+        if self._keys is not None:
+            self._remember(record)
+        self.appended += 1
+
+    def extend(self, records: List[Dict[str, Any]]):
+        if self._keys is not None:
+            for record in records:
+                self._remember(record)
+        self.logs.extend(records)
+        self.appended += len(records)
+
+
+class JSONFileStorage(StorageBackend):
+    """jsons/ altındaki JSON dosyaları (varsayılan backend)"""
+
+    name = "json"
+
+    def __init__(self, base_path: str):
+        super().__init__()
+        self.base_path = base_path
+        # Oku-değiştir-yaz işlemleri (özellikle logs.json) aynı süreçte birbirini ezmesin
+        self._write_lock = threading.RLock()
+        # Özetler süreç içinde tutulur; logs.json bu sürecin yazmadığı bir versiyona geçerse
+        # bayatlar ve arka plan işi tekrar kurar
+        self._rollups: Optional[RollupTiers] = None
+        self._rollups_version: DocumentVersion = None
+        self._rollup_lock = threading.Lock()
+        # Log eklemeleri ve doküman yazmaları önce günlüğe yazılır; logs.json her eklemede
+        # yeniden yazılmaz, kontrol noktalarında atomik olarak güncellenir
+        self.durability = Durability()
+        self.journal = Journal(self._path(JOURNAL_DOCUMENT), self.durability)
+        # Yazıcı sürecin log görüntüsü (logs.json + günlük): (imza, içerik)
+        self._logs_view: Optional[Tuple[Any, Dict[str, Any]]] = None
+        self.recovery: Dict[str, Any] = {}
+        if os.path.exists(self.journal.path):
+            self.recovery = self._recover()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.base_path, key)
+
+    def read_document(self, key: str) -> Dict[str, Any]:
+        file_path = self._path(key)
+        # Günlük logs.json'dan önce okunur: arada bir kontrol noktası olursa kayıtlar logs.json'da bulunur
+        pending = self.journal.records() if key == LOGS_DOCUMENT else None
+        try:
+            if not os.path.exists(file_path):
+                logger.warning(f"Dosya bulunamadı: {file_path}")
+                return {}
+
+            with tracing.span("file.read", path=file_path) as read_span, phase("io"):
+                with open(file_path, 'rb') as file:
+                    content = file.read()
+                read_span.set_attribute("bytes", len(content))
+
+            content = content.strip()
+            if not content:
+                logger.warning(f"Dosya boş: {file_path}")
+                return {}
+
+            data = self._parse(key, content, file_path)
+            if pending:
+                self._apply_journal(data, pending, content)
+            logger.debug("Dosya başarıyla okundu: %s", file_path)
+            return data
+
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse hatası {file_path}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Dosya okuma hatası {file_path}: {e}")
+            return {}
+
+    def load_document(self, key: str) -> Any:
+        if key == LOGS_DOCUMENT:
+            return self._load_logs()
+        with open(self._path(key), 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _load_logs(self) -> Any:
+        pending = self.journal.records()
+        try:
+            with open(self._path(LOGS_DOCUMENT), 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            if not any(record.get("op") == "logs" for record in pending):
+                raise
+            content = None
+        data = json.loads(content) if content is not None else {"logs": []}
+        if pending:
+            self._apply_journal(data, pending, content)
+        return data
+
+    @staticmethod
+    def _apply_journal(data: Any, pending: List[Dict[str, Any]], content: Optional[bytes]):
+        if not isinstance(data, dict) or not any(record.get("op") == "logs" for record in pending):
+            return
+        logs = data.setdefault('logs', [])
+        if isinstance(logs, list):
+            apply_logs(logs, pending, content)
+
+    def write_document(self, key: str, data: Any):
+        file_path = self._path(key)
+        with tracing.span("file.dump", path=file_path), phase("dump"):
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        with self._write_lock, self.journal.locked():
+            with tracing.span("file.write", path=file_path, bytes=len(payload)), phase("io"):
+                if key == LOGS_DOCUMENT:
+                    # Tüm log dokümanı bekleyen eklemelerin yerini alır
+                    self._write_logs(payload)
+                    self._logs_view = None
+                    return
+                # Yazma yarım kalırsa (güç kesintisi) açılışta günlükten yeniden yazılır
+                self.journal.append({"op": "document", "key": key, "data": data})
+                atomic_write(file_path, payload, self.durability)
+                # Yalnızca doküman yazılan kurulumda da günlük (ve açılıştaki tarama) sınırlı kalır
+                self._checkpoint_if_due()
+        writes, write_bytes = self._write_metrics(key)
+        writes.inc()
+        write_bytes.inc(len(payload))
+
+    def _write_logs(self, payload: bytes, generation: Optional[Dict[str, Any]] = None):
+        """logs.json'u atomik yaz ve günlüğü boşalt (günlük kilidi altında)
+
+        Önce yazılacak dosyanın boyu ve CRC'si günlüğe işaretlenir: değişimden hemen sonra
+        çökülürse açılışta günlükteki eski eklemeler yeni dosyaya tekrar uygulanmaz.
+        `generation` verilmezse (içerik yeniden yazıldı) logs.json yeni bir kuşağa geçer.
+        """
+        self.journal.append({"op": "checkpoint", "bytes": len(payload), "crc32": zlib.crc32(payload)}, force=True)
+        atomic_write(self._path(LOGS_DOCUMENT), payload, self.durability, force=True)
+        # Günlükteki doküman yazmaları da diske inmeden günlük boşaltılmaz
+        self.durability.flush()
+        self._reset_journal(generation or {"id": uuid.uuid4().hex})
+        metrics.JOURNAL_CHECKPOINTS.inc()
+        writes, write_bytes = self._write_metrics(LOGS_DOCUMENT)
+        writes.inc()
+        write_bytes.inc(len(payload))
+
+    def document_version(self, key: str) -> DocumentVersion:
+        if key == LOGS_DOCUMENT:
+            return self._logs_version()
+        try:
+            stat = os.stat(self._path(key))
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _logs_version(self) -> DocumentVersion:
+        try:
+            stat = os.stat(self._path(LOGS_DOCUMENT))
+            stamp, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            stamp = size = None
+        journal = self.journal.signature()
+        if journal is None:
+            return None if stamp is None else (stamp, size)
+        # Damga iki dosyanın yenisi; boy alanı iki boyu birlikte taşır (kontrol noktası ikisini de değiştirir)
+        return (max(stamp or 0, journal[0]), ((size or 0) << 32) | journal[1])
+
+    def _logs_signature(self) -> Tuple[Any, Any]:
+        try:
+            stat = os.stat(self._path(LOGS_DOCUMENT))
+            logs = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            logs = None
+        return (logs, self.journal.signature())
+
+    def list_documents(self, folder: str) -> Optional[List[str]]:
+        directory_path = self._path(folder)
+        if not os.path.exists(directory_path):
+            return None
+        return [filename for filename in os.listdir(directory_path) if filename.endswith('.json')]
+
+    def query_logs(self, channel: Optional[Any] = None, start: Optional[Any] = None,
+                   end: Optional[Any] = None) -> Optional[List[Dict[str, Any]]]:
+        logs_data = self.read_document(LOGS_DOCUMENT)
+        if not logs_data:
+            return None
+        if 'logs' not in logs_data:
+            logger.warning("Logs.json dosyasında 'logs' anahtarı bulunamadı")
+            return []
+
+        all_logs = logs_data['logs']
+        if not isinstance(all_logs, list):
+            logger.error(f"Logs verisi liste değil, tip: {type(all_logs)}")
+            return []
+
+        with phase("filter"):
+            filtered_logs = filter_logs(all_logs, channel, start, end)
+        count_records(len(all_logs), 0)
+        return filtered_logs
+
+    def _logs_content(self) -> Dict[str, Any]:
+        """logs.json + bekleyen eklemeler (günlük kilidi altında); dosyalar değişmediyse bellekten
+
+        Dönen nesne yazıcıya aittir; değiştiren, görüntüyü günceller veya geri alır.
+        logs.json bozuksa ValueError fırlatır.
+        """
+        signature = self._logs_signature()
+        cached = self._logs_view
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            content = self.load_document(LOGS_DOCUMENT)
+        except FileNotFoundError:
+            content = {"logs": []}
+        if not isinstance(content, dict) or not isinstance(content.setdefault('logs', []), list):
+            raise ValueError("logs.json beklenen biçimde değil")
+        self._logs_view = (signature, content)
+        return content
+
+    @contextmanager
+    def log_writer(self) -> Iterator[LogWriter]:
+        with self._write_lock, self.journal.locked():
+            try:
+                logs_content = self._logs_content()
+            except ValueError as e:
+                # Bozuk dosya boş bir geçmişle ezilmez; onarılana kadar eklemeler reddedilir
+                logger.error(f"Logs.json okunamıyor, log eklenmeyecek: {e}")
+                raise
+
+            logs = logs_content['logs']
+            base = len(logs)
+            writer = _JSONLogWriter(logs)
+            try:
+                yield writer
+                if not writer.appended:
+                    return
+                rollups = self._fresh_rollups()
+                new_logs = logs[base:]
+                if os.path.exists(self._path(LOGS_DOCUMENT)):
+                    self.journal.append({"op": "logs", "base": base, "logs": new_logs})
+                else:
+                    logger.info("Yeni logs.json dosyası oluşturuluyor")
+                    self._write_logs(json.dumps(logs_content, indent=2, ensure_ascii=False).encode('utf-8'))
+            except BaseException:
+                # Görüntü kalıcı olmayan eklemeleri taşımasın (yarım günlük kaydını Journal.append keser)
+                del logs[base:]
+                raise
+            self._logs_view = (self._logs_signature(), logs_content)
+            if rollups is not None:
+                with self._rollup_lock:
+                    rollups.add_logs(new_logs)
+                    self._rollups_version = self.document_version(LOGS_DOCUMENT)
+            self._checkpoint_if_due()
+
+    def _checkpoint_if_due(self):
+        """Günlük boyut veya yaş sınırını aştıysa kontrol noktası (günlük kilidi altında)"""
+        if not self.journal.checkpoint_due():
+            return
+        try:
+            self._checkpoint()
+        except (OSError, ValueError) as e:
+            # Yazmalar günlükte güvende; bir sonraki yazmada tekrar denenir
+            logger.error(f"Yazma günlüğü kontrol noktası başarısız: {e}")
+
+    def _all_logs(self) -> List[Any]:
+        try:
+            logs = self.load_document(LOGS_DOCUMENT).get('logs', [])
+        except FileNotFoundError:
+            return []
+        return [log for log in logs if isinstance(log, dict)] if isinstance(logs, list) else []
+
+    def count_logs(self) -> int:
+        return len(self._all_logs())
+
+    def iter_logs(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._all_logs())
+
+    def tail_logs(self, cursor: Any) -> Optional[Tuple[Any, bool, List[Dict[str, Any]]]]:
+        """İmleç (logs.json kuşağı, kayıt sayısı); kuşak değişmediyse yalnızca yeni kayıtlar okunur
+
+        Eklemeler önce günlükten okunur; kontrol noktasıyla logs.json'a taşınmışlarsa dosyadan
+        tamamlanır. Kuşak kaydı olmayan (eski) günlükte logs.json imzası kuşak yerine geçer.
+        """
+        with self.journal.locked():
+            pending = self.journal.records()
+            generation = self._logs_generation(pending)
+            key = ("generation", generation["id"]) if generation is not None else self._logs_signature()[0]
+            known = cursor is not None and key is not None and cursor[0] == key
+            # İmleçten sonraki eklemeler kontrol noktasıyla logs.json'a taşındıysa günlükte yoktur
+            if known and cursor[1] >= (generation or {}).get("count", 0):
+                count = cursor[1]
+                new_logs = []
+                for record in pending:
+                    if record.get("op") != "logs":
+                        continue
+                    base, logs = record.get("base", 0), record.get("logs") or []
+                    if base + len(logs) <= count:
+                        continue
+                    if base > count:
+                        break
+                    new_logs.extend(logs[count - base:])
+                    count = base + len(logs)
+                else:
+                    return (key, count), False, [log for log in new_logs if isinstance(log, dict)]
+            try:
+                content = self.load_document(LOGS_DOCUMENT)
+            except FileNotFoundError:
+                content = {}
+        logs = content.get('logs') if isinstance(content, dict) else None
+        if not isinstance(logs, list):
+            logs = []
+        if known and len(logs) >= cursor[1]:
+            return (key, len(logs)), False, [log for log in logs[cursor[1]:] if isinstance(log, dict)]
+        return (key, len(logs)), True, [log for log in logs if isinstance(log, dict)]
+
+    def compact_logs(self, cutoff: Callable[[Any], Optional[float]]) -> Dict[str, int]:
+        """logs.json'u süresi dolmamış kayıtlarla yeniden yaz (dosyanın segmentleri yok)"""
+        report = {"scanned_records": 0, "removed_records": 0, "reclaimed_bytes": 0}
+        with self._write_lock, self.journal.locked():
+            try:
+                logs_content = self._logs_content()
+            except ValueError:
+                return report
+            logs = logs_content['logs']
+            kept = [log for log in logs if not (isinstance(log, dict) and is_expired(log, cutoff))]
+            report["scanned_records"] = len(logs)
+            report["removed_records"] = len(logs) - len(kept)
+            if not report["removed_records"]:
+                return report
+
+            rollups = self._fresh_rollups()
+            size_before = os.path.getsize(self._path(LOGS_DOCUMENT)) + self.journal.size()
+            kept_content = dict(logs_content, logs=kept)
+            self._write_logs(json.dumps(kept_content, indent=2, ensure_ascii=False).encode('utf-8'))
+            self._logs_view = (self._logs_signature(), kept_content)
+            report["reclaimed_bytes"] = size_before - os.path.getsize(self._path(LOGS_DOCUMENT))
+            if rollups is not None:
+                # Özetler silinen kayıtları kapsamaya devam eder (süreç yeniden başlayana kadar)
+                with self._rollup_lock:
+                    self._rollups_version = self.document_version(LOGS_DOCUMENT)
+        return report
+
+    # Yazma günlüğü
+
+    def checkpoint(self) -> Dict[str, Any]:
+        with self._write_lock, self.journal.locked():
+            return self._checkpoint()
+
+    def _checkpoint(self) -> Dict[str, Any]:
+        """Bekleyen eklemeleri logs.json'a işle ve günlüğü boşalt (günlük kilidi altında)
+
+        İçerik değişmediği için logs.json'un kuşağı korunur; yarım kalmış bir yeniden
+        yazmanın (checkpoint işareti) ardından ise yeni kuşağa geçilir.
+        """
+        records = self.journal.records()
+        generation = self._logs_generation(records)
+        pending = [record for record in records if record.get("op") != "generation"]
+        report = {"records": len(pending), "logs_bytes": 0, "seconds": 0.0}
+        if not pending:
+            return report
+        started = time.perf_counter()
+        if any(record.get("op") in ("logs", "checkpoint") for record in pending):
+            rollups = self._fresh_rollups()
+            logs_content = self._logs_content()
+            payload = json.dumps(logs_content, indent=2, ensure_ascii=False).encode('utf-8')
+            if generation is not None and not any(record.get("op") == "checkpoint" for record in pending):
+                generation = {"id": generation["id"], "count": len(logs_content['logs'])}
+            else:
+                generation = None
+            self._write_logs(payload, generation)
+            self._logs_view = (self._logs_signature(), logs_content)
+            report["logs_bytes"] = len(payload)
+            if rollups is not None:
+                # İçerik değişmedi, yalnızca dosyalar
+                with self._rollup_lock:
+                    self._rollups_version = self.document_version(LOGS_DOCUMENT)
+        else:
+            self.durability.flush()
+            self._reset_journal(generation)
+            metrics.JOURNAL_CHECKPOINTS.inc()
+        report["seconds"] = round(time.perf_counter() - started, 6)
+        logger.debug("Yazma günlüğü işlendi: %s", report)
+        return report
+
+    def _reset_journal(self, generation: Optional[Dict[str, Any]]):
+        """Günlüğü boşalt; logs.json'un kuşağını yeni günlüğün ilk kaydı olarak yaz
+
+        Kuşak (`id`) yalnızca logs.json içeriği yeniden yazıldığında değişir; kontrol
+        noktasında korunur ve `count` dosyadaki kayıt sayısını taşır. `tail_logs`
+        izleyicileri böylece kontrol noktalarında baştan okumaz.
+        """
+        self.journal.reset()
+        if generation is not None:
+            self.journal.append(dict(generation, op="generation"))
+
+    @staticmethod
+    def _logs_generation(records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        for record in records:
+            if record.get("op") == "generation" and isinstance(record.get("id"), str):
+                return {key: value for key, value in record.items() if key in ("id", "count")}
+        return None
+
+    def _recover(self) -> Dict[str, Any]:
+        """Açılışta günlüğü doğrula: yarım kalmış son kaydı kes, kaybolmuş doküman yazmalarını yeniden yap
+
+        Bekleyen log eklemeleri günlükte kalır (okumalar onları logs.json'a ekler); yalnızca
+        yarıda kalmış bir kontrol noktası tamamlanır. Süre günlük boyuyla, günlük boyu da
+        JOURNAL_CHECKPOINT_BYTES ile sınırlıdır.
+        """
+        started = time.perf_counter()
+        with self._write_lock, self.journal.locked():
+            records, valid, size = self.journal.scan()
+            if valid < size:
+                self.journal.truncate_tail(valid)
+                metrics.JOURNAL_TORN_BYTES.inc(size - valid)
+            replayed = self._replay_documents(records)
+            checkpointed = False
+            if any(record.get("op") == "checkpoint" for record in records):
+                try:
+                    self._checkpoint()
+                    checkpointed = True
+                except (OSError, ValueError) as e:
+                    logger.error(f"Yarım kalmış kontrol noktası tamamlanamadı: {e}")
+        records = [record for record in records if record.get("op") != "generation"]
+        report = {
+            "records": len(records),
+            "pending_logs": sum(len(record.get("logs") or []) for record in records if record.get("op") == "logs"),
+            "journal_bytes": valid,
+            "torn_bytes": size - valid,
+            "replayed_documents": replayed,
+            "completed_checkpoint": checkpointed,
+            "seconds": round(time.perf_counter() - started, 6),
+        }
+        metrics.JOURNAL_RECOVERY_SECONDS.set(report["seconds"])
+        if size > valid or replayed or checkpointed:
+            logger.warning(f"Yazma günlüğü kurtarıldı: {report}")
+        elif records:
+            logger.info(f"Yazma günlüğünde {len(records)} bekleyen kayıt ({valid} byte)")
+        return report
+
+    def _replay_documents(self, records: List[Dict[str, Any]]) -> int:
+        latest = {}
+        for record in records:
+            if record.get("op") == "document" and isinstance(record.get("key"), str):
+                latest[record["key"]] = record
+        replayed = 0
+        for key, record in latest.items():
+            if not self._document_lost(key, record):
+                continue
+            payload = json.dumps(record.get("data"), indent=2, ensure_ascii=False).encode('utf-8')
+            atomic_write(self._path(key), payload, self.durability, force=True)
+            replayed += 1
+            logger.warning(f"Yarım kalmış doküman yazması günlükten tamamlandı: {key}")
+        return replayed
+
+    def _document_lost(self, key: str, record: Dict[str, Any]) -> bool:
+        """Dosya yok, okunamıyor veya günlükteki yazmadan eski ve farklı içerikte mi"""
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as file:
+                data = json.loads(file.read())
+        except (OSError, ValueError):
+            return True
+        # Sonradan başka bir yazıcının (veri kaydedici) güncellediği dosyaya dokunulmaz
+        return stat.st_mtime_ns < record.get("ns", 0) and data != record.get("data")
+
+    def durability_status(self) -> Dict[str, Any]:
+        records, valid, size = self.journal.scan()
+        return dict(self.durability.status(), journal={
+            "path": self.journal.path,
+            "bytes": size,
+            "records": len(records),
+            "torn_bytes": size - valid,
+            "pending_logs": sum(len(record.get("logs") or []) for record in records if record.get("op") == "logs"),
+            "checkpoint_bytes": config.JOURNAL_CHECKPOINT_BYTES,
+            "checkpoint_interval": config.JOURNAL_CHECKPOINT_INTERVAL,
+        }, recovery=self.recovery)
+
+    def compact_rollups(self, cutoffs: Dict[int, float]) -> int:
+        rollups = self._rollups
+        if rollups is None:
+            return 0
+        with self._rollup_lock:
+            return sum(rollups.drop_before(seconds, cutoff) for seconds, cutoff in cutoffs.items())
+
+    def _fresh_rollups(self) -> Optional[RollupTiers]:
+        rollups = self._rollups
+        if rollups is None or self._rollups_version != self.document_version(LOGS_DOCUMENT):
+            return None
+        return rollups
+
+    def query_rollups(self, seconds: int, channel: Any, start: int, end: int) -> Optional[List[Dict[str, Any]]]:
+        rollups = self._fresh_rollups()
+        if rollups is None or seconds not in rollups.tiers:
+            return None
+        with self._rollup_lock:
+            return rollups.query(seconds, channel, start, end)
+
+    def backfill_rollups(self, batch_size: int) -> bool:
+        """Özetleri logs.json'un tamamından yeniden kur (dosya parti parti okunamaz)"""
+        tiers = enabled_tiers()
+        if not tiers or self._fresh_rollups() is not None:
+            return False
+        version = self.document_version(LOGS_DOCUMENT)
+        try:
+            logs = self._all_logs()
+        except ValueError as e:
+            # Yazıcı dosyayı yazarken okunmuş olabilir; bir sonraki turda tekrar denenir
+            logger.warning(f"Özetler için logs.json okunamadı: {e}")
+            return False
+        rollups = RollupTiers(tiers)
+        rollups.add_logs(logs)
+        with self._write_lock:
+            if self.document_version(LOGS_DOCUMENT) != version:
+                return True
+            with self._rollup_lock:
+                self._rollups, self._rollups_version = rollups, version
+        metrics.ROLLUP_BACKFILLED_RECORDS.inc(len(logs))
+        logger.info(f"Log özetleri kuruldu: {len(logs)} kayıt, {rollups.bucket_count()} kova")
+        return False
+
+
+def create_storage(base_path: str, backend: Optional[str] = None) -> StorageBackend:
+    """Ayarlarda seçilen depolama backend'ini oluştur"""
+    backend = (backend or config.STORAGE_BACKEND).strip().lower()
+    if backend == "json":
+        return JSONFileStorage(base_path)
+    if backend == "sqlite":
+        from sqlite_storage import SQLiteStorage
+        database_path = config.SQLITE_PATH or os.path.join(base_path, "hidrologger.db")
+        return SQLiteStorage(database_path, base_path)
+    if backend == "segments":
+        from segment_storage import SegmentStorage
+        return SegmentStorage(base_path)
+    raise ValueError(f"Bilinmeyen depolama backend'i: {backend}")
@@ -0,0 +1,24 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sunucu modülleri düz yerleşimde (python_server/*.py)
+sys.path.insert(0, SERVER_DIR)
+
+from storage import DOCUMENT_FOLDERS
+
+SAMPLE_DATA = os.path.join(SERVER_DIR, "jsons")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Örnek jsons klasörünün geçici kopyası (boş doküman klasörleri dahil)"""
+    path = str(tmp_path / "jsons")
+    shutil.copytree(SAMPLE_DATA, path)
+    for folder in DOCUMENT_FOLDERS:
+        os.makedirs(os.path.join(path, folder), exist_ok=True)
+    return path
@@ -0,0 +1,71 @@
+import pytest
+
+import config
+from column_store import block_points, block_series
+from rollups import bucket_start, raw_points, series_from_logs
+from segment_storage import SegmentStorage
+
+START = 1800000000
+DAY = 86400
+
+
+def _append(storage, *records):
+    with storage.log_writer() as writer:
+        for channel, value, timestamp in records:
+            writer.append({"channel": channel, "value": value, "value_timestamp": timestamp,
+                           "battery_percentage": 80, "signal_strength": 300, "value_type": 1})
+
+
+def _backfill(storage):
+    while storage.backfill_columns():
+        pass
+
+
+def _assert_matches_raw(storage, channel, start, end):
+    blocks = storage.query_columns(channel, start, end)
+    assert blocks is not None
+    points = block_points(blocks)
+    assert points == raw_points(storage.query_logs(channel, start, end))
+    assert all(type(point["last"]) is float for point in points)
+    for seconds in (60, 3600):
+        first = bucket_start(start, seconds) if start is not None else None
+        assert block_series(storage.query_columns(channel, first, end), seconds) == series_from_logs(
+            storage.query_logs(channel, first, end), seconds)
+
+
+@pytest.fixture
+def storage(data_dir, monkeypatch):
+    monkeypatch.setattr(config, "SEGMENT_MAX_BYTES", 1024)
+    monkeypatch.setattr(config, "COLUMN_PERIOD_DAYS", 7)
+    storage = SegmentStorage(data_dir)
+    # Dönem sınırını aşan, sırasız gelen ve dosyalara girmeyen (sayısal olmayan) kayıtlar
+    _append(storage, *[(1 + i % 2, i * 3 % 17 + 0.5 if i % 5 else i, START + (i * 7919) % (12 * DAY))
+                       for i in range(120)])
+    _append(storage, (1, "hata", START + 5), (2.0, 9.0, START + 7), ("kanal", 1.0, START + 9))
+    return storage
+
+
+def test_columns_unavailable_until_backfilled(storage):
+    assert storage.query_columns(1, None, None) is None
+    _backfill(storage)
+    assert storage.query_columns(1, None, None) is not None
+    assert storage.query_columns("kanal", None, None) is None
+
+
+def test_column_reads_match_raw_logs(storage):
+    _backfill(storage)
+    _assert_matches_raw(storage, 1, None, None)
+    _assert_matches_raw(storage, 2, START + 3 * DAY, START + 9 * DAY)
+    _assert_matches_raw(storage, 1, START + 100, START + 100)
+    assert block_points(storage.query_columns(3, None, None)) == []
+
+
+def test_appends_after_backfill_and_reopen(storage, data_dir):
+    _backfill(storage)
+    _append(storage, (1, 4.25, START + 20 * DAY), (1, 1.0, START + 2 * DAY + 1), (2, 7, START + 13 * DAY))
+    _assert_matches_raw(storage, 1, START, START + 30 * DAY)
+    _assert_matches_raw(storage, 2, None, None)
+
+    reopened = SegmentStorage(data_dir)
+    _assert_matches_raw(reopened, 1, None, None)
+    _assert_matches_raw(reopened, 2, START + DAY, None)
@@ -0,0 +1,80 @@
+import pytest
+
+import config
+from json_reader import JSONReader, _sort_logs
+from retention import RetentionPolicy
+from storage import create_storage
+
+LAST = 1755658800
+
+
+def _expected(reader, channel, start=None, end=None):
+    logs = list(reader.storage.query_logs(channel, start, end))
+    _sort_logs(logs)
+    return logs
+
+
+def _append(reader, *records):
+    with reader._log_writer() as writer:
+        for value, timestamp in records:
+            writer.append({"channel": 1, "value": value, "value_timestamp": timestamp})
+
+
+@pytest.fixture(params=["json", "segments"])
+def backend(request, monkeypatch):
+    # Aralık önbelleği kapalı: sonuçlar doğrudan son okuma tamponundan gelsin
+    monkeypatch.setattr(config, "RANGE_CACHE_BYTES", 0)
+    return request.param
+
+
+def _reader(data_dir, backend):
+    return JSONReader(data_dir, storage=create_storage(data_dir, backend))
+
+
+def test_append_served_from_ring_immediately(data_dir, backend):
+    reader = _reader(data_dir, backend)
+    reader.get_logs(1, LAST - 3600)
+    _append(reader, (50.5, LAST + 60))
+    hits = reader.hot_tail.stats()["hits"]
+
+    logs = reader.get_logs(1, LAST - 3600)
+    assert logs[0] == {"channel": 1, "value": 50.5, "value_timestamp": LAST + 60}
+    assert logs == _expected(reader, 1, LAST - 3600)
+    assert reader.hot_tail.stats()["hits"] == hits + 1
+
+
+def test_other_instance_appends_seen_on_next_query(data_dir, backend):
+    reader = _reader(data_dir, backend)
+    writer = _reader(data_dir, backend)
+    assert reader.get_logs(1, LAST) == _expected(reader, 1, LAST)
+    _append(writer, (51.0, LAST + 120), (52.0, LAST + 180))
+    assert [log["value"] for log in reader.get_logs(1, LAST + 1)] == [52.0, 51.0]
+    _append(writer, (53.0, LAST + 240))
+    writer.storage.checkpoint()
+    assert [log["value"] for log in reader.get_logs(1, LAST + 1)] == [53.0, 52.0, 51.0]
+
+
+def test_queries_before_ring_floor_go_to_storage(data_dir, backend, monkeypatch):
+    monkeypatch.setattr(config, "HOT_TAIL_MAX_READINGS", 5)
+    reader = _reader(data_dir, backend)
+    _append(reader, *[(float(i), LAST + i * 60) for i in range(1, 21)])
+
+    recent = reader.get_logs(1, LAST + 17 * 60)
+    assert [log["value"] for log in recent] == [20.0, 19.0, 18.0, 17.0]
+    stats = reader.hot_tail.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+
+    assert reader.get_logs(1, LAST + 10 * 60) == _expected(reader, 1, LAST + 10 * 60)
+    assert reader.get_logs(1) == _expected(reader, 1)
+    assert reader.hot_tail.stats()["misses"] == 2
+
+
+def test_ring_rebuilt_after_compaction(data_dir, backend, monkeypatch):
+    monkeypatch.setattr(config, "SEGMENT_MAX_BYTES", 256)
+    reader = _reader(data_dir, backend)
+    _append(reader, *[(float(i), LAST + i * 600) for i in range(1, 30)])
+    assert len(reader.get_logs(1)) == len(_expected(reader, 1))
+
+    report = reader.storage.compact_logs(RetentionPolicy(default=3600).cutoff(LAST + 29 * 600, {}))
+    assert report["removed_records"] > 0
+    assert reader.get_logs(1) == _expected(reader, 1)
@@ -0,0 +1,148 @@
+import errno
+import json
+import os
+
+import pytest
+
+import config
+import journal
+from storage import JSONFileStorage
+
+
+def _append(storage, *values):
+    with storage.log_writer() as writer:
+        for value in values:
+            writer.append({"channel": 1, "value": value, "value_timestamp": 1800000000 + int(value)})
+
+
+def _values(storage):
+    return [log["value"] for log in storage.iter_logs()]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = JSONFileStorage(str(tmp_path))
+    _append(storage, 1)
+    storage.checkpoint()
+    return storage
+
+
+def test_append_after_torn_tail_survives_restart(storage, tmp_path):
+    _append(storage, 2)
+    with open(storage.journal.path, 'ab') as file:
+        file.write(b'\x10\x00\x00\x00garbage')
+    _append(storage, 3)
+    _append(storage, 4)
+    assert _values(storage) == [1, 2, 3, 4]
+
+    reopened = JSONFileStorage(str(tmp_path))
+    assert reopened.recovery["torn_bytes"] == 0
+    assert _values(reopened) == [1, 2, 3, 4]
+
+
+def test_failed_append_leaves_no_partial_record(storage, tmp_path, monkeypatch):
+    real_open = open
+
+    class FullDisk:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.file.close()
+
+        def write(self, data):
+            self.file.write(data[:len(data) // 2])
+            self.file.flush()
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+    def failing_open(path, mode='r', *args, **kwargs):
+        file = real_open(path, mode, *args, **kwargs)
+        return FullDisk(file) if path == storage.journal.path and mode == 'ab' else file
+
+    size = os.path.getsize(storage.journal.path)
+    monkeypatch.setattr(journal, "open", failing_open, raising=False)
+    with pytest.raises(OSError):
+        _append(storage, 2)
+    monkeypatch.undo()
+    assert os.path.getsize(storage.journal.path) == size
+
+    _append(storage, 3)
+    _append(storage, 4)
+    assert _values(storage) == [1, 3, 4]
+    assert _values(JSONFileStorage(str(tmp_path))) == [1, 3, 4]
+
+
+def test_document_writes_checkpoint_journal(storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "JOURNAL_CHECKPOINT_BYTES", 4096)
+    os.makedirs(tmp_path / "variable")
+    document = {"data": {"channel_1": {"value": 0}}}
+    for i in range(500):
+        document["data"]["channel_1"]["value"] = i
+        storage.write_document("variable/data.json", document)
+        assert storage.journal.size() < 4096 + 512
+
+    assert storage.read_document("variable/data.json")["data"]["channel_1"]["value"] == 499
+    reopened = JSONFileStorage(str(tmp_path))
+    assert reopened.recovery["records"] < 4096 // 100
+    assert _values(reopened) == [1]
+
+
+class Crash(BaseException):
+    """Süreç yazma ortasında ölmüş gibi"""
+
+
+def _crash(*args, **kwargs):
+    raise Crash()
+
+
+def test_pending_appends_replayed_after_restart(storage, tmp_path):
+    _append(storage, 2, 3)
+    reopened = JSONFileStorage(str(tmp_path))
+    assert reopened.recovery["pending_logs"] == 2
+    assert _values(reopened) == [1, 2, 3]
+
+
+def test_document_write_replayed_after_crash_before_file_write(storage, tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "variable")
+    storage.write_document("variable/data.json", {"data": {"value": 1}})
+    monkeypatch.setattr("storage.atomic_write", _crash)
+    with pytest.raises(Crash):
+        storage.write_document("variable/data.json", {"data": {"value": 2}})
+    monkeypatch.undo()
+    assert json.loads((tmp_path / "variable" / "data.json").read_bytes()) == {"data": {"value": 1}}
+
+    reopened = JSONFileStorage(str(tmp_path))
+    assert reopened.recovery["replayed_documents"] == 1
+    assert reopened.read_document("variable/data.json") == {"data": {"value": 2}}
+    assert _values(reopened) == [1]
+
+
+def test_checkpoint_completed_after_crash_before_logs_write(storage, tmp_path, monkeypatch):
+    _append(storage, 2, 3)
+    monkeypatch.setattr("storage.atomic_write", _crash)
+    with pytest.raises(Crash):
+        storage.checkpoint()
+    monkeypatch.undo()
+
+    reopened = JSONFileStorage(str(tmp_path))
+    assert reopened.recovery["completed_checkpoint"]
+    assert reopened.journal.size() < 1024
+    assert _values(reopened) == [1, 2, 3]
+
+
+def test_appends_not_duplicated_after_crash_before_journal_reset(storage, tmp_path, monkeypatch):
+    _append(storage, 2, 3)
+    monkeypatch.setattr(JSONFileStorage, "_reset_journal", _crash)
+    with pytest.raises(Crash):
+        storage.checkpoint()
+    monkeypatch.undo()
+    written = json.loads((tmp_path / "logsfile" / "logs.json").read_bytes())
+    assert [log["value"] for log in written["logs"]] == [1, 2, 3]
+
+    reopened = JSONFileStorage(str(tmp_path))
+    assert _values(reopened) == [1, 2, 3]
+    _append(reopened, 4)
+    assert _values(JSONFileStorage(str(tmp_path))) == [1, 2, 3, 4]
@@ -0,0 +1,24 @@
+import metrics
+
+
+def test_keyed_collector_replaces_previous():
+    registry = metrics.MetricsRegistry()
+    first = lambda: [("hidrologger_test", "gauge", "test", [("hidrologger_test", {}, 1)])]
+    second = lambda: [("hidrologger_test", "gauge", "test", [("hidrologger_test", {}, 2)])]
+    registry.add_collector(first, key="caches")
+    registry.add_collector(second, key="caches")
+    assert registry.render().count("hidrologger_test 2") == 1
+    assert "hidrologger_test 1" not in registry.render()
+
+    registry.remove_collector(second)
+    assert "hidrologger_test" not in registry.render()
+
+
+def test_server_instances_share_one_cache_collector(tmp_path):
+    from json_reader import JSONReader
+    from server import RESTfulServer
+
+    for _ in range(3):
+        RESTfulServer(JSONReader(str(tmp_path)))
+    rendered = metrics.REGISTRY.render()
+    assert rendered.count("# TYPE hidrologger_cache_requests counter") == 1
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from json_reader import JSONReader
+from migrate import MigrationError, Migrator, create_target
+from storage import JSONFileStorage
+
+
+def _migrate(data_dir, target, tmp_path, **kwargs):
+    kwargs.setdefault("workers", 1)
+    kwargs.setdefault("segment_bytes", 512)
+    return Migrator(data_dir, target, str(tmp_path / "migrate.checkpoint"), **kwargs)
+
+
+def _target_dir(kind, tmp_path):
+    return str(tmp_path / "hidrologger.db") if kind == "sqlite" else str(tmp_path / kind)
+
+
+@pytest.mark.parametrize("kind,workers", [("sqlite", 1), ("segments", 1), ("sqlite", 2)])
+def test_migrated_logs_read_identically(data_dir, tmp_path, kind, workers):
+    target = create_target(kind, data_dir, _target_dir(kind, tmp_path))
+    assert _migrate(data_dir, target, tmp_path, workers=workers).run() == []
+
+    source_reader = JSONReader(data_dir)
+    target_reader = JSONReader(getattr(target, "base_path", data_dir), storage=target)
+    assert len(target_reader.get_logs()) == 80
+    for channel, start, end in [(None, None, None), (1, None, None), (1, 1755100000, 1755400000), (2, None, None)]:
+        assert target_reader.get_logs(channel, start, end) == source_reader.get_logs(channel, start, end)
+    assert target.read_document("variable/channel.json") == JSONFileStorage(data_dir).read_document(
+        "variable/channel.json")
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "segments"])
+def test_rerun_resumes_from_checkpoint(data_dir, tmp_path, kind):
+    target = create_target(kind, data_dir, _target_dir(kind, tmp_path))
+    assert _migrate(data_dir, target, tmp_path).run() == []
+    initial = target.count_logs()
+
+    source = JSONFileStorage(data_dir)
+    with source.log_writer() as writer:
+        writer.append({"channel": 1, "value": 40.0, "value_timestamp": 1755662400})
+        writer.append({"channel": 1, "value": 41.5, "value_timestamp": 1755666000})
+
+    migrator = _migrate(data_dir, target, tmp_path)
+    assert migrator.run() == []
+    assert target.count_logs() == initial + 2
+    assert list(target.iter_logs())[-2:] == list(source.iter_logs())[-2:]
+
+
+def test_refuses_non_empty_target_without_checkpoint(data_dir, tmp_path):
+    target = create_target("sqlite", data_dir, _target_dir("sqlite", tmp_path))
+    assert _migrate(data_dir, target, tmp_path).run() == []
+    os.remove(str(tmp_path / "migrate.checkpoint"))
+    with pytest.raises(MigrationError):
+        _migrate(data_dir, target, tmp_path).run()
@@ -0,0 +1,93 @@
+import pytest
+
+import config
+from json_reader import JSONReader, _sort_logs
+from range_cache import RangeCache
+from storage import create_storage
+
+LAST = 1755658800
+
+
+def _append(reader, *records):
+    with reader._log_writer() as writer:
+        for value, timestamp in records:
+            writer.append({"channel": 1, "value": value, "value_timestamp": timestamp})
+
+
+def _expected(reader, channel, start=None, end=None):
+    logs = list(reader.storage.query_logs(channel, start, end))
+    _sort_logs(logs)
+    return logs
+
+
+@pytest.fixture(params=["json", "segments"])
+def reader(request, data_dir, monkeypatch):
+    # Son okuma tamponu kapalı: sorgular depoya gitsin, sonuçlar önbellekten gelsin
+    monkeypatch.setattr(config, "HOT_TAIL_WINDOW", 0.0)
+    reader = JSONReader(data_dir, storage=create_storage(data_dir, request.param))
+    _append(reader, *[(float(i), LAST - 86400 + i * 3600) for i in range(1, 24)])
+    return reader
+
+
+def test_historical_entry_survives_live_append(reader):
+    window = (1, LAST - 86400, LAST - 43200)
+    first = reader.get_logs(*window)
+    _append(reader, (99.0, LAST + 60))
+    assert reader.get_logs(*window) is first
+    stats = reader.range_cache.stats()
+    assert (stats["hits"], stats["invalidations"]) == (1, 0)
+
+
+def test_backfilled_reading_merged_into_entry(reader):
+    window = (1, LAST - 86400, LAST - 43200)
+    reader.get_logs(*window)
+    _append(reader, (-1.0, LAST - 50000))
+    logs = reader.get_logs(*window)
+    assert {"channel": 1, "value": -1.0, "value_timestamp": LAST - 50000} in logs
+    assert logs == _expected(reader, *window)
+    assert reader.range_cache.stats()["extensions"] == 1
+
+
+def test_live_edge_entry_extended(reader):
+    reader.get_logs(1, LAST - 7200)
+    _append(reader, (70.0, LAST + 60), (71.0, LAST + 120))
+    logs = reader.get_logs(1, LAST - 7200)
+    assert [log["value"] for log in logs[:2]] == [71.0, 70.0]
+    assert logs == _expected(reader, 1, LAST - 7200)
+    stats = reader.range_cache.stats()
+    assert (stats["hits"], stats["extensions"], stats["invalidations"]) == (1, 1, 0)
+
+
+def test_backfilled_reading_invalidates_series_entry(reader):
+    series = reader.get_channel_series(1, LAST - 86400, LAST, 3600)
+    _append(reader, (5.0, LAST + 7200))
+    assert reader.get_channel_series(1, LAST - 86400, LAST, 3600) is series
+    _append(reader, (500.0, LAST - 1800))
+    updated = reader.get_channel_series(1, LAST - 86400, LAST, 3600)
+    assert max(point["max"] for point in updated["points"]) == 500.0
+    assert reader.range_cache.stats()["invalidations"] == 1
+
+
+def test_result_not_stored_when_append_arrives_during_compute():
+    cache = RangeCache(1 << 20, lambda: True)
+
+    def compute():
+        cache.observe([{"channel": 1, "value_timestamp": 15}], False)
+        return [1]
+
+    assert cache.fetch("key", 1, 10, 20, compute) == [1]
+    assert cache.stats()["entries"] == 0
+    cache.fetch("other", 2, 10, 20, compute)
+    assert cache.stats()["entries"] == 1
+
+
+def test_evicts_least_recently_used_within_budget():
+    cache = RangeCache(50, lambda: True)
+    for key in "abc":
+        cache.fetch(key, 1, 0, 10, lambda: "x" * 20)
+        cache.fetch("a", 1, 0, 10, lambda: "unused")
+    stats = cache.stats()
+    assert stats["bytes"] <= 50
+    assert stats["evictions"] == 1
+    assert cache.fetch("a", 1, 0, 10, lambda: "recomputed") == "x" * 20
+    assert cache.fetch("b", 1, 0, 10, lambda: "recomputed") == "recomputed"
@@ -0,0 +1,79 @@
+import pytest
+
+import config
+from retention import Compactor, RetentionPolicy, parse_duration
+from storage import CHANNEL_DOCUMENT, LOGS_DOCUMENT, create_storage
+
+NOW = 1800000000
+DAY = 86400
+
+
+def _append(storage, *records):
+    with storage.log_writer() as writer:
+        for channel, age in records:
+            writer.append({"channel": channel, "value": float(age), "value_timestamp": NOW - age})
+
+
+def _keys(storage):
+    return sorted((log["channel"], log["value_timestamp"]) for log in storage.iter_logs())
+
+
+@pytest.fixture(params=["json", "sqlite", "segments"])
+def storage(request, data_dir, monkeypatch):
+    # Segmentler küçük tutulur ki eski kayıtlar mühürlü segmentlere düşsün
+    monkeypatch.setattr(config, "SEGMENT_MAX_BYTES", 300)
+    monkeypatch.setattr(config, "COMPACTION_MIN_EXPIRED_RATIO", 0.0)
+    storage = create_storage(data_dir, request.param)
+    storage.write_document(CHANNEL_DOCUMENT, {"channel": [{"id": 1, "channel_category": 1}]})
+    if request.param == "json":
+        storage.write_document(LOGS_DOCUMENT, {"logs": []})
+    return storage
+
+
+def test_removes_only_expired_records(storage):
+    # Kanal 1'in kategorisi 1; kanal 3 channel.json'da yok
+    records = [(channel, age) for age in (400 * DAY, 40 * DAY, 3 * DAY, 2 * 3600, 600)
+               for channel in (1, 2, 3)]
+    _append(storage, *records)
+    policy = RetentionPolicy.parse("default=30d,channel:2=365d,category:1=1d")
+
+    report = Compactor(storage, policy).run_once(NOW)
+
+    def keep(channel, age):
+        return age <= {1: DAY, 2: 365 * DAY, 3: 30 * DAY}[channel]
+
+    expected = sorted((channel, NOW - age) for channel, age in records if keep(channel, age))
+    assert _keys(storage) == expected
+    assert report["removed_records"] == len(records) - len(expected)
+    assert Compactor(storage, policy).run_once(NOW)["removed_records"] == 0
+
+
+def test_inactive_policy_keeps_everything(storage):
+    _append(storage, (1, 1000 * DAY), (2, 10))
+    before = _keys(storage)
+    report = Compactor(storage, RetentionPolicy.parse("channel:1=forever")).run_once(NOW)
+    assert report["removed_records"] == 0
+    assert _keys(storage) == before
+
+
+def test_rollup_retention_drops_old_buckets(storage, monkeypatch):
+    monkeypatch.setattr(config, "ROLLUP_TIERS", "1m,1h")
+    _append(storage, (1, 10 * DAY), (1, 3 * DAY), (1, 600))
+    while storage.backfill_rollups(100):
+        pass
+    report = Compactor(storage, RetentionPolicy.parse("", rollups="1m=2d")).run_once(NOW)
+    assert report["removed_buckets"] == 2
+    assert [point["timestamp"] for point in storage.query_rollups(60, 1, NOW - 20 * DAY, NOW)] == [
+        (NOW - 600) - (NOW - 600) % 60]
+    assert len(storage.query_rollups(3600, 1, NOW - 20 * DAY, NOW)) == 3
+    assert storage.count_logs() == 3
+
+
+def test_parse_rules():
+    policy = RetentionPolicy.parse("90d, channel:7=forever, category:2=12h")
+    assert policy.raw_seconds(7) is None
+    assert policy.raw_seconds(5, category=2) == 12 * 3600
+    assert policy.raw_seconds("5") == 90 * DAY
+    assert parse_duration("2w") == 14 * DAY
+    with pytest.raises(ValueError):
+        RetentionPolicy.parse("station:1=1d")
@@ -0,0 +1,59 @@
+import pytest
+
+import config
+from rollups import TIERS, bucket_start, choose_tier, series_from_logs
+from storage import create_storage
+
+START = 1800000000 - 1800000000 % 86400
+
+
+def _append(storage, *records):
+    with storage.log_writer() as writer:
+        for channel, value, timestamp in records:
+            writer.append({"channel": channel, "value": value, "value_timestamp": timestamp})
+
+
+def _backfill(storage):
+    while storage.backfill_rollups(7):
+        pass
+
+
+def _assert_matches_raw(storage, channel, start, end):
+    for _, seconds in TIERS:
+        # Sorgu sınırlarına düşen kovalar tam döner
+        logs = storage.query_logs(channel, bucket_start(start, seconds), bucket_start(end, seconds) + seconds - 1)
+        expected = series_from_logs(logs, seconds)
+        assert storage.query_rollups(seconds, channel, start, end) == expected
+
+
+@pytest.fixture(params=["json", "sqlite", "segments"])
+def storage(request, data_dir, monkeypatch):
+    monkeypatch.setattr(config, "ROLLUP_TIERS", "1m,1h,1d")
+    return create_storage(data_dir, request.param)
+
+
+def test_rollup_buckets_match_raw_logs(storage):
+    # Kova sınırları, aynı kovada birden çok kayıt ve iki kanal
+    _append(storage, *[(1 + i % 2, float(i * 7 % 13), START + i * 1700) for i in range(150)])
+    _backfill(storage)
+    _assert_matches_raw(storage, 1, START, START + 3 * 86400)
+    _assert_matches_raw(storage, 2, START + 5000, START + 100000)
+    assert storage.query_rollups(3600, 3, START, START + 86400) == []
+
+
+def test_appends_after_backfill_update_buckets(storage):
+    _append(storage, *[(1, float(i), START + i * 600) for i in range(20)])
+    _backfill(storage)
+    # Geç gelen eski okuma, mevcut kovanın son değerini değiştirmez; sayısal olmayan değer özete girmez
+    _append(storage, (1, 99.0, START + 30), (1, "hata", START + 660), (1, -4.5, START + 12000))
+    _backfill(storage)
+    _assert_matches_raw(storage, 1, START, START + 86400)
+    hour = storage.query_rollups(3600, 1, START, START)[0]
+    assert (hour["min"], hour["max"], hour["count"], hour["last"]) == (0.0, 99.0, 7, 5.0)
+
+
+def test_choose_tier():
+    assert choose_tier(30, [60, 3600, 86400]) is None
+    assert choose_tier(60, [60, 3600, 86400]) == 60
+    assert choose_tier(7200, [60, 3600, 86400]) == 3600
+    assert choose_tier(7 * 86400, [60, 3600]) == 3600
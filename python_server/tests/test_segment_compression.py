@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import config
+from segment_codec import CodecError, decode_records, encode_records
+from segment_storage import SegmentStorage
+from storage import filter_logs
+
+START = 1800000000
+
+
+def _append(storage, count, offset=0):
+    with storage.log_writer() as writer:
+        for i in range(offset, offset + count):
+            writer.append({"battery_percentage": 100 - i % 7, "channel": 1 + i % 3, "signal_strength": 90,
+                           "value": round(20 + i * 0.25, 2), "value_timestamp": START + i * 60, "value_type": 1})
+
+
+@pytest.fixture
+def storage(data_dir, monkeypatch):
+    monkeypatch.setattr(config, "SEGMENT_MAX_BYTES", 2048)
+    monkeypatch.setattr(config, "SEGMENT_COMPRESSION", "gzip")
+    storage = SegmentStorage(data_dir)
+    _append(storage, 200)
+    return storage
+
+
+def test_codec_roundtrip_is_lossless():
+    records = [
+        (1, {"channel": 1, "value": 2.5, "value_timestamp": START}),
+        (2, {"value_timestamp": START + 60, "channel": 1, "value": 3}),
+        (3, {"channel": 2, "value": None, "value_timestamp": "2027-01-15T08:00:00", "note": "ölçüm"}),
+        (5, {"channel": 2, "value": True, "value_timestamp": START + 1.5, "value_type": 1 << 70}),
+        (6, {"channel": 1, "value": -0.0, "value_timestamp": START + 120, "extra": {"a": [1, 2]}}),
+        (9, ["dict", "değil"]),
+    ]
+    decoded = decode_records(encode_records(records, "gzip"))
+    assert decoded == records
+    for (_, original), (_, copy) in zip(records, decoded):
+        if isinstance(original, dict):
+            assert list(copy) == list(original)
+            assert [type(value) for value in copy.values()] == [type(value) for value in original.values()]
+
+
+def test_decode_rejects_corrupt_content():
+    content = encode_records([(1, {"channel": 1, "value": 1.0, "value_timestamp": START})], "gzip")
+    with pytest.raises(CodecError):
+        decode_records(content[:-4])
+
+
+def test_compressed_segments_read_identically(storage, data_dir):
+    before = list(storage.iter_logs())
+    ranges = [(None, None, None), (2, None, None), (1, START + 3000, START + 9000), (3, START + 11000, None)]
+    expected = [storage.query_logs(*arguments) for arguments in ranges]
+
+    report = storage.compress_segments()
+    assert report["compressed_segments"] > 1
+    assert report["compression_saved_bytes"] > 0
+    assert storage.compress_segments()["compressed_segments"] == 0
+    assert any(name.endswith(".gz") for name in os.listdir(storage.segments_path))
+
+    assert list(storage.iter_logs()) == before
+    assert [storage.query_logs(*arguments) for arguments in ranges] == expected
+    assert expected == [filter_logs(before, *arguments) for arguments in ranges]
+
+    # Sıkıştırılmış segmentlerin yanına ekleme ve yeniden açılış
+    _append(storage, 20, offset=200)
+    reopened = SegmentStorage(data_dir)
+    assert reopened.count_logs() == 220
+    assert list(reopened.iter_logs())[:200] == before
+
+
+def test_repeated_queries_hit_segment_cache(storage):
+    storage.compress_segments()
+    storage.query_logs(1)
+    misses = storage.cache_stats()["segment_cache"]["misses"]
+    hits = storage.cache_stats()["segment_cache"]["hits"]
+    storage.query_logs(1)
+    stats = storage.cache_stats()["segment_cache"]
+    assert stats["misses"] == misses
+    assert stats["hits"] > hits
+    assert 0 < stats["bytes"] <= stats["max_bytes"]
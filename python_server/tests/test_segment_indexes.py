@@ -0,0 +1,78 @@
+import pytest
+
+import config
+from rollups import TIERS, bucket_start, series_from_logs
+from segment_storage import SegmentStorage
+
+START = 1800000000
+
+
+def _append(storage, count, offset=0):
+    with storage.log_writer() as writer:
+        for i in range(offset, offset + count):
+            writer.append({"channel": 1 + i % 2, "value": float(i % 11), "value_timestamp": START + i * 97})
+
+
+def _backfill(storage):
+    turns = 1
+    while storage.backfill_rollups(100):
+        turns += 1
+    return turns
+
+
+def _assert_matches_raw(storage):
+    for channel in (1, 2):
+        for _, seconds in TIERS:
+            logs = storage.query_logs(channel, bucket_start(START, seconds), None)
+            assert storage.query_rollups(seconds, channel, START, START + 10 ** 6) == series_from_logs(logs, seconds)
+
+
+@pytest.fixture
+def storage(data_dir, monkeypatch):
+    monkeypatch.setattr(config, "ROLLUP_TIERS", "1m,1h,1d")
+    monkeypatch.setattr(config, "SEGMENT_MAX_BYTES", 1024)
+    storage = SegmentStorage(data_dir)
+    _append(storage, 300)
+    assert _backfill(storage) > 2
+    return storage
+
+
+def test_restart_loads_rollups_from_index(storage, data_dir):
+    storage.save_indexes()
+    reopened = SegmentStorage(data_dir)
+    assert reopened.query_rollups(60, 1, START, START + 3600) is None
+    # Mühürlü segmentler yeniden okunmaz; yalnızca aktif segment özetlenir
+    assert _backfill(reopened) == 1
+    _assert_matches_raw(reopened)
+
+
+def test_index_catches_up_with_later_appends(storage, data_dir):
+    storage.save_indexes()
+    _append(storage, 150, offset=300)
+    reopened = SegmentStorage(data_dir)
+    _backfill(reopened)
+    _assert_matches_raw(reopened)
+
+    # Hazır özetler başka örneğin eklemelerini sorgu anında alır
+    _append(storage, 5, offset=450)
+    _assert_matches_raw(reopened)
+
+
+def test_invalid_index_is_rebuilt(storage, data_dir):
+    storage.save_indexes()
+    with open(storage.rollup_index_path, 'r+b') as file:
+        file.seek(-8, 2)
+        file.write(b'\x00' * 8)
+    reopened = SegmentStorage(data_dir)
+    assert _backfill(reopened) > 2
+    _assert_matches_raw(reopened)
+
+
+def test_index_ignored_when_tiers_change(storage, data_dir, monkeypatch):
+    storage.save_indexes()
+    monkeypatch.setattr(config, "ROLLUP_TIERS", "1h")
+    reopened = SegmentStorage(data_dir)
+    assert _backfill(reopened) > 2
+    assert reopened.query_rollups(60, 1, START, START + 3600) is None
+    logs = reopened.query_logs(1, START, None)
+    assert reopened.query_rollups(3600, 1, START, START + 10 ** 6) == series_from_logs(logs, 3600)
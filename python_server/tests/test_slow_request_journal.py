@@ -0,0 +1,10 @@
+import os
+
+import config
+from slow_request_journal import SlowRequestJournal
+
+
+def test_default_log_path_is_per_process():
+    assert "{pid}" in config.SLOW_REQUEST_LOG_PATH
+    journal = SlowRequestJournal(500, path=config.SLOW_REQUEST_LOG_PATH)
+    assert journal.path.endswith(f"hidrologger_slow_requests.{os.getpid()}.jsonl")
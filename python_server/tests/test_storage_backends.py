@@ -0,0 +1,54 @@
+import pytest
+
+from storage import create_storage, filter_logs
+
+BACKENDS = ["json", "sqlite", "segments"]
+
+
+def _append(storage, *records):
+    with storage.log_writer() as writer:
+        for channel, value, timestamp in records:
+            writer.append({"channel": channel, "value": value, "value_timestamp": timestamp})
+
+
+RECORDS = [(1, 10.5, 1800000000), (2, 3.0, 1800000030), (1, 11.0, 1800000060),
+           (2, 4.5, 1800000090), (1, 12.25, 1800000120)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_query_logs_matches_filter_logs(data_dir, backend):
+    storage = create_storage(data_dir, backend)
+    _append(storage, *RECORDS)
+    logs = list(storage.iter_logs())
+    for channel, start, end in [(None, None, None), (1, None, None), (2, 1800000030, 1800000090),
+                                (1, 1800000001, None), (None, None, 1800000060), (3, None, None)]:
+        assert storage.query_logs(channel, start, end) == filter_logs(logs, channel, start, end)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_logs_and_documents_survive_reopen(data_dir, backend):
+    storage = create_storage(data_dir, backend)
+    count = storage.count_logs()
+    _append(storage, *RECORDS)
+    document = {"alarm": {"1": {"min_value": 1.5, "max_value": 9.0}}}
+    storage.write_document("alarm/alarm.json", document)
+    assert storage.read_document("alarm/alarm.json") == document
+    expected = list(storage.iter_logs())
+    storage.close()
+
+    reopened = create_storage(data_dir, backend)
+    assert reopened.count_logs() == count + len(RECORDS)
+    assert list(reopened.iter_logs()) == expected
+    assert reopened.read_document("alarm/alarm.json") == document
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_log_writer_deduplicates_within_transaction(data_dir, backend):
+    storage = create_storage(data_dir, backend)
+    with storage.log_writer() as writer:
+        writer.append({"channel": 5, "value": 1.0, "value_timestamp": 1800000000})
+        assert writer.exists(5, 1800000000, 1.0)
+        assert not writer.exists(5, 1800000000, 2.0)
+        assert writer.last(5)["value"] == 1.0
+    assert writer.appended
+    assert storage.query_logs(5) == [{"channel": 5, "value": 1.0, "value_timestamp": 1800000000}]
@@ -0,0 +1,29 @@
+import io
+
+import pytest
+
+pytest.importorskip("flask")
+
+from production_server import WriteRouter
+
+
+def _route(method, path, query=""):
+    calls = []
+    router = WriteRouter(lambda environ, start_response: calls.append("worker") or [b""], "127.0.0.1", 1)
+    router._forward = lambda environ, start_response, timeout=None: calls.append("owner") or [b""]
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query,
+               "wsgi.input": io.BytesIO(b"")}
+    router(environ, lambda status, headers: None)
+    return calls[0]
+
+
+def test_profile_requests_stay_in_worker_unless_owner_requested():
+    assert _route("GET", "/api/admin/profile/sample", "seconds=1") == "worker"
+    assert _route("POST", "/api/admin/profile/requests") == "worker"
+    assert _route("GET", "/api/admin/profile/sample", "seconds=1&process=owner") == "owner"
+    assert _route("DELETE", "/api/admin/profile/requests", "process=owner") == "owner"
+
+
+def test_writes_go_to_owner():
+    assert _route("POST", "/api/logs/1") == "owner"
+    assert _route("GET", "/api/data/channel_1/0/10") == "worker"
@@ -0,0 +1,269 @@
+import functools
+import inspect
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# W3C trace context: version-traceid-parentid-flags
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class _Trace:
+    """Bir isteğe ait span'ların toplandığı kayıt"""
+    __slots__ = ("trace_id", "spans", "root")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.root: Optional["Span"] = None
+
+
+class Span:
+    """Zamanlanmış tek bir işlem; context manager olarak kullanılır"""
+    __slots__ = ("trace", "tracer", "span_id", "parent_id", "name", "attributes",
+                 "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, tracer: "Tracer", trace: _Trace, name: str, parent_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.tracer = tracer
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def start(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def end(self, error: Optional[BaseException] = None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Başka bir context'te bitirildi (örn. farklı thread'de teardown)
+                _current_span.set(None)
+            self._token = None
+        self.trace.spans.append(self)
+        if self.trace.root is self:
+            self.tracer.export(self.trace)
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Örnekleme kapalıyken dönen boş span; hiçbir şey kaydetmez"""
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any):
+    """Aktif bir trace varsa alt span aç, yoksa maliyetsiz boş span döndür"""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.tracer, parent.trace, name, parent.span_id, attributes)
+
+
+def traced(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Fonksiyonu aktif trace içinde bir span ile sar"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        parent = _current_span.get()
+        if parent is None:
+            return func(*args, **kwargs)
+        with Span(parent.tracer, parent.trace, name, parent.span_id):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_public_methods(cls):
+    """Sınıfın tüm public (alt çizgisiz) instance metodlarını span ile sar"""
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        setattr(cls, attr_name, traced(attr))
+    return cls
+
+
+class Tracer:
+    """İstek başına örnekleme kararı verir, biten trace'leri halka tampona ve dosyaya aktarır"""
+
+    def __init__(self, sample_rate: float = 0.0, buffer_size: int = 256, export_path: str = ""):
+        self.sample_rate = sample_rate
+        self.export_path = export_path
+        self._buffer = deque(maxlen=buffer_size)
+        self._export_lock = threading.Lock()
+        self.started = 0
+        self.exported = 0
+
+    @staticmethod
+    def parse_traceparent(header: Optional[str]):
+        """(trace_id, parent_span_id, sampled) veya None"""
+        if not header:
+            return None
+        match = TRACEPARENT_PATTERN.match(header.strip().lower())
+        if match is None or match.group(1) == "0" * 32:
+            return None
+        return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+    def start_span(self, name: str, traceparent: Optional[str] = None,
+                   attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """İstek span'ını başlat; aktif span varsa onun altına, yoksa yeni trace olarak
+
+        Örneklenmeyen isteklerde None döner ve alt span'lar hiç oluşturulmaz.
+        """
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(parent.tracer, parent.trace, name, parent.span_id, attributes).start()
+
+        remote = self.parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id, parent_id = None, None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled:
+            return None
+
+        self.started += 1
+        trace = _Trace(trace_id or f"{random.getrandbits(128):032x}")
+        trace.root = Span(self, trace, name, parent_id, attributes)
+        return trace.root.start()
+
+    @staticmethod
+    def traceparent_of(span: Span) -> str:
+        return f"00-{span.trace.trace_id}-{span.span_id}-01"
+
+    def export(self, trace: _Trace):
+        self._buffer.append(trace)
+        self.exported += 1
+        if not self.export_path:
+            return
+        document = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", "hidrologger")]},
+                "scopeSpans": [{
+                    "scope": {"name": "hidrologger.tracing"},
+                    "spans": [s.to_otlp() for s in trace.spans]
+                }]
+            }]
+        }
+        try:
+            line = json.dumps(document, ensure_ascii=False)
+            with self._export_lock:
+                with open(self.export_path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+        except Exception as e:
+            logger.error(f"Trace dosyaya yazılamadı: {e}")
+
+    def traces(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Halka tampondaki son trace'ler (yeniden eskiye)"""
+        traces = list(self._buffer)[::-1]
+        if limit is not None:
+            traces = traces[:limit]
+        result = []
+        for trace in traces:
+            spans = sorted(trace.spans, key=lambda s: s.start_ns)
+            result.append({
+                "trace_id": trace.trace_id,
+                "name": trace.root.name,
+                "duration_ms": round((trace.root.end_ns - trace.root.start_ns) / 1e6, 3),
+                "spans": [s.to_dict() for s in spans]
+            })
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "started": self.started,
+            "exported": self.exported,
+            "buffered": len(self._buffer),
+            "export_path": self.export_path or None
+        }
+
+
+TRACER = Tracer(config.TRACE_SAMPLE_RATE, config.TRACE_BUFFER_SIZE, config.TRACE_EXPORT_PATH)